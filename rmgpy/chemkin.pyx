@@ -865,10 +865,11 @@ def load_species_dictionary(path, generate_resonance_structures=True):
     then resonance isomers for each species are generated.
     """
     from rmgpy.molecule.fragment import Fragment
+    from rmgpy.molecule.query import MoleculeCollection, MoleculeQuery
     import re
     species_dict = {}
 
-    inerts = [Species().from_smiles(inert) for inert in ('[He]', '[Ne]', 'N#N', '[Ar]')]
+    inerts = MoleculeCollection.from_species([Species().from_smiles(inert) for inert in ('[He]', '[Ne]', 'N#N', '[Ar]')])
     with open(path, 'r') as f:
         adjlist = ''
         for line in f:
@@ -878,10 +879,8 @@ def load_species_dictionary(path, generate_resonance_structures=True):
                 if generate_resonance_structures:
                     species.generate_resonance_structures()
                 label = species.label
-                for inert in inerts:
-                    if inert.is_isomorphic(species):
-                        species.reactive = False
-                        break
+                if MoleculeQuery(species.molecule).is_in(inerts):
+                    species.reactive = False
                 species_dict[label] = species
                 adjlist = ''
             else:
@@ -897,10 +896,8 @@ def load_species_dictionary(path, generate_resonance_structures=True):
                 if generate_resonance_structures:
                     species.generate_resonance_structures()
                 label = species.label
-                for inert in inerts:
-                    if inert.is_isomorphic(species):
-                        species.reactive = False
-                        break
+                if MoleculeQuery(species.molecule).is_in(inerts):
+                    species.reactive = False
                 species_dict[label] = species
 
     return species_dict
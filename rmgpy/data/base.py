@@ -43,6 +43,7 @@ from rmgpy.data.reference import Reference, Article, Book, Thesis
 from rmgpy.exceptions import DatabaseError, InvalidAdjacencyListError
 from rmgpy.kinetics.uncertainties import RateUncertainty
 from rmgpy.molecule import Molecule, Group
+from rmgpy.molecule.query import MoleculeCollection, MoleculeQuery
 
 
 ################################################################################
@@ -199,6 +200,7 @@ class Database(object):
         self.metal = metal
         self.site = site
         self.facet = facet
+        self._decision_nodes = {}
 
     def load(self, path, local_context=None, global_context=None):
         """
@@ -213,6 +215,7 @@ class Database(object):
         # Clear any previously-loaded data
         self.entries = OrderedDict()
         self.top = []
+        self._decision_nodes = {}
 
         # Set up global and local context
         if global_context is None: global_context = {}
@@ -974,49 +977,13 @@ class Database(object):
             return group.match_to_structure(self, structure, atoms, strict)
         else:
             # try to pair up labeled atoms
-            centers = group.get_all_labeled_atoms()
-            initial_map = {}
-            for label in centers.keys():
-                # Make sure the labels are in both group and structure.
-                if label not in atoms:
-                    logging.log(0, "Label {0} is in group {1} but not in structure".format(label, node))
-                    if strict:
-                        # structure must match all labeled atoms in node if strict is set to True
-                        return False
-                    continue  # with the next label - ring structures might not have all labeled atoms
-                center = centers[label]
-                atom = atoms[label]
-                # Make sure labels actually point to atoms.
-                if center is None or atom is None:
-                    return False
-                # Semantic check #1: atoms with same label are equivalent
-                if isinstance(center, list) or isinstance(atom, list):
-                    pass
-                else:
-                    if not atom.is_specific_case_of(center):
-                        return False
-                # Semantic check #2: labeled atoms that share bond in the group (node)
-                # also share equivalent (or more specific) bond in the structure
-                for atom2, atom1 in initial_map.items():
-                    if group.has_bond(center, atom1) and structure.has_bond(atom, atom2):
-                        bond1 = group.get_bond(center, atom1)  # bond1 is group
-                        bond2 = structure.get_bond(atom, atom2)  # bond2 is structure
-                        if not bond2.is_specific_case_of(bond1):
-                            return False
-                    elif group.has_bond(center, atom1):  # but structure doesn't
-                        return False
-                    elif structure.has_bond(atom, atom2):  # but group doesn't
-                        # We don't mind that the structure has bond but the group doesn't
-                        pass
-                # Passed semantic checks, so add to maps of already-matched atoms
-                if not (isinstance(center, list) or isinstance(atom, list)):
-                    initial_map[atom] = center
+            initial_map = self._map_labeled_atoms(node, structure, atoms, strict)
+            if initial_map is None:
+                return False
             # Labeled atoms in the structure that are not in the group should
             # not be considered in the isomorphism check, so flag them temporarily
             # Without this we would hit a lot of nodes that are ambiguous
-            flagged_atoms = [atom for label, atom in structure.get_all_labeled_atoms().items() if label not in centers]
-            for atom in flagged_atoms:
-                atom.ignore = True
+            flagged_atoms = self._flag_unlabeled_centers(group, structure)
 
             # use mapped (labeled) atoms to try to match subgraph
             result = structure.is_subgraph_isomorphic(group, initial_map)
@@ -1027,6 +994,65 @@ class Database(object):
 
             return result
 
+    def _map_labeled_atoms(self, node, structure, atoms, strict=False):
+        """
+        Pair up the labeled atoms of the group at `node` with the atoms of
+        `structure` given in the {label: atom} dictionary `atoms`, as needed by
+        :meth:`match_node_to_structure`. Returns the initial map of structure
+        atoms to group atoms, or ``None`` if the labeled atoms cannot match.
+        """
+        group = node.item
+        centers = group.get_all_labeled_atoms()
+        initial_map = {}
+        for label in centers.keys():
+            # Make sure the labels are in both group and structure.
+            if label not in atoms:
+                logging.log(0, "Label {0} is in group {1} but not in structure".format(label, node))
+                if strict:
+                    # structure must match all labeled atoms in node if strict is set to True
+                    return None
+                continue  # with the next label - ring structures might not have all labeled atoms
+            center = centers[label]
+            atom = atoms[label]
+            # Make sure labels actually point to atoms.
+            if center is None or atom is None:
+                return None
+            # Semantic check #1: atoms with same label are equivalent
+            if isinstance(center, list) or isinstance(atom, list):
+                pass
+            else:
+                if not atom.is_specific_case_of(center):
+                    return None
+            # Semantic check #2: labeled atoms that share bond in the group (node)
+            # also share equivalent (or more specific) bond in the structure
+            for atom2, atom1 in initial_map.items():
+                if group.has_bond(center, atom1) and structure.has_bond(atom, atom2):
+                    bond1 = group.get_bond(center, atom1)  # bond1 is group
+                    bond2 = structure.get_bond(atom, atom2)  # bond2 is structure
+                    if not bond2.is_specific_case_of(bond1):
+                        return None
+                elif group.has_bond(center, atom1):  # but structure doesn't
+                    return None
+                elif structure.has_bond(atom, atom2):  # but group doesn't
+                    # We don't mind that the structure has bond but the group doesn't
+                    pass
+            # Passed semantic checks, so add to maps of already-matched atoms
+            if not (isinstance(center, list) or isinstance(atom, list)):
+                initial_map[atom] = center
+        return initial_map
+
+    def _flag_unlabeled_centers(self, group, structure):
+        """
+        Set the `ignore` flag on the labeled atoms of `structure` whose labels
+        do not appear in `group`, and return the flagged atoms so that the
+        caller can restore them.
+        """
+        centers = group.get_all_labeled_atoms()
+        flagged_atoms = [atom for label, atom in structure.get_all_labeled_atoms().items() if label not in centers]
+        for atom in flagged_atoms:
+            atom.ignore = True
+        return flagged_atoms
+
     def descend_tree(self, structure, atoms, root=None, strict=False):
         """
         Descend the tree in search of the functional group node that best
@@ -1039,6 +1065,9 @@ class Database(object):
         Set strict to ``True`` if all labels in final matched node must match that of the
         structure.  This is used in kinetics groups to find the correct reaction template, but
         not generally used in other GAVs due to species generally not being prelabeled.
+
+        The children of each node are tested using the compiled
+        :class:`DecisionNode` of that node, see :meth:`compile_tree`.
         """
 
         if root is None:
@@ -1050,23 +1079,57 @@ class Database(object):
         elif not self.match_node_to_structure(root, structure, atoms, strict):
             return None
 
-        next_node = []
-        for child in root.children:
-            if self.match_node_to_structure(child, structure, atoms, strict):
-                next_node.append(child)
+        while True:
+            next_node = self.match_children_to_structure(root, structure, atoms, strict)
+            if len(next_node) == 0:
+                if len(root.children) > 0 and root.children[-1].label.startswith('Others-'):
+                    return root.children[-1]
+                else:
+                    return root
+            # If more than one child matches, the node has overlapping children;
+            # assume the first match is the better one.
+            root = next_node[0]
 
-        if len(next_node) == 1:
-            return self.descend_tree(structure, atoms, next_node[0], strict)
-        elif len(next_node) == 0:
-            if len(root.children) > 0 and root.children[-1].label.startswith('Others-'):
-                return root.children[-1]
-            else:
-                return root
-        else:
-            # logging.warning('For {0}, a node {1} with overlapping children {2} was encountered '
-            #                 'in tree with top level nodes {3}. Assuming the first match is the '
-            #                 'better one.'.format(structure, root, next, self.top))
-            return self.descend_tree(structure, atoms, next_node[0], strict)
+    def match_children_to_structure(self, node, structure, atoms, strict=False):
+        """
+        Return the list of children of `node` that match the `structure`
+        centered at `atoms`, in the order in which they appear in the tree.
+        `node` itself is assumed to match the structure. For a :class:`Molecule`
+        structure the children are tested using the compiled
+        :class:`DecisionNode` of `node`; otherwise each child is checked with
+        :meth:`match_node_to_structure`.
+        """
+        if isinstance(node, str):
+            node = self.entries[node]
+        if isinstance(structure, Molecule) and isinstance(node.item, Group):
+            return self.get_decision_node(node).match(self, structure, atoms, strict)
+        return [child for child in node.children if self.match_node_to_structure(child, structure, atoms, strict)]
+
+    def get_decision_node(self, node):
+        """
+        Return the compiled :class:`DecisionNode` for the children of `node`,
+        compiling it if it has not been compiled yet or if the children of
+        `node` have changed since it was compiled.
+        """
+        if isinstance(node, str):
+            node = self.entries[node]
+        decision_node = self._decision_nodes.get(node)
+        if decision_node is None or not decision_node.is_valid():
+            decision_node = DecisionNode(node)
+            self._decision_nodes[node] = decision_node
+        return decision_node
+
+    def compile_tree(self):
+        """
+        Compile every group node of the tree into a :class:`DecisionNode`, so
+        that subsequent calls to :meth:`descend_tree` test the children that
+        are simple extensions of their parent directly on the mapped atoms
+        instead of by subgraph isomorphism. The compiled nodes are kept with
+        the database and are otherwise compiled lazily on first use.
+        """
+        for entry in self.entries.values():
+            if isinstance(entry.item, Group) and entry.children:
+                self.get_decision_node(entry)
 
     def are_siblings(self, node, node_other):
         """
@@ -1319,6 +1382,280 @@ def get_all_combinations(node_lists):
     return items
 
 
+################################################################################
+
+class DecisionNode(object):
+    """
+    The compiled form of the children of a group node in a database tree, used
+    by :meth:`Database.descend_tree` to find the matching children of a node
+    without a full subgraph isomorphism check for every sibling.
+
+    Most children differ from their parent only by a more specific atom type,
+    radical, lone pair or charge on one atom, or a more specific order on one
+    bond, as generated by :meth:`Group.get_extensions`. Since the parent is
+    already known to match the structure, such a child matches if and only if
+    the structure atom (or bond) that the parent maps to the differing atom (or
+    bond) is a specific case of it. If the differing atom is a labeled center,
+    its image in the structure is fixed by the labels; otherwise the images are
+    taken from the subgraph isomorphisms of the parent, which are found once
+    for all children. Children that are not simple extensions of the parent
+    are checked with :meth:`Database.match_node_to_structure`.
+
+    The attributes are:
+
+    =============== ============================================================
+    Attribute       Description
+    =============== ============================================================
+    `node`          The :class:`Entry` whose children are compiled
+    `tests`         A list of ``(child, parent_atoms, item)`` tuples in the order of the children, where
+                    `parent_atoms` is a tuple of the one or two parent group atoms whose images are tested
+                    against the child :class:`GroupAtom` or :class:`GroupBond` `item`, or ``None`` if the child
+                    must be matched by subgraph isomorphism
+    `signature`     The node item and the children (with their items) at compilation time
+    =============== ============================================================
+    """
+
+    def __init__(self, node):
+        self.node = node
+        self.signature = (node.item, [(child, child.item) for child in node.children])
+        self.tests = [self._compile_child(node.item, child) for child in node.children]
+
+    def __repr__(self):
+        return '<DecisionNode "{0}" with {1:d} of {2:d} children compiled>'.format(
+            self.node.label, len([test for test in self.tests if test[1] is not None]), len(self.tests))
+
+    def is_valid(self):
+        """
+        Return ``True`` if the node and its children are the same as when the
+        node was compiled, or ``False`` if the tree has been modified.
+        """
+        item, children = self.signature
+        if item is not self.node.item or len(children) != len(self.node.children):
+            return False
+        for (child, child_item), current in zip(children, self.node.children):
+            if child is not current or child_item is not current.item:
+                return False
+        return True
+
+    @staticmethod
+    def _compile_child(group, child):
+        """
+        Return the test tuple for `child`, whose parent has the item `group`.
+        """
+        child_group = child.item
+        if not isinstance(group, Group) or not isinstance(child_group, Group):
+            return child, None, None
+        if (len(child_group.atoms) != len(group.atoms)
+                or len(child_group.get_all_edges()) != len(group.get_all_edges())
+                or sorted(child_group.multiplicity) != sorted(group.multiplicity)
+                or sorted(child_group.metal) != sorted(group.metal)
+                or sorted(child_group.facet) != sorted(group.facet)):
+            return child, None, None
+
+        # The labeled atoms of the child must correspond to those of the parent
+        centers = group.get_all_labeled_atoms()
+        child_centers = child_group.get_all_labeled_atoms()
+        if set(centers.keys()) != set(child_centers.keys()):
+            return child, None, None
+        initial_map = {}
+        for label, child_atom in child_centers.items():
+            if isinstance(child_atom, list) or isinstance(centers[label], list):
+                return child, None, None
+            initial_map[child_atom] = centers[label]
+        if not child_group.is_mapping_valid(group, initial_map, equivalent=False):
+            return child, None, None
+
+        # Look for a correspondence of child and parent atoms under which
+        # exactly one atom or one bond of the child is more specific
+        for mapping in child_group.find_subgraph_isomorphisms(group, initial_map):
+            differences = []
+            for child_atom, atom in mapping.items():
+                if not _is_same_group_atom(child_atom, atom):
+                    differences.append(((atom,), child_atom))
+            for child_bond in child_group.get_all_edges():
+                atom1, atom2 = mapping[child_bond.vertex1], mapping[child_bond.vertex2]
+                if set(child_bond.order) != set(group.get_bond(atom1, atom2).order):
+                    differences.append(((atom1, atom2), child_bond))
+            if len(differences) == 1:
+                parent_atoms, item = differences[0]
+                return child, parent_atoms, item
+        return child, None, None
+
+    def match(self, database, structure, atoms, strict=False):
+        """
+        Return the list of children of the node that match the `structure`
+        centered at `atoms`, in the order in which they appear in the tree.
+        The node itself must match the structure.
+        """
+        matches = []
+        pinned = None
+        images = None
+        for child, parent_atoms, item in self.tests:
+            if parent_atoms is None:
+                if database.match_node_to_structure(child, structure, atoms, strict):
+                    matches.append(child)
+                continue
+            if pinned is None:
+                pinned = self._get_labeled_images(atoms)
+            if all(atom in pinned for atom in parent_atoms):
+                if self._is_specific_case(structure, [pinned[atom] for atom in parent_atoms], item):
+                    matches.append(child)
+                continue
+            if images is None:
+                images = self._get_images(database, structure, atoms, strict)
+            for mapping in images:
+                if self._is_specific_case(structure, [mapping[atom] for atom in parent_atoms], item):
+                    matches.append(child)
+                    break
+        return matches
+
+    def _get_labeled_images(self, atoms):
+        """
+        Return a dictionary mapping the labeled atoms of the node to the atoms
+        of the structure with the same label, for the labels that fix the
+        image of the group atom in every subgraph isomorphism.
+        """
+        pinned = {}
+        for label, center in self.node.item.get_all_labeled_atoms().items():
+            atom = atoms.get(label)
+            if atom is None or isinstance(center, list) or isinstance(atom, list):
+                continue
+            pinned[center] = atom
+        return pinned
+
+    def _get_images(self, database, structure, atoms, strict=False):
+        """
+        Return the list of all subgraph isomorphisms of the node in the
+        structure, as dictionaries mapping group atoms to structure atoms.
+        """
+        group = self.node.item
+        initial_map = database._map_labeled_atoms(self.node, structure, atoms, strict)
+        if initial_map is None:
+            return []
+        flagged_atoms = database._flag_unlabeled_centers(group, structure)
+        mappings = structure.find_subgraph_isomorphisms(group, initial_map)
+        for atom in flagged_atoms:
+            atom.ignore = False
+        return [{group_atom: atom for atom, group_atom in mapping.items()} for mapping in mappings]
+
+    @staticmethod
+    def _is_specific_case(structure, images, item):
+        """
+        Return ``True`` if the structure atom, or the bond between the two
+        structure atoms, in `images` is a specific case of `item`.
+        """
+        if len(images) == 1:
+            return images[0].is_specific_case_of(item)
+        if not structure.has_bond(images[0], images[1]):
+            return False
+        return structure.get_bond(images[0], images[1]).is_specific_case_of(item)
+
+
+def _is_same_group_atom(atom1, atom2):
+    """
+    Return ``True`` if the group atoms `atom1` and `atom2` accept exactly the
+    same atoms, ignoring their labels, or ``False`` otherwise.
+    """
+    return (set(atom1.atomtype) == set(atom2.atomtype)
+            and set(atom1.radical_electrons) == set(atom2.radical_electrons)
+            and set(atom1.lone_pairs) == set(atom2.lone_pairs)
+            and set(atom1.charge) == set(atom2.charge)
+            and set(atom1.site) == set(atom2.site)
+            and set(atom1.morphology) == set(atom2.morphology)
+            and atom1.props == atom2.props)
+
+
+################################################################################
+
+class ForbiddenStructureIndex(object):
+    """
+    A precompiled index of the entries of a :class:`ForbiddenStructures`
+    database, used so that most molecules can be cleared without any
+    isomorphism checks. The attributes are:
+
+    =================== =============================== ========================
+    Attribute           Type                            Description
+    =================== =============================== ========================
+    `entries`           ``dict``                        The indexed entries
+    `molecules`         ``MoleculeCollection``          The molecules of the Molecule and Species entries
+    `groups`            ``list``                        The Group entries with their labels, element counts and atom types
+    `unsupported`       ``list``                        The entries that cannot be checked
+    =================== =============================== ========================
+
+    A molecule is only compared to the forbidden molecules with the same
+    invariants, and can only contain a forbidden group if it has at least the
+    element counts of the group and, for every group atom, an atom with one
+    of the atom types that the group atom accepts.
+    """
+
+    def __init__(self, entries):
+        from rmgpy.species import Species
+
+        self.entries = entries
+        self.molecules = MoleculeCollection()
+        self.groups = []
+        self.unsupported = []
+
+        for entry in entries.values():
+            if isinstance(entry.item, Molecule):
+                self.molecules.add(entry.item, entry)
+            elif isinstance(entry.item, Species):
+                self.molecules.add_species(entry.item, entry)
+            elif isinstance(entry.item, Group):
+                atomtypes = []
+                for atom in entry.item.atoms:
+                    accepted = set()
+                    for atomtype in atom.atomtype:
+                        accepted.add(atomtype)
+                        accepted.update(atomtype.specific)
+                    atomtypes.append(accepted)
+                self.groups.append((entry, list(entry.item.get_all_labeled_atoms().keys()),
+                                    entry.item.get_element_count(), atomtypes))
+            else:
+                self.unsupported.append(entry)
+
+    def __repr__(self):
+        return '<ForbiddenStructureIndex with {0:d} molecules and {1:d} groups>'.format(len(self.molecules),
+                                                                                       len(self.groups))
+
+    def is_valid(self, entries):
+        """
+        Return ``True`` if the index was built for the dictionary `entries`.
+        Changes to the dictionary itself are not detected, see
+        :meth:`ForbiddenStructures.reset_index`.
+        """
+        return self.entries is entries
+
+    @staticmethod
+    def get_molecule_fingerprint(molecule):
+        """
+        Return the element counts and the set of atom types of `molecule`,
+        or ``None`` if some of its atoms do not have an atom type.
+        """
+        atomtypes = set()
+        for atom in molecule.atoms:
+            atomtype = getattr(atom, 'atomtype', None)
+            if atomtype is None:
+                return None
+            atomtypes.add(atomtype)
+        return molecule.get_element_count(), atomtypes
+
+    @staticmethod
+    def is_fingerprint_match(fingerprint, element_count, atomtypes):
+        """
+        Return ``False`` if a molecule with the given `fingerprint` cannot
+        contain a group with the given `element_count` and accepted `atomtypes`.
+        """
+        molecule_element_count, molecule_atomtypes = fingerprint
+        for element, count in element_count.items():
+            if molecule_element_count.get(element, 0) < count:
+                return False
+        for accepted in atomtypes:
+            if accepted.isdisjoint(molecule_atomtypes):
+                return False
+        return True
+
+
 ################################################################################
 
 class ForbiddenStructures(Database):
@@ -1333,25 +1670,28 @@ class ForbiddenStructures(Database):
         contains forbidden functionality, or ``False`` if not. Labeled atoms
         on the forbidden structures and the molecule are honored.
         """
-        from rmgpy.species import Species
+        index = self.get_index()
 
-        for entry in self.entries.values():
-            if isinstance(entry.item, Molecule) or isinstance(entry.item, Species):
-                # Perform an isomorphism check
-                if entry.item.is_isomorphic(molecule):
-                    return True
-            elif isinstance(entry.item, Group):
-                # We need to do subgraph isomorphism
-                entry_labeled_atoms = entry.item.get_all_labeled_atoms()
-                molecule_labeled_atoms = molecule.get_all_labeled_atoms()
-                for label in entry_labeled_atoms:
+        if index.unsupported:
+            raise NotImplementedError('Checking is only implemented for forbidden Groups, Molecule, and Species.')
+
+        # Perform an isomorphism check against the forbidden molecules with the same key only
+        if MoleculeQuery(molecule).is_in(index.molecules):
+            return True
+
+        if index.groups:
+            # We need to do subgraph isomorphism against the groups that pass the fingerprint screen
+            molecule_labeled_atoms = molecule.get_all_labeled_atoms()
+            fingerprint = index.get_molecule_fingerprint(molecule)
+            for entry, labels, element_count, atomtypes in index.groups:
+                for label in labels:
                     # all group labels must be present in the molecule
                     if label not in molecule_labeled_atoms: break
                 else:
+                    if fingerprint is not None and not index.is_fingerprint_match(fingerprint, element_count, atomtypes):
+                        continue
                     if molecule.is_subgraph_isomorphic(entry.item, generate_initial_map=True):
                         return True
-            else:
-                raise NotImplementedError('Checking is only implemented for forbidden Groups, Molecule, and Species.')
 
         # Until we have more thermodynamic data of molecular ions we will forbid them
         if molecule.get_net_charge() != 0:
@@ -1359,11 +1699,31 @@ class ForbiddenStructures(Database):
 
         return False
 
+    def get_index(self):
+        """
+        Return the :class:`ForbiddenStructureIndex` for the current entries.
+        The index is rebuilt after :meth:`reset_index` has been called or the
+        entries dictionary has been replaced.
+        """
+        index = getattr(self, '_index', None)
+        if index is None or not index.is_valid(self.entries):
+            index = self._index = ForbiddenStructureIndex(self.entries)
+        return index
+
+    def reset_index(self):
+        """
+        Clear the forbidden structure index. This is done automatically when
+        entries are loaded; call this method after adding, removing or
+        replacing entries directly, or after modifying the item of an entry.
+        """
+        self._index = None
+
     def load_old(self, path):
         """
         Load an old forbidden structures file from the location `path` on disk.
         """
         self.load_old_dictionary(path, pattern=True)
+        self.reset_index()
         return self
 
     def save_old(self, path):
@@ -1397,6 +1757,7 @@ class ForbiddenStructures(Database):
                 item = make_logic_node(group)
             else:
                 item = Group().from_adjacency_list(group)
+        self.reset_index()
         self.entries[label] = Entry(
             label=label,
             item=item,
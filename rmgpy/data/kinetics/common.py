@@ -146,6 +146,17 @@ def save_entry(f, entry):
     f.write(')\n\n')
 
 
+def get_reactant_key(species_list):
+    """
+    Return a key for the list of :class:`Species` objects `species_list` that
+    does not depend on their order and is the same for any two lists of
+    isomorphic species, as needed for indexing library reactions by their
+    reactants. The key is built from the formula and multiplicity of each
+    species, which :meth:`Molecule.is_isomorphic` requires to be equal.
+    """
+    return tuple(sorted([(spc.fingerprint, spc.multiplicity) for spc in species_list]))
+
+
 def ensure_species(input_list, resonance=False, keep_isomorphic=False):
     """
     The input list of :class:`Species` or :class:`Molecule` objects is modified
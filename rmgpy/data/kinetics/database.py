@@ -38,8 +38,8 @@ import rmgpy.constants as constants
 from rmgpy.data.base import LogicNode
 from rmgpy.data.kinetics.common import ensure_species, generate_molecule_combos, \
                                        find_degenerate_reactions, ensure_independent_atom_ids, \
-                                       check_for_same_reactants
-from rmgpy.data.kinetics.family import KineticsFamily
+                                       check_for_same_reactants, get_reactant_key
+from rmgpy.data.kinetics.family import KineticsFamily, run_cross_validation
 from rmgpy.data.kinetics.library import LibraryReaction, KineticsLibrary
 from rmgpy.exceptions import DatabaseError
 from rmgpy.kinetics import Arrhenius, ArrheniusEP, ThirdBody, Lindemann, Troe, \
@@ -420,6 +420,35 @@ and immediately used in input files without any additional changes.
                 onoff = 'on ' if self.recommended_families[label] else 'off'
                 f.write("{num:<2d}    {onoff}     {label}\n".format(num=number, label=label, onoff=onoff))
 
+    def cross_validate_families(self, families=None, old=False, nprocs=None, **kwargs):
+        """
+        Perform K-fold cross validation on several kinetics families at once,
+        the folds of all of the families are evaluated together on a pool of `nprocs`
+        processes (if None uses the number of CPUs on the machine).
+        `families` is a list of family labels (all families by default) and `old`
+        selects :meth:`KineticsFamily.cross_validate_old` rather than
+        :meth:`KineticsFamily.cross_validate`, the remaining keyword arguments are
+        passed on to it. Returns a dictionary mapping each family label to the
+        cross validation results of that family.
+        """
+        if families is None:
+            families = list(self.families.keys())
+
+        jobs = {}
+        splits = {}
+        for label in families:
+            family = self.families[label]
+            if old:
+                jobs[label], splits[label] = family._prepare_cross_validate_old(**kwargs)
+            else:
+                jobs[label], splits[label] = family._prepare_cross_validate(**kwargs)
+
+        results = run_cross_validation(jobs, splits, nprocs=nprocs)
+
+        if old and not kwargs.get('uncertainties', True):
+            return {label: errors for label, (errors, uncertainties) in results.items()}
+        return results
+
     def generate_reactions(self, reactants, products=None, only_families=None, resonance=True):
         """
         Generate all reactions between the provided list of one or two
@@ -456,7 +485,8 @@ and immediately used in input files without any additional changes.
         ensure_species(reactants)
 
         reaction_list = []
-        for entry in library.entries.values():
+        # only the entries with a matching set of reactants or products need to be checked
+        for entry in library.get_reaction_index().get(get_reactant_key(reactants), []):
             if entry.item.matches_species(reactants, products=products):
                 reaction = LibraryReaction(
                     reactants=entry.item.reactants[:],
@@ -35,8 +35,10 @@ import itertools
 import logging
 import multiprocessing as mp
 import os.path
+import pickle
 import random
 import re
+import time
 import warnings
 from collections import OrderedDict
 from copy import deepcopy
@@ -1207,6 +1209,21 @@ class KineticsFamily(Database):
             return
         self.rules.fill_rules_by_averaging_up(self.get_root_template(), {}, verbose)
 
+    def _get_changed_atoms(self, product_structure, forward=True):
+        """
+        Return the ids of the atoms of `product_structure` that are named in
+        the forward or reverse recipe of this family, and whose bonds or
+        electrons may therefore have been changed by applying it, together
+        with any atoms that do not have an atom type yet.
+        """
+        recipe = self.forward_recipe if forward else self.reverse_recipe
+        labels = set()
+        for action in recipe.actions:
+            labels.add(action[1])
+            if action[0] in ['CHANGE_BOND', 'FORM_BOND', 'BREAK_BOND']:
+                labels.add(action[3])
+        return {id(atom) for atom in product_structure.atoms if atom.label in labels or atom.atomtype is None}
+
     def apply_recipe(self, reactant_structures, forward=True, unique=True, relabel_atoms=True):
         """
         Apply the recipe for this reaction family to the list of
@@ -1245,6 +1262,7 @@ class KineticsFamily(Database):
         # this thing the product_structure (although it's the same object in memory)
         product_structure = reactant_structure
 
+        changed_atoms = None
         if not product_structure.props['validAromatic']:
             if isinstance(product_structure, Molecule) or isinstance(product_structure, Fragment):
                 # For molecules, kekulize the product to redistribute bonds appropriately
@@ -1254,6 +1272,10 @@ class KineticsFamily(Database):
                 # If there is an analagous aliphatic group in the family, then the product template will be identical
                 # There should NOT be any families that consist solely of aromatic reactant templates
                 return []
+        elif isinstance(product_structure, Molecule):
+            # Only the atoms named in the recipe have had their bonds or electrons changed,
+            # so only they need new atom types when the products are updated below
+            changed_atoms = self._get_changed_atoms(product_structure, forward)
 
         # If reaction family is its own reverse, relabel atoms
         # This allows comparison of the product species to forbidden
@@ -1388,7 +1410,11 @@ class KineticsFamily(Database):
             # If product structures are Group objects and the reaction is in certain families
             # (families with charged substances), the charge of structures will be updated
             if isinstance(struct, Molecule):
-                struct.update(sort_atoms=not self.save_order)
+                if changed_atoms is None:
+                    struct.update(sort_atoms=not self.save_order)
+                else:
+                    struct.update(sort_atoms=not self.save_order,
+                                  atoms=[atom for atom in struct.atoms if id(atom) in changed_atoms])
             elif isinstance(struct, Fragment):
                 struct.update()
             elif isinstance(struct, Group):
@@ -2713,14 +2739,9 @@ class KineticsFamily(Database):
         comp = []
         new_inds = []
 
+        matches = self._get_extension_matches(newgrp)
         for i, rxn in enumerate(rxns):
-            rmol = rxn.reactants[0].molecule[0]
-            for r in rxn.reactants[1:]:
-                rmol = rmol.merge(r.molecule[0])
-
-            rmol.identify_ring_membership()
-
-            if rmol.is_subgraph_isomorphic(newgrp, generate_initial_map=True, save_order=True):
+            if self._reaction_matches_cached(rxn, newgrp, matches):
                 new.append(rxn)
                 new_inds.append(i)
             else:
@@ -2734,7 +2755,57 @@ class KineticsFamily(Database):
             rmol = rmol.merge(r.molecule[0])
         rmol.identify_ring_membership()
         return rmol.is_subgraph_isomorphic(grp, generate_initial_map=True, save_order=True)
-    
+
+    def clear_extension_cache(self):
+        """
+        Clears the memoised reaction/extension matches used during tree generation
+        """
+        self._extension_match_cache = dict()
+        self._reactant_structure_cache = dict()
+
+    def _get_extension_matches(self, grp):
+        """
+        Returns the memo of training reaction matches for the extension group grp
+        Extensions are identified by their adjacency list, so the same extension generated
+        again for a later iteration or by extend_node reuses the earlier subgraph isomorphism checks
+        """
+        if getattr(self, '_extension_match_cache', None) is None:
+            self.clear_extension_cache()
+        key = grp.to_adjacency_list()
+        try:
+            return self._extension_match_cache[key]
+        except KeyError:
+            matches = self._extension_match_cache[key] = dict()
+            return matches
+
+    def _reaction_matches_cached(self, rxn, grp, matches):
+        """
+        Memoised version of reaction_matches, matches is the memo for grp from _get_extension_matches
+        The memos are keyed by the reaction id, the reaction itself is stored alongside the result
+        so a recycled id can never return a stale result
+        """
+        try:
+            cached_rxn, match = matches[id(rxn)]
+            if cached_rxn is rxn:
+                return match
+        except KeyError:
+            pass
+
+        try:
+            cached_rxn, rmol = self._reactant_structure_cache[id(rxn)]
+            if cached_rxn is not rxn:
+                raise KeyError
+        except KeyError:
+            rmol = rxn.reactants[0].molecule[0]
+            for r in rxn.reactants[1:]:
+                rmol = rmol.merge(r.molecule[0])
+            rmol.identify_ring_membership()
+            self._reactant_structure_cache[id(rxn)] = (rxn, rmol)
+
+        match = rmol.is_subgraph_isomorphic(grp, generate_initial_map=True, save_order=True)
+        matches[id(rxn)] = (rxn, match)
+        return match
+
     def eval_ext(self, parent, ext, extname, template_rxn_map, obj=None, T=1000.0):
         """
         evaluates the objective function obj
@@ -3026,10 +3097,12 @@ class KineticsFamily(Database):
         comp_entries = []
         new_entries = []
 
+        ext_matches = self._get_extension_matches(ext[0])
+        comp_matches = self._get_extension_matches(ext[1]) if ext[1] is not None else None
         for i, entry in enumerate(template_rxn_map[parent.label]):
-            if self.reaction_matches(entry,ext[0]):
+            if self._reaction_matches_cached(entry, ext[0], ext_matches):
                 new_entries.append(entry)
-            elif ext[1] is None or self.reaction_matches(entry,ext[1]):
+            elif ext[1] is None or self._reaction_matches_cached(entry, ext[1], comp_matches):
                 comp_entries.append(entry)
             else:
                 logging.error("Reaction matched neither the new group or its complement")
@@ -3092,9 +3165,10 @@ class KineticsFamily(Database):
             template_rxn_map[parent.label] = comp_entries
         return True
 
-    def generate_tree(self, rxns=None, obj=None, thermo_database=None, T=1000.0, nprocs=1, min_splitable_entry_num=2,
+    def generate_tree(self, rxns=None, obj=None, thermo_database=None, T=1000.0, nprocs=None, min_splitable_entry_num=2,
                       min_rxns_to_spawn=20, max_batch_size=800, outlier_fraction=0.02, stratum_num=8,
-                      new_fraction_threshold_to_reopt_node=0.25, extension_iter_max=np.inf, extension_iter_item_cap=np.inf):
+                      new_fraction_threshold_to_reopt_node=0.25, extension_iter_max=np.inf, extension_iter_item_cap=np.inf,
+                      checkpoint_path=None, checkpoint_interval=600.0):
         """
         Generate a tree by greedy optimization based on the objective function obj
         the optimization is done by iterating through every group and if the group has
@@ -3106,13 +3180,17 @@ class KineticsFamily(Database):
         associated if their parent has no kinetics data associated and they either have only one child or
         have two children one of which has no kinetics data and no children
         (its parent becomes the parent of its only relevant child node)
+
+        If checkpoint_path is given the partially built tree is periodically saved there, if a checkpoint
+        already exists at that path the build resumes from it, the checkpoint is removed once the tree is complete
         
         Args:
             rxns: List of reactions to generate tree from (if None pull the whole training set)
             obj: Object to expand tree from (if None uses top node)
             thermo_database: Thermodynamic database used for reversing training reactions
             T: Temperature the tree is optimized for
-            nprocs: Number of process for parallel tree generation 
+            nprocs: Number of processes for parallel tree generation, including this one
+                (if None uses the number of CPUs on the machine)
             min_splitable_entry_num: the minimum number of splitable reactions at a node in order to spawn
                 a new process solving that node
             min_rxns_to_spawn: the minimum number of reactions at a node to spawn a new process solving that node
@@ -3122,42 +3200,69 @@ class KineticsFamily(Database):
                 in the first batch
             stratum_num: Number of strata used in stratified sampling scheme
             max_rxns_to_reopt_node: Nodes with more matching reactions than this will not be pruned
+            checkpoint_path: Path of the file the partially built tree is checkpointed to and resumed from
+            checkpoint_interval: Minimum time in seconds between periodic checkpoints
         """
+        if nprocs is None:
+            nprocs = mp.cpu_count()
+
         if rxns is None:
             rxns = self.get_training_set(thermo_database=thermo_database, remove_degeneracy=True, estimate_thermo=True,
                                          fix_labels=True, get_reverse=True)
 
-        if len(rxns) <= max_batch_size:
-            template_rxn_map = self.get_reaction_matches(rxns=rxns, thermo_database=thermo_database, remove_degeneracy=True,
-                                                         fix_labels=True, exact_matches_only=True, get_reverse=True)
-            self.make_tree_nodes(template_rxn_map=template_rxn_map, obj=obj, T=T, nprocs=nprocs - 1, depth=0,
-                                 min_splitable_entry_num=min_splitable_entry_num, min_rxns_to_spawn=min_rxns_to_spawn,extension_iter_max=extension_iter_max)
-        else:
-            def rxnkey(rxn):
-                c = 0
-                for react in rxn.reactants:
-                    c += len(react.molecule[0].atoms)
-                return c
-            rxnsorted = sorted(rxns,key=rxnkey)
-            batches = [rxnsorted[i * max_batch_size:(i + 1) * max_batch_size] for i in range((len(rxnsorted) + max_batch_size - 1) // max_batch_size )]
-            for i, batch in enumerate(batches):
-                if i == 0:
-                    rxns = batch
-                else:
-                    rxns += batch
-                    logging.error("pruning tree")
-                    self.prune_tree(rxns, batch, thermo_database=thermo_database, new_fraction_threshold_to_reopt_node=new_fraction_threshold_to_reopt_node)
-                    logging.error("pruned tree down to {} nodes".format(len(list(self.groups.entries))))
-                logging.error("getting reaction matches")
-                template_rxn_map = self.get_reaction_matches(rxns=rxns, thermo_database=thermo_database, fix_labels=True,
-                                                             exact_matches_only=True, get_reverse=True)
-                logging.error("building tree with {} rxns".format(len(rxns)))
+        start_batch = 0
+        resumed = False
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            start_batch = self.load_tree_checkpoint(checkpoint_path)
+            resumed = True
+            logging.info("Resuming tree generation for {0} from checkpoint {1} at batch {2}".format(
+                self.label, checkpoint_path, start_batch))
+
+        self.clear_extension_cache()
+        try:
+            if len(rxns) <= max_batch_size:
+                template_rxn_map = self.get_reaction_matches(rxns=rxns, thermo_database=thermo_database, remove_degeneracy=True,
+                                                             fix_labels=True, exact_matches_only=True, get_reverse=True)
                 self.make_tree_nodes(template_rxn_map=template_rxn_map, obj=obj, T=T, nprocs=nprocs - 1, depth=0,
-                                     min_splitable_entry_num=min_splitable_entry_num, min_rxns_to_spawn=min_rxns_to_spawn, extension_iter_max=extension_iter_max,
-                                     extension_iter_item_cap=extension_iter_item_cap)
-                logging.error("built tree with {} nodes".format(len(list(self.groups.entries))))
-            
-            self.auto_generated = True
+                                     min_splitable_entry_num=min_splitable_entry_num, min_rxns_to_spawn=min_rxns_to_spawn,extension_iter_max=extension_iter_max,
+                                     checkpoint_path=checkpoint_path, checkpoint_interval=checkpoint_interval)
+            else:
+                def rxnkey(rxn):
+                    c = 0
+                    for react in rxn.reactants:
+                        c += len(react.molecule[0].atoms)
+                    return c
+                rxnsorted = sorted(rxns,key=rxnkey)
+                batches = [rxnsorted[i * max_batch_size:(i + 1) * max_batch_size] for i in range((len(rxnsorted) + max_batch_size - 1) // max_batch_size )]
+                for i, batch in enumerate(batches):
+                    if i == 0:
+                        rxns = batch
+                    else:
+                        rxns += batch
+                    if i < start_batch:  # already built into the checkpointed tree
+                        continue
+                    if i > 0 and not (resumed and i == start_batch):  # a resumed batch was pruned before its checkpoint
+                        logging.error("pruning tree")
+                        self.prune_tree(rxns, batch, thermo_database=thermo_database, new_fraction_threshold_to_reopt_node=new_fraction_threshold_to_reopt_node)
+                        logging.error("pruned tree down to {} nodes".format(len(list(self.groups.entries))))
+                    if checkpoint_path:
+                        self.save_tree_checkpoint(checkpoint_path, batch=i)
+                    logging.error("getting reaction matches")
+                    template_rxn_map = self.get_reaction_matches(rxns=rxns, thermo_database=thermo_database, fix_labels=True,
+                                                                 exact_matches_only=True, get_reverse=True)
+                    logging.error("building tree with {} rxns".format(len(rxns)))
+                    self.make_tree_nodes(template_rxn_map=template_rxn_map, obj=obj, T=T, nprocs=nprocs - 1, depth=0,
+                                         min_splitable_entry_num=min_splitable_entry_num, min_rxns_to_spawn=min_rxns_to_spawn, extension_iter_max=extension_iter_max,
+                                         extension_iter_item_cap=extension_iter_item_cap, checkpoint_path=checkpoint_path,
+                                         checkpoint_interval=checkpoint_interval, checkpoint_batch=i)
+                    logging.error("built tree with {} nodes".format(len(list(self.groups.entries))))
+
+                self.auto_generated = True
+        finally:
+            self.clear_extension_cache()
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
                 
     def get_rxn_batches(self, rxns, T=1000.0, max_batch_size=800, outlier_fraction=0.02, stratum_num=8):
         """
@@ -3235,137 +3340,177 @@ class KineticsFamily(Database):
                     entry.item.clear_reg_dims()
 
     def make_tree_nodes(self, template_rxn_map=None, obj=None, T=1000.0, nprocs=0, depth=0, min_splitable_entry_num=2,
-                        min_rxns_to_spawn=20, extension_iter_max=np.inf, extension_iter_item_cap=np.inf):
+                        min_rxns_to_spawn=20, extension_iter_max=np.inf, extension_iter_item_cap=np.inf,
+                        checkpoint_path=None, checkpoint_interval=600.0, checkpoint_batch=0):
+        """
+        Greedily extends the nodes in template_rxn_map holding more than one training reaction
+        until none of them can be split any further
 
-        if depth > 0:
-            root = self.groups.entries[list(template_rxn_map.keys())[0]]
-        else:
-            for entry in self.groups.entries.values():  # find the root entry for this branch
-                if entry.index != -1:
-                    root = entry
-                    break
-            while root.parent is not None:
-                root = root.parent
-
-        if depth == 0: #may start with reactions at many nodes first iteration
-            psize = 0.0
-            entries = [root]
-            while entries != []:
-                entry = entries[-1]
-                if entry.children:
-                    psize += float(len(template_rxn_map[entry.label]))
-                    entries.extend(entry.children)
-                    entries.remove(entry)
-                else:
-                    psize += float(len(template_rxn_map[entry.label]))
-                    entries.remove(entry)
-        else:
-            psize = float(len(template_rxn_map[root.label]))
-            
-        logging.error(psize)
+        Nodes with many reactions are queued to a pool of nprocs worker processes, each worker builds
+        the complete subtree below its node while this process keeps extending the remaining nodes
+        and grafts the finished subtrees into the tree as they arrive.  A subtree whose worker fails
+        is rebuilt locally instead.  If checkpoint_path is given the tree is checkpointed every
+        checkpoint_interval seconds and whenever a subtree is grafted, see save_tree_checkpoint
+        """
         mult_completed_nodes = []  # nodes containing multiple identical training reactions
-        boo = True  # if the for loop doesn't break becomes false and the while loop terminates
-        active_procs = []
-        active_conns = []
-        active_proc_num = []
-        proc_names = []
-        free_procs = nprocs
-        extra_entries = []
-
-        while boo:
-            remove_inds = []
-            for k, p in enumerate(active_procs):  # check if any processes have finished
-                if active_conns[k].poll():
-                    new_entries = self._absorb_process(p, active_conns[k], proc_names[k])
-                    extra_entries += new_entries
-                    remove_inds.append(k)
-
-            remove_inds.reverse()
-            for ind in remove_inds:  # remove finished process objects
-                free_procs += active_proc_num[ind]
-                del active_proc_num[ind]
-                del active_procs[ind]
-                del active_conns[ind]
-                del proc_names[ind]
-
-            splitable_entry_num = 0
-            for label, items in template_rxn_map.items():  # figure out how many splitable objects there are
-                entry = self.groups.entries[label]
-                if len(items) > 1 and entry not in mult_completed_nodes:
-                    splitable_entry_num += 1
-
-            for label in list(template_rxn_map.keys()):
-                entry = self.groups.entries[label]
-                if not isinstance(entry.item, Group):  # skip logic nodes
-                    continue
-                if len(template_rxn_map[label]) == 0:
-                    continue
-                if entry.index != -1 and len(template_rxn_map[entry.label]) > 1 and entry not in mult_completed_nodes:
-                    if entry.parent and (free_procs > 0 and splitable_entry_num > min_splitable_entry_num and
-                            len(template_rxn_map[entry.label]) > min_rxns_to_spawn):
-                        procs_out = int(len(template_rxn_map[entry.label]) / psize * free_procs)
-                        free_procs -= procs_out
-                        assert free_procs >= 0
-                        conn, p, name = _spawn_tree_process(family=self,
-                                                            template_rxn_map={entry.label: template_rxn_map[entry.label]},
-                                                            obj=obj, T=T, nprocs=procs_out - 1, depth=depth,
-                                                            min_splitable_entry_num=min_splitable_entry_num,
-                                                            min_rxns_to_spawn=min_rxns_to_spawn,extension_iter_max=extension_iter_max,
-                                                            extension_iter_item_cap=extension_iter_item_cap)
-                        active_procs.append(p)
-                        active_conns.append(conn)
-                        proc_names.append(name)
-                        active_proc_num.append(procs_out)
-                        L = entry.label
-                        self.groups.entries[L].parent.children.remove(entry)
-                        del template_rxn_map[L]  # prevents this process from recreating work done by another process
-                        del self.groups.entries[L]
-
-                        splitable_entry_num -= 1
+        pool = None
+        pending = dict()  # labels of the nodes being built on workers mapped to their results and reactions
+        local_only = set()  # labels of the nodes whose workers failed
+        last_checkpoint = time.time()
+
+        try:
+            while True:
+                for label in [label for label, (result, _) in pending.items() if result.ready()]:
+                    result, rxns = pending.pop(label)
+                    try:
+                        nodes = result.get()
+                    except Exception as e:
+                        logging.error('Failed to build the subtree at node {0} on a worker process, '
+                                      'building it locally instead'.format(label))
+                        logging.error(e)
+                        local_only.add(label)
+                        template_rxn_map[label] = rxns
                         continue
-                    boo2 = self.extend_node(entry, template_rxn_map, obj, T, iter_max=extension_iter_max, iter_item_cap=extension_iter_item_cap)
-                    if boo2:  # extended node so restart while loop
-                        break
-                    else:  # no extensions could be generated since all reactions were identical
-                        mult_completed_nodes.append(entry)
-            else:
-                if len(active_procs) == 0:
-                    boo = False
+                    self._graft_subtree(nodes)
+                    self._fix_tree_indices()
+                    if checkpoint_path:
+                        self.save_tree_checkpoint(checkpoint_path, batch=checkpoint_batch)
+                        last_checkpoint = time.time()
+
+                splitable_entry_num = 0
+                for label, items in template_rxn_map.items():  # figure out how many splitable objects there are
+                    entry = self.groups.entries[label]
+                    if len(items) > 1 and entry not in mult_completed_nodes:
+                        splitable_entry_num += 1
+
+                extended = False
+                for label in list(template_rxn_map.keys()):
+                    entry = self.groups.entries[label]
+                    if not isinstance(entry.item, Group):  # skip logic nodes
+                        continue
+                    if len(template_rxn_map[label]) == 0:
+                        continue
+                    if entry.index != -1 and len(template_rxn_map[entry.label]) > 1 and entry not in mult_completed_nodes:
+                        if (nprocs > 0 and entry.parent and label not in local_only and
+                                splitable_entry_num > min_splitable_entry_num and
+                                len(template_rxn_map[entry.label]) > min_rxns_to_spawn):
+                            if pool is None:
+                                pool = mp.Pool(nprocs, initializer=_init_tree_worker,
+                                               initargs=(self, obj, T, min_splitable_entry_num, min_rxns_to_spawn,
+                                                         extension_iter_max, extension_iter_item_cap))
+                            # the worker builds the whole subtree, so take the node out of the map to keep
+                            # this process from extending it again, it is put back if the worker fails
+                            rxns = template_rxn_map.pop(label)
+                            pending[label] = (pool.apply_async(_make_subtree,
+                                                               (label, entry.item, _get_reg_dims(entry.item), rxns)),
+                                              rxns)
+                            splitable_entry_num -= 1
+                            continue
+                        if self.extend_node(entry, template_rxn_map, obj, T, iter_max=extension_iter_max,
+                                            iter_item_cap=extension_iter_item_cap):
+                            extended = True  # extended node so restart while loop
+                            break
+                        else:  # no extensions could be generated since all reactions were identical
+                            mult_completed_nodes.append(entry)
 
-            # fix indicies
-            iters = 0
-            for entry in self.groups.entries.values():
-                if entry.index != -1:
-                    entry.index = iters
-                    iters += 1
-
-        # add the entries generated on other processors
-        index = max([ent.index for ent in self.groups.entries.values()]) + 1
-        for item in extra_entries:
-            if item.label in self.groups.entries.keys():
-                continue
-            item.index = index
-            index += 1
-            self.groups.entries[item.label] = item
+                self._fix_tree_indices()
+
+                if checkpoint_path and time.time() - last_checkpoint >= checkpoint_interval:
+                    self.save_tree_checkpoint(checkpoint_path, batch=checkpoint_batch)
+                    last_checkpoint = time.time()
 
-        for label, entry in self.groups.entries.items():
-            if entry.index != -1 and entry.parent is None and entry.label != root.label:
-                pname = "_".join(label.split('_')[:-1])
-                while pname not in self.groups.entries.keys():
-                    pname = "_".join(label.split('_')[:-1])
-                entry.parent = self.groups.entries[pname]
-                entry.parent.children.append(entry)
+                if not extended:
+                    if not pending:
+                        break
+                    next(iter(pending.values()))[0].wait(1.0)  # nothing left to do locally, wait on the workers
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
 
         return
 
-    def _absorb_process(self, p, conn, name):
-        try:
-            grps = conn.recv()
-            p.terminate()
-        except Exception as e:
-            logging.error('failed to absorb process {}'.format(name))
-            raise e
-        return grps
+    def _get_tree_root(self):
+        """
+        Returns the top entry of the tree being generated
+        """
+        for entry in self.groups.entries.values():  # find the root entry for this branch
+            if entry.index != -1:
+                root = entry
+                break
+        while root.parent is not None:
+            root = root.parent
+        return root
+
+    def _fix_tree_indices(self):
+        """
+        Renumbers the tree entries consecutively
+        """
+        iters = 0
+        for entry in self.groups.entries.values():
+            if entry.index != -1:
+                entry.index = iters
+                iters += 1
+
+    def _get_subtree_nodes(self, root):
+        """
+        Returns a picklable description of the subtree below the entry root as a list of
+        (label, parent label, group, regularization dimensions) tuples with parents listed before their children
+        """
+        nodes = []
+        entries = [root]
+        while entries:
+            entry = entries.pop(0)
+            parent_label = entry.parent.label if entry.parent is not None and entry is not root else None
+            nodes.append((entry.label, parent_label, entry.item, _get_reg_dims(entry.item)))
+            entries.extend(entry.children)
+        return nodes
+
+    def _graft_subtree(self, nodes):
+        """
+        Adds the subtree described by nodes (from _get_subtree_nodes) to the tree
+        The first node must already be in the tree, its group is replaced since the
+        subtree generation may have updated its regularization dimensions
+        """
+        for i, (label, parent_label, grp, reg_dims) in enumerate(nodes):
+            _set_reg_dims(grp, reg_dims)
+            if i == 0:
+                self.groups.entries[label].item = grp
+            elif label not in self.groups.entries:
+                self.add_entry(self.groups.entries[parent_label], grp, label)
+
+    def save_tree_checkpoint(self, path, batch=0):
+        """
+        Saves the partially generated tree to path so that generate_tree can resume from it
+        batch is the index of the reaction batch being built
+        The file is replaced atomically so an interruption never leaves a corrupted checkpoint
+        """
+        checkpoint = {
+            'family': self.label,
+            'batch': batch,
+            'nodes': self._get_subtree_nodes(self._get_tree_root()),
+        }
+        with open(path + '.tmp', 'wb') as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + '.tmp', path)
+
+    def load_tree_checkpoint(self, path):
+        """
+        Restores a tree saved by save_tree_checkpoint onto the root of the (cleaned) tree
+        and returns the index of the reaction batch that was being built
+        """
+        with open(path, 'rb') as f:
+            checkpoint = pickle.load(f)
+        root = self._get_tree_root()
+        if checkpoint['family'] != self.label:
+            raise DatabaseError('Tree checkpoint {0} belongs to family {1} not {2}'.format(
+                path, checkpoint['family'], self.label))
+        if checkpoint['nodes'][0][0] != root.label:
+            raise DatabaseError('Tree checkpoint {0} is rooted at {1} not {2}'.format(
+                path, checkpoint['nodes'][0][0], root.label))
+        self._graft_subtree(checkpoint['nodes'])
+        self._fix_tree_indices()
+        return checkpoint['batch']
 
     def make_bm_rules_from_template_rxn_map(self, template_rxn_map, nprocs=1, Tref=1000.0, fmax=1.0e5):
 
@@ -3417,14 +3562,26 @@ class KineticsFamily(Database):
 
                 index += 1
 
-    def cross_validate(self, folds=5, template_rxn_map=None, test_rxn_inds=None, T=1000.0, iters=0, random_state=1, ascend=False):
+    def cross_validate(self, folds=5, template_rxn_map=None, test_rxn_inds=None, T=1000.0, iters=0, random_state=1, ascend=False,
+                       nprocs=1):
         """
         Perform K-fold cross validation on an automatically generated tree at temperature T
         after finding an appropriate node for kinetics estimation it will move up the tree
         iters times.  
+        Folds are evaluated on nprocs processes (if None uses the number of CPUs on the machine)
         Returns a dictionary mapping {rxn:Ln(k_Est/k_Train)}
         """
+        job, splits = self._prepare_cross_validate(folds=folds, template_rxn_map=template_rxn_map,
+                                                   test_rxn_inds=test_rxn_inds, T=T, iters=iters,
+                                                   random_state=random_state, ascend=ascend)
+        return run_cross_validation({self.label: job}, {self.label: splits}, nprocs=nprocs)[self.label]
 
+    def _prepare_cross_validate(self, folds=5, template_rxn_map=None, test_rxn_inds=None, T=1000.0, iters=0,
+                                random_state=1, ascend=False):
+        """
+        Does the preprocessing shared by all of the folds of cross_validate
+        Returns the cross validation job and the list of (train indices, test indices) folds for run_cross_validation
+        """
         if template_rxn_map is None:
             template_rxn_map = self.get_reaction_matches(remove_degeneracy=True, get_reverse=True, fix_labels=True)
 
@@ -3435,94 +3592,117 @@ class KineticsFamily(Database):
                 folds = len(rxns)
 
             kf = KFold(folds, shuffle=True, random_state=random_state)
-            kfsplits = kf.split(rxns)
+            splits = list(kf.split(rxns))
         else:
-            kfsplits = [([0, ], [0, ])]
+            splits = [(None, test_rxn_inds)]
 
+        job = (self, rxns, '_cross_validate_fold', dict(template_rxn_map=template_rxn_map, T=T, iters=iters, ascend=ascend))
+        return job, splits
+
+    def _cross_validate_fold(self, rxns, train_index, test_index, template_rxn_map, T=1000.0, iters=0, ascend=False):
+        """
+        Evaluates a single fold of cross_validate, the reactions rxns[test_index] are held out
+        Returns the dictionaries mapping {rxn:Ln(k_Est/k_Train)} and {rxn:uncertainty} for the held out reactions
+        """
         errors = {}
         uncertainties = {}
 
-        for train_index, test_index in kfsplits:
+        rxns_test = rxns[test_index]
 
-            if test_rxn_inds is None:
-                rxns_test = rxns[test_index]
-            else:
-                rxns_test = rxns[test_rxn_inds]
+        for rxn in rxns_test:
 
-            for rxn in rxns_test:
+            krxn = rxn.kinetics.get_rate_coefficient(T)
 
-                krxn = rxn.kinetics.get_rate_coefficient(T)
+            entry = self.get_root_template()[0]
 
-                entry = self.get_root_template()[0]
+            boo = True
+            while boo:  # find the entry it matches
+                for child in entry.children:
+                    rs = template_rxn_map[child.label]
+                    if rxn in rs:
+                        entry = child
+                        break
+                else:
+                    boo = False
 
-                boo = True
-                while boo:  # find the entry it matches
-                    for child in entry.children:
-                        rs = template_rxn_map[child.label]
-                        if rxn in rs:
-                            entry = child
-                            break
-                    else:
-                        boo = False
+            while entry.parent and len(set(template_rxn_map[entry.label]) - set(rxns_test)) <= 1:
+                if entry.parent:
+                    entry = entry.parent
 
-                while entry.parent and len(set(template_rxn_map[entry.label]) - set(rxns_test)) <= 1:
-                    if entry.parent:
-                        entry = entry.parent
+            for q in range(iters):
+                if entry.parent:
+                    entry = entry.parent
 
-                for q in range(iters):
-                    if entry.parent:
-                        entry = entry.parent
+            uncertainties[rxn] = self.rules.entries[entry.label][0].data.uncertainty
+            
+            if not ascend:
+                L = list(set(template_rxn_map[entry.label]) - set(rxns_test))
 
-                uncertainties[rxn] = self.rules.entries[entry.label][0].data.uncertainty
-                
-                if not ascend:
-                    L = list(set(template_rxn_map[entry.label]) - set(rxns_test))
-
-                    if L != []:
-                        kinetics = ArrheniusBM().fit_to_reactions(L, recipe=self.forward_recipe.actions)
-                        kinetics = kinetics.to_arrhenius(rxn.get_enthalpy_of_reaction(T))
-                        k = kinetics.get_rate_coefficient(T)
-                        errors[rxn] = np.log(k / krxn)
-                    else:
-                        raise ValueError('only one piece of kinetics information in the tree?')
-                else:
-                    boo = True
-                    rlist = list(set(template_rxn_map[entry.label]) - set(rxns_test))
-                    kinetics = _make_rule((self.forward_recipe.actions,rlist,T,1.0e3,"",[rxn.rank for rxn in rlist]))
-                    logging.error("determining fold rate")
-                    c = 1
-                    while boo:
-                        parent = entry.parent 
-                        if parent is None:
-                            break
-                        rlistparent = list(set(template_rxn_map[parent.label]) - set(rxns_test))
-                        kineticsparent = _make_rule((self.forward_recipe.actions,rlistparent,T,1.0e3,"",[rxn.rank for rxn in rlistparent]))
-                        err_parent = abs(kineticsparent.uncertainty.data_mean + kineticsparent.uncertainty.mu - kinetics.uncertainty.data_mean) + np.sqrt(2.0*kineticsparent.uncertainty.var/np.pi)
-                        err_entry = abs(kinetics.uncertainty.mu) + np.sqrt(2.0*kinetics.uncertainty.var/np.pi)
-                        if err_entry > err_parent:
-                            entry = entry.parent
-                            kinetics = kineticsparent
-                            logging.error("recursing {}".format(c))
-                            c += 1
-                        else:
-                            boo = False
-                            
+                if L != []:
+                    kinetics = ArrheniusBM().fit_to_reactions(L, recipe=self.forward_recipe.actions)
                     kinetics = kinetics.to_arrhenius(rxn.get_enthalpy_of_reaction(T))
                     k = kinetics.get_rate_coefficient(T)
                     errors[rxn] = np.log(k / krxn)
-                    
+                else:
+                    raise ValueError('only one piece of kinetics information in the tree?')
+            else:
+                boo = True
+                rlist = list(set(template_rxn_map[entry.label]) - set(rxns_test))
+                kinetics = _make_rule((self.forward_recipe.actions,rlist,T,1.0e3,"",[rxn.rank for rxn in rlist]))
+                logging.error("determining fold rate")
+                c = 1
+                while boo:
+                    parent = entry.parent 
+                    if parent is None:
+                        break
+                    rlistparent = list(set(template_rxn_map[parent.label]) - set(rxns_test))
+                    kineticsparent = _make_rule((self.forward_recipe.actions,rlistparent,T,1.0e3,"",[rxn.rank for rxn in rlistparent]))
+                    err_parent = abs(kineticsparent.uncertainty.data_mean + kineticsparent.uncertainty.mu - kinetics.uncertainty.data_mean) + np.sqrt(2.0*kineticsparent.uncertainty.var/np.pi)
+                    err_entry = abs(kinetics.uncertainty.mu) + np.sqrt(2.0*kinetics.uncertainty.var/np.pi)
+                    if err_entry > err_parent:
+                        entry = entry.parent
+                        kinetics = kineticsparent
+                        logging.error("recursing {}".format(c))
+                        c += 1
+                    else:
+                        boo = False
+                        
+                kinetics = kinetics.to_arrhenius(rxn.get_enthalpy_of_reaction(T))
+                k = kinetics.get_rate_coefficient(T)
+                errors[rxn] = np.log(k / krxn)
+                
         return errors, uncertainties
 
-    def cross_validate_old(self, folds=5, T=1000.0, random_state=1, estimator='rate rules', thermo_database=None, get_reverse=False, uncertainties=True):
+    def cross_validate_old(self, folds=5, T=1000.0, random_state=1, estimator='rate rules', thermo_database=None, get_reverse=False,
+                           uncertainties=True, rxns=None, nprocs=1):
         """
         Perform K-fold cross validation on an automatically generated tree at temperature T
+        rxns is the training set from get_training_set, it is computed if not given
+        Folds are evaluated on nprocs processes (if None uses the number of CPUs on the machine)
         Returns a dictionary mapping {rxn:Ln(k_Est/k_Train)}
         """
-        errors = {}
-        uncs = {}
-        
-        kpu = KineticParameterUncertainty()
-        rxns = np.array(self.get_training_set(remove_degeneracy=True,get_reverse=get_reverse))
+        job, splits = self._prepare_cross_validate_old(folds=folds, T=T, random_state=random_state, estimator=estimator,
+                                                       thermo_database=thermo_database, get_reverse=get_reverse,
+                                                       uncertainties=uncertainties, rxns=rxns)
+        errors, uncs = run_cross_validation({self.label: job}, {self.label: splits}, nprocs=nprocs)[self.label]
+
+        if uncertainties:
+            return errors, uncs
+        else:
+            return errors
+
+    def _prepare_cross_validate_old(self, folds=5, T=1000.0, random_state=1, estimator='rate rules', thermo_database=None,
+                                    get_reverse=False, uncertainties=True, rxns=None):
+        """
+        Does the preprocessing shared by all of the folds of cross_validate_old
+        Returns the cross validation job and the list of (train indices, test indices) folds for run_cross_validation
+        """
+        if estimator != 'rate rules':
+            raise ValueError('{0} is not a valid value for input `estimator`'.format(estimator))
+
+        if rxns is None:
+            rxns = self.get_training_set(remove_degeneracy=True, get_reverse=get_reverse)
+        rxns = np.array(rxns)
 
         if folds == 0:
             folds = len(rxns)
@@ -3535,40 +3715,47 @@ class KineticsFamily(Database):
         else:
             tdb = thermo_database
 
-        for train_index, test_index in kf.split(rxns):
+        job = (self, rxns, '_cross_validate_old_fold', dict(T=T, thermo_database=tdb, get_reverse=get_reverse,
+                                                            uncertainties=uncertainties))
+        return job, list(kf.split(rxns))
+
+    def _cross_validate_old_fold(self, rxns, train_index, test_index, T=1000.0, thermo_database=None, get_reverse=False,
+                                 uncertainties=True):
+        """
+        Evaluates a single fold of cross_validate_old, the rules are refit without the reactions rxns[test_index]
+        Returns the dictionaries mapping {rxn:Ln(k_Est/k_Train)} and {rxn:uncertainty} for the held out reactions
+        """
+        errors = {}
+        uncs = {}
+
+        kpu = KineticParameterUncertainty()
 
-            self.rules.entries = {}  # clear rules each iteration
-            if get_reverse:
-                train_index = [x for x in train_index if x<len(rxns)/2]
-            self.add_rules_from_training(train_indices=train_index, thermo_database=tdb)
-            self.fill_rules_by_averaging_up()
-            rxns_test = rxns[test_index]
+        self.rules.entries = {}  # clear rules each iteration
+        if get_reverse:
+            train_index = [x for x in train_index if x<len(rxns)/2]
+        self.add_rules_from_training(train_indices=train_index, thermo_database=thermo_database)
+        self.fill_rules_by_averaging_up()
+        rxns_test = rxns[test_index]
 
-            for rxn in rxns_test:
+        for rxn in rxns_test:
 
-                krxn = rxn.kinetics.get_rate_coefficient(T)
+            krxn = rxn.kinetics.get_rate_coefficient(T)
 
-                template_labels = self.get_reaction_template_labels(rxn)
-                template = self.retrieve_template(template_labels)
-                if estimator == 'rate rules':
-                    kinetics, entry = self.estimate_kinetics_using_rate_rules(template, degeneracy=1)
-                else:
-                    raise ValueError('{0} is not a valid value for input `estimator`'.format(estimator))
+            template_labels = self.get_reaction_template_labels(rxn)
+            template = self.retrieve_template(template_labels)
+            kinetics, entry = self.estimate_kinetics_using_rate_rules(template, degeneracy=1)
 
-                k = kinetics.get_rate_coefficient(T)
+            k = kinetics.get_rate_coefficient(T)
 
-                errors[rxn] = np.log(k / krxn)
-                if uncertainties:
-                    testrxn = deepcopy(rxn)
-                    testrxn.kinetics = kinetics
-                    boo,source = self.extract_source_from_comments(testrxn)
-                    sdict = {"Rate Rules":source}
-                    uncs[rxn] = kpu.get_uncertainty_value(sdict)
-                    
-        if uncertainties:
-            return errors, uncs
-        else:
-            return errors
+            errors[rxn] = np.log(k / krxn)
+            if uncertainties:
+                testrxn = deepcopy(rxn)
+                testrxn.kinetics = kinetics
+                boo,source = self.extract_source_from_comments(testrxn)
+                sdict = {"Rate Rules":source}
+                uncs[rxn] = kpu.get_uncertainty_value(sdict)
+
+        return errors, uncs
 
     def simple_regularization(self, node, template_rxn_map, test=True):
         """
@@ -4410,33 +4597,132 @@ def _make_rule(rr):
         return None
 
 
-def _spawn_tree_process(family, template_rxn_map, obj, T, nprocs, depth, min_splitable_entry_num, min_rxns_to_spawn, extension_iter_max, extension_iter_item_cap):
-    parent_conn, child_conn = mp.Pipe()
-    name = list(template_rxn_map.keys())[0]
-    p = mp.Process(target=_child_make_tree_nodes,
-                   args=(family, child_conn, template_rxn_map, obj, T, nprocs,
-                         depth, name, min_splitable_entry_num, min_rxns_to_spawn, extension_iter_max, extension_iter_item_cap))
-    p.start()
-    return parent_conn, p, name
+def run_cross_validation(jobs, splits, nprocs=1):
+    """
+    Runs the cross validation folds of one or more families on a pool of nprocs processes
+    (if None uses the number of CPUs on the machine)
+    jobs maps each family label to the job from KineticsFamily._prepare_cross_validate or
+    _prepare_cross_validate_old and splits maps it to the list of (train indices, test indices) folds.
+    The preprocessed jobs are shared read-only with the worker processes rather than recomputed for every fold
+    Returns a dictionary mapping each family label to the merged ({rxn:Ln(k_Est/k_Train)}, {rxn:uncertainty})
+    dictionaries and logs the time taken by each fold and in total
+    """
+    if nprocs is None:
+        nprocs = mp.cpu_count()
+
+    tasks = [(label, i, train_index, test_index) for label in jobs for i, (train_index, test_index) in enumerate(splits[label])]
+
+    t0 = time.time()
+    if nprocs > 1 and len(tasks) > 1:
+        pool = mp.Pool(min(nprocs, len(tasks)), initializer=_init_cross_validation_worker, initargs=(jobs,))
+        try:
+            results = pool.starmap(_run_cross_validation_job, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_run_cross_validation_job(*task, jobs=jobs) for task in tasks]
+
+    out = {label: ({}, {}) for label in jobs}
+    for label, i, errors, uncertainties, fold_time in results:
+        rxns = jobs[label][1]
+        out[label][0].update({rxns[j]: err for j, err in errors.items()})
+        out[label][1].update({rxns[j]: unc for j, unc in uncertainties.items()})
+        logging.info('Cross validation fold {0} of {1} for {2} took {3:.2f} s'.format(i + 1, len(splits[label]), label,
+                                                                                     fold_time))
+    logging.info('Cross validation of {0} took {1:.2f} s'.format(', '.join(jobs.keys()), time.time() - t0))
+
+    return out
+
 
+_cross_validation_jobs = None
 
-def _child_make_tree_nodes(family, child_conn, template_rxn_map, obj, T, nprocs, depth, name, min_splitable_entry_num,
-                           min_rxns_to_spawn, extension_iter_max, extension_iter_item_cap):
-    del_labels = []
-    root_label = list(template_rxn_map.keys())[0]
-    for label in family.groups.entries.keys():
-        if label != root_label:
-            del_labels.append(label)
-    for label in del_labels:
-        del family.groups.entries[label]
 
-    family.groups.entries[root_label].parent = None
+def _init_cross_validation_worker(jobs):
+    """
+    Pool initializer for cross validation workers, the preprocessed jobs are
+    only transferred once per worker rather than once per fold
+    """
+    global _cross_validation_jobs
+    _cross_validation_jobs = jobs
+
+
+def _run_cross_validation_job(label, i, train_index, test_index, jobs=None):
+    """
+    Evaluates fold i of the cross validation job of the family label
+    the results are keyed by reaction index so they can be returned from a worker process
+    """
+    if jobs is None:
+        jobs = _cross_validation_jobs
+    family, rxns, method, kwargs = jobs[label]
+    t0 = time.time()
+    errors, uncertainties = getattr(family, method)(rxns, train_index, test_index, **kwargs)
+    inds = {id(rxn): j for j, rxn in enumerate(rxns)}
+    errors = {inds[id(rxn)]: err for rxn, err in errors.items()}
+    uncertainties = {inds[id(rxn)]: unc for rxn, unc in uncertainties.items()}
+    return label, i, errors, uncertainties, time.time() - t0
+
+
+def _get_reg_dims(grp):
+    """
+    Returns the regularization dimensions of the group grp in a form that survives pickling
+    (group pickles drop them and atom types are stored by label)
+    """
+    atoms = grp.atoms
+    atom_dims = [([[at.label for at in dim] for dim in atm.reg_dim_atm], atm.reg_dim_u, atm.reg_dim_r,
+                  atm.reg_dim_site, atm.reg_dim_morphology) for atm in atoms]
+    bond_dims = [(atoms.index(bd.vertex1), atoms.index(bd.vertex2), bd.reg_dim) for bd in grp.get_all_edges()]
+    return atom_dims, bond_dims
+
+
+def _set_reg_dims(grp, reg_dims):
+    """
+    Restores the regularization dimensions from _get_reg_dims onto the group grp
+    """
+    atom_dims, bond_dims = reg_dims
+    atoms = grp.atoms
+    for atm, (reg_dim_atm, reg_dim_u, reg_dim_r, reg_dim_site, reg_dim_morphology) in zip(atoms, atom_dims):
+        atm.reg_dim_atm = [[ATOMTYPES[label] for label in dim] for dim in reg_dim_atm]
+        atm.reg_dim_u = reg_dim_u
+        atm.reg_dim_r = reg_dim_r
+        atm.reg_dim_site = reg_dim_site
+        atm.reg_dim_morphology = reg_dim_morphology
+    for ind1, ind2, reg_dim in bond_dims:
+        grp.get_bond(atoms[ind1], atoms[ind2]).reg_dim = reg_dim
+
+
+_tree_worker = None
 
-    family.make_tree_nodes(template_rxn_map=template_rxn_map, obj=obj, T=T, nprocs=nprocs, depth=depth + 1,
-                           min_splitable_entry_num=min_splitable_entry_num, min_rxns_to_spawn=min_rxns_to_spawn, 
+
+def _init_tree_worker(family, obj, T, min_splitable_entry_num, min_rxns_to_spawn, extension_iter_max,
+                      extension_iter_item_cap):
+    """
+    Pool initializer for tree generation workers, the family and objective function are
+    only transferred once per worker rather than once per subtree
+    """
+    global _tree_worker
+    _tree_worker = (family, obj, T, min_splitable_entry_num, min_rxns_to_spawn, extension_iter_max,
+                    extension_iter_item_cap)
+
+
+def _make_subtree(label, grp, reg_dims, rxns):
+    """
+    Builds the complete subtree below the node label with group grp matching the training reactions rxns
+    on a tree generation worker and returns it in the form from KineticsFamily._get_subtree_nodes
+    """
+    family, obj, T, min_splitable_entry_num, min_rxns_to_spawn, extension_iter_max, extension_iter_item_cap = _tree_worker
+    _set_reg_dims(grp, reg_dims)
+    root = Entry(index=0, label=label, item=grp)
+    family.groups.entries = OrderedDict([(label, root)])
+    family.rules.entries = OrderedDict([(label, [])])
+    family.clear_extension_cache()
+
+    family.make_tree_nodes(template_rxn_map={label: rxns}, obj=obj, T=T, nprocs=0, depth=1,
+                           min_splitable_entry_num=min_splitable_entry_num, min_rxns_to_spawn=min_rxns_to_spawn,
                            extension_iter_max=extension_iter_max, extension_iter_item_cap=extension_iter_item_cap)
 
-    child_conn.send(list(family.groups.entries.values()))
+    return family._get_subtree_nodes(root)
+
 
 def average_kinetics(kinetics_list):
     """
@@ -40,7 +40,7 @@ from collections import OrderedDict
 import numpy as np
 
 from rmgpy.data.base import DatabaseError, Database, Entry
-from rmgpy.data.kinetics.common import save_entry
+from rmgpy.data.kinetics.common import save_entry, get_reactant_key
 from rmgpy.data.kinetics.family import TemplateReaction
 from rmgpy.kinetics import Arrhenius, ThirdBody, Lindemann, Troe, \
                            PDepArrhenius, MultiArrhenius, MultiPDepArrhenius, Chebyshev 
@@ -230,6 +230,7 @@ class KineticsLibrary(Database):
     def __init__(self, label='', name='', solvent=None, short_desc='', long_desc='', auto_generated=False):
         Database.__init__(self, label=label, name=name, short_desc=short_desc, long_desc=long_desc)
         self.auto_generated = auto_generated
+        self._reaction_index = None
 
     def __str__(self):
         return 'Kinetics Library {0}'.format(self.label)
@@ -237,6 +238,32 @@ class KineticsLibrary(Database):
     def __repr__(self):
         return '<KineticsLibrary "{0}">'.format(self.label)
 
+    def get_reaction_index(self):
+        """
+        Return a dictionary mapping the reactant key from
+        :func:`get_reactant_key` of each side of every library reaction to
+        the list of entries having that set of reactants or products. The
+        index is built when the library is loaded, and is rebuilt after
+        :meth:`reset_reaction_index` has been called.
+        """
+        if self._reaction_index is None:
+            index = {}
+            for entry in self.entries.values():
+                keys = {get_reactant_key(entry.item.reactants), get_reactant_key(entry.item.products)}
+                for key in keys:
+                    index.setdefault(key, []).append(entry)
+            self._reaction_index = index
+        return self._reaction_index
+
+    def reset_reaction_index(self):
+        """
+        Clear the reaction index. This is done automatically when entries are
+        loaded or merged; call this method after adding, removing or replacing
+        entries directly, or after modifying the reactants or products of an
+        entry.
+        """
+        self._reaction_index = None
+
     def get_library_reactions(self):
         """
         makes library and template reactions as appropriate from the library comments
@@ -387,12 +414,14 @@ class KineticsLibrary(Database):
         for entry in entries_to_remove:
             logging.debug("Removing duplicate reaction with index {0}.".format(entry.index))
             del (self.entries[entry.index])
+        self.reset_reaction_index()
         logging.debug("NB. the entries have not been renumbered, so these indices are missing.")
 
     def load(self, path, local_context=None, global_context=None):
         # Clear any previously-loaded data
         self.entries = OrderedDict()
         self.top = []
+        self.reset_reaction_index()
 
         # Set up global and local context
         if global_context is None:
@@ -522,6 +551,9 @@ class KineticsLibrary(Database):
             self.check_for_duplicates()
             self.convert_duplicates_to_multi()
 
+        self.reset_reaction_index()
+        self.get_reaction_index()
+
     def load_entry(self,
                    index,
                    label,
@@ -561,6 +593,7 @@ class KineticsLibrary(Database):
         #    raise DatabaseError('Reaction {0} in kinetics library {1} was not balanced! Please reformulate.'.format(rxn, self.label))
         # label = str(rxn)
         assert index not in self.entries, "Index of reaction {0} is not unique!".format(label)
+        self.reset_reaction_index()
         self.entries[index] = Entry(
             index=index,
             label=label,
@@ -639,6 +672,7 @@ class KineticsLibrary(Database):
             reactions.extend(pdep_reactions)
 
         self.entries = {}
+        self.reset_reaction_index()
         for index, reaction in enumerate(reactions):
             entry = Entry(
                 index=index + 1,
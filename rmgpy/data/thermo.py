@@ -46,6 +46,7 @@ import rmgpy.quantity
 from rmgpy.data.base import Database, Entry, make_logic_node, DatabaseError
 from rmgpy.ml.estimator import MLEstimator
 from rmgpy.molecule import Molecule, Bond, Group
+from rmgpy.molecule.query import MoleculeCollection, MoleculeQuery
 from rmgpy.species import Species
 from rmgpy.thermo import NASAPolynomial, NASA, ThermoData, Wilhoit
 from rmgpy.data.surface import MetalDatabase
@@ -601,6 +602,27 @@ class ThermoDepository(Database):
 
     def __init__(self, label='', name='', short_desc='', long_desc='', metal=None, site=None, facet=None):
         Database.__init__(self, label=label, name=name, short_desc=short_desc, long_desc=long_desc, metal=metal, site=site, facet=facet)
+        self._molecule_collection = None
+
+    def get_molecule_collection(self):
+        """
+        Return a :class:`MoleculeCollection` of the molecules of all entries,
+        with the entries as the items. The collection is built on first use
+        and is rebuilt when the depository is reloaded.
+        """
+        if self._molecule_collection is None or self._molecule_collection[0] is not self.entries:
+            collection = MoleculeCollection()
+            for entry in self.entries.values():
+                collection.add(entry.item, entry)
+            self._molecule_collection = (self.entries, collection)
+        return self._molecule_collection[1]
+
+    def reset_molecule_collection(self):
+        """
+        Clear the molecule collection. Call this method after adding, removing
+        or replacing entries, or after modifying the molecule of an entry.
+        """
+        self._molecule_collection = None
 
     def load_entry(self, index, label, molecule, thermo, reference=None, referenceType='', shortDesc='', longDesc='',
                    rank=None, metal=None, site=None, facet=None):
@@ -642,6 +664,28 @@ class ThermoLibrary(Database):
     def __init__(self, label='', name='', solvent=None, short_desc='', long_desc='', metal=None, site=None, facet=None):
         Database.__init__(self, label=label, name=name, short_desc=short_desc, long_desc=long_desc,
                           metal=metal, site=site, facet=facet)
+        self._molecule_collection = None
+
+    def get_molecule_collection(self):
+        """
+        Return a :class:`MoleculeCollection` of the molecules of all entries,
+        with the entries as the items. The collection is extended as entries
+        are loaded, and is rebuilt when the library is reloaded.
+        """
+        if self._molecule_collection is None or self._molecule_collection[0] is not self.entries:
+            collection = MoleculeCollection()
+            for entry in self.entries.values():
+                collection.add(entry.item, entry)
+            self._molecule_collection = (self.entries, collection)
+        return self._molecule_collection[1]
+
+    def reset_molecule_collection(self):
+        """
+        Clear the molecule collection. Call this method after adding, removing
+        or replacing entries directly, or after modifying the molecule of an
+        entry, rather than through :meth:`load_entry`.
+        """
+        self._molecule_collection = None
 
     def load_entry(self,
                    index,
@@ -672,12 +716,11 @@ class ThermoLibrary(Database):
             raise DatabaseError('Found a duplicate molecule with label {0} in the thermo library {1}. '
                                 'Please correct your library.'.format(label, self.name))
 
-        for entry in self.entries.values():
-            if molecule.is_isomorphic(entry.item):
-                if molecule.multiplicity == entry.item.multiplicity:
-                    raise DatabaseError('Adjacency list and multiplicity of {0} matches that of '
-                                        'existing molecule {1} in thermo library {2}. Please '
-                                        'correct your library.'.format(label, entry.label, self.name))
+        collection = self.get_molecule_collection()
+        for entry in MoleculeQuery(molecule).find_in(collection, first=True):
+            raise DatabaseError('Adjacency list and multiplicity of {0} matches that of '
+                                'existing molecule {1} in thermo library {2}. Please '
+                                'correct your library.'.format(label, entry.label, self.name))
 
         self.entries[label] = Entry(
             index=index,
@@ -693,6 +736,7 @@ class ThermoLibrary(Database):
             facet=facet,
             site=site,
         )
+        collection.add(molecule, self.entries[label])
 
     def save_entry(self, f, entry):
         """
@@ -1156,6 +1200,7 @@ class ThermoDatabase(object):
             for label in to_delete:
                 logging.info(" {0}".format(label))
                 library.entries.pop(label)
+            library.reset_molecule_collection()
 
     def save_old(self, path):
         """
@@ -1262,6 +1307,36 @@ class ThermoDatabase(object):
         
         Returns: ThermoData
         """
+        return self._get_thermo_data(species, metal_to_scale_to=metal_to_scale_to)
+
+    def get_thermo_data_batch(self, species_list, metal_to_scale_to=None):
+        """
+        Return the list of thermodynamic parameters for each :class:`Species`
+        object in `species_list`, as :meth:`get_thermo_data` does. The species
+        which are not found in the libraries or estimated by another method
+        are estimated together by :meth:`get_thermo_data_from_groups_batch`.
+
+        Returns: list of ThermoData
+        """
+        thermo_list = [self._get_thermo_data(species, metal_to_scale_to=metal_to_scale_to, estimate_from_groups=False)
+                       for species in species_list]
+        indices = [i for i, thermo0 in enumerate(thermo_list) if thermo0 is None]
+        group_thermo_list = self.get_thermo_data_from_groups_batch([species_list[i] for i in indices])
+        for i, thermo0 in zip(indices, group_thermo_list):
+            species = species_list[i]
+            # Update entropy by symmetry correction
+            thermo0.S298.value_si -= constants.R * math.log(species.get_symmetry_number())
+            find_cp0_and_cpinf(species, thermo0)
+            thermo_list[i] = thermo0
+        return thermo_list
+
+    def _get_thermo_data(self, species, metal_to_scale_to=None, estimate_from_groups=True):
+        """
+        Return the thermodynamic parameters for a given :class:`Species`
+        object `species` as described in :meth:`get_thermo_data`. If
+        `estimate_from_groups` is ``False``, ``None`` is returned instead of
+        estimating the thermo by group additivity.
+        """
         from rmgpy.rmg.input import get_input
 
         thermo0 = self.get_thermo_data_from_libraries(species)
@@ -1414,6 +1489,8 @@ class ThermoDatabase(object):
                                                            ml_settings)
 
             if thermo0 is None:
+                if not estimate_from_groups:
+                    return None
                 # And lastly, resort back to group additivity to determine thermo for molecule
                 thermo0 = self.get_thermo_data_from_groups(species)
 
@@ -1734,6 +1811,7 @@ class ThermoDatabase(object):
         """
         import rmgpy.rmg.main
         thermo_data = None
+        query = MoleculeQuery(species.molecule)
 
         # chatelak 11/15/14: modification to introduce liquid phase thermo libraries
         library_list = deepcopy(self.library_order)  # copy the value to not affect initial object
@@ -1749,7 +1827,7 @@ class ThermoDatabase(object):
             # Only if function not called by training_set
             if liq_libraries and training_set is None:
                 for label in liq_libraries:
-                    thermo_data = self.get_thermo_data_from_library(species, self.libraries[label])
+                    thermo_data = self.get_thermo_data_from_library(species, self.libraries[label], query)
                     if thermo_data is not None:
                         if len(thermo_data) != 3:
                             raise RuntimeError("thermo_data should be a tuple (thermo_data, library, entry), "
@@ -1770,7 +1848,7 @@ class ThermoDatabase(object):
         # all gas phase, already checked by checkLibrairies function in database.load()
         # Check the libraries in order; return the first successful match
         for label in library_list:
-            thermo_data = self.get_thermo_data_from_library(species, self.libraries[label])
+            thermo_data = self.get_thermo_data_from_library(species, self.libraries[label], query)
             if thermo_data is not None:
                 if len(thermo_data) != 3:
                     raise RuntimeError("thermo_data should be a tuple (thermo_data, library, entry), "
@@ -1797,8 +1875,9 @@ class ThermoDatabase(object):
         # Data from depository comes first
         thermo_data_list.extend(self.get_thermo_data_from_depository(species))
         # Data from libraries comes second
+        query = MoleculeQuery(species.molecule)
         for label in self.library_order:
-            data = self.get_thermo_data_from_library(species, self.libraries[label])
+            data = self.get_thermo_data_from_library(species, self.libraries[label], query)
             if data:
                 if len(data) != 3:
                     raise RuntimeError("data should be a tuple (thermo_data, library, entry), "
@@ -1844,19 +1923,13 @@ class ThermoDatabase(object):
         Returns: a list of tuples (thermo_data, depository, entry) without any Cp0 or CpInf data.
         """
         items = []
-        for entry in self.depository['stable'].entries.values():
-            for molecule in species.molecule:
-                if molecule.is_isomorphic(entry.item):
-                    items.append((deepcopy(entry.data), self.depository['stable'], entry))
-                    break
-        for entry in self.depository['radical'].entries.values():
-            for molecule in species.molecule:
-                if molecule.is_isomorphic(entry.item):
-                    items.append((deepcopy(entry.data), self.depository['radical'], entry))
-                    break
+        query = MoleculeQuery(species.molecule)
+        for depository in [self.depository['stable'], self.depository['radical']]:
+            for entry in query.find_in(depository.get_molecule_collection()):
+                items.append((deepcopy(entry.data), depository, entry))
         return items
 
-    def get_thermo_data_from_library(self, species, library):
+    def get_thermo_data_from_library(self, species, library, query=None):
         """
         Return the set of thermodynamic parameters corresponding to a given
         :class:`Species` object `species` from the specified thermodynamics
@@ -1864,19 +1937,23 @@ class ThermoDatabase(object):
         for a library with that name. If no match is found in that library,
         ``None`` is returned. If no corresponding library is found, a
         :class:`DatabaseError` is raised.
+
+        The entries are looked up by the canonical keys of the resonance
+        structures, so only entries with the same key are checked for
+        isomorphism. A :class:`MoleculeQuery` of ``species.molecule`` may be
+        passed as `query` to reuse its keys when searching several libraries.
         
         Returns a tuple: (ThermoData, library, entry)  or None.
         """
+        if query is None:
+            query = MoleculeQuery(species.molecule)
         match = None
-        for entry in library.entries.values():
-            for molecule in species.molecule:
-                if molecule.is_isomorphic(entry.item) and entry.data is not None:
-                    thermo_data = deepcopy(entry.data)
-                    thermo_data.label = entry.label
-                    find_cp0_and_cpinf(species, thermo_data)
-                    match = (thermo_data, library, entry)
-                    break
-            if match is not None:
+        for entry, molecule in query.find_matches(library.get_molecule_collection()):
+            if entry.data is not None:
+                thermo_data = deepcopy(entry.data)
+                thermo_data.label = entry.label
+                find_cp0_and_cpinf(species, thermo_data)
+                match = (thermo_data, library, entry)
                 break
         if match is not None:
             # Move the matched molecule to the first position in the list
@@ -1905,6 +1982,41 @@ class ThermoDatabase(object):
             tdata = self.estimate_thermo_via_group_additivity(molecule)
             thermo.append(tdata)
 
+        return self._select_thermo_data_from_groups(species, thermo)
+
+    def get_thermo_data_from_groups_batch(self, species_list):
+        """
+        Return the list of thermodynamic parameters for each :class:`Species`
+        object in `species_list`, as :meth:`get_thermo_data_from_groups` does,
+        estimating the resonance isomers of all species together with
+        :meth:`estimate_thermo_via_group_additivity_batch`.
+
+        This does not account for symmetry. The method calling this should correct for it.
+
+        Returns: list of ThermoData
+        """
+        molecules = []
+        for species in species_list:
+            for molecule in species.molecule:
+                molecule.clear_labeled_atoms()
+                molecule.update_atomtypes()
+                molecules.append(molecule)
+        thermo = self.estimate_thermo_via_group_additivity_batch(molecules)
+
+        thermo_list = []
+        start = 0
+        for species in species_list:
+            end = start + len(species.molecule)
+            thermo_list.append(self._select_thermo_data_from_groups(species, thermo[start:end]))
+            start = end
+        return thermo_list
+
+    def _select_thermo_data_from_groups(self, species, thermo):
+        """
+        Sort the resonance isomers of `species` by :meth:`prioritize_thermo`
+        of their group additivity estimates `thermo`, and return the estimate
+        of the first isomer.
+        """
         indices = self.prioritize_thermo(species, thermo)
 
         species.molecule = [species.molecule[ind] for ind in indices]
@@ -2034,9 +2146,7 @@ class ThermoDatabase(object):
         if not molecule.is_radical():
             raise ValueError("Method only valid for radicals.")
 
-        saturated_struct = molecule.copy(deep=True)
-        added = saturated_struct.saturate_radicals()
-        saturated_struct.props['saturated'] = True
+        saturated_struct, added = self._get_hbi_saturated_structure(molecule)
 
         # Get thermo estimate for saturated form of structure
         if stable_thermo_estimator == self.get_thermo_data_from_libraries:
@@ -2068,8 +2178,25 @@ class ThermoDatabase(object):
             # assumes that the thermo data comes from QMTP or from a thermolibrary
             thermo_data_sat.S298.value_si += constants.R * math.log(saturated_struct.get_symmetry_number())
 
-        thermo_data = thermo_data_sat
+        return self._add_hbi_thermo_data(thermo_data_sat, molecule, saturated_struct, added)
+
+    def _get_hbi_saturated_structure(self, molecule):
+        """
+        Return a copy of the radical `molecule` saturated with hydrogen atoms,
+        and the dictionary of the hydrogen atoms and bonds added to each
+        radical site, for estimating its thermo via hydrogen bond increments.
+        """
+        saturated_struct = molecule.copy(deep=True)
+        added = saturated_struct.saturate_radicals()
+        saturated_struct.props['saturated'] = True
+        return saturated_struct, added
 
+    def _add_hbi_thermo_data(self, thermo_data, molecule, saturated_struct, added):
+        """
+        Add the hydrogen bond increments of the radical sites of `molecule`
+        to the `thermo_data` of its `saturated_struct`, which has the hydrogen
+        atoms `added` to each radical site, and return it.
+        """
         # For each radical site, get radical correction
         # Only one radical site should be considered at a time; all others
         # should be saturated with hydrogen atoms
@@ -2132,16 +2259,42 @@ class ThermoDatabase(object):
         The entropy is not corrected for the symmetry of the molecule,
         this should be done later by the calling function.
         """
-        # For thermo estimation we need the atoms to already be sorted because we
-        # iterate over them; if the order changes during the iteration then we
-        # will probably not visit the right atoms, and so will get the thermo wrong.
-        molecule.sort_atoms()
+        return self.estimate_thermo_via_group_additivity_batch([molecule])[0]
 
-        if molecule.is_radical():
-            thermo_data = self.estimate_radical_thermo_via_hbi(molecule, self.compute_group_additivity_thermo)
-        else:
-            thermo_data = self.compute_group_additivity_thermo(molecule)
-        return thermo_data
+    def estimate_thermo_via_group_additivity_batch(self, molecules):
+        """
+        Return the list of thermodynamic parameters estimated for each of the
+        :class:`Molecule` objects in `molecules` using the group additivity
+        values method, as :meth:`estimate_thermo_via_group_additivity` does.
+        The non-radical molecules and the saturated forms of the radicals are
+        estimated together by :meth:`compute_group_additivity_thermo_batch`,
+        and the hydrogen bond increments of the radicals are then added to
+        the estimates of their saturated forms.
+
+        The entropy is not corrected for the symmetry of the molecules,
+        this should be done later by the calling function.
+        """
+        stable_molecules = []
+        radicals = []
+        for molecule in molecules:
+            # For thermo estimation we need the atoms to already be sorted because we
+            # iterate over them; if the order changes during the iteration then we
+            # will probably not visit the right atoms, and so will get the thermo wrong.
+            molecule.sort_atoms()
+            if molecule.is_radical():
+                saturated_struct, added = self._get_hbi_saturated_structure(molecule)
+                radicals.append((saturated_struct, added))
+                stable_molecules.append(saturated_struct)
+            else:
+                radicals.append(None)
+                stable_molecules.append(molecule)
+
+        thermo_list = self.compute_group_additivity_thermo_batch(stable_molecules)
+        for i, (molecule, radical) in enumerate(zip(molecules, radicals)):
+            if radical is not None:
+                saturated_struct, added = radical
+                thermo_list[i] = self._add_hbi_thermo_data(thermo_list[i], molecule, saturated_struct, added)
+        return thermo_list
 
     def compute_group_additivity_thermo(self, molecule):
         """
@@ -2153,36 +2306,101 @@ class ThermoDatabase(object):
         The entropy is not corrected for the symmetry of the molecule,
         this should be done later by the calling function.
         """
+        return self.compute_group_additivity_thermo_batch([molecule])[0]
 
-        assert not molecule.is_radical(), "This method is only for saturated non-radical species."
-        # For thermo estimation we need the atoms to already be sorted because we
-        # iterate over them; if the order changes during the iteration then we
-        # will probably not visit the right atoms, and so will get the thermo wrong.
-        molecule.sort_atoms()
+    def compute_group_additivity_thermo_batch(self, molecules):
+        """
+        Return the list of thermodynamic parameters corresponding to each of
+        the non-radical :class:`Molecule` objects in `molecules` using the
+        group additivity values method.
 
-        # Create the ThermoData object
-        thermo_data = ThermoData(
-            Tdata=([300, 400, 500, 600, 800, 1000, 1500], "K"),
-            Cpdata=([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], "J/(mol*K)"),
-            H298=(0.0, "kJ/mol"),
-            S298=(0.0, "J/(mol*K)"),
-        )
+        Each distinct group value found for the molecules is stored as a row
+        of H298, S298 and the heat capacities, keyed by the labels of its
+        database and group, and the number of times each molecule uses each
+        group value as a row of a count matrix, so the group values of all
+        molecules are added up by a single matrix product. Ring corrections
+        are then added to each cyclic molecule.
+
+        The entropy is not corrected for the symmetry of the molecules,
+        this should be done later by the calling function.
+        """
+        tdata = [300, 400, 500, 600, 800, 1000, 1500]
+        columns = {}
+        group_values = []
+        counts = []
+        comments = []
+        for molecule in molecules:
+            assert not molecule.is_radical(), "This method is only for saturated non-radical species."
+            # For thermo estimation we need the atoms to already be sorted because we
+            # iterate over them; if the order changes during the iteration then we
+            # will probably not visit the right atoms, and so will get the thermo wrong.
+            molecule.sort_atoms()
+
+            terms, comment = self._get_group_additivity_terms(molecule)
+            count = {}
+            for data in terms:
+                # The comment of a group value is the label of its database and group
+                column = columns.get(data.comment)
+                if column is None:
+                    if len(data.Tdata.value_si) != len(tdata) or any(T1 != T2 for T1, T2 in zip(data.Tdata.value_si, tdata)):
+                        raise ValueError('Cannot add these ThermoData objects due to their having different '
+                                         'temperature points.')
+                    column = columns[data.comment] = len(group_values)
+                    group_values.append([data.H298.value_si, data.S298.value_si] + data.Cpdata.value_si.tolist())
+                count[column] = count.get(column, 0) + 1
+            counts.append(count)
+            comments.append(comment)
+
+        count_matrix = np.zeros((len(molecules), len(group_values)))
+        for i, count in enumerate(counts):
+            for column, number in count.items():
+                count_matrix[i, column] = number
+        totals = count_matrix.dot(np.array(group_values).reshape((len(group_values), 2 + len(tdata))))
+
+        thermo_list = []
+        for molecule, total, comment in zip(molecules, totals, comments):
+            thermo_data = ThermoData(
+                Tdata=(tdata, "K"),
+                Cpdata=([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], "J/(mol*K)"),
+                H298=(0.0, "kJ/mol"),
+                S298=(0.0, "J/(mol*K)"),
+            )
+            thermo_data.H298.value_si = total[0]
+            thermo_data.S298.value_si = total[1]
+            thermo_data.Cpdata.value_si[:] = total[2:]
+            thermo_data.comment = comment
+            if molecule.is_cyclic():
+                self._add_ring_correction_thermo_data(thermo_data, molecule)
+            thermo_list.append(thermo_data)
 
+        return thermo_list
+
+    def _get_group_additivity_terms(self, molecule):
+        """
+        Return the list of group values added up to estimate the thermo of the
+        non-radical `molecule` by group additivity, in the order in which they
+        are added, and the comment describing them. The ring corrections are
+        not included.
+        """
+        terms = []
+        comments = []
         cyclic = molecule.is_cyclic()
         # Generate estimates of the thermodynamics parameters
         for atom in molecule.atoms:
             # Iterate over atoms and skip hydogens and halogens (since there are no groups centered on these atomtypes)
             if atom.is_non_hydrogen() and not atom.is_halogen():
                 # Get initial thermo estimate from main group database
-                data_added = False
                 try:
-                    data_added = self._add_group_thermo_data(thermo_data, self.groups['group'], molecule, {'*': atom})[1]
+                    data = self._get_group_thermo_data(self.groups['group'], molecule, {'*': atom})
                 except KeyError:
                     logging.error("Couldn't find in main thermo database:")
                     logging.error(molecule)
                     logging.error(molecule.to_adjacency_list())
                     raise
-                if not data_added:
+                if not data.is_all_zeros():
+                    terms.append(data)
+                    comments.append(data.comment)
+                else:
                     neighbors = ''.join(sorted([atom2.atomtype.label for atom2 in atom.edges.keys()
                                                 if atom2.atomtype.label != 'H']))
                     neighbors += 'H' * len(['H' for atom2 in atom.edges.keys() if atom2.atomtype.label == 'H'])
@@ -2190,10 +2408,7 @@ class ThermoDatabase(object):
                         neighbors = neighbors.replace('Cb', '')
                     group_str = f'{atom.atomtype.label}-{neighbors}'
                     if group_str not in ['O2d-CO', 'S2d-CS']:
-                        if thermo_data.comment:
-                            thermo_data.comment += f' + missing({group_str})'
-                        else:
-                            thermo_data.comment = f'Thermo group additivity estimation: missing({group_str})'
+                        comments.append(f'missing({group_str})')
                 # Correct for gauche and 1,5- interactions
                 # Pair atom with its 1st and 2nd nonHydrogen neighbors, 
                 # Then match the pair with the entries in the database longDistanceInteraction_noncyclic.py
@@ -2208,15 +2423,9 @@ class ThermoDatabase(object):
                         # If `atom_2` is bonded to a halogen, we apply noncyclic corrections regardless if `atom_2` is in a cycle or not.
                         # If `atom_2` is not bonded to a halogen, and `atom` or `atom_2` is in a cycle, do not apply this correction.
                         # Note that previously we do not do gauche for cyclic molecule, which is unreasonable for cyclic molecule with a long tail.
-                        try:
-                            self._add_group_thermo_data(thermo_data, self.groups['longDistanceInteraction_noncyclic'],
-                                                        molecule, {'*1': atom, '*2': atom_2})
-                        except KeyError:
-                            pass
-                try:
-                    self._add_group_thermo_data(thermo_data, self.groups['other'], molecule, {'*': atom})
-                except KeyError:
-                    pass
+                        self._append_group_thermo_data(terms, comments, self.groups['longDistanceInteraction_noncyclic'],
+                                                       molecule, {'*1': atom, '*2': atom_2})
+                self._append_group_thermo_data(terms, comments, self.groups['other'], molecule, {'*': atom})
 
         # Do long distance interaction correction for cyclic molecule. 
         # First get smallest set of smallest rings. 
@@ -2234,41 +2443,58 @@ class ThermoDatabase(object):
             sssr = molecule.get_smallest_set_of_smallest_rings()
             for ring in sssr:
                 for atomPair in itertools.permutations(ring, 2):
-                    try:
-                        self._add_group_thermo_data(thermo_data, self.groups['longDistanceInteraction_cyclic'], molecule,
-                                                    {'*1': atomPair[0], '*2': atomPair[1]})
-                    except KeyError:
-                        pass
+                    self._append_group_thermo_data(terms, comments, self.groups['longDistanceInteraction_cyclic'],
+                                                   molecule, {'*1': atomPair[0], '*2': atomPair[1]})
 
-        # Do ring corrections separately because we only want to match
-        # each ring one time
+        if comments:
+            comment = 'Thermo group additivity estimation: ' + ' + '.join(comments)
+        else:
+            comment = ''
+        return terms, comment
 
-        if cyclic:
-            monorings, polyrings = molecule.get_disparate_cycles()
-            for ring in monorings:
-                # Make a temporary structure containing only the atoms in the ring
-                # NB. if any of the ring corrections depend on ligands not in the ring, they will not be found!
-                try:
-                    self._add_ring_correction_thermo_data_from_tree(thermo_data, self.groups['ring'], molecule, ring)
-                except KeyError:
-                    logging.error("Couldn't find a match in the monocyclic ring database even though "
-                                  "monocyclic rings were found.")
-                    logging.error(molecule)
-                    logging.error(molecule.to_adjacency_list())
-                    raise
-            for polyring in polyrings:
-                # Make a temporary structure containing only the atoms in the ring
-                # NB. if any of the ring corrections depend on ligands not in the ring, they will not be found!
-                try:
-                    self._add_polycyclic_correction_thermo_data(thermo_data, molecule, polyring)
-                except KeyError:
-                    logging.error("Couldn't find a match in the polycyclic ring database even though "
-                                  "polycyclic rings were found.")
-                    logging.error(molecule)
-                    logging.error(molecule.to_adjacency_list())
-                    raise
+    def _append_group_thermo_data(self, terms, comments, database, molecule, atom):
+        """
+        Append the group value of `database` for the atoms ``atom`` in
+        ``molecule`` and its comment to `terms` and `comments`, unless it is
+        zero or no group matches.
+        """
+        try:
+            data = self._get_group_thermo_data(database, molecule, atom)
+        except KeyError:
+            return
+        if not data.is_all_zeros():
+            terms.append(data)
+            comments.append(data.comment)
 
-        return thermo_data
+    def _add_ring_correction_thermo_data(self, thermo_data, molecule):
+        """
+        Add the ring corrections of the cyclic `molecule` to `thermo_data`.
+        """
+        # Do ring corrections separately because we only want to match
+        # each ring one time
+        monorings, polyrings = molecule.get_disparate_cycles()
+        for ring in monorings:
+            # Make a temporary structure containing only the atoms in the ring
+            # NB. if any of the ring corrections depend on ligands not in the ring, they will not be found!
+            try:
+                self._add_ring_correction_thermo_data_from_tree(thermo_data, self.groups['ring'], molecule, ring)
+            except KeyError:
+                logging.error("Couldn't find a match in the monocyclic ring database even though "
+                              "monocyclic rings were found.")
+                logging.error(molecule)
+                logging.error(molecule.to_adjacency_list())
+                raise
+        for polyring in polyrings:
+            # Make a temporary structure containing only the atoms in the ring
+            # NB. if any of the ring corrections depend on ligands not in the ring, they will not be found!
+            try:
+                self._add_polycyclic_correction_thermo_data(thermo_data, molecule, polyring)
+            except KeyError:
+                logging.error("Couldn't find a match in the polycyclic ring database even though "
+                              "polycyclic rings were found.")
+                logging.error(molecule)
+                logging.error(molecule.to_adjacency_list())
+                raise
 
     def _add_polycyclic_correction_thermo_data(self, thermo_data, molecule, polyring):
         """
@@ -2545,6 +2771,22 @@ class ThermoDatabase(object):
         Returns:
             tuple: The combined ThermoData object and a bool flag indicating whether new data was added to it.
         """
+        data = self._get_group_thermo_data(database, molecule, atom)
+
+        if thermo_data is None:
+            return data, False
+        else:
+            if data.is_all_zeros():
+                return thermo_data, False
+            return add_thermo_data(thermo_data, data, group_additivity=True), True
+
+    def _get_group_thermo_data(self, database, molecule, atom):
+        """
+        Return the group additivity thermodynamic data of `database` for the
+        atom ``atom`` in the structure ``molecule``, with its comment set to
+        the group it came from.
+        The parameter ``atom`` is a dictionary of label-atom pairs like {'*',atom}
+        """
         node0 = database.descend_tree(molecule, atom, None)
         if node0 is None:
             raise KeyError(f'Node not found for atom {atom} in molecule {molecule} in thermo database {database.label}.')
@@ -2569,14 +2811,13 @@ class ThermoDatabase(object):
                                     f" reference may exist. Last node was {node.label} pointing to group called {data} in "
                                     f"database {database.label}")
 
-            for entry in database.entries.values():
-                if entry.label == data:
-                    data = entry.data
-                    comment = entry.label
-                    break
-            else:
+            # Entries are stored by their labels
+            entry = database.entries.get(data)
+            if entry is None or entry.label != data:
                 raise DatabaseError(f"Node {node.label} points to a non-existing group called {data} "
                                     f"in database {database.label}")
+            data = entry.data
+            comment = entry.label
         data.comment = f'{database.label}({comment})'
 
         # This code prints the hierarchy of the found node; useful for debugging
@@ -2586,12 +2827,7 @@ class ThermoDatabase(object):
         #   node = node.parent
         # print result[4:]
 
-        if thermo_data is None:
-            return data, False
-        else:
-            if data.is_all_zeros():
-                return thermo_data, False
-            return add_thermo_data(thermo_data, data, group_additivity=True), True
+        return data
 
     def _remove_group_thermo_data(self, thermo_data, database, molecule, atom):
         """
@@ -65,6 +65,8 @@ class MLEstimator:
     ==================== ======================= =======================
     `hf298_estimator`    :class:`Predictor`      Hf298 estimator
     `s298_cp_estimator`  :class:`Predictor`      S298 and Cp estimator
+    `hf298_path`         ``str``                 The path the Hf298 estimator was loaded from
+    `s298_cp_path`       ``str``                 The path the S298 and Cp estimator was loaded from
     `temps`              ``list``                Cp temperatures
     ==================== ======================= =======================
     """
@@ -74,6 +76,8 @@ class MLEstimator:
     temps = [300.0, 400.0, 500.0, 600.0, 800.0, 1000.0, 1500.0]
 
     def __init__(self, hf298_path: str, s298_cp_path: str):
+        self.hf298_path = hf298_path
+        self.s298_cp_path = s298_cp_path
         self.hf298_estimator = load_estimator(hf298_path)
         self.s298_cp_estimator = load_estimator(s298_cp_path)
 
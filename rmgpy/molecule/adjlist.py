@@ -37,7 +37,8 @@ import warnings
 
 from rmgpy.exceptions import InvalidAdjacencyListError
 from rmgpy.molecule.atomtype import get_atomtype
-from rmgpy.molecule.element import get_element, PeriodicSystem
+import rmgpy.molecule.element as elements
+from rmgpy.molecule.element import Element, get_element, PeriodicSystem
 from rmgpy.molecule.group import GroupAtom, GroupBond
 from rmgpy.molecule.molecule import Atom, Bond
 from rmgpy.molecule.fragment import Fragment, CuttingLabel
@@ -447,6 +448,13 @@ def from_old_adjacency_list(adjlist, group=False, saturate_h=False):
 
 ###############################
 
+# The elements accepted in the atom type field of a molecule adjacency list
+_ELEMENTS = {name: value for name, value in vars(elements).items() if isinstance(value, Element)}
+# The values of the fields of a molecule adjacency list, for the fast path parser
+_ELECTRONS = {'0': 0, '1': 1, '2': 2, '3': 3, '4': 4}
+_CHARGES = {'0': 0, '+1': 1, '+2': 2, '+3': 3, '+4': 4, '-1': -1, '-2': -2, '-3': -3, '-4': -4}
+_BOND_ORDERS = {'S': 1, 'D': 2, 'T': 3, 'B': 1.5, 'Q': 4, 'vdW': 0, 'H': 0.1, 'R': 0.05}
+
 re_intermediate_adjlist = re.compile(r'^\s*(\d*)\s+' +  # atom number digit
                                      r'(?P<label>\*\d*\s+)?' +  # optional label eg * or *2
                                      r'(?P<atomtype>\{?[A-Z]\S*)\s+' +  # atomtype eg R!H or {Cb,Cd}
@@ -466,11 +474,9 @@ re_old_adjlist = re.compile(r'^\s*(\d*)\s+' +  # atom number digit
 def from_adjacency_list(adjlist, group=False, saturate_h=False, check_consistency=True):
     """
     Convert a string adjacency list `adjlist` into a set of :class:`Atom` and
-    :class:`Bond` objects.
+    :class:`Bond` objects. Molecule adjacency lists in the standard form are
+    read by a fast path, and any others by the general parser.
     """
-    atoms = []
-    atom_dict = {}
-    bonds = {}
     multiplicity = None
 
     adjlist = adjlist.strip()
@@ -528,6 +534,57 @@ def from_adjacency_list(adjlist, group=False, saturate_h=False, check_consistenc
         if len(lines) == 0:
             raise InvalidAdjacencyListError('No atoms specified in adjacency list: \n{0}'.format(adjlist))
         
+    atoms = None
+    if not group:
+        atoms = _read_molecule_atom_lines(lines)
+    if atoms is not None:
+        metal = ''
+        facet = ''
+    else:
+        atoms, metal, facet = _read_atom_lines(lines, adjlist, group)
+
+    if saturate_h:
+        # Add explicit hydrogen atoms to complete structure if desired
+        if not group:
+            Saturator.saturate(atoms)
+
+    # Consistency checks
+    if not group and check_consistency:
+        # Molecule consistency check
+        # Electron and valency consistency check for each atom
+        for atom in atoms:
+            if isinstance(atom, Atom):
+                ConsistencyChecker.check_partial_charge(atom)
+
+        n_rad = sum([atom.radical_electrons for atom in atoms])
+        absolute_spin_per_electron = 1 / 2.
+        if multiplicity is None:
+            multiplicity = 2 * (n_rad * absolute_spin_per_electron) + 1
+
+        ConsistencyChecker.check_multiplicity(n_rad, multiplicity)
+        for atom in atoms:
+            ConsistencyChecker.check_hund_rule(atom, multiplicity)
+        return atoms, multiplicity, metal, facet
+    else:
+        # Currently no group consistency check
+        if not group:
+            if multiplicity is None:
+                n_rad = sum([atom.radical_electrons for atom in atoms])
+                multiplicity = n_rad + 1
+
+        return atoms, multiplicity, metal, facet
+
+
+def _read_atom_lines(lines, adjlist, group):
+    """
+    Return the atoms and the metal and facet read from the atom `lines` of
+    the adjacency list `adjlist`. This reads any valid adjacency list, and
+    raises an :class:`InvalidAdjacencyListError` for invalid ones.
+    """
+    atoms = []
+    atom_dict = {}
+    bonds = {}
+
     mistake1 = re.compile(r'\{[^}]*\s+[^}]*\}')
     if group:
         metal = []
@@ -851,37 +908,108 @@ def from_adjacency_list(adjlist, group=False, saturate_h=False, check_consistenc
                 atom1.edges[atom2] = bond
                 atom2.edges[atom1] = bond
 
-    if saturate_h:
-        # Add explicit hydrogen atoms to complete structure if desired
-        if not group:
-            Saturator.saturate(atoms)
+    return atoms, metal, facet
 
-    # Consistency checks
-    if not group and check_consistency:
-        # Molecule consistency check
-        # Electron and valency consistency check for each atom
-        for atom in atoms:
-            if isinstance(atom, Atom):
-                ConsistencyChecker.check_partial_charge(atom)
 
-        n_rad = sum([atom.radical_electrons for atom in atoms])
-        absolute_spin_per_electron = 1 / 2.
-        if multiplicity is None:
-            multiplicity = 2 * (n_rad * absolute_spin_per_electron) + 1
+def _read_molecule_atom_lines(lines):
+    """
+    Return the atoms read from the atom `lines` of a molecule adjacency list,
+    or ``None`` if the lines are not in the standard form written by
+    :func:`to_adjacency_list`. The atoms are created and bonded in a single
+    pass over the lines, giving the same result as :func:`_read_atom_lines`.
+
+    The atom numbers must be increasing, and each atom may only have an
+    optional label, an element, its unpaired electrons and optionally its lone
+    pairs, charge and isotope, followed by its bonds. Anything else, including
+    any error, is left to :func:`_read_atom_lines`, which reads every valid
+    adjacency list and reports errors.
+    """
+    atoms = []
+    atom_dict = {}
+    pending = {}
+    last_aid = 0
+    for line in lines:
+        data = line.split()
+        if not data:
+            continue
+        try:
+            aid = int(data[0])
+        except ValueError:
+            return None
+        if aid <= last_aid:
+            return None
+        last_aid = aid
 
-        ConsistencyChecker.check_multiplicity(n_rad, multiplicity)
-        for atom in atoms:
-            ConsistencyChecker.check_hund_rule(atom, multiplicity)
-        return atoms, multiplicity, metal, facet
-    else:
-        # Currently no group consistency check
-        if not group:
-            if multiplicity is None:
-                n_rad = sum([atom.radical_electrons for atom in atoms])
-                multiplicity = n_rad + 1
+        index = 1
+        label = ''
+        if len(data) > 1 and data[1][0] == '*':
+            label = data[1]
+            index = 2
+        if len(data) < index + 2:
+            return None
+        element = _ELEMENTS.get(data[index])
+        token = data[index + 1]
+        radical_electrons = _ELECTRONS.get(token[1:]) if token[0] == 'u' else None
+        if element is None or radical_electrons is None:
+            return None
+        index += 2
+
+        lone_pairs = 0
+        if index < len(data) and data[index][0] == 'p':
+            lone_pairs = _ELECTRONS.get(data[index][1:])
+            if lone_pairs is None:
+                return None
+            index += 1
+        charge = 0
+        if index < len(data) and data[index][0] == 'c':
+            charge = _CHARGES.get(data[index][1:])
+            if charge is None:
+                return None
+            index += 1
+        isotope = -1
+        if index < len(data) and data[index][0] == 'i':
+            try:
+                isotope = int(data[index][1:])
+            except ValueError:
+                return None
+            index += 1
 
-        return atoms, multiplicity, metal, facet
+        atom = Atom(element, radical_electrons, charge, label, lone_pairs)
+        if isotope != -1:
+            atom.element = get_element(atom.number, isotope)
+        atoms.append(atom)
+        atom_dict[aid] = atom
+
+        # Bonds to atoms on previous lines are created in order of atom number,
+        # so that the bonds of each atom are stored in the same order as by
+        # _read_atom_lines; the others are completed on later lines
+        previous = []
+        for datum in data[index:]:
+            if datum[0] != '{' or datum[-1] != '}':
+                return None
+            aid2, comma, order = datum[1:-1].partition(',')
+            try:
+                aid2 = int(aid2)
+            except ValueError:
+                return None
+            if aid2 == aid or order not in _BOND_ORDERS:
+                return None
+            if aid2 in atom_dict:
+                if pending.pop((aid2, aid), None) != order:
+                    return None
+                previous.append((aid2, order))
+            else:
+                pending[aid, aid2] = order
+        previous.sort()
+        for aid2, order in previous:
+            atom2 = atom_dict[aid2]
+            bond = Bond(atom2, atom, _BOND_ORDERS[order])
+            atom2.edges[atom] = bond
+            atom.edges[atom2] = bond
 
+    if pending or not atoms:
+        return None
+    return atoms
 
 
 def to_adjacency_list(atoms, multiplicity, metal='', facet='', label=None, group=False, remove_h=False, remove_lone_pairs=False,
@@ -895,34 +1023,28 @@ def to_adjacency_list(atoms, multiplicity, metal='', facet='', label=None, group
     if not atoms:
         return ''
 
-    adjlist = ''
-
     # Don't remove hydrogen atoms if the molecule consists only of hydrogen atoms
     try:
         if remove_h and all([atom.element.symbol == 'H' for atom in atoms]): remove_h = False
     except AttributeError:
         pass
 
+    if not group:
+        return _write_molecule_adjacency_list(atoms, multiplicity, metal, facet, label, remove_h)
+
+    adjlist = ''
+
     if label:
         adjlist += label + '\n'
 
-    if group:
-        if multiplicity:
-            # Functional group should have a list of possible multiplicities.  
-            # If the list is empty, then it does not need to be written
-            adjlist += 'multiplicity [{0!s}]\n'.format(','.join(str(i) for i in multiplicity))
-        if metal:
-            adjlist += 'metal [{0!s}]\n'.format(','.join(i for i in metal))
-        if facet:
-            adjlist += 'facet [{0!s}]\n'.format(','.join(i for i in facet))
-    else:
-        assert isinstance(multiplicity, int), "Molecule should have an integer multiplicity"
-        if multiplicity != 1 or any(atom.radical_electrons for atom in atoms):
-            adjlist += 'multiplicity {0!r}\n'.format(multiplicity)
-        if metal:
-            adjlist += f"metal {metal}\n"
-        if facet:
-            adjlist += f"facet {facet}\n"
+    if multiplicity:
+        # Functional group should have a list of possible multiplicities.  
+        # If the list is empty, then it does not need to be written
+        adjlist += 'multiplicity [{0!s}]\n'.format(','.join(str(i) for i in multiplicity))
+    if metal:
+        adjlist += 'metal [{0!s}]\n'.format(','.join(i for i in metal))
+    if facet:
+        adjlist += 'facet [{0!s}]\n'.format(','.join(i for i in facet))
 
     # Determine the numbers to use for each atom
     atom_numbers = {}
@@ -943,87 +1065,60 @@ def to_adjacency_list(atoms, multiplicity, metal='', facet='', label=None, group
     atom_props = {}
     atom_site = {}
     atom_morphology = {}
-    if group:
-        for atom in atom_numbers:
-            # Atom type(s)
-            if len(atom.atomtype) == 1:
-                atom_types[atom] = atom.atomtype[0].label
-            else:
-                atom_types[atom] = '[{0}]'.format(','.join([a.label for a in atom.atomtype]))
-            # Unpaired Electron(s)
-            if len(atom.radical_electrons) == 1:
-                atom_unpaired_electrons[atom] = str(atom.radical_electrons[0])
-            elif len(atom.radical_electrons) == 0:
-                atom_unpaired_electrons[atom] = 'x'  # Empty list indicates wildcard
-            else:
-                atom_unpaired_electrons[atom] = '[{0}]'.format(','.join([str(radical) for radical in atom.radical_electrons]))
+    for atom in atom_numbers:
+        # Atom type(s)
+        if len(atom.atomtype) == 1:
+            atom_types[atom] = atom.atomtype[0].label
+        else:
+            atom_types[atom] = '[{0}]'.format(','.join([a.label for a in atom.atomtype]))
+        # Unpaired Electron(s)
+        if len(atom.radical_electrons) == 1:
+            atom_unpaired_electrons[atom] = str(atom.radical_electrons[0])
+        elif len(atom.radical_electrons) == 0:
+            atom_unpaired_electrons[atom] = 'x'  # Empty list indicates wildcard
+        else:
+            atom_unpaired_electrons[atom] = '[{0}]'.format(','.join([str(radical) for radical in atom.radical_electrons]))
 
-            # Lone Electron Pair(s)
-            if len(atom.lone_pairs) == 1:
-                atom_lone_pairs[atom] = str(atom.lone_pairs[0])
-            elif len(atom.lone_pairs) == 0:
-                atom_lone_pairs[atom] = None  # Empty list indicates wildcard
-            else:
-                atom_lone_pairs[atom] = '[{0}]'.format(','.join([str(pair) for pair in atom.lone_pairs]))
+        # Lone Electron Pair(s)
+        if len(atom.lone_pairs) == 1:
+            atom_lone_pairs[atom] = str(atom.lone_pairs[0])
+        elif len(atom.lone_pairs) == 0:
+            atom_lone_pairs[atom] = None  # Empty list indicates wildcard
+        else:
+            atom_lone_pairs[atom] = '[{0}]'.format(','.join([str(pair) for pair in atom.lone_pairs]))
 
-            # Charges
-            if len(atom.charge) == 1:
-                atom_charge[atom] = '+' + str(atom.charge[0]) if atom.charge[0] > 0 else str(atom.charge[0])
-            elif len(atom.charge) == 0:
-                atom_charge[atom] = None  # Empty list indicates wildcard
-            else:
-                atom_charge[atom] = '[{0}]'.format(','.join(['+'+str(charge) if charge > 0 else ''+str(charge) for charge in atom.charge]))
+        # Charges
+        if len(atom.charge) == 1:
+            atom_charge[atom] = '+' + str(atom.charge[0]) if atom.charge[0] > 0 else str(atom.charge[0])
+        elif len(atom.charge) == 0:
+            atom_charge[atom] = None  # Empty list indicates wildcard
+        else:
+            atom_charge[atom] = '[{0}]'.format(','.join(['+'+str(charge) if charge > 0 else ''+str(charge) for charge in atom.charge]))
 
-            # Sites
-            if len(atom.site) == 1:
-                atom_site[atom] = "\"" + atom.site[0] + "\""
-            elif len(atom.site) == 0:
-                atom_site[atom] = None  # Empty list indicates wildcard
-            else:
-                atom_site[atom] = '["{0}"]'.format('","'.join(s for s in atom.site))
+        # Sites
+        if len(atom.site) == 1:
+            atom_site[atom] = "\"" + atom.site[0] + "\""
+        elif len(atom.site) == 0:
+            atom_site[atom] = None  # Empty list indicates wildcard
+        else:
+            atom_site[atom] = '["{0}"]'.format('","'.join(s for s in atom.site))
+        
+        # Morphologies
+        if len(atom.morphology) == 1:
+            atom_morphology[atom] = "\"" + atom.morphology[0] + "\""
+        elif len(atom.morphology) == 0:
+            atom_morphology[atom] = None  # Empty list indicates wildcard
+        else:
+            atom_morphology[atom] = '["{0}"]'.format('","'.join(s for s in atom.morphology))
             
-            # Morphologies
-            if len(atom.morphology) == 1:
-                atom_morphology[atom] = "\"" + atom.morphology[0] + "\""
-            elif len(atom.morphology) == 0:
-                atom_morphology[atom] = None  # Empty list indicates wildcard
-            else:
-                atom_morphology[atom] = '["{0}"]'.format('","'.join(s for s in atom.morphology))
-                
-            # Isotopes
-            atom_isotope[atom] = -1
-
-            # Other props
-            props = []
-            if 'inRing' in atom.props:
-                props.append(' r{0}'.format(int(atom.props['inRing'])))
-            atom_props[atom] = props
-    else:
-        for atom in atom_numbers:
-            # Atom type
-            atom_types[atom] = '{0}'.format(atom.symbol)
-            # Unpaired Electron(s)
-            atom_unpaired_electrons[atom] = '{0}'.format(atom.radical_electrons)
-            # Lone Electron Pair(s)
-            atom_lone_pairs[atom] = str(atom.lone_pairs)
-            # Partial Charge(s)
-            atom_charge[atom] = '+' + str(atom.charge) if atom.charge > 0 else '' + str(atom.charge)
-            # Sites
-            if atom.site:
-                atom_site[atom] = "\"" + atom.site + "\""
-            else:
-                atom_site[atom] = None
-            # Morphology
-            if atom.morphology:
-                atom_morphology[atom] = "\"" + atom.morphology + "\""
-            else:
-                atom_morphology[atom] = None
-            # Isotopes
-            if isinstance(atom, Atom):
-                atom_isotope[atom] = atom.element.isotope
-            else:
-                # cutting labels in fragment cases
-                atom_isotope[atom] = atom.isotope
+        # Isotopes
+        atom_isotope[atom] = -1
+
+        # Other props
+        props = []
+        if 'inRing' in atom.props:
+            props.append(' r{0}'.format(int(atom.props['inRing'])))
+        atom_props[atom] = props
 
     # Determine field widths
     atom_number_width = max([len(s) for s in atom_numbers.values()]) + 1
@@ -1061,7 +1156,7 @@ def to_adjacency_list(atoms, multiplicity, metal='', facet='', label=None, group
         # Isotopes
         if atom_isotope[atom] != -1:
             adjlist += ' i{0}'.format(atom_isotope[atom])
-        if group and len(atom_props[atom]) > 0:
+        if len(atom_props[atom]) > 0:
             for prop in atom_props[atom]:
                 adjlist += prop
 
@@ -1078,23 +1173,15 @@ def to_adjacency_list(atoms, multiplicity, metal='', facet='', label=None, group
             adjlist += ' {{{0},'.format(atom_numbers[atom2])
 
             # Bond type(s)
-            if group:
-                code = '[{0}]'
-                if len(bond.order) == 1:
-                    code = '{0}'
-                # preference is for string representation, backs down to number
-                # numbers if doesn't work
-                try:
-                    adjlist += code.format(','.join(bond.get_order_str()))
-                except ValueError:
-                    adjlist += code.format(','.join(str(bond.get_order_num())))
-            else:
-                # preference is for string representation, backs down to number
-                # numbers if doesn't work
-                try:
-                    adjlist += bond.get_order_str()
-                except ValueError:
-                    adjlist += str(bond.get_order_num())
+            code = '[{0}]'
+            if len(bond.order) == 1:
+                code = '{0}'
+            # preference is for string representation, backs down to number
+            # numbers if doesn't work
+            try:
+                adjlist += code.format(','.join(bond.get_order_str()))
+            except ValueError:
+                adjlist += code.format(','.join(str(bond.get_order_num())))
             adjlist += '}'
 
         # Each atom begins on a new line
@@ -1103,6 +1190,73 @@ def to_adjacency_list(atoms, multiplicity, metal='', facet='', label=None, group
     return adjlist
 
 
+def _write_molecule_adjacency_list(atoms, multiplicity, metal, facet, label, remove_h):
+    """
+    Return the adjacency list of the molecule made of `atoms`, as written by
+    :func:`to_adjacency_list`. The fields of each line are collected in a list
+    and all lines are joined at the end.
+    """
+    assert isinstance(multiplicity, int), "Molecule should have an integer multiplicity"
+    lines = []
+    if label:
+        lines.append(label)
+    if multiplicity != 1 or any(atom.radical_electrons for atom in atoms):
+        lines.append('multiplicity {0!r}'.format(multiplicity))
+    if metal:
+        lines.append(f"metal {metal}")
+    if facet:
+        lines.append(f"facet {facet}")
+
+    # Determine the atoms to write and the numbers to use for each atom
+    written_atoms = [atom for atom in atoms if not (remove_h and atom.symbol == 'H' and atom.label == '')]
+    atom_numbers = {id(atom): str(index + 1) for index, atom in enumerate(written_atoms)}
+    positions = {id(atom): index for index, atom in enumerate(atoms)}
+
+    # Determine field widths
+    atom_number_width = len(str(len(written_atoms))) + 1
+    atom_label_width = max([len(atom.label) for atom in written_atoms])
+    if atom_label_width > 0:
+        atom_label_width += 1
+    atom_type_width = max([len(atom.symbol) for atom in written_atoms]) + 1
+    atom_unpaired_electrons_width = max([len(str(atom.radical_electrons)) for atom in written_atoms])
+
+    for atom in written_atoms:
+        charge = atom.charge
+        fields = [atom_numbers[id(atom)].ljust(atom_number_width),
+                  atom.label.ljust(atom_label_width),
+                  atom.symbol.ljust(atom_type_width),
+                  'u', str(atom.radical_electrons).ljust(atom_unpaired_electrons_width),
+                  ' p', str(atom.lone_pairs),
+                  ' c', '+' + str(charge) if charge > 0 else str(charge)]
+        if atom.site:
+            fields.append(' s"{0}"'.format(atom.site))
+        if atom.morphology:
+            fields.append(' m"{0}"'.format(atom.morphology))
+        # Cutting labels in fragments store their isotope directly
+        isotope = atom.element.isotope if isinstance(atom, Atom) else atom.isotope
+        if isotope != -1:
+            fields.append(' i{0}'.format(isotope))
+
+        # Bonds list, sorted the same way as the atoms
+        bonds = atom.bonds
+        for atom2 in sorted(bonds, key=lambda other: positions[id(other)]):
+            number = atom_numbers.get(id(atom2))
+            if number is None:
+                continue
+            bond = bonds[atom2]
+            # preference is for string representation, backs down to number
+            # numbers if doesn't work
+            try:
+                order = bond.get_order_str()
+            except ValueError:
+                order = str(bond.get_order_num())
+            fields.append(' {{{0},{1}}}'.format(number, order))
+
+        lines.append(''.join(fields))
+
+    return '\n'.join(lines) + '\n'
+
+
 def get_old_electron_state(atom):
     """
     Get the old adjacency list format electronic state
@@ -51,6 +51,10 @@ cdef class AtomType:
     cdef public list lone_pairs
     cdef public list charge
 
+    cdef public int index
+    cdef public object match_bit
+    cdef public object specific_mask
+
     cpdef bint is_specific_case_of(self, AtomType other)
 
     cpdef bint equivalent(self, AtomType other)
@@ -59,4 +63,6 @@ cdef class AtomType:
 
 cpdef list get_features(atom, dict bonds)
 
+cpdef long long get_feature_key(list features) except? -2
+
 cpdef AtomType get_atomtype(atom, dict bonds)
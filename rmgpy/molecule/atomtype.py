@@ -67,6 +67,9 @@ class AtomType:
     `decrement_radical`   ``list``            The atom type(s) that result when the number of radical electrons is decremented
     `increment_lone_pair` ``list``            The atom type(s) that result when the number of lone electron pairs is incremented
     `decrement_lone_pair` ``list``            The atom type(s) that result when the number of lone electron pairs is decremented
+    `index`               ``int``             The position of the atom type in :data:`ATOMTYPES`, or -1 if not registered
+    `match_bit`           ``int``             A bitmask with only the bit of this atom type set, or 0 if not registered
+    `specific_mask`       ``int``             A bitmask of the indices of this atom type and its more specific atom types
 
     The following features are what are required in a given atomtype. Any int in the list is acceptable. An empty list is a wildcard
     ------------------------------------------------------------------------------
@@ -118,6 +121,9 @@ class AtomType:
         self.benzene = benzene or []
         self.lone_pairs = lone_pairs or []
         self.charge = charge or []
+        self.index = -1
+        self.match_bit = 0
+        self.specific_mask = 0
 
     def __repr__(self):
         return '<AtomType "%s">' % self.label
@@ -824,6 +830,17 @@ for atomtype in ATOMTYPES.values():
         for index in range(len(items)):
             items[index] = ATOMTYPES[items[index]]
 
+# Number the registered atom types so that sets of them can be stored as
+# bitmasks, which makes matching atoms against group atoms a bitwise AND. The
+# masks are Python integers, as there are more atom types than bits in a C int
+for index, atomtype in enumerate(ATOMTYPES.values()):
+    atomtype.index = index
+    atomtype.match_bit = 1 << index
+for atomtype in ATOMTYPES.values():
+    atomtype.specific_mask = atomtype.match_bit
+    for specific in atomtype.specific:
+        atomtype.specific_mask |= specific.match_bit
+
 
 def get_features(atom, bonds):
     """
@@ -865,13 +882,41 @@ def get_features(atom, bonds):
     return features
 
 
+def get_feature_key(features):
+    """
+    Return a compact integer encoding of the `features` returned by
+    :func:`get_features`, with four bits for each bond count and eight bits
+    each for the lone pairs and charge, or -1 if any feature is out of range.
+    """
+    cython.declare(key=cython.longlong, i=cython.int)
+
+    key = 0
+    for i in range(8):
+        if not 0 <= features[i] < 16:
+            return -1
+        key = key * 16 + features[i]
+    for i in range(8, 10):
+        if not -128 <= features[i] < 128:
+            return -1
+        key = key * 256 + features[i] + 128
+    return key
+
+
+# The atom types determined so far, keyed by element symbol and then by the
+# feature key of the atom, which turns most perceptions into a lookup
+_atomtype_table = {}
+
+
 def get_atomtype(atom, bonds):
     """
     Determine the appropriate atom type for an :class:`Atom` object `atom`
     with local bond structure `bonds`, a ``dict`` containing atom-bond pairs.
+    The result for each combination of element and features is stored in a
+    lookup table, so only the first atom of each kind is compared with the
+    features of the specific atom types.
     """
 
-    cython.declare(atom_symbol=str)
+    cython.declare(atom_symbol=str, key=cython.longlong, table=dict)
     cython.declare(mol_feature_list=cython.list, atomtype_feature_list=cython.list)
 
     # Use element and counts to determine proper atom type
@@ -881,6 +926,14 @@ def get_atomtype(atom, bonds):
         return ATOMTYPES[atom_symbol]
 
     mol_feature_list = get_features(atom, bonds)
+    key = get_feature_key(mol_feature_list)
+    try:
+        table = _atomtype_table[atom_symbol]
+    except KeyError:
+        table = _atomtype_table[atom_symbol] = {}
+    if key in table:
+        return table[key]
+
     for specific_atom_type in ATOMTYPES[atom_symbol].specific:
         atomtype_feature_list = specific_atom_type.get_features()
         for mol_feature, atomtype_feature in zip(mol_feature_list, atomtype_feature_list):
@@ -889,6 +942,8 @@ def get_atomtype(atom, bonds):
             elif mol_feature not in atomtype_feature:
                 break
         else:
+            if key >= 0:
+                table[key] = specific_atom_type
             return specific_atom_type
     else:
         single, all_double, r_double, o_double, s_double, triple, quadruple, benzene, lone_pairs, charge = mol_feature_list
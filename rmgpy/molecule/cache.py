@@ -0,0 +1,713 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains process-wide caches of expensive results computed for
+molecules. The :class:`ResonanceCache` stores the resonance structures
+generated for a molecule, keyed by the canonical hash of the input structure,
+so that the resonance algorithms only need to be run once per structure. The
+:class:`SymmetryNumberCache` does the same for symmetry numbers, and the
+:class:`IdentifierCache` stores the SMILES and InChI translations made by
+:mod:`rmgpy.molecule.translator` in both directions.
+"""
+
+import atexit
+import logging
+import os
+import pathlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+
+from rmgpy.molecule.query import get_molecule_key
+
+# Atom property used to track which input atom each atom of a generated resonance structure came from
+_INDEX_PROP = '_resonance_cache_index'
+
+
+class ResonanceCacheEntry(object):
+    """
+    The resonance structures generated for a single input structure. The
+    attributes are:
+
+    =================== =============== ========================================
+    Attribute           Type            Description
+    =================== =============== ========================================
+    `template`          :class:`Molecule` A copy of the input structure
+    `structures`        ``list``        Copies of the generated resonance structures
+    `indices`           ``list``        For each structure, the index of the template atom corresponding to each atom
+    `input_index`       ``int``         The position of the input structure in the list, or ``None`` if it was removed
+    `options`           ``tuple``       The options used to generate the structures
+    =================== =============== ========================================
+    """
+
+    def __init__(self, template, structures, indices, input_index=None, options=()):
+        self.template = template
+        self.structures = structures
+        self.indices = indices
+        self.input_index = input_index
+        self.options = options
+
+    def restore(self, mol):
+        """
+        Return a list of resonance structures for `mol`, which must be
+        isomorphic to the template, or ``None`` if it is not. The atoms of the
+        returned structures take their labels, ids and properties from the
+        corresponding atoms of `mol`, and `mol` itself is returned in place of
+        the input structure. As when the structures are generated, the atom
+        order of `mol` is not changed.
+        """
+        mappings = self.template.find_isomorphism(mol, save_order=True, strict=True)
+        if not mappings:
+            return None
+        mapping = mappings[0]
+        atoms = [mapping[atom] for atom in self.template.atoms]
+
+        mol_list = []
+        for i, (structure, indices) in enumerate(zip(self.structures, self.indices)):
+            if i == self.input_index:
+                mol.reactive = structure.reactive
+                mol_list.append(mol)
+                continue
+            new_mol = structure.copy(deep=True)
+            for atom, index in zip(new_mol.atoms, indices):
+                source = atoms[index]
+                atom.label = source.label
+                atom.id = source.id
+                atom.props = deepcopy(source.props)
+                atom.coords = source.coords[:]
+            mol_list.append(new_mol)
+        return mol_list
+
+
+class ResonanceCache(object):
+    """
+    A least-recently-used cache of generated resonance structures. Entries
+    are keyed by :func:`~rmgpy.molecule.query.get_molecule_key` of the input
+    structure (which includes its canonical hash) and by the options used to
+    generate the structures. Structures whose keys collide are told apart by
+    an isomorphism check, which also provides the atom mapping used to
+    transfer atom labels and ids to the returned copies. The attributes are:
+
+    =================== =============== ========================================
+    Attribute           Type            Description
+    =================== =============== ========================================
+    `max_size`          ``int``         The maximum number of input structures stored (0 disables the cache)
+    `path`              ``str``         The file the cache is loaded from and saved to, if any
+    `hits`              ``int``         The number of requests answered from the cache
+    `misses`            ``int``         The number of requests which required generating the structures
+    `evictions`         ``int``         The number of entries removed to respect `max_size`
+    =================== =============== ========================================
+    """
+
+    def __init__(self, max_size=10000, path=None):
+        self.max_size = max_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return '<ResonanceCache with {0:d} structures: {1:d} hits, {2:d} misses>'.format(
+            len(self.entries), self.hits, self.misses)
+
+    @property
+    def enabled(self):
+        """``True`` if the cache stores any structures."""
+        return self.max_size > 0
+
+    @property
+    def hit_rate(self):
+        """The fraction of requests answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_statistics(self):
+        """
+        Return a dictionary with the number of stored structures, hits, misses
+        and evictions and the hit rate.
+        """
+        return {'size': len(self.entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hit_rate}
+
+    def log_statistics(self, level=logging.INFO):
+        """
+        Log the cache statistics at the given `level`.
+        """
+        logging.log(level, 'Resonance structure cache: {0:d} structures, {1:d} hits, {2:d} misses '
+                           '({3:.1%} hit rate)'.format(len(self.entries), self.hits, self.misses, self.hit_rate))
+
+    def clear(self):
+        """
+        Remove all stored structures and reset the statistics.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_key(mol, clar_structures=True, keep_isomorphic=False, filter_structures=True):
+        """
+        Return the key under which the resonance structures of `mol` generated
+        with the given options are stored.
+        """
+        return get_molecule_key(mol) + (clar_structures, keep_isomorphic, filter_structures)
+
+    def generate(self, mol, method, clar_structures=True, keep_isomorphic=False, filter_structures=True):
+        """
+        Return the resonance structures of `mol`, either restored from the
+        cache or generated by calling ``method(mol, clar_structures,
+        keep_isomorphic, filter_structures)`` and then stored.
+        """
+        options = (clar_structures, keep_isomorphic, filter_structures)
+        key = self.get_key(mol, *options)
+        mol_list = self.get(mol, key)
+        if mol_list is not None:
+            return mol_list
+
+        template = mol.copy(deep=True)
+        for index, atom in enumerate(mol.atoms):
+            atom.props[_INDEX_PROP] = index
+        try:
+            mol_list = method(mol, *options)
+            self.put(key, template, mol, mol_list, options)
+        finally:
+            for atom in mol.atoms:
+                atom.props.pop(_INDEX_PROP, None)
+        return mol_list
+
+    def get(self, mol, key):
+        """
+        Return the stored resonance structures of `mol` under `key`, or
+        ``None`` if there are none.
+        """
+        entries = self.entries.get(key)
+        if entries is not None:
+            for entry in entries:
+                mol_list = entry.restore(mol)
+                if mol_list is not None:
+                    self.hits += 1
+                    self.entries.move_to_end(key)
+                    return mol_list
+        self.misses += 1
+        return None
+
+    def put(self, key, template, mol, mol_list, options=()):
+        """
+        Store copies of the resonance structures in `mol_list`, generated from
+        the input structure `mol`, under `key`. The atoms of `mol` must have
+        been marked with their index in `template` before the structures were
+        generated; the marks are removed from the generated structures here.
+        Structures containing atoms that do not come from `mol` are not stored.
+        """
+        indices = [[atom.props.get(_INDEX_PROP) for atom in structure.atoms] for structure in mol_list]
+        for structure in mol_list:
+            if structure is not mol:
+                for atom in structure.atoms:
+                    atom.props.pop(_INDEX_PROP, None)
+        if not self.enabled or any(None in structure_indices for structure_indices in indices):
+            return
+
+        input_index = None
+        for i, structure in enumerate(mol_list):
+            if structure is mol:
+                input_index = i
+                break
+        entry = ResonanceCacheEntry(template, [structure.copy(deep=True) for structure in mol_list],
+                                    indices, input_index, options)
+        self.entries.setdefault(key, []).append(entry)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def save(self, path=None):
+        """
+        Save the stored structures to the file at `path`, or to `self.path` if
+        not given. The file is replaced atomically, so that other processes
+        never load a partially written cache.
+        """
+        path = path or self.path
+        entries = [entry for entry_list in self.entries.values() for entry in entry_list]
+        temp_path = '{0}.{1:d}.tmp'.format(path, os.getpid())
+        with open(temp_path, 'wb') as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def load(self, path=None):
+        """
+        Add the structures saved in the file at `path`, or at `self.path` if
+        not given, to the cache. Entries are keyed again after loading, so
+        files can be shared between processes.
+        """
+        path = path or self.path
+        with open(path, 'rb') as f:
+            entries = pickle.load(f)
+        for entry in entries:
+            key = self.get_key(entry.template, *entry.options)
+            self.entries.setdefault(key, []).append(entry)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+class SymmetryNumberCache(object):
+    """
+    A least-recently-used cache of symmetry numbers, keyed by
+    :func:`~rmgpy.molecule.query.get_molecule_key`. Molecules whose keys
+    collide are told apart by an isomorphism check. The time spent looking up
+    and calculating symmetry numbers is recorded. The attributes are:
+
+    =================== =============== ========================================
+    Attribute           Type            Description
+    =================== =============== ========================================
+    `max_size`          ``int``         The maximum number of structures stored (0 disables the cache)
+    `hits`              ``int``         The number of requests answered from the cache
+    `misses`            ``int``         The number of requests which required calculating the symmetry number
+    `evictions`         ``int``         The number of entries removed to respect `max_size`
+    `lookup_time`       ``float``       The total time spent looking up symmetry numbers, in seconds
+    `calculation_time`  ``float``       The total time spent calculating symmetry numbers, in seconds
+    =================== =============== ========================================
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lookup_time = 0.0
+        self.calculation_time = 0.0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return '<SymmetryNumberCache with {0:d} structures: {1:d} hits, {2:d} misses>'.format(
+            len(self.entries), self.hits, self.misses)
+
+    @property
+    def enabled(self):
+        """``True`` if the cache stores any structures."""
+        return self.max_size > 0
+
+    @property
+    def hit_rate(self):
+        """The fraction of requests answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_statistics(self):
+        """
+        Return a dictionary with the number of stored structures, hits, misses
+        and evictions, the hit rate, and the lookup and calculation times.
+        """
+        return {'size': len(self.entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hit_rate,
+                'lookup_time': self.lookup_time,
+                'calculation_time': self.calculation_time}
+
+    def log_statistics(self, level=logging.INFO):
+        """
+        Log the cache statistics at the given `level`.
+        """
+        logging.log(level, 'Symmetry number cache: {0:d} structures, {1:d} hits, {2:d} misses ({3:.1%} hit rate), '
+                           '{4:.2f} s lookup, {5:.2f} s calculation'.format(len(self.entries), self.hits, self.misses,
+                                                                           self.hit_rate, self.lookup_time,
+                                                                           self.calculation_time))
+
+    def clear(self):
+        """
+        Remove all stored structures and reset the statistics.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lookup_time = 0.0
+        self.calculation_time = 0.0
+
+    def get_symmetry_number(self, mol, method):
+        """
+        Return the symmetry number of `mol`, either from the cache or
+        calculated by calling ``method(mol)`` and then stored.
+        """
+        start = time.time()
+        key = None
+        if self.enabled:
+            key = get_molecule_key(mol)
+            entries = self.entries.get(key)
+            if entries is not None:
+                for template, symmetry_number in entries:
+                    if template.is_isomorphic(mol, save_order=True):
+                        self.hits += 1
+                        self.entries.move_to_end(key)
+                        self.lookup_time += time.time() - start
+                        return symmetry_number
+        self.misses += 1
+        lookup_end = time.time()
+        self.lookup_time += lookup_end - start
+
+        symmetry_number = method(mol)
+        self.calculation_time += time.time() - lookup_end
+
+        if key is not None:
+            self.entries.setdefault(key, []).append((mol.copy(deep=True), symmetry_number))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return symmetry_number
+
+
+class IdentifierCache(object):
+    """
+    A thread-safe, least-recently-used cache of translations between molecules
+    and string identifiers such as SMILES and InChI. Identifiers written for a
+    molecule are keyed by :func:`~rmgpy.molecule.query.get_molecule_key` of the
+    molecule and by the identifier type and backend, and molecules whose keys
+    collide are told apart by an isomorphism check. Structures read from an
+    identifier are keyed by the identifier string, its type, the backend and
+    whether atom type errors were raised, and copies of them are returned.
+
+    If a `path` is given, translations are also stored in an SQLite database
+    at that location, so that they can be reused by other processes and later
+    jobs. A database opened with `read_only` set is only used for lookups.
+    The attributes are:
+
+    =================== =============== ========================================
+    Attribute           Type            Description
+    =================== =============== ========================================
+    `max_size`          ``int``         The maximum number of translations stored in each direction (0 disables the cache)
+    `path`              ``str``         The SQLite database the translations are shared through, if any
+    `read_only`         ``bool``        ``True`` if new translations are not written to the database
+    `hits`              ``int``         The number of requests answered from the cache
+    `misses`            ``int``         The number of requests which required a translation
+    `evictions`         ``int``         The number of entries removed to respect `max_size`
+    =================== =============== ========================================
+    """
+
+    # The number of database writes made before they are committed
+    commit_interval = 100
+
+    def __init__(self, max_size=10000, path=None, read_only=False):
+        self.max_size = max_size
+        self.path = None
+        self.read_only = read_only
+        self.identifiers = OrderedDict()
+        self.structures = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._connection = None
+        self._pending = 0
+        self._close_registered = False
+        if path is not None:
+            self.connect(path, read_only)
+
+    def __len__(self):
+        return len(self.identifiers) + len(self.structures)
+
+    def __repr__(self):
+        return '<IdentifierCache with {0:d} translations: {1:d} hits, {2:d} misses>'.format(
+            len(self), self.hits, self.misses)
+
+    @property
+    def enabled(self):
+        """``True`` if the cache stores any translations."""
+        return self.max_size > 0
+
+    @property
+    def hit_rate(self):
+        """The fraction of requests answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_statistics(self):
+        """
+        Return a dictionary with the number of stored translations, hits,
+        misses and evictions and the hit rate.
+        """
+        return {'size': len(self),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hit_rate}
+
+    def log_statistics(self, level=logging.INFO):
+        """
+        Log the cache statistics at the given `level`.
+        """
+        logging.log(level, 'Identifier cache: {0:d} translations, {1:d} hits, {2:d} misses '
+                           '({3:.1%} hit rate)'.format(len(self), self.hits, self.misses, self.hit_rate))
+
+    def clear(self):
+        """
+        Remove all translations stored in memory and reset the statistics. The
+        database, if any, is not modified.
+        """
+        with self._lock:
+            self.identifiers.clear()
+            self.structures.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def connect(self, path, read_only=False):
+        """
+        Share translations through the SQLite database at `path`, which is
+        created if needed unless `read_only` is set.
+        """
+        with self._lock:
+            self.close()
+            if read_only:
+                # Build the URI from the path so that characters such as ? and # in it are escaped
+                uri = pathlib.Path(path).resolve().as_uri() + '?mode=ro'
+                connection = sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False)
+            else:
+                connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+                connection.execute('CREATE TABLE IF NOT EXISTS identifiers (molecule_key TEXT, identifier_type TEXT, '
+                                   'backend TEXT, adjlist TEXT, identifier TEXT, '
+                                   'PRIMARY KEY (molecule_key, identifier_type, backend, adjlist))')
+                connection.execute('CREATE TABLE IF NOT EXISTS structures (identifier TEXT, identifier_type TEXT, '
+                                   'backend TEXT, raise_exception INTEGER, adjlist TEXT, '
+                                   'PRIMARY KEY (identifier, identifier_type, backend, raise_exception))')
+                connection.commit()
+            self._connection = connection
+            self.path = path
+            self.read_only = read_only
+            # Close whichever database is connected at exit
+            if not self._close_registered:
+                atexit.register(self.close)
+                self._close_registered = True
+
+    def commit(self):
+        """
+        Commit any translations not yet written to the database.
+        """
+        with self._lock:
+            if self._connection is not None and self._pending:
+                self._connection.commit()
+                self._pending = 0
+
+    def close(self):
+        """
+        Commit pending translations and close the database, if any.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self.commit()
+                self._connection.close()
+                self._connection = None
+                self.path = None
+
+    def get_identifier(self, mol, identifier_type, backend):
+        """
+        Return the stored identifier of type `identifier_type` written for
+        `mol` with `backend`, or ``None`` if there is none.
+        """
+        if not self.enabled:
+            return None
+        key = (get_molecule_key(mol), identifier_type, backend)
+        with self._lock:
+            entries = self.identifiers.get(key)
+            if entries is None and self._connection is not None:
+                entries = self._load_identifiers(key)
+            if entries is not None:
+                for template, identifier in entries:
+                    if template.is_isomorphic(mol, save_order=True):
+                        self.hits += 1
+                        self.identifiers.move_to_end(key)
+                        return identifier
+            self.misses += 1
+        return None
+
+    def put_identifier(self, mol, identifier_type, backend, identifier):
+        """
+        Store the `identifier` of type `identifier_type` written for `mol`
+        with `backend`.
+        """
+        if not self.enabled:
+            return
+        key = (get_molecule_key(mol), identifier_type, backend)
+        template = mol.copy(deep=True)
+        with self._lock:
+            self.identifiers.setdefault(key, []).append((template, identifier))
+            self.identifiers.move_to_end(key)
+            self._evict(self.identifiers)
+            if self._connection is not None and not self.read_only:
+                self._write('INSERT OR REPLACE INTO identifiers VALUES (?, ?, ?, ?, ?)',
+                            (repr(key[0]), identifier_type, backend, template.to_adjacency_list(), identifier))
+
+    def get_structure(self, identifier, identifier_type, backend, raise_atomtype_exception=True):
+        """
+        Return a copy of the structure read from the `identifier` of type
+        `identifier_type` with `backend`, or ``None`` if there is none.
+        """
+        if not self.enabled:
+            return None
+        key = (identifier, identifier_type, backend, raise_atomtype_exception)
+        with self._lock:
+            structure = self.structures.get(key)
+            if structure is None and self._connection is not None:
+                structure = self._load_structure(key)
+            if structure is not None:
+                self.hits += 1
+                self.structures.move_to_end(key)
+                return structure.copy(deep=True)
+            self.misses += 1
+        return None
+
+    def put_structure(self, identifier, identifier_type, backend, raise_atomtype_exception, mol):
+        """
+        Store a copy of the structure `mol` read from the `identifier` of type
+        `identifier_type` with `backend`.
+        """
+        if not self.enabled:
+            return
+        key = (identifier, identifier_type, backend, raise_atomtype_exception)
+        structure = mol.copy(deep=True)
+        with self._lock:
+            self.structures[key] = structure
+            self.structures.move_to_end(key)
+            self._evict(self.structures)
+            if self._connection is not None and not self.read_only:
+                self._write('INSERT OR REPLACE INTO structures VALUES (?, ?, ?, ?, ?)',
+                            (identifier, identifier_type, backend, int(raise_atomtype_exception),
+                             structure.to_adjacency_list()))
+
+    def _evict(self, entries):
+        """
+        Remove the least recently used `entries` beyond `max_size`.
+        """
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def _write(self, statement, parameters):
+        """
+        Execute the database `statement`, committing every `commit_interval`
+        writes. Errors, e.g. from a locked database, are logged and ignored.
+        """
+        try:
+            self._connection.execute(statement, parameters)
+            self._pending += 1
+            if self._pending >= self.commit_interval:
+                self.commit()
+        except sqlite3.Error as e:
+            logging.warning('Unable to write to identifier cache database {0}: {1}'.format(self.path, e))
+
+    def _load_identifiers(self, key):
+        """
+        Return the identifiers stored in the database under `key`, adding
+        them to the in-memory cache, or ``None`` if there are none.
+        """
+        try:
+            rows = self._connection.execute('SELECT adjlist, identifier FROM identifiers WHERE molecule_key=? '
+                                            'AND identifier_type=? AND backend=?', (repr(key[0]),) + key[1:]).fetchall()
+        except sqlite3.Error as e:
+            logging.warning('Unable to read from identifier cache database {0}: {1}'.format(self.path, e))
+            return None
+        entries = []
+        for adjlist, identifier in rows:
+            template = _read_adjacency_list(adjlist, False)
+            if template is not None:
+                entries.append((template, identifier))
+        if not entries:
+            return None
+        self.identifiers[key] = entries
+        self._evict(self.identifiers)
+        return entries
+
+    def _load_structure(self, key):
+        """
+        Return the structure stored in the database under `key`, adding it to
+        the in-memory cache, or ``None`` if there is none.
+        """
+        identifier, identifier_type, backend, raise_atomtype_exception = key
+        try:
+            row = self._connection.execute('SELECT adjlist FROM structures WHERE identifier=? AND identifier_type=? '
+                                           'AND backend=? AND raise_exception=?',
+                                           (identifier, identifier_type, backend,
+                                            int(raise_atomtype_exception))).fetchone()
+        except sqlite3.Error as e:
+            logging.warning('Unable to read from identifier cache database {0}: {1}'.format(self.path, e))
+            return None
+        if row is None:
+            return None
+        structure = _read_adjacency_list(row[0], raise_atomtype_exception)
+        if structure is None:
+            return None
+        self.structures[key] = structure
+        self._evict(self.structures)
+        return structure
+
+
+def _read_adjacency_list(adjlist, raise_atomtype_exception):
+    """
+    Return the molecule described by `adjlist`, or ``None`` if it cannot be
+    read.
+    """
+    from rmgpy.molecule.molecule import Molecule
+    try:
+        return Molecule().from_adjacency_list(adjlist, raise_atomtype_exception=raise_atomtype_exception,
+                                              raise_charge_exception=False, check_consistency=False)
+    except Exception as e:
+        logging.debug('Unable to read cached structure {0}: {1}'.format(adjlist, e))
+        return None
+
+
+# The cache used by rmgpy.molecule.resonance.generate_resonance_structures
+resonance_cache = ResonanceCache()
+
+# The cache used by rmgpy.molecule.molecule.Molecule.calculate_symmetry_number
+symmetry_number_cache = SymmetryNumberCache()
+
+# The cache used by rmgpy.molecule.translator to read and write identifiers
+identifier_cache = IdentifierCache()
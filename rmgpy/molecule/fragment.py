@@ -29,6 +29,7 @@
 
 import itertools
 import logging
+from collections import OrderedDict
 
 import rmgpy.molecule.group as gr
 import rmgpy.molecule.element as elements
@@ -38,12 +39,16 @@ from rmgpy.molecule.element import get_element
 from rmgpy.molecule.graph import Graph, Vertex
 from rmgpy.molecule.molecule import Atom, Bond, Molecule
 from rmgpy.molecule.atomtype import get_atomtype, AtomTypeError, ATOMTYPES, AtomType
+from rmgpy.molecule.query import get_molecule_key
 from rdkit import Chem
 
 # this variable is used to name atom IDs so that there are as few conflicts by
 # using the entire space of integer objects
 ATOM_ID_COUNTER = -(2**15)
 
+# the maximum number of structures whose cut fragments are cached
+CUT_CACHE_SIZE = 10000
+
 
 class CuttingLabel(Atom):
     def __init__(self, name="", label="", id=-1):
@@ -388,17 +393,18 @@ class Fragment(Molecule):
                 return True
         return False
 
-    def update(self, sort_atoms=True):
+    def update(self, sort_atoms=True, atoms=None):
         # currently sort_atoms does not work for fragments
-        for v in self.vertices:
+        self.reset_canonical_hash()
+        for v in (self.vertices if atoms is None else atoms):
             if not isinstance(v, CuttingLabel):
                 v.update_charge()
 
-        self.update_atomtypes()
+        self.update_atomtypes(atoms=atoms)
         self.update_multiplicity()
         self.sort_vertices()
 
-    def update_atomtypes(self, log_species=True, raise_exception=True):
+    def update_atomtypes(self, log_species=True, raise_exception=True, atoms=None):
         """
         Iterate through the atoms in the structure, checking their atom types
         to ensure they are correct (i.e. accurately describe their local bond
@@ -407,12 +413,17 @@ class Fragment(Molecule):
         If `raise_exception` is `False`, then the generic atomType 'R' will
         be prescribed to any atom when get_atomtype fails. Currently used for
         resonance hybrid atom types.
+
+        If a list of `atoms` is given, only those atoms are updated.
         """
+        if atoms is None:
+            atoms = self.vertices
+
         # Because we use lonepairs to match atomtypes and default is -100 when unspecified,
         # we should update before getting the atomtype.
-        self.update_lone_pairs()
+        self.update_lone_pairs(atoms)
 
-        for v in self.vertices:
+        for v in atoms:
             if isinstance(v, CuttingLabel):
                 continue
             try:
@@ -428,12 +439,14 @@ class Fragment(Molecule):
                     raise
                 v.atomtype = ATOMTYPES["R"]
 
-    def update_lone_pairs(self):
+    def update_lone_pairs(self, atoms=None):
         """
-        Iterate through the atoms in the structure and calculate the
-        number of lone electron pairs, assuming a neutral molecule.
+        Iterate through the atoms in the structure, or only the given list of
+        `atoms`, and calculate the number of lone electron pairs, assuming a
+        neutral molecule.
         """
-        for v in self.vertices:
+        self.reset_canonical_hash()
+        for v in (self.vertices if atoms is None else atoms):
             if isinstance(v, CuttingLabel):
                 continue
             if not v.is_hydrogen():
@@ -846,397 +859,68 @@ class Fragment(Molecule):
         the number of products should be less (or equal) than 3, due to the 3 body collision
         rxn format limit.
         size_threshold is the minimum size for each aliphatic fragment size. Default value is 5.
-        """
-        mol = self.generate_resonance_structures()[0]
 
-        # slice mol
-        frag_smiles_list = []
-        if cut_through:
-            arom_cut_frag = self.sliceitup_arom(
-                mol.to_smiles(), size_threshold=size_threshold
-            )
-            for frag in arom_cut_frag:
-                aliph_cut_frag = self.sliceitup_aliph(
-                    frag, size_threshold=size_threshold
-                )
-                for ele in aliph_cut_frag:
-                    frag_smiles_list.append(ele)
-        else:
-            # if aromatic, only perform sliceitup_arom, if aliphatic, only sliceitup_aliph
-            if mol.is_aromatic():
-                # try aromatic cut first, if no cut found, try aliphatic cut then
-                frag_smiles_list = self.sliceitup_arom(
-                    mol.to_smiles(), size_threshold=size_threshold
-                )
-                if len(frag_smiles_list) == 1:
-                    # try aliphatic cut then
-                    frag_smiles_list = self.sliceitup_aliph(
-                        mol.to_smiles(), size_threshold=size_threshold
+        The cuts are found by matching the cutting patterns against the fragment graph,
+        and the fragments cut from each structure are cached, so that a structure which
+        is cut again, e.g. when it is formed by another reaction, is not matched again.
+        """
+        key = (get_molecule_key(self), cut_through, size_threshold)
+        frag_list = _get_cut_fragments(self, key)
+        if frag_list is None:
+            mol = self.generate_resonance_structures()[0]
+
+            # slice mol
+            if cut_through:
+                frag_list = []
+                for frag in _cut_fragment(mol, _AROMATIC_CUT_PATTERNS, size_threshold):
+                    frag_list.extend(
+                        _cut_fragment(frag, _ALIPHATIC_CUT_PATTERNS, size_threshold, skip_rings=True)
                     )
             else:
-                frag_smiles_list = self.sliceitup_aliph(
-                    mol.to_smiles(), size_threshold=size_threshold
-                )
+                # if aromatic, only perform sliceitup_arom, if aliphatic, only sliceitup_aliph
+                if mol.is_aromatic():
+                    # try aromatic cut first, if no cut found, try aliphatic cut then
+                    frag_list = _cut_fragment(mol, _AROMATIC_CUT_PATTERNS, size_threshold)
+                    if len(frag_list) == 1:
+                        # try aliphatic cut then
+                        frag_list = _cut_fragment(mol, _ALIPHATIC_CUT_PATTERNS, size_threshold, skip_rings=True)
+                else:
+                    frag_list = _cut_fragment(mol, _ALIPHATIC_CUT_PATTERNS, size_threshold, skip_rings=True)
+            _put_cut_fragments(self, key, frag_list)
 
         if output_smiles:
-            return frag_smiles_list
+            return [frag.to_smiles() for frag in frag_list]
         else:
-            frag_list = []
-            for frag in frag_smiles_list:
-                frag = Fragment().from_smiles_like_string(frag)
-                res_frag = frag.generate_resonance_structures()[0]
-                frag_list.append(res_frag)
             return frag_list
 
     def sliceitup_arom(self, molecule, size_threshold=None):
         """
         Several specified aromatic patterns
         """
-        # set min size for each aliphatic fragment size
-        if size_threshold:
-            size_threshold = size_threshold
-        else:
-            size_threshold = 5
-        # if input is smiles string, output smiles
-        if isinstance(molecule, str):
-            molecule_smiles = molecule
-        # if input is fragment, output frafgment
-        elif isinstance(molecule, Fragment):
-            mol = molecule.generate_resonance_structures()[0]
-            molecule_smiles = mol.to_smiles()
-
-        # if input has Cuttinglabel, need to transform to later
-        _, cutting_label_list = self.detect_cutting_label(molecule_smiles)
-        # transfer to rdkit molecule for substruct matching
-        f = self.from_smiles_like_string(molecule_smiles)
-        molecule_to_cut, rdAtomIdx_frag = f.to_rdkit_mol()
-
-        # replace CuttingLabel to special Atom (metal) in rdkit
-        for atom, idx in rdAtomIdx_frag.items():
-            if isinstance(atom, CuttingLabel):
-                cuttinglabel_atom = molecule_to_cut.GetAtomWithIdx(idx)
-                if atom.symbol == "R":
-                    cuttinglabel_atom.SetAtomicNum(
-                        11
-                    )  # [Na], will replace back to CuttingLabel later
-                else:
-                    cuttinglabel_atom.SetAtomicNum(19)  # [K]
-
-        # substructure matching
-        pattern_list = ["pattern_1", "pattern_2", "pattern_3", "pattern_4"]
-        frag_list = []
-        for pattern in pattern_list:
-            emol, atom_map_index = self.pattern_call("Arom", pattern)
-            # start pattern matching
-            atom_map = molecule_to_cut.GetSubstructMatches(emol)
-            if atom_map:
-                # go through all matches and see if it agree with size threshold
-                for matched_atom_map in atom_map:
-                    # find the correct bond to break
-                    bonds_to_cut = []
-                    for ind in atom_map_index:
-                        b1 = matched_atom_map[ind]
-                        b2 = matched_atom_map[ind + 1]
-                        bond = molecule_to_cut.GetBondBetweenAtoms(b1, b2)
-                        bonds_to_cut.append(bond)
-                    # Break bonds
-                    newmol = Chem.RWMol(molecule_to_cut)
-                    # fragmentize
-                    new_mol = Chem.FragmentOnBonds(
-                        newmol,
-                        [bond.GetIdx() for bond in bonds_to_cut],
-                        dummyLabels=[(0, 0)] * len(bonds_to_cut),
-                    )
-                    # mol_set contains new set of fragments
-                    mol_set = Chem.GetMolFrags(new_mol, asMols=True)
-                    # check all fragments' size
-                    if all(
-                        sum(1 for atom in mol.GetAtoms() if atom.GetAtomicNum() == 6)
-                        >= size_threshold
-                        for mol in mol_set
-                    ):
-                        # replace * at cutting position with cutting label
-                        for ind, rdmol in enumerate(mol_set):
-                            frag = Chem.MolToSmiles(rdmol)
-                            if len(mol_set) > 2:  # means it cut into 3 fragments
-                                if frag.count("*") > 1:
-                                    # replace both with R
-                                    frag_smi = frag.replace("*", "R")
-                                else:
-                                    frag_smi = frag.replace("*", "L")
-                            else:  # means it only cut once, generate 2 fragments
-                                if ind == 0:
-                                    frag_smi = frag.replace("*", "R")
-                                else:
-                                    frag_smi = frag.replace("*", "L")
-                            frag_list.append(frag_smi)
-                        break
-                    else:
-                        # turn to next matched_atom_map
-                        continue
-            else:
-                # no match for this pattern
-                # cannot cut this molecule with this pattern
-                continue
-            # if there is appropariate cutting, stop further pattern matching
-            if frag_list != []:
-                break
-
-        if frag_list == []:
-            # this means no appropriate match for all patterns
-            # cannot cut this molecule
-            frag_list.append(molecule_smiles)
-        else:
-            if cutting_label_list != []:
-                frag_list_replaced = []
-                # replace metal atom back to Cuttinglabel
-                for metal_frag in frag_list:
-                    n_frag_smiles = metal_frag.replace("[Na]", "R")
-                    nn_frag_smiles = n_frag_smiles.replace("[K]", "L")
-                    frag_list_replaced.append(nn_frag_smiles)
-                frag_list = frag_list_replaced
-
-        if isinstance(molecule, str):
-            frag_list_new = []
-            for frag in frag_list:
-                n_frag_smiles = frag.replace("[Na]", "R")
-                new_frag_smiles = n_frag_smiles.replace("[K]", "L")
-                frag_list_new.append(new_frag_smiles)
-            return frag_list_new
-        elif isinstance(molecule, Fragment):
-            frag_list_new = []
-            for frag in frag_list:
-                n_frag_smiles = frag.replace("[Na]", "R")
-                new_frag_smiles = n_frag_smiles.replace("[K]", "L")
-
-                frag = Fragment().from_smiles_like_string(new_frag_smiles)
-                res_frag = frag.generate_resonance_structures()[0]
-                frag_list_new.append(res_frag)
-            return frag_list_new
+        return self._sliceitup(molecule, _AROMATIC_CUT_PATTERNS, size_threshold, skip_rings=False)
 
     def sliceitup_aliph(self, molecule, size_threshold=None):
         """
         Several specified aliphatic patterns
         """
-        # set min size for each aliphatic fragment size
-        if size_threshold:
-            size_threshold = size_threshold
-        else:
-            size_threshold = 5
-        # if input is smiles string, output smiles
-        if isinstance(molecule, str):
-            molecule_smiles = molecule
-        # if input is fragment, output frafgment
-        elif isinstance(molecule, Fragment):
-            mol = molecule.generate_resonance_structures()[0]
-            molecule_smiles = mol.to_smiles()
-
-        # if input has Cuttinglabel, need to transform to later
-        _, cutting_label_list = self.detect_cutting_label(molecule_smiles)
-        # transfer to rdkit molecule for substruct matching
-        f = self.from_smiles_like_string(molecule_smiles)
-        molecule_to_cut, rdAtomIdx_frag = f.to_rdkit_mol()
-
-        # replace CuttingLabel to special Atom (metal) in rdkit
-        for atom, idx in rdAtomIdx_frag.items():
-            if isinstance(atom, CuttingLabel):
-                cuttinglabel_atom = molecule_to_cut.GetAtomWithIdx(idx)
-                if atom.symbol == "R":
-                    cuttinglabel_atom.SetAtomicNum(
-                        11
-                    )  # [Na], will replace back to CuttingLabel later
-                else:
-                    cuttinglabel_atom.SetAtomicNum(19)  # [K]
-
-        # substructure matching
-        pattern_list = ["pattern_1", "pattern_2", "pattern_3"]
-        frag_list = []
-        for pattern in pattern_list:
-            emol, atom_map_index = self.pattern_call("Aliph", pattern)
-            # start pattern matching
-            atom_map = molecule_to_cut.GetSubstructMatches(emol)
-            if atom_map:
-                # go through all matches and see if it agree with size threshold or in ring
-                for matched_atom_map in atom_map:
-                    if self.check_in_ring(molecule_to_cut, matched_atom_map):
-                        # do not cut ring
-                        continue
-                    # find the correct bond to break
-                    bonds_to_cut = []
-                    for ind in atom_map_index:
-                        b1 = matched_atom_map[ind]
-                        b2 = matched_atom_map[ind + 1]
-                        bond = molecule_to_cut.GetBondBetweenAtoms(b1, b2)
-                        bonds_to_cut.append(bond)
-                    # Break bonds
-                    newmol = Chem.RWMol(molecule_to_cut)
-                    # fragmentize
-                    new_mol = Chem.FragmentOnBonds(
-                        newmol,
-                        [bond.GetIdx() for bond in bonds_to_cut],
-                        dummyLabels=[(0, 0)] * len(bonds_to_cut),
-                    )
-                    # mol_set contains new set of fragments
-                    mol_set = Chem.GetMolFrags(new_mol, asMols=True)
-                    # check all fragments' size
-                    if all(
-                        sum(1 for atom in mol.GetAtoms() if atom.GetAtomicNum() == 6)
-                        >= size_threshold
-                        for mol in mol_set
-                    ):
-                        # replace * at cutting position with cutting label
-                        for ind, rdmol in enumerate(mol_set):
-                            frag = Chem.MolToSmiles(rdmol)
-                            if len(mol_set) > 2:  # means it cut into 3 fragments
-                                if frag.count("*") > 1:
-                                    # replace both with R
-                                    frag_smi = frag.replace("*", "R")
-                                else:
-                                    frag_smi = frag.replace("*", "L")
-                            else:  # means it only cut once, generate 2 fragments
-                                if ind == 0:
-                                    frag_smi = frag.replace("*", "R")
-                                else:
-                                    frag_smi = frag.replace("*", "L")
-                            frag_list.append(frag_smi)
-                        break
-                    else:
-                        # turn to next matched_atom_map
-                        continue
-            else:
-                # no match for this pattern
-                # cannot cut this molecule with this pattern
-                continue
-            # if there is appropariate cutting, stop further pattern matching
-            if frag_list != []:
-                break
+        return self._sliceitup(molecule, _ALIPHATIC_CUT_PATTERNS, size_threshold, skip_rings=True)
 
-        if frag_list == []:
-            # this means no appropriate match for all patterns
-            # cannot cut this molecule
-            frag_list.append(molecule_smiles)
-        else:
-            if cutting_label_list != []:
-                frag_list_replaced = []
-                # replace metal atom back to Cuttinglabel
-                for metal_frag in frag_list:
-                    n_frag_smiles = metal_frag.replace("[Na]", "R")
-                    nn_frag_smiles = n_frag_smiles.replace("[K]", "L")
-                    frag_list_replaced.append(nn_frag_smiles)
-                frag_list = frag_list_replaced
-
-        if isinstance(molecule, str):
-            frag_list_new = []
-            for frag in frag_list:
-                n_frag_smiles = frag.replace("[Na]", "R")
-                new_frag_smiles = n_frag_smiles.replace("[K]", "L")
-                frag_list_new.append(new_frag_smiles)
-            return frag_list_new
-        elif isinstance(molecule, Fragment):
-            frag_list_new = []
-            for frag in frag_list:
-                n_frag_smiles = frag.replace("[Na]", "R")
-                new_frag_smiles = n_frag_smiles.replace("[K]", "L")
-
-                frag = Fragment().from_smiles_like_string(new_frag_smiles)
-                res_frag = frag.generate_resonance_structures()[0]
-                frag_list_new.append(res_frag)
-            return frag_list_new
-
-    def pattern_call(self, pattern_type, pattern):
-        """
-        pattern_type currently only supports 'Aliph' and 'Arom', specifying which pattern will
-        give output as pattern in rdkit mol and atom_map_index for substructure matching
-        """
-        if pattern_type == "Arom":
-            if pattern == "pattern_1":
-                mol = Chem.MolFromSmiles("c1ccccc1C(C(c2ccccc2)CCCCC)CCCCC")
-                emol = Chem.RWMol(mol)
-                # add some H at terminal aliphatic C to avoid cutting at potential allylic C
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(16, 24, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(16, 25, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(21, 26, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(21, 27, Chem.rdchem.BondType.SINGLE)
-                atom_map_index = [16, 21]
-
-            if pattern == "pattern_2":
-                mol = Chem.MolFromSmiles("c1ccccc1C(CCCCC)CCCCC")
-                emol = Chem.RWMol(mol)
-                # add some H at terminal aliphatic C to avoid cutting at potential allylic C
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(14, 17, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(14, 18, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(9, 19, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(9, 20, Chem.rdchem.BondType.SINGLE)
-                atom_map_index = [9, 14]
-
-            if pattern == "pattern_3":
-                mol = Chem.MolFromSmiles("c1ccccc1C(=C)CCCCCC")
-                emol = Chem.RWMol(mol)
-                # add some H at terminal aliphatic C to avoid cutting at potential allylic C
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(11, 14, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(11, 15, Chem.rdchem.BondType.SINGLE)
-                atom_map_index = [11]
-
-            if pattern == "pattern_4":
-                mol = Chem.MolFromSmiles("c1ccccc1CCCCCC")
-                emol = Chem.RWMol(mol)
-                # add some H at terminal aliphatic C to avoid cutting at potential allylic C
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(9, 12, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(9, 13, Chem.rdchem.BondType.SINGLE)
-                atom_map_index = [9]
-
-        elif pattern_type == "Aliph":
-            if pattern == "pattern_1":
-                mol = Chem.MolFromSmiles("CCC=CCCCCC")
-                emol = Chem.RWMol(mol)
-                # add some H at terminal aliphatic C to avoid cutting at potential allylic C
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(6, 9, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(6, 10, Chem.rdchem.BondType.SINGLE)
-                atom_map_index = [6]
-
-            if pattern == "pattern_2":
-                mol = Chem.MolFromSmiles("C=CCCCCC")
-                emol = Chem.RWMol(mol)
-                # add some H at terminal aliphatic C to avoid cutting at potential allylic C
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(4, 7, Chem.rdchem.BondType.SINGLE)
-                emol.AddAtom(Chem.rdchem.Atom("H"))
-                emol.AddBond(4, 8, Chem.rdchem.BondType.SINGLE)
-                atom_map_index = [4]
-
-            if pattern == "pattern_3":
-                mol = Chem.MolFromSmiles("CCCCCC")
-                mol = Chem.AddHs(mol, onlyOnAtoms=[2, 3])
-                emol = Chem.RWMol(mol)
-                atom_map_index = [2]
-        else:
-            raise NameError("Currently only Arom or Aliph type patterns are included")
-
-        return emol, atom_map_index
-
-    def check_in_ring(self, rd_mol, mapped_atom_idx):
+    def _sliceitup(self, molecule, patterns, size_threshold, skip_rings):
         """
-        Check if the mapped structure is in ring
+        Cut `molecule` with the first of the `patterns` which gives fragments of at
+        least `size_threshold` carbon atoms each. If input is smiles string, output
+        smiles, and if input is fragment, output fragment.
         """
-        for idx in mapped_atom_idx:
-            atom = rd_mol.GetAtomWithIdx(idx)
-            if atom.IsInRing():
-                return True
-        return False
+        if isinstance(molecule, str):
+            mol = Fragment().from_smiles_like_string(molecule)
+            frag_list = _cut_fragment(mol.generate_resonance_structures()[0], patterns, size_threshold, skip_rings)
+            if len(frag_list) == 1:
+                # cannot cut this molecule
+                return [molecule]
+            return [frag.to_smiles() for frag in frag_list]
+        else:
+            mol = molecule.generate_resonance_structures()[0]
+            return _cut_fragment(mol, patterns, size_threshold, skip_rings)
 
     def from_smiles_like_string(self, smiles_like_string):
         smiles = smiles_like_string
@@ -1832,3 +1516,243 @@ class Fragment(Molecule):
             mol_repr.update()
 
         return mol_repr, mapping
+
+
+def _make_cut_pattern(bonds, hydrogens, cuts):
+    """
+    Return a pattern of carbon atoms used to cut fragments. The `bonds` are
+    given as (index1, index2, order) and must reach each atom from an atom
+    with a lower index, `hydrogens` gives the exact number of hydrogens on
+    an atom by its index and `cuts` lists the pairs of atoms whose bond is
+    cut. Atoms with a benzene bond in the pattern only match aromatic
+    carbons and the others only match aliphatic carbons. The pattern is
+    returned as a tuple of the number of hydrogens of each atom (``None``
+    if not given), the (index, order) bonds of each atom to atoms with lower
+    indices, the cuts and whether each atom is aromatic.
+    """
+    size = max(max(index1, index2) for index1, index2, order in bonds) + 1
+    neighbors = [[] for i in range(size)]
+    aromatic = [False] * size
+    for index1, index2, order in bonds:
+        if index1 > index2:
+            index1, index2 = index2, index1
+        neighbors[index2].append((index1, order))
+        if order == 1.5:
+            aromatic[index1] = aromatic[index2] = True
+    for index in range(1, size):
+        if not neighbors[index]:
+            raise ValueError("Atom {0} of the cutting pattern is not bonded to a preceding atom.".format(index))
+        neighbors[index].sort()
+    return [hydrogens.get(index) for index in range(size)], neighbors, cuts, aromatic
+
+
+def _chain(*indices):
+    """
+    Return the single bonds of a chain through the atoms with the given `indices`.
+    """
+    return [(index1, index2, 1) for index1, index2 in zip(indices[:-1], indices[1:])]
+
+
+def _benzene(start):
+    """
+    Return the bonds of a benzene ring of the atoms `start` to `start` + 5.
+    """
+    return [(start + i, start + (i + 1) % 6, 1.5) for i in range(6)]
+
+
+# patterns tried in order for aromatic cuts; hydrogens are required at the
+# terminal aliphatic C to avoid cutting at potential allylic C
+_AROMATIC_CUT_PATTERNS = [
+    # c1ccccc1C(C(c2ccccc2)CCCCC)CCCCC
+    _make_cut_pattern(_benzene(0) + _chain(5, 6, 7, 8) + _benzene(8) + _chain(7, 14, 15, 16, 17, 18)
+                      + _chain(6, 19, 20, 21, 22, 23), {16: 2, 21: 2}, [(16, 17), (21, 22)]),
+    # c1ccccc1C(CCCCC)CCCCC
+    _make_cut_pattern(_benzene(0) + _chain(5, 6, 7, 8, 9, 10, 11) + _chain(6, 12, 13, 14, 15, 16),
+                      {9: 2, 14: 2}, [(9, 10), (14, 15)]),
+    # c1ccccc1C(=C)CCCCCC
+    _make_cut_pattern(_benzene(0) + _chain(5, 6) + [(6, 7, 2)] + _chain(6, 8, 9, 10, 11, 12, 13),
+                      {11: 2}, [(11, 12)]),
+    # c1ccccc1CCCCCC
+    _make_cut_pattern(_benzene(0) + _chain(5, 6, 7, 8, 9, 10, 11), {9: 2}, [(9, 10)]),
+]
+
+# patterns tried in order for aliphatic cuts
+_ALIPHATIC_CUT_PATTERNS = [
+    # CCC=CCCCCC
+    _make_cut_pattern(_chain(0, 1, 2) + [(2, 3, 2)] + _chain(3, 4, 5, 6, 7, 8), {6: 2}, [(6, 7)]),
+    # C=CCCCCC
+    _make_cut_pattern([(0, 1, 2)] + _chain(1, 2, 3, 4, 5, 6), {4: 2}, [(4, 5)]),
+    # CCCCCC
+    _make_cut_pattern(_chain(0, 1, 2, 3, 4, 5), {2: 2, 3: 2}, [(2, 3)]),
+]
+
+# fragments cut from recently cut structures, as lists of (structure, fragments)
+# keyed by the molecule key of the structure and the cutting options
+_cut_cache = OrderedDict()
+
+
+def _get_cut_fragments(fragment, key):
+    """
+    Return copies of the fragments cut from `fragment` with the options in
+    `key`, or ``None`` if they are not cached.
+    """
+    entries = _cut_cache.get(key)
+    if entries is not None:
+        for template, frag_list in entries:
+            if template.is_isomorphic(fragment):
+                _cut_cache.move_to_end(key)
+                return [frag.copy(deep=True) for frag in frag_list]
+    return None
+
+
+def _put_cut_fragments(fragment, key, frag_list):
+    """
+    Cache copies of the fragments in `frag_list` cut from `fragment` with
+    the options in `key`.
+    """
+    if CUT_CACHE_SIZE <= 0:
+        return
+    entry = (fragment.copy(deep=True), [frag.copy(deep=True) for frag in frag_list])
+    _cut_cache.setdefault(key, []).append(entry)
+    _cut_cache.move_to_end(key)
+    while len(_cut_cache) > CUT_CACHE_SIZE:
+        _cut_cache.popitem(last=False)
+
+
+def _match_cut_pattern(pattern, atoms, matched):
+    """
+    Generate the lists of atoms among `atoms` matched by each atom of the
+    cutting `pattern`, extending the list of `matched` atoms.
+    """
+    hydrogens, neighbors, cuts, aromatic = pattern
+    index = len(matched)
+    if index == len(hydrogens):
+        yield list(matched)
+        return
+    if index == 0:
+        candidates = atoms
+    else:
+        neighbor, order = neighbors[index][0]
+        candidates = [atom for atom, bond in matched[neighbor].edges.items() if bond.is_order(order)]
+    for atom in candidates:
+        if not atom.is_carbon() or atom in matched:
+            continue
+        if hydrogens[index] is not None and \
+                sum(1 for other in atom.edges if other.is_hydrogen()) != hydrogens[index]:
+            continue
+        if not aromatic[index] and any(bond.is_benzene() for bond in atom.edges.values()):
+            # an aliphatic atom of the pattern does not match an aromatic carbon
+            continue
+        for neighbor, order in neighbors[index][1:]:
+            bond = atom.edges.get(matched[neighbor])
+            if bond is None or not bond.is_order(order):
+                break
+        else:
+            matched.append(atom)
+            for match in _match_cut_pattern(pattern, atoms, matched):
+                yield match
+            matched.pop()
+
+
+def _get_cut_components(atoms, cut_bonds):
+    """
+    Return the lists of indices of the `atoms` in each part left when the
+    `cut_bonds`, given as pairs of atoms, are cut, ordered by their first atom.
+    """
+    cut = set()
+    for atom1, atom2 in cut_bonds:
+        cut.add((atom1, atom2))
+        cut.add((atom2, atom1))
+    indices = {atom: index for index, atom in enumerate(atoms)}
+    components = []
+    visited = set()
+    for atom in atoms:
+        if atom in visited:
+            continue
+        visited.add(atom)
+        component = []
+        stack = [atom]
+        while stack:
+            atom1 = stack.pop()
+            component.append(indices[atom1])
+            for atom2 in atom1.edges:
+                if atom2 not in visited and (atom1, atom2) not in cut:
+                    visited.add(atom2)
+                    stack.append(atom2)
+        components.append(sorted(component))
+    return components
+
+
+def _cut_fragment(fragment, patterns, size_threshold=None, skip_rings=False):
+    """
+    Cut `fragment` at the bonds of the first match of the first of the
+    cutting `patterns` which gives parts of at least `size_threshold` carbon
+    atoms each (5 by default), and return the resulting fragments. If
+    `skip_rings` is ``True``, matches containing ring atoms are not cut. A
+    list of `fragment` alone is returned if it cannot be cut.
+    """
+    if not size_threshold:
+        size_threshold = 5
+    atoms = fragment.vertices
+    ring_atoms = None
+    for pattern in patterns:
+        cuts = pattern[2]
+        for match in _match_cut_pattern(pattern, atoms, []):
+            if skip_rings:
+                if ring_atoms is None:
+                    ring_atoms = set(atom for atom in atoms if not atom.is_hydrogen()
+                                     and fragment.is_vertex_in_cycle(atom))
+                if any(atom in ring_atoms for atom in match):
+                    # do not cut ring
+                    continue
+            cut_bonds = [(match[index1], match[index2]) for index1, index2 in cuts]
+            components = _get_cut_components(atoms, cut_bonds)
+            if all(sum(1 for index in component if atoms[index].is_carbon()) >= size_threshold
+                   for component in components):
+                return _make_cut_fragments(fragment, cut_bonds, components)
+    # this means no appropriate match for all patterns
+    return [fragment]
+
+
+def _make_cut_fragments(fragment, cut_bonds, components):
+    """
+    Return the fragments made by cutting the `cut_bonds` of `fragment`,
+    which leave the parts with the atom indices in `components`. The cut
+    ends are capped with cutting labels: if the fragment is cut into three
+    parts, the part with more than one cut end gets R labels and the others
+    get L labels, otherwise the first part gets R and the second gets L.
+    """
+    indices = {atom: index for index, atom in enumerate(fragment.vertices)}
+    component_indices = {}
+    for i, component in enumerate(components):
+        for index in component:
+            component_indices[index] = i
+    cut_ends = [0] * len(components)
+    for atom1, atom2 in cut_bonds:
+        cut_ends[component_indices[indices[atom1]]] += 1
+        cut_ends[component_indices[indices[atom2]]] += 1
+
+    new = fragment.copy(deep=True)
+    atoms = new.vertices
+    labels = [[] for component in components]
+    for atom1, atom2 in cut_bonds:
+        index1, index2 = indices[atom1], indices[atom2]
+        atom1, atom2 = atoms[index1], atoms[index2]
+        new.remove_bond(new.get_bond(atom1, atom2))
+        for atom, index in ((atom1, index1), (atom2, index2)):
+            i = component_indices[index]
+            if len(components) > 2:
+                name = "R" if cut_ends[i] > 1 else "L"
+            else:
+                name = "R" if i == 0 else "L"
+            cutting_label = CuttingLabel(name=name)
+            cutting_label.edges[atom] = Bond(atom, cutting_label, order=1)
+            atom.edges[cutting_label] = cutting_label.edges[atom]
+            labels[i].append(cutting_label)
+
+    frag_list = []
+    for component, component_labels in zip(components, labels):
+        frag = Fragment(vertices=[atoms[index] for index in component] + component_labels)
+        frag.update()
+        frag_list.append(frag.generate_resonance_structures()[0])
+    return frag_list
@@ -44,6 +44,10 @@ cdef class Vertex(object):
 
     cpdef bint is_specific_case_of(self, Vertex other) except -2
 
+    cpdef tuple get_match_bits(self)
+
+    cpdef tuple get_match_masks(self)
+
     cpdef reset_connectivity_values(self)
 
 cpdef short get_vertex_connectivity_value(Vertex vertex) except 1 # all values should be negative
@@ -62,6 +66,10 @@ cdef class Edge(object):
 
     cpdef bint is_specific_case_of(self, Edge other) except -2
 
+    cpdef int get_match_bits(self)
+
+    cpdef int get_match_masks(self)
+
     cpdef Vertex get_other_vertex(self, Vertex vertex)
 
 ################################################################################
@@ -70,12 +78,19 @@ cdef Vertex _get_edge_vertex1(Edge edge)
 
 cdef Vertex _get_edge_vertex2(Edge edge)
 
+cdef list _copy_vertices(list vertices)
+
 cdef class Graph(object):
 
     cdef public list vertices
     
     cdef public list ordered_vertices
 
+    cdef object _canonical_hash
+    cdef object _canonical_hash_nonstrict
+
+    cdef dict _ring_cache
+
     cpdef Vertex add_vertex(self, Vertex vertex)
 
     cpdef Edge add_edge(self, Edge edge)
@@ -106,6 +121,22 @@ cdef class Graph(object):
 
     cpdef reset_connectivity_values(self)
 
+    cpdef object get_vertex_hash_label(self, Vertex vertex, bint strict=?)
+
+    cpdef object get_edge_hash_label(self, Edge edge, bint strict=?)
+
+    cpdef object get_canonical_hash(self, bint strict=?)
+
+    cpdef reset_canonical_hash(self)
+
+    cpdef bint is_canonical_hash_equal(self, Graph other, bint strict=?)
+
+    cpdef reset_ring_cache(self)
+
+    cdef list _get_cached_rings(self, object key)
+
+    cdef _set_cached_rings(self, object key, list rings)
+
     cpdef sort_vertices(self, bint save_order=?)
     
     cpdef restore_vertex_order(self)
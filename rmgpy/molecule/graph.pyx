@@ -113,6 +113,25 @@ cdef class Vertex(object):
         """
         return True
 
+    cpdef tuple get_match_bits(self):
+        """
+        Return a tuple of integers with one bit set for each semantic property
+        of `self`, such that `self` is a specific case of a vertex with match
+        masks ``masks`` if every ``bits[i] & masks[i]`` is nonzero, or
+        ``None`` if the vertex cannot be encoded. Derived classes with
+        semantic information may reimplement this function and
+        :meth:`get_match_masks` to speed up subgraph isomorphism.
+        """
+        return None
+
+    cpdef tuple get_match_masks(self):
+        """
+        Return a tuple of bitmasks of the semantic properties allowed by
+        `self`, to be compared with the result of :meth:`get_match_bits`, or
+        ``None`` if the vertex cannot be encoded.
+        """
+        return None
+
     cpdef reset_connectivity_values(self):
         """
         Reset the cached structure information for this vertex.
@@ -184,6 +203,25 @@ cdef class Edge(object):
         """
         return True
 
+    cpdef int get_match_bits(self):
+        """
+        Return an integer with one bit set for the semantic properties of
+        `self`, such that `self` is a specific case of an edge with match mask
+        ``mask`` if ``bits & mask`` is nonzero, or zero if the edge cannot be
+        encoded. Derived classes with semantic information may reimplement
+        this function and :meth:`get_match_masks` to speed up subgraph
+        isomorphism.
+        """
+        return 0
+
+    cpdef int get_match_masks(self):
+        """
+        Return a bitmask of the semantic properties allowed by `self`, to be
+        compared with the result of :meth:`get_match_bits`, or zero if the
+        edge cannot be encoded.
+        """
+        return 0
+
     cpdef Vertex get_other_vertex(self, Vertex vertex):
         """
         Given a vertex that makes up part of the edge, return the other vertex.
@@ -207,6 +245,40 @@ cdef Vertex _get_edge_vertex1(Edge edge):
 cdef Vertex _get_edge_vertex2(Edge edge):
     return edge.vertex2
 
+cdef list _copy_vertices(list vertices):
+    """
+    Return copies of the given `vertices`, connected by copies of the edges
+    between them. The vertices are located by index rather than by hashing,
+    and each edge is copied once.
+    """
+    cdef Vertex vertex, vertex1, vertex2, new_vertex1, new_vertex2
+    cdef Edge edge
+    cdef dict index
+    cdef list new_vertices
+    cdef int i, j
+
+    new_vertices = []
+    index = {}
+    for i, vertex in enumerate(vertices):
+        new_vertex1 = vertex.copy()
+        new_vertex1.edges = {}
+        new_vertices.append(new_vertex1)
+        index[id(vertex)] = i
+
+    for i, vertex1 in enumerate(vertices):
+        new_vertex1 = new_vertices[i]
+        for vertex2, edge in vertex1.edges.items():
+            j = index[id(vertex2)]
+            if j < i:
+                continue
+            new_vertex2 = new_vertices[j]
+            edge = edge.copy()
+            edge.vertex1 = new_vertex2
+            edge.vertex2 = new_vertex1
+            new_vertex1.edges[new_vertex2] = edge
+            new_vertex2.edges[new_vertex1] = edge
+    return new_vertices
+
 cdef class Graph(object):
     """
     A graph data type. The vertices of the graph are stored in a list
@@ -232,6 +304,8 @@ cdef class Graph(object):
         """
         self.vertices.append(vertex)
         vertex.edges = dict()
+        self.reset_canonical_hash()
+        self.reset_ring_cache()
         return vertex
 
     cpdef Edge add_edge(self, Edge edge):
@@ -243,6 +317,8 @@ cdef class Graph(object):
             raise ValueError('Attempted to add edge between vertices not in the graph.')
         edge.vertex1.edges[edge.vertex2] = edge
         edge.vertex2.edges[edge.vertex1] = edge
+        self.reset_canonical_hash()
+        self.reset_ring_cache()
         return edge
 
     cpdef list get_all_edges(self):
@@ -300,6 +376,8 @@ cdef class Graph(object):
             del vertex2.edges[vertex]
         vertex.edges = dict()
         self.vertices.remove(vertex)
+        self.reset_canonical_hash()
+        self.reset_ring_cache()
 
     cpdef remove_edge(self, Edge edge):
         """
@@ -309,6 +387,8 @@ cdef class Graph(object):
         """
         del edge.vertex1.edges[edge.vertex2]
         del edge.vertex2.edges[edge.vertex1]
+        self.reset_canonical_hash()
+        self.reset_ring_cache()
 
     cpdef Graph copy(self, bint deep=False):
         """
@@ -318,31 +398,12 @@ cdef class Graph(object):
         original vertices and edges are used in the new graph.
         """
         cdef Graph other
-        cdef Vertex vertex, vertex1, vertex2
-        cdef Edge edge
-        cdef dict edges, mapping
-        cdef list vertices
-        cdef int index1, index2
 
         other = Graph()
-        vertices = self.vertices
-        mapping = {}
-        for vertex in vertices:
-            if deep:
-                vertex2 = other.add_vertex(vertex.copy())
-                mapping[vertex] = vertex2
-            else:
-                edges = vertex.edges
-                other.add_vertex(vertex)
-                vertex.edges = edges
         if deep:
-            for vertex1 in vertices:
-                for vertex2 in vertex1.edges:
-                    edge = vertex1.edges[vertex2]
-                    edge = edge.copy()
-                    edge.vertex1 = mapping[vertex1]
-                    edge.vertex2 = mapping[vertex2]
-                    other.add_edge(edge)
+            other.vertices = _copy_vertices(self.vertices)
+        else:
+            other.vertices = self.vertices[:]
         return other
 
     cpdef dict copy_and_map(self):
@@ -350,28 +411,7 @@ cdef class Graph(object):
         Create a deep copy of the current graph, and return the dict
         'mapping'. Method was modified from Graph.copy() method
         """
-        cdef Graph other
-        cdef Vertex vertex, vertex1, vertex2
-        cdef Edge edge
-        cdef dict edges, mapping
-        cdef list vertices
-        cdef int index1, index2
-
-        other = Graph()
-        vertices = self.vertices
-        mapping = {}
-        for vertex in vertices:
-            vertex2 = other.add_vertex(vertex.copy())
-            mapping[vertex] = vertex2
-
-        for vertex1 in vertices:
-            for vertex2 in vertex1.edges:
-                edge = vertex1.edges[vertex2]
-                edge = edge.copy()
-                edge.vertex1 = mapping[vertex1]
-                edge.vertex2 = mapping[vertex2]
-                other.add_edge(edge)
-        return mapping
+        return dict(zip(self.vertices, _copy_vertices(self.vertices)))
 
     cpdef Graph merge(self, Graph other):
         """
@@ -447,6 +487,8 @@ cdef class Graph(object):
         """
         cdef Vertex vertex
         for vertex in self.vertices: vertex.reset_connectivity_values()
+        self.reset_canonical_hash()
+        self.reset_ring_cache()
 
     cpdef update_connectivity_values(self):
         """
@@ -468,6 +510,135 @@ cdef class Graph(object):
             for vertex2 in vertex1.edges: count += vertex2.connectivity2
             vertex1.connectivity3 = count
 
+    cpdef object get_vertex_hash_label(self, Vertex vertex, bint strict=True):
+        """
+        Return the label of `vertex` used to seed :meth:`get_canonical_hash`.
+        Subclasses override this to expose the attributes compared by their
+        ``equivalent`` method; any two vertices which are equivalent must
+        have equal labels. Labels should be built from numbers and tuples
+        only so that the resulting hash does not change between processes.
+        The base implementation does not distinguish between vertices.
+        """
+        return 0
+
+    cpdef object get_edge_hash_label(self, Edge edge, bint strict=True):
+        """
+        Return the label of `edge` used by :meth:`get_canonical_hash`. The
+        same rules apply as for :meth:`get_vertex_hash_label`.
+        """
+        return 0
+
+    cpdef object get_canonical_hash(self, bint strict=True):
+        """
+        Return an integer hash of the graph which does not depend on the order
+        of the vertices. Isomorphic graphs always have the same hash, so two
+        graphs with different hashes can be rejected without running VF2;
+        equal hashes do not guarantee that the graphs are isomorphic.
+
+        The hash is computed by Weisfeiler-Lehman refinement of the vertex
+        and edge labels and is cached separately for the strict and the
+        non-strict (``strict=False``) labels. The cache is cleared when
+        vertices or edges are added or removed and by the methods of
+        subclasses which update the vertices or edges, such as
+        :meth:`Molecule.update`; call :meth:`reset_canonical_hash` after
+        modifying vertices or edges in place by other means.
+        """
+        if strict:
+            if self._canonical_hash is None:
+                self._canonical_hash = self._compute_canonical_hash(True)
+            return self._canonical_hash
+        else:
+            if self._canonical_hash_nonstrict is None:
+                self._canonical_hash_nonstrict = self._compute_canonical_hash(False)
+            return self._canonical_hash_nonstrict
+
+    cpdef reset_canonical_hash(self):
+        """
+        Clear the cached canonical hashes. Call this method when you have
+        modified the graph.
+        """
+        self._canonical_hash = None
+        self._canonical_hash_nonstrict = None
+
+    cpdef bint is_canonical_hash_equal(self, Graph other, bint strict=True):
+        """
+        Return ``True`` if `other` has the same canonical hash as this graph,
+        which is a necessary condition for the graphs to be isomorphic. The
+        cached hashes are out of date if vertices or edges were modified in
+        place without calling :meth:`reset_canonical_hash`, so they are
+        recomputed before ``False`` is returned.
+        """
+        if self.get_canonical_hash(strict) == other.get_canonical_hash(strict):
+            return True
+        self.reset_canonical_hash()
+        other.reset_canonical_hash()
+        return self.get_canonical_hash(strict) == other.get_canonical_hash(strict)
+
+    cpdef reset_ring_cache(self):
+        """
+        Clear the cached results of ring perception. This is done
+        automatically when vertices or edges are added or removed; changes
+        to the vertices or edges themselves, such as bond orders, do not
+        affect the rings.
+        """
+        self._ring_cache = None
+
+    cdef list _get_cached_rings(self, object key):
+        """
+        Return a copy of the cached list of rings for `key`, or ``None`` if
+        it has not been computed since the graph was last modified.
+        """
+        cdef list rings
+        if self._ring_cache is None:
+            return None
+        rings = self._ring_cache.get(key)
+        if rings is None:
+            return None
+        return [ring[:] for ring in rings]
+
+    cdef _set_cached_rings(self, object key, list rings):
+        """
+        Store a copy of the list of `rings` for `key`, so that callers are
+        free to modify the returned lists.
+        """
+        if self._ring_cache is None:
+            self._ring_cache = {}
+        self._ring_cache[key] = [ring[:] for ring in rings]
+
+    def _compute_canonical_hash(self, bint strict):
+        """
+        Compute the value returned by :meth:`get_canonical_hash`. Each round
+        relabels every vertex by its previous label together with the sorted
+        (edge label, neighbor label) pairs, until the number of distinct vertex
+        labels stops increasing.
+        """
+        cdef dict labels, new_labels, edge_labels
+        cdef Vertex vertex, vertex2
+        cdef Edge edge
+        cdef int count, new_count, i
+
+        labels = {}
+        for vertex in self.vertices:
+            labels[vertex] = hash(self.get_vertex_hash_label(vertex, strict))
+        edge_labels = {}
+        for edge in self.get_all_edges():
+            edge_labels[edge] = hash(self.get_edge_hash_label(edge, strict))
+
+        count = len(set(labels.values()))
+        for i in range(len(self.vertices)):
+            new_labels = {}
+            for vertex in self.vertices:
+                new_labels[vertex] = hash((labels[vertex], tuple(sorted([
+                    (edge_labels[edge], labels[vertex2]) for vertex2, edge in vertex.edges.items()
+                ]))))
+            labels = new_labels
+            new_count = len(set(labels.values()))
+            if new_count <= count:
+                break
+            count = new_count
+
+        return hash((len(self.vertices), len(edge_labels), tuple(sorted(labels.values()))))
+
     cpdef sort_vertices(self, bint save_order=False):
         """
         Sort the vertices in the graph. This can make certain operations, e.g.
@@ -475,6 +646,7 @@ cdef class Graph(object):
         """
         cdef Vertex vertex
         cdef int index
+        cdef list order
 
         if save_order:
             self.ordered_vertices = self.vertices[:]
@@ -487,18 +659,30 @@ cdef class Graph(object):
         # If we need to sort then let's also update the connecitivities so
         # we're sure they are right, since the sorting labels depend on them
         self.update_connectivity_values()
+        order = self.vertices[:]
         self.vertices.sort(key=get_vertex_connectivity_value)
         for index, vertex in enumerate(self.vertices):
             vertex.sorting_label = index
+            if vertex is not order[index]:
+                # The order of the perceived rings depends on the vertex order
+                self.reset_ring_cache()
 
     cpdef restore_vertex_order(self):
         """
         reorder the vertices to what they were before sorting
         if you saved the order
         """
+        cdef int index
+        cdef Vertex vertex
+
         if not self.ordered_vertices or len(self.vertices) != len(self.ordered_vertices):
             raise ValueError('Number of vertices has changed cannot restore original vertex order')
         else:
+            for index, vertex in enumerate(self.ordered_vertices):
+                if vertex is not self.vertices[index]:
+                    # The order of the perceived rings depends on the vertex order
+                    self.reset_ring_cache()
+                    break
             self.vertices = self.ordered_vertices
 
     cpdef bint is_isomorphic(self, Graph other, dict initial_map=None, bint generate_initial_map=False, bint save_order=False, bint strict=True) except -2:
@@ -652,6 +836,10 @@ cdef class Graph(object):
         cdef set polycyclic_cycle
         cdef Vertex vertex
 
+        continuous_cycles = self._get_cached_rings('polycycles')
+        if continuous_cycles is not None:
+            return continuous_cycles
+
         sssr = self.get_smallest_set_of_smallest_rings()
         if not sssr:
             return []
@@ -682,6 +870,7 @@ cdef class Graph(object):
 
             # convert each set to a list
             continuous_cycles = [list(cycle) for cycle in continuous_cycles]
+            self._set_cached_rings('polycycles', continuous_cycles)
             return continuous_cycles
 
     cpdef list get_monocycles(self):
@@ -691,6 +880,10 @@ cdef class Graph(object):
         cdef list polycyclic_vertices, sssr, monocyclic_cycles, polycyclic_sssr
         cdef Vertex vertex
 
+        monocyclic_cycles = self._get_cached_rings('monocycles')
+        if monocyclic_cycles is not None:
+            return monocyclic_cycles
+
         sssr = self.get_smallest_set_of_smallest_rings()
         if not sssr:
             return []
@@ -713,6 +906,7 @@ cdef class Graph(object):
         monocyclic_cycles = sssr
         for cycle in polycyclic_sssr:
             monocyclic_cycles.remove(cycle)
+        self._set_cached_rings('monocycles', monocyclic_cycles)
         return monocyclic_cycles
 
     cpdef tuple get_disparate_cycles(self):
@@ -822,6 +1016,10 @@ cdef class Graph(object):
         cdef Vertex vertex, root_vertex
         cdef set set1, set2
 
+        cycle_list = self._get_cached_rings(('cycles', size))
+        if cycle_list is not None:
+            return cycle_list
+
         # Make a copy of the graph so we don't modify the original
         graph = self.copy(deep=True)
         vertices = graph.vertices[:]
@@ -901,7 +1099,9 @@ cdef class Graph(object):
             cycle_list[i] = [self.vertices[vertices.index(v)] for v in cycle_list[i]]
 
         #remove duplicates if there are more than 2 cycles:
-        if len(cycle_list) < 2: return cycle_list
+        if len(cycle_list) < 2:
+            self._set_cached_rings(('cycles', size), cycle_list)
+            return cycle_list
         cycle_set_list = [set(cycle_list[0])]
         for cycle1 in cycle_list[1:]:
             set1 = set(cycle1)
@@ -915,6 +1115,7 @@ cdef class Graph(object):
         #transform back to list of lists:
         cycle_set_list = [list(set1) for set1 in cycle_set_list]
 
+        self._set_cached_rings(('cycles', size), cycle_set_list)
         return cycle_set_list
 
     cpdef list get_all_simple_cycles_of_size(self, int size):
@@ -987,6 +1188,10 @@ cdef class Graph(object):
         cdef list sssr
         cdef object graph, data, cycle
 
+        sssr = self._get_cached_rings('sssr')
+        if sssr is not None:
+            return sssr
+
         graph = py_rdl.Graph.from_edges(
             self.get_all_edges(),
             _get_edge_vertex1,
@@ -1000,6 +1205,7 @@ cdef class Graph(object):
         for cycle in data.get_sssr():
             sssr.append(self.sort_cyclic_vertices([graph.get_node_for_index(i) for i in cycle.nodes]))
 
+        self._set_cached_rings('sssr', sssr)
         return sssr
 
     cpdef list get_relevant_cycles(self):
@@ -1020,6 +1226,10 @@ cdef class Graph(object):
         cdef list rc
         cdef object graph, data, cycle
 
+        rc = self._get_cached_rings('rc')
+        if rc is not None:
+            return rc
+
         graph = py_rdl.Graph.from_edges(
             self.get_all_edges(),
             _get_edge_vertex1,
@@ -1033,6 +1243,7 @@ cdef class Graph(object):
         for cycle in data.get_rcs():
             rc.append(self.sort_cyclic_vertices([graph.get_node_for_index(i) for i in cycle.nodes]))
 
+        self._set_cached_rings('rc', rc)
         return rc
 
     cpdef list sort_cyclic_vertices(self, list vertices):
@@ -31,6 +31,12 @@ cimport rmgpy.molecule.molecule as mol
 from cpython cimport bool
 ################################################################################
 
+cpdef object get_value_mask(list values)
+
+cpdef int get_bond_order_mask(list orders, double tolerance=?)
+
+################################################################################
+
 cdef class GroupAtom(Vertex):
 
     cdef public list atomtype
@@ -70,6 +76,8 @@ cdef class GroupAtom(Vertex):
 
     cpdef bint is_specific_case_of(self, Vertex other) except -2
 
+    cpdef tuple get_match_masks(self)
+
     cpdef bint is_surface_site(self) except -2
 
     cpdef bint is_bonded_to_surface(self) except -2
@@ -121,6 +129,8 @@ cdef class GroupBond(Edge):
 
     cpdef bint is_specific_case_of(self, Edge other) except -2
 
+    cpdef int get_match_masks(self)
+
     cpdef make_bond(self, mol.Molecule molecule, mol.Atom atom1, mol.Atom atom2)
 
 ################################################################################
@@ -178,6 +188,8 @@ cdef class Group(Graph):
 
     cpdef update_charge(self)
 
+    cpdef object get_edge_hash_label(self, Edge edge, bint strict=?)
+
     cpdef bint is_isomorphic(self, Graph other, dict initial_map=?, bint generate_initial_map=?, bint save_order=?, bint strict=?) except -2
 
     cpdef list find_isomorphism(self, Graph other, dict initial_map=?, bint save_order=?, bint strict=?)
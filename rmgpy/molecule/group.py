@@ -46,6 +46,53 @@ from rmgpy.molecule.element import PeriodicSystem
 from rmgpy.molecule.graph import Vertex, Edge, Graph
 
 
+################################################################################
+
+# The bond orders that can be encoded as bits when matching bonds against
+# group bonds, and the offset that maps small integers to nonnegative bits
+MATCH_BOND_ORDERS = (0, 0.05, 0.1, 1, 1.5, 2, 3, 4)
+MATCH_VALUE_OFFSET = 16
+
+
+def get_value_mask(values):
+    """
+    Return a bitmask with one bit set for each of the small integers in the
+    list `values`, such as radical electrons, lone pairs or charges, or
+    ``None`` if any value is out of range. An empty list is a wildcard, so
+    every bit of its mask is set.
+    """
+    cython.declare(value=object)
+    # The mask is a Python integer, as it can have more bits than a C int
+    if not values:
+        return -1
+    mask = 0
+    for value in values:
+        if not -MATCH_VALUE_OFFSET <= value < 64 - MATCH_VALUE_OFFSET:
+            return None
+        mask |= 1 << (value + MATCH_VALUE_OFFSET)
+    return mask
+
+
+def get_bond_order_mask(orders, tolerance=1e-6):
+    """
+    Return a bitmask with one bit set for each of the bond `orders`, or zero
+    if `orders` is empty or any order is not within `tolerance` of one of
+    :data:`MATCH_BOND_ORDERS`.
+    """
+    cython.declare(mask=cython.int, bit=cython.int, found=cython.bint)
+    mask = 0
+    for order in orders:
+        found = False
+        for bit, match_order in enumerate(MATCH_BOND_ORDERS):
+            if abs(order - match_order) <= tolerance:
+                mask |= 1 << bit
+                found = True
+                break
+        if not found:
+            return 0
+    return mask
+
+
 ################################################################################
 
 class GroupAtom(Vertex):
@@ -532,6 +579,31 @@ class GroupAtom(Vertex):
         # Otherwise self is in fact a specific case of other
         return True
 
+
+    def get_match_masks(self):
+        """
+        Return a tuple of bitmasks of the atom types, radical electrons, lone
+        pairs and charges allowed by this group atom, such that an atom is a
+        specific case of it if each of the bits from
+        :meth:`Atom.get_match_bits` overlaps the corresponding mask. Return
+        ``None`` if the group atom has constraints that are not encoded, i.e.
+        surface sites, morphologies or ring membership.
+        """
+        cython.declare(atomtype=AtomType)
+        if self.site or self.morphology or 'inRing' in self.props:
+            return None
+        atomtype_mask = 0
+        for atomtype in self.atomtype:
+            if atomtype.index < 0:
+                return None
+            atomtype_mask |= atomtype.specific_mask
+        radical_mask = get_value_mask(self.radical_electrons)
+        lone_pair_mask = get_value_mask(self.lone_pairs)
+        charge_mask = get_value_mask(self.charge)
+        if radical_mask is None or lone_pair_mask is None or charge_mask is None:
+            return None
+        return atomtype_mask, radical_mask, lone_pair_mask, charge_mask
+
     def is_surface_site(self):
         """
         Return ``True`` if the atom represents a surface site or ``False`` if not.
@@ -1096,6 +1168,15 @@ class GroupBond(Edge):
         # Otherwise self is in fact a specific case of other
         return True
 
+
+    def get_match_masks(self):
+        """
+        Return a bitmask of the bond orders allowed by this group bond, to be
+        compared with :meth:`Bond.get_match_bits`, or zero if any of the
+        orders cannot be encoded.
+        """
+        return get_bond_order_mask(self.order)
+
     def make_bond(self, molecule, atom1, atom2):
         """
         Creates a :class: Bond between atom1 and atom2 analogous to self
@@ -1145,7 +1226,7 @@ class Group(Graph):
         """
         A helper function used when pickling an object.
         """
-        return (Group, (self.vertices, self.props))
+        return (Group, (self.vertices, self.props, self.multiplicity, self.metal, self.facet))
 
     def _repr_png_(self):
         """
@@ -1192,6 +1273,8 @@ class Group(Graph):
     @atoms.setter
     def atoms(self, atoms):
         self.vertices = atoms
+        self.reset_canonical_hash()
+        self.reset_ring_cache()
 
     def add_atom(self, atom):
         """
@@ -1328,6 +1411,7 @@ class Group(Graph):
 
     def update(self):
 
+        self.reset_canonical_hash()
         self.update_connectivity_values()
         self.update_fingerprint()
 
@@ -1897,6 +1981,15 @@ class Group(Graph):
             if len(atom.radical_electrons) >= 1:
                 self.radicalCount += atom.radical_electrons[0]
 
+    def get_edge_hash_label(self, bond, strict=True):
+        """
+        Return the label of `bond` used to compute the canonical hash, which
+        is the set of allowed bond orders. Atom labels are not used because
+        group atoms with wildcard atom types can be equivalent to atoms with
+        different labels.
+        """
+        return tuple(sorted(set(bond.order)))
+
     def is_isomorphic(self, other, initial_map=None, generate_initial_map=False, save_order=False, strict=True):
         """
         Returns ``True`` if two graphs are isomorphic and ``False``
@@ -1912,6 +2005,8 @@ class Group(Graph):
         if not isinstance(other, Group):
             raise TypeError(
                 'Got a {0} object for parameter "other", when a Group object is required.'.format(other.__class__))
+        if not self.is_canonical_hash_equal(other):
+            return False
         # Do the isomorphism comparison
         return Graph.is_isomorphic(self, other, initial_map, generate_initial_map, save_order=save_order)
 
@@ -1932,6 +2027,8 @@ class Group(Graph):
         if not isinstance(other, Group):
             raise TypeError(
                 'Got a {0} object for parameter "other", when a Group object is required.'.format(other.__class__))
+        if not self.is_canonical_hash_equal(other):
+            return []
         # Do the isomorphism comparison
         return Graph.find_isomorphism(self, other, initial_map, save_order=save_order)
 
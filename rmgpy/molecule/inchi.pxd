@@ -45,9 +45,19 @@ cpdef bint _has_unexpected_lone_pairs(Molecule mol)
 
 cpdef list _get_unpaired_electrons(Molecule mol)
 
-cpdef list _compute_agglomerate_distance(list agglomerates, Molecule mol)
+cpdef list _get_atom_distances(Molecule mol, int index, dict atom_positions, dict distances)
 
-cpdef bint _is_valid_combo(list combo, Molecule mol, list distances)
+cpdef list _get_pair_distances(Molecule mol, list indices, dict atom_positions, dict distances)
+
+cpdef dict _count_distances(list distances)
+
+cpdef dict _take_distances(list row, list chosen, dict remaining)
+
+cpdef list _find_lowest_group(Molecule mol, list chosen, dict remaining, list e_layer, int start, list group, bint lower,
+                              dict atom_positions, dict distances)
+
+cpdef _find_lowest_singletons(Molecule mol, list chosen, dict remaining, list e_layers, list best,
+                              dict atom_positions, dict distances)
 
 cpdef list _find_lowest_u_layer(Molecule mol, list u_layer, list equivalent_atoms)
 
@@ -41,7 +41,7 @@ from rmgpy.exceptions import InchiException
 from rmgpy.molecule.adjlist import ConsistencyChecker
 from rmgpy.molecule.converter import to_rdkit_mol
 from rmgpy.molecule.molecule import Atom, Bond, Molecule
-from rmgpy.molecule.util import agglomerate, partition, generate_combo, swap
+from rmgpy.molecule.util import partition, swap
 
 # search for (*) PARENTHESES
 PARENTHESES = re.compile(r'\((.[^\(\)]*)\)')
@@ -367,54 +367,204 @@ def _get_unpaired_electrons(mol):
     return sorted(locations)
 
 
-def _compute_agglomerate_distance(agglomerates, mol):
+def _get_atom_distances(mol, index, atom_positions, distances):
     """
-    Iterates over a list of lists containing atom indices.
-    For each list the distances between the atoms is computed.
-    A list of distances is returned.
+    Returns a list of the number of bonds on the shortest path from the atom
+    with the 1-based `index` to each atom of the molecule, or -1 for the atoms
+    that cannot be reached.
 
+    The list is computed by a breadth-first search the first time and stored
+    in the dictionary `distances`, keyed by `index`. `atom_positions` maps the
+    ids of the atoms to their positions in the molecule.
     """
 
     cython.declare(
-        distances=list,
-        agglomerate=list,
-        dist=dict,
+        row=list,
+        frontier=list,
+        new_frontier=list,
+        distance=int,
+        position=int,
+        atom=Atom,
+        neighbor=Atom,
     )
 
-    distances = []
-    for agglomerate in agglomerates:
-        dist = pathfinder.compute_atom_distance(agglomerate, mol)
-        distances.append(dist)
+    row = distances.get(index)
+    if row is not None:
+        return row
 
-    return distances
+    row = [-1] * len(mol.atoms)
+    row[index - 1] = 0
+    frontier = [mol.atoms[index - 1]]
+    distance = 0
+    while frontier:
+        distance += 1
+        new_frontier = []
+        for atom in frontier:
+            for neighbor in atom.edges:
+                position = atom_positions[id(neighbor)]
+                if row[position] < 0:
+                    row[position] = distance
+                    new_frontier.append(neighbor)
+        frontier = new_frontier
 
+    distances[index] = row
+    return row
 
-def _is_valid_combo(combo, mol, distances):
+
+def _get_pair_distances(mol, indices, atom_positions, distances):
+    """
+    Returns the sorted list of the distances between each pair of the atoms
+    with the 1-based `indices`. A pair of atoms is only counted once, and a
+    single atom has a distance of 0 to itself.
+    """
+
+    cython.declare(
+        pairs=set,
+        i=int,
+        j=int,
+    )
+
+    if len(indices) == 1:
+        return [0]
+
+    pairs = set([(i, j) if i <= j else (j, i) for i, j in itertools.combinations(indices, 2)])
+    return sorted([_get_atom_distances(mol, i, atom_positions, distances)[j - 1] for i, j in pairs])
+
+
+def _count_distances(distances):
     """
-    Check if the combination of atom indices refers to
-    atoms that are adjacent in the molecule.
+    Returns a dictionary with the number of times each distance appears in
+    the list `distances`.
     """
+
     cython.declare(
-        agglomerates=list,
-        new_distances=list,
-        orig_dist=dict,
-        new_dist=dict,
+        counts=dict,
+        distance=int,
     )
 
-    # compute shortest path between atoms
-    agglomerates = agglomerate(combo)
-    new_distances = _compute_agglomerate_distance(agglomerates, mol)
+    counts = {}
+    for distance in distances:
+        counts[distance] = counts.get(distance, 0) + 1
+    return counts
 
-    # combo is valid if the distance is equal to the parameter distance
 
-    if len(distances) != len(new_distances): return False
+def _take_distances(row, chosen, remaining):
+    """
+    Removes the distances in `row` to each of the 1-based indices of the
+    `chosen` atoms from `remaining`, a dictionary with the number of pairs
+    still to be chosen at each distance, and returns the dictionary of removed
+    distances. If one of the distances is not available, `remaining` is left
+    unchanged and ``None`` is returned.
+    """
+
+    cython.declare(
+        used=dict,
+        other=int,
+        distance=int,
+    )
+
+    used = {}
+    for other in chosen:
+        distance = row[other - 1]
+        used[distance] = used.get(distance, 0) + 1
+        if used[distance] > remaining.get(distance, 0):
+            return None
+    for distance in used:
+        remaining[distance] -= used[distance]
+    return used
 
-    for orig_dist, new_dist in zip(distances, new_distances):
-        # only compare the values of the dictionaries:
-        if sorted(orig_dist.values()) != sorted(new_dist.values()):
-            return False
 
-    return True
+def _find_lowest_group(mol, chosen, remaining, e_layer, start, group, lower, atom_positions, distances):
+    """
+    Searches for the numerically lowest combination of atoms from the sorted
+    list of equivalent atoms `e_layer` that has the same distances between its
+    atoms as the unpaired electrons in the sorted list `group`, and is lower
+    than `group`.
+
+    The atoms are added to `chosen` in increasing order, starting at position
+    `start` of `e_layer`, so the combinations are tried in increasing
+    numerical order and the first one that is found is the lowest. `remaining`
+    holds the number of pairs still to be chosen at each distance, and a
+    branch is abandoned as soon as one of its distances is not available.
+    `lower` is ``True`` if `chosen` is already lower than the start of
+    `group`, otherwise the search stops at the first atom that is higher.
+
+    Returns the combination, or ``None`` if there is none lower than `group`.
+    """
+
+    cython.declare(
+        k=int,
+        position=int,
+        index=int,
+        distance=int,
+        used=dict,
+        result=list,
+    )
+
+    k = len(chosen)
+    if k == len(group):
+        return list(chosen) if lower else None
+
+    for position in range(start, len(e_layer) - len(group) + k + 1):
+        index = e_layer[position]
+        if not lower and index > group[k]:
+            break
+        used = _take_distances(_get_atom_distances(mol, index, atom_positions, distances), chosen, remaining)
+        if used is None:
+            continue
+        chosen.append(index)
+        result = _find_lowest_group(mol, chosen, remaining, e_layer, position + 1, group,
+                                    lower or index < group[k], atom_positions, distances)
+        chosen.pop()
+        for distance in used:
+            remaining[distance] += used[distance]
+        if result is not None:
+            return result
+
+    return None
+
+
+def _find_lowest_singletons(mol, chosen, remaining, e_layers, best, atom_positions, distances):
+    """
+    Searches for the numerically lowest choice of one atom from each of the
+    lists of equivalent atoms in `e_layers`, after the atoms `chosen` from the
+    lists before them, such that the distances between all of the chosen atoms
+    are the distances in `remaining`, a dictionary with the number of pairs
+    still to be chosen at each distance.
+
+    The lowest combination found is stored in `best`, which should initially
+    hold the original combination. A branch is abandoned as soon as one of its
+    distances is not available, or when even the lowest atoms of the remaining
+    lists would not result in a lower combination than `best`.
+    """
+
+    cython.declare(
+        k=int,
+        index=int,
+        distance=int,
+        used=dict,
+        bound=list,
+        e_layer=list,
+    )
+
+    k = len(chosen)
+    if k == len(e_layers):
+        best[:] = sorted(chosen)
+        return
+
+    for index in e_layers[k]:
+        bound = sorted(chosen + [index] + [e_layer[0] for e_layer in e_layers[k + 1:]])
+        if bound >= best:
+            # the atoms are sorted, so the later ones will not do better
+            break
+        used = _take_distances(_get_atom_distances(mol, index, atom_positions, distances), chosen, remaining)
+        if used is None:
+            continue
+        chosen.append(index)
+        _find_lowest_singletons(mol, chosen, remaining, e_layers, best, atom_positions, distances)
+        chosen.pop()
+        for distance in used:
+            remaining[distance] += used[distance]
 
 
 def _find_lowest_u_layer(mol, u_layer, equivalent_atoms):
@@ -427,9 +577,12 @@ def _find_lowest_u_layer(mol, u_layer, equivalent_atoms):
     Each possible combination is valid if and only if the distances between the atoms of the
     combination is identical to the distances between the original combination.
 
-    First, the algorithm partitions equivalent atoms that bear an unpaired electron.
-    Next, the combinations are generated, and for each combination it is verified whether
-    it pertains to a "valid" combination.
+    First, the algorithm partitions equivalent atoms that bear an unpaired electron. The
+    unpaired electrons in each set of equivalent atoms with more than one of them are
+    compared among themselves, and the sets with a single one are compared together, so
+    the lowest combination of each of these is found separately. The distances between
+    atoms are computed once for each atom by a breadth-first search, and combinations that
+    cannot be lower than the best one found so far are skipped.
 
     Returns a list of indices corresponding to the lowest combination of atom indices bearing
     unpaired electrons.
@@ -441,10 +594,12 @@ def _find_lowest_u_layer(mol, u_layer, equivalent_atoms):
         corresponding_E_layers=list,
         group=list,
         e_layer=list,
-        combos=list,
-        orig_agglomerates=list,
-        orig_distances=list,
-        selected_group=list,
+        singletons=list,
+        singleton_E_layers=list,
+        atom_positions=dict,
+        distances=dict,
+        remaining=dict,
+        best=list,
         combo=list,
     )
     if not equivalent_atoms:
@@ -454,30 +609,35 @@ def _find_lowest_u_layer(mol, u_layer, equivalent_atoms):
 
     grouped_electrons, corresponding_E_layers = partition(u_layer, equivalent_atoms)
 
-    # don't process atoms that do not belong to an equivalence layer
-    for group, e_layer in zip(grouped_electrons[:], corresponding_E_layers[:]):
+    for group, e_layer in zip(grouped_electrons, corresponding_E_layers):
+        if e_layer and len(set(group)) < len(group):
+            # only combinations of different atoms are considered, none of which has the distances
+            # of an equivalent atom with more than one unpaired electron, so no combination is valid
+            return sorted(u_layer)
+
+    atom_positions = {id(atom): i for i, atom in enumerate(mol.atoms)}
+    distances = {}
+    singletons = []
+    singleton_E_layers = []
+    for group, e_layer in zip(grouped_electrons, corresponding_E_layers):
         if not e_layer:
+            # don't process atoms that do not belong to an equivalence layer
             new_u_layer.extend(group)
-            grouped_electrons.remove(group)
-            corresponding_E_layers.remove(e_layer)
-
-    combos = generate_combo(grouped_electrons, corresponding_E_layers)
-    # compute original distance:
-    orig_agglomerates = agglomerate(grouped_electrons)
-    orig_distances = _compute_agglomerate_distance(orig_agglomerates, mol)
-
-    # deflate the list of lists to be able to numerically compare them
-    selected_group = sorted(itertools.chain.from_iterable(grouped_electrons))
-
-    # see if any of the combos is valid and results in a lower numerical combination than the original
-    for combo in combos:
-        if _is_valid_combo(combo, mol, orig_distances):
-            combo = sorted(itertools.chain.from_iterable(combo))
-            if combo < selected_group:
-                selected_group = combo
-
-    # add the minimized unpaired electron positions to the u-layer:
-    new_u_layer.extend(selected_group)
+        elif len(group) == 1:
+            singletons.extend(group)
+            singleton_E_layers.append(sorted(e_layer))
+        else:
+            group = sorted(group)
+            remaining = _count_distances(_get_pair_distances(mol, group, atom_positions, distances))
+            combo = _find_lowest_group(mol, [], remaining, sorted(e_layer), 0, group, False, atom_positions,
+                                       distances)
+            new_u_layer.extend(combo if combo is not None else group)
+
+    if singletons:
+        remaining = _count_distances(_get_pair_distances(mol, singletons, atom_positions, distances))
+        best = sorted(singletons)
+        _find_lowest_singletons(mol, [], remaining, singleton_E_layers, best, atom_positions, distances)
+        new_u_layer.extend(best)
 
     return sorted(new_u_layer)
 
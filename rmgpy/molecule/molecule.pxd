@@ -54,6 +54,8 @@ cdef class Atom(Vertex):
 
     cpdef bint is_specific_case_of(self, Vertex other) except -2
 
+    cpdef tuple get_match_bits(self)
+
     cpdef Vertex copy(self)
 
     cpdef bint is_hydrogen(self)
@@ -110,6 +112,8 @@ cdef class Bond(Edge):
 
     cpdef bint is_specific_case_of(self, Edge other) except -2
 
+    cpdef int get_match_bits(self)
+
     cpdef str get_order_str(self)
     
     cpdef set_order_str(self, str new_order)
@@ -202,6 +206,10 @@ cdef class Molecule(Graph):
 
     cpdef dict get_element_count(self)
 
+    cpdef object get_vertex_hash_label(self, Vertex vertex, bint strict=?)
+
+    cpdef object get_edge_hash_label(self, Edge edge, bint strict=?)
+
     cpdef bint is_isomorphic(self, Graph other, dict initial_map=?, bint generate_initial_map=?, bint save_order=?, bint strict=?) except -2
 
     cpdef list find_isomorphism(self, Graph other, dict initial_map=?, bint save_order=?, bint strict=?)
@@ -247,7 +255,7 @@ cdef class Molecule(Graph):
 
     cpdef double calculate_cpinf(self) except -1
 
-    cpdef update_atomtypes(self, bint log_species=?, bint raise_exception=?)
+    cpdef update_atomtypes(self, bint log_species=?, bint raise_exception=?, list atoms=?)
 
     cpdef bint is_radical(self) except -2
 
@@ -261,7 +269,7 @@ cdef class Molecule(Graph):
 
     cpdef list generate_resonance_structures(self, bint keep_isomorphic=?, bint filter_structures=?, bint save_order=?)
 
-    cpdef update_lone_pairs(self)
+    cpdef update_lone_pairs(self, list atoms=?)
 
     cpdef dict saturate_radicals(self, bint raise_atomtype_exception=?)
 
@@ -38,6 +38,7 @@ describe the corresponding atom or bond.
 import itertools
 import logging
 import os
+import zlib
 from collections import OrderedDict, defaultdict
 from copy import deepcopy
 from urllib.parse import quote
@@ -331,6 +332,22 @@ class Atom(Vertex):
                 return False
             return True
 
+    def get_match_bits(self):
+        """
+        Return a tuple of integers with one bit set for the atom type, radical
+        electrons, lone pairs and charge of this atom, to be compared with
+        :meth:`GroupAtom.get_match_masks`, or ``None`` if the atom cannot be
+        encoded, e.g. because its atom type has not been set.
+        """
+        if self.atomtype is None or self.atomtype.index < 0:
+            return None
+        radical_bit = gr.get_value_mask([self.radical_electrons])
+        lone_pair_bit = gr.get_value_mask([self.lone_pairs])
+        charge_bit = gr.get_value_mask([self.charge])
+        if radical_bit is None or lone_pair_bit is None or charge_bit is None:
+            return None
+        return self.atomtype.match_bit, radical_bit, lone_pair_bit, charge_bit
+
     def copy(self):
         """
         Generate a deep copy of the current atom. Modifying the
@@ -351,7 +368,7 @@ class Atom(Vertex):
         a.morphology = self.morphology
         a.coords = self.coords[:]
         a.id = self.id
-        a.props = deepcopy(self.props)
+        a.props = deepcopy(self.props) if self.props else {}
         return a
 
     def is_hydrogen(self):
@@ -716,6 +733,15 @@ class Bond(Edge):
         # There are no generic bond types, so is_specific_case_of is the same as equivalent
         return self.equivalent(other)
 
+    def get_match_bits(self):
+        """
+        Return an integer with one bit set for the order of this bond, to be
+        compared with :meth:`GroupBond.get_match_masks`, or zero if the order
+        cannot be encoded. The tolerance is tighter than that of
+        :meth:`is_order` so that the bits agree with :meth:`equivalent`.
+        """
+        return gr.get_bond_order_mask([self.order], 9e-5)
+
     def get_order_str(self):
         """
         returns a string representing the bond order
@@ -1064,6 +1090,8 @@ class Molecule(Graph):
     @atoms.setter
     def atoms(self, atoms):
         self.vertices = atoms
+        self.reset_canonical_hash()
+        self.reset_ring_cache()
 
     @property
     def fingerprint(self):
@@ -1212,27 +1240,36 @@ class Molecule(Graph):
         Placing hydrogens last during sorting ensures that functions with hydrogen
         removal work properly.
         """
-        cython.declare(vertex=Vertex, a=Atom, index=int)
+        cython.declare(vertex=Vertex, a=Atom, index=int, order=list)
         for vertex in self.vertices:
             if vertex.sorting_label < 0:
                 self.update_connectivity_values()
                 break
+        order = self.vertices[:]
         self.atoms.sort(reverse=True)
         for index, vertex in enumerate(self.vertices):
             vertex.sorting_label = index
+            if vertex is not order[index]:
+                # The order of the perceived rings depends on the atom order
+                self.reset_ring_cache()
 
-    def update(self, log_species=True, raise_atomtype_exception=True, sort_atoms=True):
+    def update(self, log_species=True, raise_atomtype_exception=True, sort_atoms=True, atoms=None):
         """
         Update the charge and atom types of atoms.
         Update multiplicity, and sort atoms (if ``sort_atoms`` is ``True``)
         Does not necessarily update the connectivity values (which are used in isomorphism checks)
         If you need that, call update_connectivity_values()
+
+        If a list of `atoms` is given, only the charges and atom types of
+        those atoms are updated, e.g. because the bonds and electrons of the
+        other atoms have not changed since their atom types were determined.
         """
 
-        for atom in self.atoms:
+        self.reset_canonical_hash()
+        for atom in (self.atoms if atoms is None else atoms):
             atom.update_charge()
 
-        self.update_atomtypes(log_species=log_species, raise_exception=raise_atomtype_exception)
+        self.update_atomtypes(log_species=log_species, raise_exception=raise_atomtype_exception, atoms=atoms)
         self.update_multiplicity()
         if sort_atoms:
             self.sort_atoms()
@@ -1438,7 +1475,7 @@ class Molecule(Graph):
                     self.add_bond(bond)
         self.update_atomtypes(raise_exception=raise_atomtype_exception)
 
-    def update_atomtypes(self, log_species=True, raise_exception=True):
+    def update_atomtypes(self, log_species=True, raise_exception=True, atoms=None):
         """
         Iterate through the atoms in the structure, checking their atom types
         to ensure they are correct (i.e. accurately describe their local bond
@@ -1447,12 +1484,17 @@ class Molecule(Graph):
         If `raise_exception` is `False`, then the generic atomtype 'R' will
         be prescribed to any atom when get_atomtype fails. Currently used for
         resonance hybrid atom types.
+
+        If a list of `atoms` is given, only those atoms are updated.
         """
+        if atoms is None:
+            atoms = self.vertices
+
         # Because we use lonepairs to match atomtypes and default is -100 when unspecified,
         # we should update before getting the atomtype.
-        self.update_lone_pairs()
+        self.update_lone_pairs(atoms)
 
-        for atom in self.vertices:
+        for atom in atoms:
             try:
                 atom.atomtype = get_atomtype(atom, atom.edges)
             except AtomTypeError:
@@ -1532,6 +1574,30 @@ class Molecule(Graph):
 
         return element_count
 
+    def get_vertex_hash_label(self, atom, strict=True):
+        """
+        Return the label of `atom` used to compute the canonical hash. The
+        strict label contains the element, charge, radical electrons, lone
+        pairs, site and morphology, while the non-strict label only contains
+        the element, matching :meth:`Atom.equivalent`.
+        """
+        element = atom.element
+        label = (element.number, element.isotope, zlib.crc32(element.symbol.encode()))
+        if strict:
+            label = label + (atom.charge, atom.radical_electrons, atom.lone_pairs,
+                             zlib.crc32((atom.site or '').encode()), zlib.crc32((atom.morphology or '').encode()))
+        return label
+
+    def get_edge_hash_label(self, bond, strict=True):
+        """
+        Return the label of `bond` used to compute the canonical hash. The
+        strict label is the rounded bond order; bonds are not distinguished
+        in the non-strict case.
+        """
+        if strict:
+            return round(bond.order, 3)
+        return 0
+
     def is_isomorphic(self, other, initial_map=None, generate_initial_map=False, save_order=False, strict=True):
         """
         Returns :data:`True` if two graphs are isomorphic and :data:`False`
@@ -1566,6 +1632,10 @@ class Molecule(Graph):
         #check facet
         if self.facet != other.facet:
             return False
+        # Compare the canonical hashes, which are also a necessary condition
+        # but take the atom and bond attributes into account
+        if not self.is_canonical_hash_equal(other, strict):
+            return False
         # if given an initial map, ensure that it's valid.
         if initial_map:
             if not self.is_mapping_valid(other, initial_map, equivalent=True):
@@ -1609,6 +1679,8 @@ class Molecule(Graph):
         #check facet
         if self.facet != other.facet:
             return []
+        if not self.is_canonical_hash_equal(other, strict):
+            return []
         # Do the isomorphism comparison
         result = Graph.find_isomorphism(self, other, initial_map, save_order=save_order, strict=strict)
         return result
@@ -2204,11 +2276,13 @@ class Molecule(Graph):
     def calculate_symmetry_number(self):
         """
         Return the symmetry number for the structure. The symmetry number
-        includes both external and internal modes.
+        includes both external and internal modes. Symmetry numbers are cached
+        in :data:`rmgpy.molecule.cache.symmetry_number_cache`.
         """
+        from rmgpy.molecule.cache import symmetry_number_cache
         from rmgpy.molecule.symmetry import calculate_symmetry_number
         self.update_connectivity_values()  # for consistent results
-        self.symmetry_number = calculate_symmetry_number(self)
+        self.symmetry_number = symmetry_number_cache.get_symmetry_number(self, calculate_symmetry_number)
         return self.symmetry_number
 
     def is_radical(self):
@@ -2296,13 +2370,15 @@ class Molecule(Graph):
                 radical_atoms_list.append(atom)
         return radical_atoms_list
 
-    def update_lone_pairs(self):
+    def update_lone_pairs(self, atoms=None):
         """
-        Iterate through the atoms in the structure and calculate the
-        number of lone electron pairs, assuming a neutral molecule.
+        Iterate through the atoms in the structure, or only the given list of
+        `atoms`, and calculate the number of lone electron pairs, assuming a
+        neutral molecule.
         """
         cython.declare(atom1=Atom, atom2=Atom, bond12=Bond, order=float)
-        for atom1 in self.vertices:
+        self.reset_canonical_hash()
+        for atom1 in (self.vertices if atoms is None else atoms):
             if atom1.is_hydrogen() or atom1.is_surface_site():
                 atom1.lone_pairs = 0
             else:
@@ -2337,6 +2413,7 @@ class Molecule(Graph):
 
         saturator = Saturator()
         saturator.saturate(self.atoms)
+        self.reset_canonical_hash()
         if update: self.update()
 
     def saturate_radicals(self, raise_atomtype_exception=True):
@@ -2689,6 +2766,7 @@ class Molecule(Graph):
         Kekulizes an aromatic molecule.
         """
         kekulize(self)
+        self.reset_canonical_hash()
 
     def assign_atom_ids(self):
         """
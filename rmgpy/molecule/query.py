@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains classes for comparing one molecule (or set of resonance
+structures) against many molecules by isomorphism. A :class:`MoleculeQuery`
+computes the invariants of its molecules once, and a
+:class:`MoleculeCollection` stores the target molecules indexed by the same
+invariants, so that only targets with identical invariants are checked by
+full isomorphism.
+"""
+
+
+def get_molecule_key(molecule, strict=True):
+    """
+    Return the key of `molecule` used to index molecules for isomorphism
+    checks. Two molecules which are isomorphic (ignoring electrons if `strict`
+    is ``False``) always have the same key.
+    """
+    return (molecule.fingerprint, molecule.multiplicity, molecule.metal, molecule.facet,
+            molecule.get_canonical_hash(strict))
+
+
+class MoleculeCollection(object):
+    """
+    A collection of target molecules, each associated with an item that is
+    returned when the molecule is matched, e.g. the species or database entry
+    that contains it. The attributes are:
+
+    =================== =============== ========================================
+    Attribute           Type            Description
+    =================== =============== ========================================
+    `strict`            ``bool``        ``False`` if the molecules are compared ignoring electrons
+    `index`             ``dict``        Lists of (position, molecule, item) keyed by :func:`get_molecule_key`
+    =================== =============== ========================================
+
+    Items are returned in the order in which they were first added.
+    """
+
+    def __init__(self, strict=True):
+        self.strict = strict
+        self.index = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return '<MoleculeCollection with {0:d} molecules and {1:d} keys>'.format(self._size, len(self.index))
+
+    @classmethod
+    def from_species(cls, species_list, strict=True):
+        """
+        Return a collection of the molecules of every species in
+        `species_list`, with the species as the items.
+        """
+        collection = cls(strict=strict)
+        for species in species_list:
+            collection.add_species(species)
+        return collection
+
+    def add(self, molecule, item=None):
+        """
+        Add `molecule` to the collection, associated with `item`, which
+        defaults to the molecule itself.
+        """
+        key = get_molecule_key(molecule, self.strict)
+        self.index.setdefault(key, []).append((self._size, molecule, molecule if item is None else item))
+        self._size += 1
+
+    def add_species(self, species, item=None):
+        """
+        Add every molecule of `species` to the collection, associated with
+        `item`, which defaults to the species itself.
+        """
+        for molecule in species.molecule:
+            self.add(molecule, species if item is None else item)
+
+    def get_candidates(self, key):
+        """
+        Return the list of (position, molecule, item) tuples with the given
+        `key`.
+        """
+        return self.index.get(key, [])
+
+
+class MoleculeQuery(object):
+    """
+    A molecule, or list of molecules such as the resonance structures of a
+    species, prepared for comparison with the molecules of one or more
+    :class:`MoleculeCollection` objects. A target matches if it is isomorphic
+    to any of the query molecules. The attributes are:
+
+    =================== =============== ========================================
+    Attribute           Type            Description
+    =================== =============== ========================================
+    `molecules`         ``list``        The query molecules
+    `strict`            ``bool``        ``False`` if the molecules are compared ignoring electrons
+    `keys`              ``list``        The :func:`get_molecule_key` of each query molecule
+    =================== =============== ========================================
+
+    """
+
+    def __init__(self, molecules, strict=True):
+        if not isinstance(molecules, (list, tuple)):
+            molecules = [molecules]
+        self.molecules = list(molecules)
+        self.strict = strict
+        self.keys = [get_molecule_key(molecule, strict) for molecule in self.molecules]
+
+    def __repr__(self):
+        return '<MoleculeQuery of {0!r}>'.format(self.molecules)
+
+    def find_matches(self, collection, first=False):
+        """
+        Return a list of (item, molecule) tuples for the items of `collection`
+        with a molecule isomorphic to one of the query molecules, where
+        `molecule` is the first query molecule that matched. Each item is
+        returned once, in the order of the collection. If `first` is ``True``,
+        stop after the first match.
+        """
+        if collection.strict != self.strict:
+            raise ValueError('Cannot search a collection with strict={0} using a query with strict={1}.'.format(
+                collection.strict, self.strict))
+        candidates = []
+        for query_index, key in enumerate(self.keys):
+            for position, target, item in collection.get_candidates(key):
+                candidates.append((position, query_index, target, item))
+        candidates.sort(key=lambda candidate: candidate[:2])
+
+        matches = []
+        matched = set()
+        for position, query_index, target, item in candidates:
+            if id(item) in matched:
+                continue
+            molecule = self.molecules[query_index]
+            if molecule.is_isomorphic(target, strict=self.strict):
+                matches.append((item, molecule))
+                if first:
+                    break
+                matched.add(id(item))
+        return matches
+
+    def find_in(self, collection, first=False):
+        """
+        Return the list of items of `collection` with a molecule isomorphic to
+        one of the query molecules, in the order of the collection. If `first`
+        is ``True``, return at most one item.
+        """
+        return [item for item, molecule in self.find_matches(collection, first=first)]
+
+    def is_in(self, collection):
+        """
+        Return ``True`` if `collection` contains a molecule isomorphic to one
+        of the query molecules, or ``False`` otherwise.
+        """
+        return len(self.find_matches(collection, first=True)) > 0
@@ -34,7 +34,9 @@ cpdef dict analyze_molecule(Graph mol, bint save_order=?)
 
 cpdef list generate_resonance_structures(Graph mol, bint clar_structures=?, bint keep_isomorphic=?, bint filter_structures=?, bint save_order=?)
 
-cpdef list _generate_resonance_structures(list mol_list, list method_list, bint keep_isomorphic=?, bint copy=?, bint save_order=?)
+cpdef list _generate_resonance_structure_list(Graph mol, bint clar_structures=?, bint keep_isomorphic=?, bint filter_structures=?, bint save_order=?)
+
+cpdef list _generate_resonance_structures(list mol_list, list method_list, bint keep_isomorphic=?, bint copy=?, bint save_order=?, bint filter_structures=?)
 
 cpdef list generate_allyl_delocalization_resonance_structures(Graph mol)
 
@@ -60,6 +62,10 @@ cpdef list generate_kekule_structure(Graph mol)
 
 cpdef list generate_clar_structures(Graph mol, bint save_order=?)
 
+cpdef tuple _get_clar_variables(Graph molecule, bint save_order=?)
+
+cpdef list _clar_enumeration(Graph mol, bint save_order=?)
+
 cpdef list _clar_optimization(Graph mol, list constraints=?, max_num=?, save_order=?)
 
 cpdef list _clar_transformation(Graph mol, list aromatic_ring)
@@ -59,10 +59,18 @@ import rmgpy.molecule.filtration as filtration
 import rmgpy.molecule.pathfinder as pathfinder
 from rmgpy.exceptions import ILPSolutionError, KekulizationError, AtomTypeError, ResonanceError
 from rmgpy.molecule.adjlist import Saturator
+from rmgpy.molecule.cache import resonance_cache
 from rmgpy.molecule.graph import Vertex
 from rmgpy.molecule.kekulize import kekulize
 from rmgpy.molecule.molecule import Atom, Bond, Molecule
-from rmgpy.molecule.fragment import CuttingLabel
+from rmgpy.molecule.fragment import CuttingLabel, Fragment
+from rmgpy.molecule.query import get_molecule_key
+
+# The maximum number of search steps used to enumerate Clar structures before falling back to the MILP
+CLAR_MAX_STEPS = 100000
+# The maximum number of ring system topologies whose Clar solutions are cached
+CLAR_CACHE_SIZE = 1000
+_clar_solution_cache = {}
 
 
 def populate_resonance_algorithms(features=None):
@@ -172,8 +180,10 @@ def generate_resonance_structures(mol, clar_structures=True, keep_isomorphic=Fal
       All are kept regardless of aromaticity because the radical is more likely to delocalize into the ring.
     - Stable polycyclic aromatic species: Clar structures are generated
     - Stable monocyclic aromatic species: Kekule structures are generated
+
+    The generated structures are stored in :data:`rmgpy.molecule.cache.resonance_cache`, so that later calls for an
+    isomorphic structure return copies of them, with the atom labels and ids of the new input molecule.
     """
-    cython.declare(mol_list=list, new_mol_list=list, features=dict, method_list=list)
 
     # Check that mol is a valid structure in terms of atomTypes and net charge. Since SMILES with hypervalance
     # heteroatoms are not always read correctly, print a suggestion to input the structure using an adjList.
@@ -195,6 +205,24 @@ def generate_resonance_structures(mol, clar_structures=True, keep_isomorphic=Fal
         raise ResonanceError('Can only generate resonance structures for reactive molecules! Got the following '
                              'unreactive structure:\n{0}Reactive = {1}'.format(mol.to_adjacency_list(), mol.reactive))
 
+    # Structures generated with keep_isomorphic=True depend on the atom ids, so they can only be reused if the ids
+    # are unique, and structures generated with save_order=True must not be reordered by the isomorphism check
+    if (resonance_cache.enabled and not save_order and not isinstance(mol, Fragment)
+            and (not keep_isomorphic or mol.atom_ids_valid())):
+        return resonance_cache.generate(mol, _generate_resonance_structure_list, clar_structures=clar_structures,
+                                        keep_isomorphic=keep_isomorphic, filter_structures=filter_structures)
+    return _generate_resonance_structure_list(mol, clar_structures=clar_structures, keep_isomorphic=keep_isomorphic,
+                                              filter_structures=filter_structures, save_order=save_order)
+
+
+def _generate_resonance_structure_list(mol, clar_structures=True, keep_isomorphic=False, filter_structures=True,
+                                       save_order=False):
+    """
+    Generate and return all of the resonance structures for the input molecule, which has already been updated and
+    checked by :func:`generate_resonance_structures`. The arguments are the same as for that function.
+    """
+    cython.declare(mol_list=list, new_mol_list=list, features=dict, method_list=list)
+
     mol_list = [mol]
 
     # Analyze molecule
@@ -230,23 +258,23 @@ def generate_resonance_structures(mol, clar_structures=True, keep_isomorphic=Fal
         if features['is_radical'] and not features['is_aryl_radical']:
             _generate_resonance_structures(mol_list, [generate_kekule_structure],
                                            keep_isomorphic=keep_isomorphic,
-                                           save_order=save_order)
+                                           save_order=save_order, filter_structures=filter_structures)
             _generate_resonance_structures(mol_list, [generate_allyl_delocalization_resonance_structures],
                                            keep_isomorphic=keep_isomorphic,
-                                           save_order=save_order)
+                                           save_order=save_order, filter_structures=filter_structures)
         if features['isPolycyclicAromatic'] and clar_structures:
             _generate_resonance_structures(mol_list, [generate_clar_structures],
                                            keep_isomorphic=keep_isomorphic,
-                                           save_order=save_order)
+                                           save_order=save_order, filter_structures=filter_structures)
         else:
             _generate_resonance_structures(mol_list, [generate_aromatic_resonance_structure],
                                            keep_isomorphic=keep_isomorphic,
-                                           save_order=save_order)
+                                           save_order=save_order, filter_structures=filter_structures)
 
     # Generate remaining resonance structures
     method_list = populate_resonance_algorithms(features)
     _generate_resonance_structures(mol_list, method_list, keep_isomorphic=keep_isomorphic,
-                                   save_order=save_order)
+                                   save_order=save_order, filter_structures=filter_structures)
 
     if filter_structures:
         return filtration.filter_structures(mol_list, features=features, save_order=save_order)
@@ -255,7 +283,7 @@ def generate_resonance_structures(mol, clar_structures=True, keep_isomorphic=Fal
 
 
 def _generate_resonance_structures(mol_list, method_list, keep_isomorphic=False, copy=False,
-                                   save_order=False):
+                                   save_order=False, filter_structures=False):
     """
     Iteratively generate all resonance structures for a list of starting molecules using the specified methods.
 
@@ -266,16 +294,37 @@ def _generate_resonance_structures(mol_list, method_list, keep_isomorphic=False,
                             if True, only remove structures that give is_identical=True
         copy                if False, append new resonance structures to input list (default)
                             if True, make a new list with all of the resonance structures
+        filter_structures   if True, the structures will be filtered afterwards, so structures which deviate
+                            too much from the octet rule to be expanded or kept are discarded as they are found
+                            if False, keep all of the resonance structures (default)
     """
     cython.declare(index=cython.int, molecule=Graph, new_mol_list=list, new_mol=Graph, mol=Graph,
-                   input_charge=cython.int, x=Vertex)
+                   input_charge=cython.int, x=Vertex, octet_deviation_list=list, charge_span_list=list,
+                   structure_index=dict, key=tuple, i=cython.int, prune=cython.bint)
 
     if copy:
         # Make a copy of the list so we don't modify the input list
         mol_list = mol_list[:]
 
-    min_octet_deviation = min(filtration.get_octet_deviation_list(mol_list))
-    min_charge_span = min(filtration.get_charge_span_list(mol_list))
+    # The octet deviation and charge span of each structure are computed once, when it is added to the list,
+    # and the structures are indexed by their molecule key so that each new structure is only compared
+    # with the structures which may be isomorphic to it
+    octet_deviation_list = filtration.get_octet_deviation_list(mol_list)
+    charge_span_list = filtration.get_charge_span_list(mol_list)
+    structure_index = {}
+    for mol in mol_list:
+        structure_index.setdefault(get_molecule_key(mol), []).append(mol)
+
+    min_octet_deviation = min(octet_deviation_list)
+    min_charge_span = min(charge_span_list)
+
+    # A structure can be discarded if it will not be expanded and a structure with a lower octet deviation
+    # will be kept. Structures with a different net charge are removed below, so they are not counted, and
+    # nothing is discarded for adsorbates, which may lose structures for other reasons.
+    prune = filter_structures and not mol_list[0].contains_surface_site()
+    input_charge = mol_list[0].get_net_charge()
+    min_kept_octet_deviation = min([octet_deviation_list[i] for i in range(len(mol_list))
+                                    if mol_list[i].get_net_charge() == input_charge])
 
     # Iterate over resonance structures
     index = 0
@@ -288,8 +337,8 @@ def _generate_resonance_structures(mol_list, method_list, keep_isomorphic=False,
         # Sometimes rearranging the structure requires an additional higher charge span structure, so allow
         # structures with a +1 higher charge span compared to the minimum, e.g., [O-]S#S[N+]#N
         # Filtration is always called.
-        octet_deviation = filtration.get_octet_deviation(molecule)
-        charge_span = molecule.get_charge_span()
+        octet_deviation = octet_deviation_list[index]
+        charge_span = charge_span_list[index]
         if octet_deviation <= min_octet_deviation + 2 and charge_span <= min_charge_span + 1:
             for method in method_list:
                 new_mol_list.extend(method(molecule))
@@ -302,7 +351,8 @@ def _generate_resonance_structures(mol_list, method_list, keep_isomorphic=False,
 
         for new_mol in new_mol_list:
             # Append to structure list if unique
-            for mol in mol_list:
+            key = get_molecule_key(new_mol)
+            for mol in structure_index.get(key, []):
                 if not keep_isomorphic and mol.is_isomorphic(new_mol,
                                                              initial_map=None,
                                                              generate_initial_map=False,
@@ -313,14 +363,31 @@ def _generate_resonance_structures(mol_list, method_list, keep_isomorphic=False,
                 elif keep_isomorphic and mol.is_identical(new_mol):
                     break
             else:
+                structure_index.setdefault(key, []).append(new_mol)
+                octet_deviation = filtration.get_octet_deviation(new_mol)
+                if prune:
+                    if (octet_deviation > min_octet_deviation + 2
+                            and octet_deviation > min_kept_octet_deviation):
+                        # The minimal octet deviations can only decrease, so this structure will neither be
+                        # expanded nor survive the filtration. It stays in the index so it is not checked again.
+                        continue
+                    if octet_deviation < min_kept_octet_deviation and new_mol.get_net_charge() == input_charge:
+                        min_kept_octet_deviation = octet_deviation
                 mol_list.append(new_mol)
+                octet_deviation_list.append(octet_deviation)
+                charge_span_list.append(new_mol.get_charge_span())
 
         # Move to the next resonance structure
         index += 1
 
-    # check net charge
-    input_charge = mol_list[0].get_net_charge()
+    if prune:
+        # Discard the structures which were added before the minimal octet deviations decreased, except for
+        # the original structure, which is needed by the filtration
+        mol_list[1:] = [mol_list[i] for i in range(1, len(mol_list))
+                        if octet_deviation_list[i] <= min_octet_deviation + 2
+                        or octet_deviation_list[i] <= min_kept_octet_deviation]
 
+    # check net charge
     for mol in mol_list[1:]:
         if mol.get_net_charge() != input_charge:
             mol_list.remove(mol)
@@ -915,11 +982,14 @@ def generate_clar_structures(mol, save_order=False):
     if not mol.atom_ids_valid():
         mol.assign_atom_ids()
 
-    try:
-        output = _clar_optimization(mol, save_order=save_order)
-    except ILPSolutionError:
-        # The optimization algorithm did not work on the first iteration
-        return []
+    output = _clar_enumeration(mol, save_order=save_order)
+    if output is None:
+        # The ring system is too large to enumerate the solutions, so solve the MILP instead
+        try:
+            output = _clar_optimization(mol, save_order=save_order)
+        except ILPSolutionError:
+            # The optimization algorithm did not work on the first iteration
+            return []
 
     mol_list = []
 
@@ -955,6 +1025,215 @@ def generate_clar_structures(mol, save_order=False):
     return mol_list
 
 
+def _get_clar_variables(molecule, save_order=False):
+    """
+    Get the variables of the Clar structure problem for `molecule`, which are returned as a tuple of:
+        [0] List of aromatic rings, sorted by atom IDs
+        [1] List of atoms in the aromatic rings, sorted by ID
+        [2] List of bonds involving the ring atoms, ignoring bonds to hydrogen
+        [3] List of fixed values of the exocyclic bonds (1 if double and 0 otherwise), or ``None`` for other bonds
+    """
+    cython.declare(aromatic_rings=list, atoms=list, bonds=list, exo=list)
+
+    aromatic_rings = molecule.get_aromatic_rings(save_order=save_order)[0]
+    aromatic_rings.sort(key=lambda x: sum([atom.id for atom in x]))
+
+    # Get list of atoms that are in rings
+    atoms = set()
+    for ring in aromatic_rings:
+        atoms.update(ring)
+    atoms = sorted(atoms, key=lambda x: x.id)
+
+    # Get list of bonds involving the ring atoms, ignoring bonds to hydrogen
+    bonds = set()
+    for atom in atoms:
+        bonds.update([atom.bonds[key] for key in atom.bonds.keys() if key.is_non_hydrogen()])
+    bonds = sorted(bonds, key=lambda x: (x.atom1.id, x.atom2.id))
+
+    # Identify exocyclic bonds, and save their bond orders
+    exo = []
+    for bond in bonds:
+        if bond.atom1 not in atoms or bond.atom2 not in atoms:
+            if bond.is_double():
+                exo.append(1)
+            else:
+                exo.append(0)
+        else:
+            exo.append(None)
+
+    return aromatic_rings, atoms, bonds, exo
+
+
+def _clar_enumeration(mol, save_order=False):
+    """
+    Find the Clar structures of a molecule combinatorially, as an alternative to :func:`_clar_optimization` which
+    returns the same solutions in the same form, but without solving a series of MILPs. Rings are assigned as sextets
+    by choosing sets of disjoint aromatic rings, largest first, and keeping those sets for which the remaining ring
+    atoms can be assigned double bonds.
+
+    Solutions are cached by the topology of the ring system, given by the rings, bonds and exocyclic bond orders in
+    terms of atom indices. Returns ``None`` if the ring system is too large to be enumerated quickly, in which case the
+    MILP should be used instead.
+    """
+    cython.declare(molecule=Graph, new_mol=Graph, aromatic_rings=list, atoms=list, bonds=list, exo=list,
+                   indices=dict, positions=dict, output=list, solutions=list, solution=list)
+
+    # Make a copy of the molecule so we don't destroy the original
+    molecule = mol.copy(deep=True)
+
+    aromatic_rings, atoms, bonds, exo = _get_clar_variables(molecule, save_order=save_order)
+
+    if not aromatic_rings:
+        return []
+
+    indices = {atom: index for index, atom in enumerate(atoms)}
+    key = (
+        len(atoms),
+        tuple([tuple(sorted([indices[atom] for atom in ring])) for ring in aromatic_rings]),
+        tuple([(indices[bond.atom1], indices[bond.atom2]) if exo[index] is None
+               else (indices.get(bond.atom1, indices.get(bond.atom2)), -1) for index, bond in enumerate(bonds)]),
+        tuple(exo),
+    )
+    try:
+        solutions = _clar_solution_cache[key]
+    except KeyError:
+        solutions = _enumerate_clar_solutions(key[0], list(key[1]), list(key[2]), exo)
+        if solutions is None:
+            return None
+        if len(_clar_solution_cache) >= CLAR_CACHE_SIZE:
+            _clar_solution_cache.clear()
+        _clar_solution_cache[key] = solutions
+
+    # Each solution is applied to its own copy of the molecule
+    positions = {atom: index for index, atom in enumerate(molecule.vertices)}
+    output = []
+    for solution in solutions:
+        if not output:
+            output.append((molecule, aromatic_rings, bonds, solution[:]))
+            continue
+        new_mol = molecule.copy(deep=True)
+        output.append((
+            new_mol,
+            [[new_mol.vertices[positions[atom]] for atom in ring] for ring in aromatic_rings],
+            [new_mol.get_bond(new_mol.vertices[positions[bond.atom1]], new_mol.vertices[positions[bond.atom2]])
+             for bond in bonds],
+            solution[:],
+        ))
+    return output
+
+
+def _enumerate_clar_solutions(n_atoms, rings, bonds, exo, max_steps=CLAR_MAX_STEPS):
+    """
+    Enumerate the Clar solutions of the problem solved by :func:`_clar_optimization`, given the number of ring atoms,
+    the rings and bonds as tuples of atom indices (with -1 for the outer atom of exocyclic bonds), and the fixed values
+    of the exocyclic bonds (``None`` for the other bonds).
+
+    Sets of disjoint rings are tried as sextets in order of decreasing size, and each set is accepted if the remaining
+    ring atoms can be covered by double bonds, found by backtracking. Returns one solution for every set with the
+    maximum number of sextets, an empty list if there are none, or ``None`` if more than `max_steps` steps are needed.
+    """
+    cython.declare(covered=list, neighbors=list, candidates=list, solutions=list, steps=list, k=cython.int)
+
+    covered = [0] * n_atoms
+    neighbors = [[] for _ in range(n_atoms)]
+    for index, (i, j) in enumerate(bonds):
+        if exo[index] is not None:
+            covered[i] += exo[index]
+        else:
+            neighbors[i].append((j, index))
+            neighbors[j].append((i, index))
+    if any([count > 1 for count in covered]):
+        return []
+
+    # Rings containing atoms with exocyclic double bonds cannot be sextets
+    candidates = [index for index, ring in enumerate(rings) if not any([covered[atom] for atom in ring])]
+
+    steps = [0]
+    for k in range(len(candidates), 0, -1):
+        solutions = []
+        for sextets in _get_disjoint_rings(rings, candidates, k, 0, [], set(), steps):
+            if steps[0] > max_steps:
+                return None
+            free = set([atom for atom in range(n_atoms) if not covered[atom]])
+            for index in sextets:
+                free.difference_update(rings[index])
+            double_bonds = []
+            if _find_double_bonds(free, neighbors, double_bonds, steps, max_steps):
+                solution = [0] * (len(rings) + len(bonds))
+                for index in sextets:
+                    solution[index] = 1
+                for index in double_bonds:
+                    solution[len(rings) + index] = 1
+                for index, value in enumerate(exo):
+                    if value is not None:
+                        solution[len(rings) + index] = value
+                solutions.append(solution)
+            elif steps[0] > max_steps:
+                return None
+        if solutions:
+            return solutions
+    return []
+
+
+def _get_disjoint_rings(rings, candidates, k, start, chosen, used, steps):
+    """
+    Generate every list of `k` mutually disjoint rings from `candidates[start:]`, in addition to the rings in
+    `chosen`, whose atoms are in `used`.
+    """
+    if k == 0:
+        yield chosen[:]
+        return
+    for position in range(start, len(candidates) - k + 1):
+        steps[0] += 1
+        ring = rings[candidates[position]]
+        if used.isdisjoint(ring):
+            chosen.append(candidates[position])
+            used.update(ring)
+            for result in _get_disjoint_rings(rings, candidates, k - 1, position + 1, chosen, used, steps):
+                yield result
+            used.difference_update(ring)
+            chosen.pop()
+
+
+def _find_double_bonds(free, neighbors, double_bonds, steps, max_steps):
+    """
+    Find a set of bonds covering each atom in `free` exactly once by backtracking, always branching on the atom with
+    the fewest options. The indices of the bonds are appended to `double_bonds`, and `free` is restored on return.
+    Returns ``True`` if such a set was found.
+    """
+    cython.declare(atom=cython.int, options=list, best_atom=cython.int, best_options=list)
+
+    if not free:
+        return True
+    steps[0] += 1
+    if steps[0] > max_steps:
+        return False
+
+    best_atom = -1
+    best_options = None
+    for atom in free:
+        options = [(other, index) for other, index in neighbors[atom] if other in free]
+        if not options:
+            return False
+        if best_options is None or len(options) < len(best_options):
+            best_atom, best_options = atom, options
+            if len(options) == 1:
+                break
+
+    free.discard(best_atom)
+    for other, index in best_options:
+        free.discard(other)
+        double_bonds.append(index)
+        if _find_double_bonds(free, neighbors, double_bonds, steps, max_steps):
+            free.add(other)
+            free.add(best_atom)
+            return True
+        double_bonds.pop()
+        free.add(other)
+    free.add(best_atom)
+    return False
+
+
 def _clar_optimization(mol, constraints=None, max_num=None, save_order=False):
     """
     Implements linear programming algorithm for finding Clar structures. This algorithm maximizes the number
@@ -981,35 +1260,11 @@ def _clar_optimization(mol, constraints=None, max_num=None, save_order=False):
     # Make a copy of the molecule so we don't destroy the original
     molecule = mol.copy(deep=True)
 
-    aromatic_rings = molecule.get_aromatic_rings(save_order=save_order)[0]
-    aromatic_rings.sort(key=lambda x: sum([atom.id for atom in x]))
+    aromatic_rings, atoms, bonds, exo = _get_clar_variables(molecule, save_order=save_order)
 
     if not aromatic_rings:
         return []
 
-    # Get list of atoms that are in rings
-    atoms = set()
-    for ring in aromatic_rings:
-        atoms.update(ring)
-    atoms = sorted(atoms, key=lambda x: x.id)
-
-    # Get list of bonds involving the ring atoms, ignoring bonds to hydrogen
-    bonds = set()
-    for atom in atoms:
-        bonds.update([atom.bonds[key] for key in atom.bonds.keys() if key.is_non_hydrogen()])
-    bonds = sorted(bonds, key=lambda x: (x.atom1.id, x.atom2.id))
-
-    # Identify exocyclic bonds, and save their bond orders
-    exo = []
-    for bond in bonds:
-        if bond.atom1 not in atoms or bond.atom2 not in atoms:
-            if bond.is_double():
-                exo.append(1)
-            else:
-                exo.append(0)
-        else:
-            exo.append(None)
-
     # Dimensions
     l = len(aromatic_rings)
     m = len(atoms)
@@ -33,6 +33,8 @@ molecule from its chemical graph representation.
 """
 import itertools
 
+import cython
+
 
 def calculate_atom_symmetry_number(molecule, atom):
     """
@@ -57,23 +59,26 @@ def calculate_atom_symmetry_number(molecule, atom):
     if num_neighbors < 2:
         return symmetry_number
 
-    # Create temporary structures for each functional group attached to atom
-    molecule0 = molecule
-    molecule = molecule0.copy(True)
-    atom = molecule.vertices[molecule0.vertices.index(atom)]
-    molecule.remove_atom(atom)
-    groups = molecule.split()
-
-    # Determine equivalence of functional groups around atom
-    group_isomorphism = dict([(group, dict()) for group in groups])
-    for group1 in groups:
-        for group2 in groups:
-            if group1 is not group2 and group2 not in group_isomorphism[group1]:
-                group_isomorphism[group1][group2] = group1.is_isomorphic(group2)
-                group_isomorphism[group2][group1] = group_isomorphism[group1][group2]
-            elif group1 is group2:
-                group_isomorphism[group1][group1] = True
-    count = [sum([int(group_isomorphism[group1][group2]) for group2 in groups]) for group1 in groups]
+    # Count the equivalent functional groups around atom from their invariants if possible
+    count = _count_equivalent_groups(atom)
+    if count is None:
+        # Create temporary structures for each functional group attached to atom
+        molecule0 = molecule
+        molecule = molecule0.copy(True)
+        atom = molecule.vertices[molecule0.vertices.index(atom)]
+        molecule.remove_atom(atom)
+        groups = molecule.split()
+
+        # Determine equivalence of functional groups around atom
+        group_isomorphism = dict([(group, dict()) for group in groups])
+        for group1 in groups:
+            for group2 in groups:
+                if group1 is not group2 and group2 not in group_isomorphism[group1]:
+                    group_isomorphism[group1][group2] = group1.is_isomorphic(group2)
+                    group_isomorphism[group2][group1] = group_isomorphism[group1][group2]
+                elif group1 is group2:
+                    group_isomorphism[group1][group1] = True
+        count = [sum([int(group_isomorphism[group1][group2]) for group2 in groups]) for group1 in groups]
     for i in range(count.count(2) // 2):
         count.remove(2)
     for i in range(count.count(3) // 3):
@@ -165,6 +170,9 @@ def calculate_bond_symmetry_number(molecule, atom1, atom2):
         # aren't any)
         elif len(molecule.vertices) == 2:
             symmetry_number = 2
+        # The groups on both sides of the bond can only be pairwise isomorphic if their invariants match
+        elif _get_group_invariants(atom1, atom2) != _get_group_invariants(atom2, atom1):
+            return symmetry_number
         else:
             molecule.remove_bond(bond)
             structure = molecule.copy(True)
@@ -543,6 +551,116 @@ def _indistinguishable(atom1, atom2):
     return True
 
 
+def _get_atom_key(atom):
+    """
+    Return the attributes of `atom` which must be the same for it to be
+    matched to another atom when checking isomorphism.
+    """
+    return (atom.element.symbol, atom.element.isotope, atom.radical_electrons, atom.lone_pairs, atom.charge,
+            atom.atomtype.label if atom.atomtype is not None else '', atom.site or '', atom.morphology or '')
+
+
+def _get_group_invariants(center, excluded=None):
+    """
+    Return a sorted list of invariants of the functional groups attached to
+    `center`, which are the connected groups of atoms left when `center` and
+    `excluded` (if given) are removed. Each invariant contains the number of
+    atoms in the group and the sorted atom attributes and bond orders, so that
+    groups with different invariants cannot be isomorphic.
+    """
+    cython.declare(visited=set, invariants=list, group=list, orders=list, stack=list)
+
+    visited = {id(center)}
+    if excluded is not None:
+        visited.add(id(excluded))
+    invariants = []
+    for neighbor in center.edges:
+        if id(neighbor) in visited:
+            continue
+        visited.add(id(neighbor))
+        group = []
+        orders = []
+        stack = [neighbor]
+        while stack:
+            atom = stack.pop()
+            group.append(_get_atom_key(atom))
+            for other, bond in atom.edges.items():
+                if other is center or other is excluded:
+                    continue
+                orders.append(round(bond.order, 3))
+                if id(other) not in visited:
+                    visited.add(id(other))
+                    stack.append(other)
+        invariants.append((len(group), sorted(group), sorted(orders)))
+    invariants.sort()
+    return invariants
+
+
+def _count_equivalent_groups(atom):
+    """
+    Return the number of functional groups around `atom` (which must not be in
+    a cycle) that are isomorphic to each group, as used by
+    :func:`calculate_atom_symmetry_number`, without splitting the molecule.
+    Groups with different invariants are not isomorphic, and single atoms are
+    isomorphic if their attributes match. Returns ``None`` if two groups of
+    more than one atom have the same invariants, so that isomorphism must be
+    checked.
+    """
+    cython.declare(invariants=list, count=list, n=cython.int)
+
+    invariants = _get_group_invariants(atom)
+    count = []
+    for invariant in invariants:
+        n = invariants.count(invariant)
+        if n > 1 and invariant[0] > 1:
+            return None
+        count.append(n)
+    return count
+
+
+def _get_cyclic_bonds(molecule):
+    """
+    Return the set of ids of the bonds in `molecule` that are contained in a
+    cycle, i.e. that are not bridges, found using a single depth-first search.
+    """
+    cython.declare(index=dict, low=dict, cyclic=set, counter=cython.int, stack=list)
+
+    index = {}
+    low = {}
+    cyclic = set()
+    counter = 0
+    for root in molecule.vertices:
+        if id(root) in index:
+            continue
+        index[id(root)] = low[id(root)] = counter
+        counter += 1
+        stack = [(root, None, iter(list(root.edges.items())))]
+        while stack:
+            atom, parent_bond, neighbors = stack[-1]
+            for neighbor, bond in neighbors:
+                if bond is parent_bond:
+                    continue
+                if id(neighbor) in index:
+                    # A back edge always closes a cycle
+                    if index[id(neighbor)] < index[id(atom)]:
+                        cyclic.add(id(bond))
+                        low[id(atom)] = min(low[id(atom)], index[id(neighbor)])
+                else:
+                    index[id(neighbor)] = low[id(neighbor)] = counter
+                    counter += 1
+                    stack.append((neighbor, bond, iter(list(neighbor.edges.items()))))
+                    break
+            else:
+                stack.pop()
+                if stack:
+                    parent = stack[-1][0]
+                    low[id(parent)] = min(low[id(parent)], low[id(atom)])
+                    if low[id(atom)] <= index[id(parent)]:
+                        # The tree edge is not a bridge
+                        cyclic.add(id(parent_bond))
+    return cyclic
+
+
 def calculate_symmetry_number(molecule):
     """
     Return the symmetry number for the structure. The symmetry number
@@ -550,19 +668,27 @@ def calculate_symmetry_number(molecule):
     """
     symmetry_number = 1
 
+    cyclic_bonds = _get_cyclic_bonds(molecule)
+    cyclic_atoms = set()
+    for atom1 in molecule.vertices:
+        for bond in atom1.edges.values():
+            if id(bond) in cyclic_bonds:
+                cyclic_atoms.add(id(atom1))
+                break
+    indices = dict([(id(atom), index) for index, atom in enumerate(molecule.vertices)])
+
     for atom in molecule.vertices:
-        if not molecule.is_atom_in_cycle(atom):
+        if id(atom) not in cyclic_atoms:
             symmetry_number *= calculate_atom_symmetry_number(molecule, atom)
 
     for atom1 in molecule.vertices:
         for atom2 in list(atom1.edges):  # Make a copy of the list of neighbors since we modify the dictionary
-            if (molecule.vertices.index(atom1) < molecule.vertices.index(atom2) and
-                    not molecule.is_bond_in_cycle(atom1.edges[atom2])):
+            if indices[id(atom1)] < indices[id(atom2)] and id(atom1.edges[atom2]) not in cyclic_bonds:
                 symmetry_number *= calculate_bond_symmetry_number(molecule, atom1, atom2)
 
     symmetry_number *= calculate_axis_symmetry_number(molecule)
 
-    if molecule.is_cyclic():
+    if cyclic_bonds:
         symmetry_number *= calculate_cyclic_symmetry_number(molecule)
 
     return symmetry_number
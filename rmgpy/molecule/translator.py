@@ -49,6 +49,7 @@ import rmgpy.molecule.inchi as inchiutil
 import rmgpy.molecule.molecule as mm
 import rmgpy.molecule.util as util
 from rmgpy.exceptions import DependencyError
+from rmgpy.molecule.cache import identifier_cache
 from rmgpy.molecule.converter import to_rdkit_mol, from_rdkit_mol, to_ob_mol, from_ob_mol
 
 # constants
@@ -172,7 +173,7 @@ def to_inchi(mol, backend='rdkit-first', aug_level=0):
         backend     choice of backend, 'rdkit-first' (default), 'openbabel-first', 'rdkit', or 'openbabel'
         aug_level   level of augmentation, 0, 1, or 2
     """
-    cython.declare(inchi=str, ulayer=str, player=str, mlayer=str)
+    cython.declare(inchi=str, ulayer=str, player=str, mlayer=str, aug_inchi=str)
 
     if aug_level == 0:
         return _write(mol, 'inchi', backend)
@@ -185,11 +186,19 @@ def to_inchi(mol, backend='rdkit-first', aug_level=0):
         return inchi + mlayer
 
     elif aug_level == 2:
+        # The augmented layers depend on the positions of the electrons, so
+        # they are stored in the identifier cache with the complete string
+        aug_inchi = identifier_cache.get_identifier(mol, 'aug_inchi', backend)
+        if aug_inchi is not None:
+            return aug_inchi
+
         inchi = to_inchi(mol, backend=backend)
 
         ulayer, player = inchiutil.create_augmented_layers(mol)
 
-        return inchiutil.compose_aug_inchi(inchi, ulayer, player)
+        aug_inchi = inchiutil.compose_aug_inchi(inchi, ulayer, player)
+        identifier_cache.put_identifier(mol, 'aug_inchi', backend, aug_inchi)
+        return aug_inchi
 
     else:
         raise ValueError("Implemented values for aug_level are 0, 1, or 2.")
@@ -208,7 +217,7 @@ def to_inchi_key(mol, backend='rdkit-first', aug_level=0):
         backend     choice of backend, 'rdkit-first' (default), 'openbabel-first', 'rdkit', or 'openbabel'
         aug_level   level of augmentation, 0, 1, or 2
     """
-    cython.declare(key=str, ulayer=str, player=str, mlayer=str)
+    cython.declare(key=str, ulayer=str, player=str, mlayer=str, aug_key=str)
 
     if aug_level == 0:
         return _write(mol, 'inchikey', backend)
@@ -221,11 +230,17 @@ def to_inchi_key(mol, backend='rdkit-first', aug_level=0):
         return key + mlayer
 
     elif aug_level == 2:
+        aug_key = identifier_cache.get_identifier(mol, 'aug_inchikey', backend)
+        if aug_key is not None:
+            return aug_key
+
         key = to_inchi_key(mol, backend=backend)
 
         ulayer, player = inchiutil.create_augmented_layers(mol)
 
-        return inchiutil.compose_aug_inchi_key(key, ulayer, player)
+        aug_key = inchiutil.compose_aug_inchi_key(key, ulayer, player)
+        identifier_cache.put_identifier(mol, 'aug_inchikey', backend, aug_key)
+        return aug_key
 
     else:
         raise ValueError("Implemented values for aug_level are 0, 1, or 2.")
@@ -497,6 +512,9 @@ def _read(mol, identifier, identifier_type, backend, raise_atomtype_exception=Tr
 
     If not in the dictionary, parse it through the specified backed,
     or try all backends.
+
+    Parsed structures are stored in the shared identifier cache, and copies
+    of them are returned for later requests with the same arguments.
     """
     # Check for potential mistakes in input arguments
     if 'InChIKey' in identifier:
@@ -504,9 +522,17 @@ def _read(mol, identifier, identifier_type, backend, raise_atomtype_exception=Tr
     elif 'InChI' in identifier and identifier_type != 'inchi':
         raise ValueError('Improper identifier type "{0}". The provided identifier appears to be an InChI.'.format(identifier_type))
 
+    cached = identifier_cache.get_structure(identifier, identifier_type, backend, raise_atomtype_exception)
+    if cached is not None:
+        mol.atoms = cached.atoms
+        mol.multiplicity = cached.multiplicity
+        mol._fingerprint = mol._inchi = mol._smiles = None
+        return mol
+
     if _lookup(mol, identifier, identifier_type) is not None:
         if _check_output(mol, identifier):
             mol.update_atomtypes(log_species=True, raise_exception=raise_atomtype_exception)
+            identifier_cache.put_structure(identifier, identifier_type, backend, raise_atomtype_exception, mol)
             return mol
 
     for option in _get_backend_list(backend):
@@ -519,6 +545,7 @@ def _read(mol, identifier, identifier_type, backend, raise_atomtype_exception=Tr
 
         if _check_output(mol, identifier):
             mol.update_atomtypes(log_species=True, raise_exception=raise_atomtype_exception)
+            identifier_cache.put_structure(identifier, identifier_type, backend, raise_atomtype_exception, mol)
             return mol
         else:
             logging.debug('Backend {0} is not able to parse identifier {1}'.format(option, identifier))
@@ -530,14 +557,29 @@ def _write(mol, identifier_type, backend):
     """
     Converts the input molecule to the specified identifier type.
 
-    Uses backends as specified by the `backend` argument.
+    Uses backends as specified by the `backend` argument. Identifiers are
+    stored in the shared identifier cache and reused for isomorphic molecules.
 
     Returns a string identifier of the requested type.
     """
+    cython.declare(cached=cython.bint)
     # Check that the molecule is not empty
     if not mol.atoms:
         return ''
 
+    # Atom labels, e.g. the cutting labels of fragments, are written into
+    # SMILES but are not compared by the cache, so such SMILES are not cached
+    cached = True
+    if identifier_type == 'smi':
+        for atom in mol.atoms:
+            if atom.label:
+                cached = False
+                break
+    if cached:
+        output = identifier_cache.get_identifier(mol, identifier_type, backend)
+        if output is not None:
+            return output
+
     for option in _get_backend_list(backend):
         if option == 'rdkit':
             try:
@@ -553,6 +595,8 @@ def _write(mol, identifier_type, backend):
             raise NotImplementedError("Unrecognized backend {0}".format(option))
 
         if _check_output(mol, output):
+            if cached:
+                identifier_cache.put_identifier(mol, identifier_type, backend, output)
             return output
         else:
             logging.debug('Backend {0} is not able to generate {1} for this molecule:\n'
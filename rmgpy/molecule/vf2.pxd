@@ -25,8 +25,14 @@
 #                                                                             #
 ###############################################################################
 
+from cpython cimport array
+
 from rmgpy.molecule.graph cimport Vertex, Edge, Graph
 
+cdef tuple _get_adjacency(list vertices)
+
+cdef bint _match_bits(tuple bits, tuple masks) except -2
+
 cdef class VF2:
 
     cdef Graph graph1, graph2
@@ -40,6 +46,22 @@ cdef class VF2:
     
     cdef bint is_match
     cdef list mapping_list
+
+    # Search state, with vertices identified by their index in vertices1 and vertices2
+    cdef Graph state_graph1, state_graph2
+    cdef list vertices1, vertices2
+    cdef dict indices1, indices2
+    cdef array.array start1, start2
+    cdef array.array adjacency1, adjacency2
+    cdef list edges1, edges2
+    cdef array.array core1, core2
+    cdef array.array term1, term2
+    cdef int depth
+    cdef array.array candidates
+    cdef array.array edge_bits1, edge_masks2
+    cdef array.array domain
+    cdef array.array order, parent
+    cdef int order_length
     
     cpdef bint is_isomorphic(self, Graph graph1, Graph graph2, dict initial_mapping, bint save_order=?, bint strict=?) except -2
         
@@ -51,10 +73,20 @@ cdef class VF2:
     
     cdef isomorphism(self, Graph graph1, Graph graph2, dict initial_mapping, bint subgraph, bint find_all, bint save_order=?, bint strict=?)
 
-    cdef bint match(self, int call_depth) except -2
+    cdef initialize_state(self)
+
+    cdef bint initialize_candidates(self) except -2
+
+    cdef initialize_order(self)
+
+    cdef bint match(self, int position) except -2
+
+    cdef bint try_pair(self, int index1, int index2, int position) except -2
         
     cpdef bint feasible(self, Vertex vertex1, Vertex vertex2) except -2
+
+    cdef bint is_feasible(self, int index1, int index2) except -2
     
-    cdef add_to_mapping(self, Vertex vertex1, Vertex vertex2)
+    cdef add_to_mapping(self, int index1, int index2)
         
-    cdef remove_from_mapping(self, Vertex vertex1, Vertex vertex2)
+    cdef remove_from_mapping(self, int index1, int index2)
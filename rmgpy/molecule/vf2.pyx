@@ -28,11 +28,74 @@
 """
 This module contains graph ismorphism functions that implement the VF2
 algorithm of Vento and Foggia.  https://doi.org/10.1109/TPAMI.2004.75
+
+The vertices of the second graph are matched in a fixed order chosen as in
+VF2++ (Juttner and Madarasi, https://doi.org/10.1016/j.dam.2018.02.018):
+vertices with the most already-ordered neighbors come first, followed by
+those with the fewest candidate vertices in the first graph and then by
+degree. The search state is kept in integer arrays indexed by the position
+of each vertex in its graph, and the adjacency of both graphs is compiled
+into compressed integer arrays at the start of every search. For subgraph
+matching of molecules against groups, the semantic properties of atoms and
+bonds are also compiled into bits and those of group atoms and group bonds
+into bitmasks, so most semantic tests are bitwise ANDs.
 """
 
+from cpython cimport array
+import array
+
 from rmgpy.exceptions import VF2Error
 from rmgpy.molecule.graph cimport Graph
 
+cdef array.array _int_array = array.array('i', [])
+cdef array.array _char_array = array.array('b', [])
+
+################################################################################
+
+cdef tuple _get_adjacency(list vertices):
+    """
+    Return the index of each vertex in `vertices` keyed by its id, and the
+    adjacency of the vertices as compressed arrays: the neighbors of vertex
+    ``i`` are ``adjacency[start[i]:start[i+1]]`` and the corresponding edges
+    are ``edges[start[i]:start[i+1]]``.
+    """
+    cdef dict indices
+    cdef list neighbors, edges
+    cdef array.array start
+    cdef Vertex vertex, vertex2
+    cdef Edge edge
+    cdef int i
+
+    indices = {}
+    for i, vertex in enumerate(vertices):
+        indices[id(vertex)] = i
+
+    start = array.clone(_int_array, len(vertices) + 1, zero=False)
+    neighbors = []
+    edges = []
+    for i, vertex in enumerate(vertices):
+        start.data.as_ints[i] = len(neighbors)
+        for vertex2, edge in vertex.edges.items():
+            index = indices.get(id(vertex2))
+            if index is not None:
+                neighbors.append(index)
+                edges.append(edge)
+    start.data.as_ints[len(vertices)] = len(neighbors)
+
+    return indices, start, array.array('i', neighbors), edges
+
+cdef bint _match_bits(tuple bits, tuple masks) except -2:
+    """
+    Return ``True`` if each of the `bits` of a vertex overlaps the
+    corresponding entry of the `masks` of another vertex.
+    """
+    cdef int k
+
+    for k in range(len(bits)):
+        if not bits[k] & masks[k]:
+            return False
+    return True
+
 ################################################################################
 
 cdef class VF2:
@@ -111,15 +174,7 @@ cdef class VF2:
         If `find_all` is ``True``, all isomorphisms are found; otherwise only
         the first is found.
         """
-        cdef int call_depth, index1, index2
-
-        if self.graph1 is not graph1:
-            self.graph1 = graph1
-            graph1.sort_vertices(save_order)
-
-        if self.graph2 is not graph2:
-            self.graph2 = graph2
-            graph2.sort_vertices(save_order)
+        cdef Vertex vertex1, vertex2
 
         self.initial_mapping = initial_mapping
         self.subgraph = subgraph
@@ -145,128 +200,257 @@ cdef class VF2:
             # a subgraph of the first
             return
 
-        # Initialize call_depth with the size of the smallest graph
-        # Each recursive call to match() will decrease it by one;
-        # when the whole graph has been explored, it should reach 0
-        # It should never go below zero!
-        call_depth = len(graph2.vertices)
-
-        # Initialize mapping by clearing any previous mapping information
-        for vertex1 in graph1.vertices:
-            vertex1.mapping = None
-            vertex1.terminal = False
-        for vertex2 in graph2.vertices:
-            vertex2.mapping = None
-            vertex2.terminal = False
+        # The vertex order must be saved on every call that restores it, even if
+        # the graph was already sorted by a previous call
+        if self.graph1 is not graph1 or save_order:
+            self.graph1 = graph1
+            graph1.sort_vertices(save_order)
+
+        if self.graph2 is not graph2 or save_order:
+            self.graph2 = graph2
+            graph2.sort_vertices(save_order)
+
+        # Compile the adjacency of both graphs and clear the mapping
+        self.initialize_state()
+
         # Set the initial mapping if provided
         if self.initial_mapping is not None:
             for vertex1, vertex2 in self.initial_mapping.items():
-                self.add_to_mapping(vertex1, vertex2)
-            call_depth -= len(self.initial_mapping)
+                try:
+                    self.add_to_mapping(self.indices1[id(vertex1)], self.indices2[id(vertex2)])
+                except KeyError:
+                    raise VF2Error('Initial mapping contains vertices that are not in the graphs.')
 
-        self.match(call_depth)
+        # Only search if every unmapped vertex of graph2 has at least one candidate
+        if self.initialize_candidates():
+            self.initialize_order()
+            self.match(0)
 
         if save_order:
             graph1.restore_vertex_order()
             graph2.restore_vertex_order()
+            # The restored graphs are no longer sorted
+            self.graph1 = self.graph2 = None
 
-        # We're done, so clear the mappings to prevent downstream effects
-        for vertex1 in graph1.vertices:
-            vertex1.mapping = None
-            vertex1.terminal = False
-        for vertex2 in graph2.vertices:
-            vertex2.mapping = None
-            vertex2.terminal = False
+        # We're done, so release the state to prevent downstream effects
+        self.state_graph1 = self.state_graph2 = None
 
-    cdef bint match(self, int call_depth) except -2:
+    cdef initialize_state(self):
         """
-        Recursively search for pairs of vertices to match, until all vertices
-        are matched or the viable set of matches is exhausted. The `call_depth`
-        parameter helps ensure we never enter an infinite loop.
+        Compile the adjacency arrays of the current graphs and reset the
+        mapping and terminal arrays.
+        """
+        cdef int n1, n2, i
+
+        self.vertices1 = self.graph1.vertices[:]
+        self.vertices2 = self.graph2.vertices[:]
+        self.indices1, self.start1, self.adjacency1, self.edges1 = _get_adjacency(self.vertices1)
+        self.indices2, self.start2, self.adjacency2, self.edges2 = _get_adjacency(self.vertices2)
+        n1 = len(self.vertices1)
+        n2 = len(self.vertices2)
+
+        # core1[i] is the index in graph2 mapped to vertex i of graph1 or -1,
+        # term1[i] is the depth at which vertex i was first adjacent to the
+        # mapping (or mapped) or 0, and similarly for graph2
+        self.core1 = array.clone(_int_array, n1, zero=False)
+        self.core2 = array.clone(_int_array, n2, zero=False)
+        for i in range(n1):
+            self.core1.data.as_ints[i] = -1
+        for i in range(n2):
+            self.core2.data.as_ints[i] = -1
+        self.term1 = array.clone(_int_array, n1, zero=True)
+        self.term2 = array.clone(_int_array, n2, zero=True)
+        self.depth = 0
+
+        self.candidates = None
+        self.edge_bits1 = self.edge_masks2 = None
+        self.order_length = 0
+        self.state_graph1 = self.graph1
+        self.state_graph2 = self.graph2
+
+    cdef bint initialize_candidates(self) except -2:
+        """
+        Evaluate the semantic relationship of every pair of unmapped vertices
+        once, storing the number of candidates of each vertex of graph2 in
+        `domain`. Return ``False`` if any vertex of graph2 has no candidates.
+        For subgraph matching, the match bits and masks of the vertices and
+        edges are compiled first; pairs that cannot be encoded fall back to
+        :meth:`is_specific_case_of`.
         """
         cdef Vertex vertex1, vertex2
+        cdef Edge edge
+        cdef int n1, n2, i, j, count
+        cdef int *core1
+        cdef int *core2
+        cdef signed char *candidates
+        cdef bint is_candidate
+        cdef list bits1, masks2
+        cdef tuple bits, masks
+
+        n1 = len(self.vertices1)
+        n2 = len(self.vertices2)
+        if self.subgraph:
+            bits1 = [vertex1.get_match_bits() for vertex1 in self.vertices1]
+            masks2 = [vertex2.get_match_masks() for vertex2 in self.vertices2]
+            self.edge_bits1 = array.array('i', [edge.get_match_bits() for edge in self.edges1])
+            self.edge_masks2 = array.array('i', [edge.get_match_masks() for edge in self.edges2])
+        self.candidates = array.clone(_char_array, n1 * n2, zero=True)
+        self.domain = array.clone(_int_array, n2, zero=True)
+        candidates = self.candidates.data.as_schars
+        core1 = self.core1.data.as_ints
+        core2 = self.core2.data.as_ints
+
+        for j in range(n2):
+            if core2[j] >= 0:
+                continue
+            vertex2 = self.vertices2[j]
+            count = 0
+            for i in range(n1):
+                vertex1 = self.vertices1[i]
+                if vertex1.ignore or core1[i] >= 0:
+                    continue
+                if self.subgraph:
+                    bits = bits1[i]
+                    masks = masks2[j]
+                    if bits is not None and masks is not None:
+                        is_candidate = _match_bits(bits, masks)
+                    else:
+                        is_candidate = vertex1.is_specific_case_of(vertex2)
+                else:
+                    # To be feasible the connectivity values must be an exact match
+                    is_candidate = (vertex1.connectivity1 == vertex2.connectivity1
+                                    and vertex1.connectivity2 == vertex2.connectivity2
+                                    and vertex1.connectivity3 == vertex2.connectivity3
+                                    and vertex1.equivalent(vertex2, strict=self.strict))
+                if is_candidate:
+                    candidates[i * n2 + j] = 1
+                    count += 1
+            if count == 0:
+                return False
+            self.domain.data.as_ints[j] = count
+        return True
+
+    cdef initialize_order(self):
+        """
+        Choose the order in which the unmapped vertices of graph2 are matched.
+        At each step the vertex with the most neighbors that are already
+        ordered or mapped is chosen, breaking ties by the fewest candidates
+        and then by the highest degree. The `parent` of each vertex is one
+        of those neighbors, if any, so that only the neighbors of its image
+        need to be tried.
+        """
+        cdef int n2, j, k, best, position
+        cdef int *start2
+        cdef int *adjacency2
+        cdef int *core2
+        cdef int *domain
+        cdef int *connections
+        cdef signed char *placed
+        cdef array.array connections_array, placed_array
+
+        n2 = len(self.vertices2)
+        start2 = self.start2.data.as_ints
+        adjacency2 = self.adjacency2.data.as_ints
+        core2 = self.core2.data.as_ints
+        domain = self.domain.data.as_ints
+        connections_array = array.clone(_int_array, n2, zero=True)
+        placed_array = array.clone(_char_array, n2, zero=True)
+        connections = connections_array.data.as_ints
+        placed = placed_array.data.as_schars
+        self.order = array.clone(_int_array, n2, zero=False)
+        self.parent = array.clone(_int_array, n2, zero=False)
+
+        for j in range(n2):
+            if core2[j] >= 0:
+                placed[j] = 1
+                for k in range(start2[j], start2[j + 1]):
+                    connections[adjacency2[k]] += 1
+
+        position = 0
+        while True:
+            best = -1
+            for j in range(n2):
+                if placed[j]:
+                    continue
+                if (best < 0 or connections[j] > connections[best]
+                        or (connections[j] == connections[best]
+                            and (domain[j] < domain[best]
+                                 or (domain[j] == domain[best]
+                                     and start2[j + 1] - start2[j] > start2[best + 1] - start2[best])))):
+                    best = j
+            if best < 0:
+                break
+            placed[best] = 1
+            self.order.data.as_ints[position] = best
+            self.parent.data.as_ints[position] = -1
+            for k in range(start2[best], start2[best + 1]):
+                j = adjacency2[k]
+                if placed[j] and self.parent.data.as_ints[position] < 0:
+                    self.parent.data.as_ints[position] = j
+                connections[j] += 1
+            position += 1
+        self.order_length = position
+
+    cdef bint match(self, int position) except -2:
+        """
+        Recursively search for pairs of vertices to match, until all vertices
+        are matched or the viable set of matches is exhausted. The vertex of
+        graph2 at `position` in the matching order is matched next.
+        """
+        cdef Vertex vertex2
         cdef dict mapping
-        cdef bint has_terminals
+        cdef int index2, parent, index, k
+        cdef int *start1
+        cdef int *adjacency1
+        cdef int *core2
 
-        # The call depth should never be negative!
-        if call_depth < 0:
-            raise VF2Error('Negative call depth encountered in VF2_match().')
+        core2 = self.core2.data.as_ints
 
         # Done if we have mapped to all vertices in graph
-        if call_depth == 0:
+        if position == self.order_length:
             if self.find_all:
                 mapping = {}
-                for vertex2 in self.graph2.vertices:
+                for index2, vertex2 in enumerate(self.vertices2):
                     if vertex2.ignore:
                         continue
-                    assert vertex2.mapping is not None
-                    assert vertex2.mapping.mapping is vertex2
-                    mapping[vertex2.mapping] = vertex2
+                    mapping[self.vertices1[core2[index2]]] = vertex2
                 self.mapping_list.append(mapping)
             self.is_match = True
             return True
 
-        # Create list of pairs of candidates for inclusion in mapping
-        """
-        10.1109/TPAMI.2004.75 says:
-        "The set P(s) will be made of all the node pairs (n,m),
-        with n belonging to T1out(s) and m to T2out(s),
-        unless one of these two sets is empty. In this case,
-        the set P(s) is likewise obtained by considering
-        T1in(s) and T2in(s), respectively."
-
-        But: for us, bonds are not directional, so ignore Tin(s)
-        and just use Tout(s) which is what we call "terminals".
-        """
-        has_terminals = False
-        for vertex2 in self.graph2.vertices:
-            if vertex2.ignore:
-                continue
-            if vertex2.terminal:
-                # graph2 has terminals, so graph1 also must have terminals
-                has_terminals = True
-                break
+        index2 = self.order.data.as_ints[position]
+        parent = self.parent.data.as_ints[position]
+        if parent >= 0:
+            # The vertex is adjacent to a mapped vertex, so it can only be
+            # mapped to a neighbor of the image of that vertex
+            start1 = self.start1.data.as_ints
+            adjacency1 = self.adjacency1.data.as_ints
+            index = core2[parent]
+            for k in range(start1[index], start1[index + 1]):
+                if self.try_pair(adjacency1[k], index2, position):
+                    return True
         else:
-            """
-            "In presence of not connected graphs, for some state s,
-            all of the above sets may be empty. In this case,
-            the set of candidate pairs making up P(s) will be
-            the set Pd(s) of all the pairs of nodes not contained
-            neither in G1(s) nor in G2(s)."
-
-            So: use nodes not yet mapped.
-            """
-            # Take first unmapped vertex
-            for vertex2 in self.graph2.vertices:
-                if vertex2.mapping is None:
-                    break
-            else:
-                raise VF2Error("Still seeking candidate pairs but all nodes in graph2 are already mapped.")
-
-        for vertex1 in self.graph1.vertices:
-            if vertex1.ignore:
-                continue
-            # If terminals are available, then skip vertices in the first
-            # graph that are not terminals
-            if has_terminals and not vertex1.terminal:
-                continue
-            # Otherwise take any node that is not already matched
-            if vertex1.mapping is not None:
-                continue
-            # Propose a pairing
-            if self.feasible(vertex1, vertex2):
-                # Add proposed match to mapping
-                self.add_to_mapping(vertex1, vertex2)
-                # Recurse
-                is_match = self.match(call_depth - 1)
-                if is_match and not self.find_all:
+            for index in range(len(self.vertices1)):
+                if self.try_pair(index, index2, position):
                     return True
-                # Undo proposed match
-                self.remove_from_mapping(vertex1, vertex2)
 
         # None of the proposed matches led to a complete isomorphism, so return False
         return False
 
+    cdef bint try_pair(self, int index1, int index2, int position) except -2:
+        """
+        Add the pair of vertices `index1` and `index2` to the mapping if it
+        is feasible and continue the search. Return ``True`` if the search is
+        complete.
+        """
+        if self.core1.data.as_ints[index1] >= 0 or not self.is_feasible(index1, index2):
+            return False
+        self.add_to_mapping(index1, index2)
+        if self.match(position + 1) and not self.find_all:
+            return True
+        self.remove_from_mapping(index1, index2)
+        return False
+
     cpdef bint feasible(self, Vertex vertex1, Vertex vertex2) except -2:
         """
         Return ``True`` if vertex `vertex1` from the first graph is a feasible
@@ -275,153 +459,174 @@ cdef class VF2:
         including several structural "look-aheads" that cheaply eliminate many
         otherwise feasible pairs.
         """
-        cdef Vertex vert1, vert2
-        cdef Edge edge1, edge2
-        cdef int term1_count, term2_count, neither1_count, neither2_count
+        if self.state_graph1 is not self.graph1 or self.state_graph2 is not self.graph2:
+            self.initialize_state()
+        if self.candidates is None:
+            self.initialize_candidates()
+        return self.is_feasible(self.vertices1.index(vertex1), self.vertices2.index(vertex2))
 
-        if not self.subgraph:
-            # To be feasible the connectivity values must be an exact match
-            if vertex1.connectivity1 != vertex2.connectivity1: return False
-            if vertex1.connectivity2 != vertex2.connectivity2: return False
-            if vertex1.connectivity3 != vertex2.connectivity3: return False
+    cdef bint is_feasible(self, int index1, int index2) except -2:
+        """
+        Return ``True`` if vertex `index1` of the first graph is a feasible
+        match for vertex `index2` of the second graph given the current
+        mapping, or ``False`` if not.
+        """
+        cdef Edge edge1, edge2
+        cdef int k1, k2, neighbor1, neighbor2, bits, mask
+        cdef int term1_count, term2_count, mapped1_count, mapped2_count
+        cdef int *start1
+        cdef int *start2
+        cdef int *adjacency1
+        cdef int *adjacency2
+        cdef int *core1
+        cdef int *core2
 
         # Semantic check #1: vertex1 and vertex2 must be equivalent
-        if self.subgraph:
-            if not vertex1.is_specific_case_of(vertex2): return False
-        else:
-            if not vertex1.equivalent(vertex2, strict=self.strict): return False
+        if not self.candidates.data.as_schars[index1 * len(self.vertices2) + index2]:
+            return False
+
+        start1 = self.start1.data.as_ints
+        start2 = self.start2.data.as_ints
+        adjacency1 = self.adjacency1.data.as_ints
+        adjacency2 = self.adjacency2.data.as_ints
+        core1 = self.core1.data.as_ints
+        core2 = self.core2.data.as_ints
 
         # Semantic check #2: adjacent vertices to vertex1 and vertex2 that are
         # already mapped should be connected by equivalent edges
-        for vert2 in vertex2.edges:
-            if vert2.mapping is not None:
-                vert1 = vert2.mapping
-                if vert1 not in vertex1.edges:
+        term2_count = mapped2_count = 0
+        for k2 in range(start2[index2], start2[index2 + 1]):
+            neighbor2 = adjacency2[k2]
+            if core2[neighbor2] >= 0:
+                neighbor1 = core2[neighbor2]
+                for k1 in range(start1[index1], start1[index1 + 1]):
+                    if adjacency1[k1] == neighbor1:
+                        break
+                else:
                     # The vertices are joined in graph2, but not in graph1
                     return False
                 if self.strict:
                     # Check that the edges are equivalent
                     # If self.strict=False, we only care that the edge exists
-                    edge1 = vertex1.edges[vert1]
-                    edge2 = vertex2.edges[vert2]
                     if self.subgraph:
-                        if not edge1.is_specific_case_of(edge2): return False
+                        bits = self.edge_bits1.data.as_ints[k1]
+                        mask = self.edge_masks2.data.as_ints[k2]
+                        if bits and mask:
+                            if not bits & mask: return False
+                        else:
+                            edge1 = self.edges1[k1]
+                            edge2 = self.edges2[k2]
+                            if not edge1.is_specific_case_of(edge2): return False
                     else:
+                        edge1 = self.edges1[k1]
+                        edge2 = self.edges2[k2]
                         if not edge1.equivalent(edge2): return False
+                mapped2_count += 1
+            elif self.term2.data.as_ints[neighbor2] > 0:
+                term2_count += 1
 
         # There could still be edges in graph1 that aren't in graph2; this is okay
         # for subgraph matching, but not for exact matching
-        if not self.subgraph:
-            for vert1 in vertex1.edges:
-                if vert1.mapping is not None:
-                    if vert1.mapping not in vertex2.edges:
+        term1_count = mapped1_count = 0
+        for k1 in range(start1[index1], start1[index1 + 1]):
+            neighbor1 = adjacency1[k1]
+            if core1[neighbor1] >= 0:
+                if not self.subgraph:
+                    neighbor2 = core1[neighbor1]
+                    for k2 in range(start2[index2], start2[index2 + 1]):
+                        if adjacency2[k2] == neighbor2:
+                            break
+                    else:
                         # The vertices are joined in graph1, but not in graph2
                         return False
-
-        # Count number of terminals adjacent to vertex1 and vertex2
-        term1_count = term2_count = neither1_count = neither2_count = 0  # note that 0 is immutable
-        for vert1 in vertex1.edges:
-            if vert1.terminal:
+                mapped1_count += 1
+            elif self.term1.data.as_ints[neighbor1] > 0:
                 term1_count += 1
-            elif vert1.mapping is not None:
-                neither1_count += 1
-        for vert2 in vertex2.edges:
-            if vert2.terminal:
-                term2_count += 1
-            elif vert2.mapping is not None:
-                neither2_count += 1
 
         # Level 2 look-ahead: the number of adjacent vertices of vertex1 and
-        # vertex2 that are non-terminals must be equal
-        if self.subgraph:
-            if neither1_count < neither2_count: return False
-        else:
-            if neither1_count != neither2_count: return False
-
+        # vertex2 that are already mapped must be equal
         # Level 1 look-ahead: the number of adjacent vertices of vertex1 and
         # vertex2 that are terminals must be equal
         if self.subgraph:
+            if mapped1_count < mapped2_count: return False
             if term1_count < term2_count: return False
         else:
+            if mapped1_count != mapped2_count: return False
             if term1_count != term2_count: return False
 
-        # Level 0 look-ahead: all adjacent vertices of vertex2 already in the
-        # mapping must map to adjacent vertices of vertex1
-        for vert2 in vertex2.edges:
-            if vert2.mapping is not None:
-                if vert2.mapping not in vertex1.edges: return False
-        # Also, all adjacent vertices of vertex1 already in the mapping must map to
-        # adjacent vertices of vertex2, unless we are subgraph matching
-        if not self.subgraph:
-            for vert1 in vertex1.edges:
-                if vert1.mapping is not None:
-                    if vert1.mapping not in vertex2.edges: return False
-
         # All of our tests have been passed, so the two vertices are a feasible pair
         return True
 
-    cdef add_to_mapping(self, Vertex vertex1, Vertex vertex2):
+    cdef add_to_mapping(self, int index1, int index2):
         """
-        Add as valid a mapping of vertex `vertex1` from the first graph to
-        vertex `vertex2` from the second graph, and update the terminals
+        Add as valid a mapping of vertex `index1` from the first graph to
+        vertex `index2` from the second graph, and update the terminals
         status accordingly.        
         """
-        cdef Vertex v
-
-        # Map the vertices to one another
-        vertex1.mapping = vertex2
-        vertex2.mapping = vertex1
+        cdef int k, depth
+        cdef int *start
+        cdef int *adjacency
+        cdef int *term
 
-        # Remove these vertices from the set of terminals
-        vertex1.terminal = False
-        vertex2.terminal = False
+        self.depth += 1
+        depth = self.depth
 
-        # Add any neighboring vertices not already in mapping to terminals
-        for v in vertex1.edges:
-            v.terminal = v.mapping is None
-        for v in vertex2.edges:
-            v.terminal = v.mapping is None
-
-    cdef remove_from_mapping(self, Vertex vertex1, Vertex vertex2):
+        # Map the vertices to one another
+        self.core1.data.as_ints[index1] = index2
+        self.core2.data.as_ints[index2] = index1
+
+        # Add the vertices and any neighboring vertices not already in the
+        # mapping to the terminals, recording the depth at which they were added
+        term = self.term1.data.as_ints
+        start = self.start1.data.as_ints
+        adjacency = self.adjacency1.data.as_ints
+        if term[index1] == 0:
+            term[index1] = depth
+        for k in range(start[index1], start[index1 + 1]):
+            if term[adjacency[k]] == 0:
+                term[adjacency[k]] = depth
+        term = self.term2.data.as_ints
+        start = self.start2.data.as_ints
+        adjacency = self.adjacency2.data.as_ints
+        if term[index2] == 0:
+            term[index2] = depth
+        for k in range(start[index2], start[index2 + 1]):
+            if term[adjacency[k]] == 0:
+                term[adjacency[k]] = depth
+
+    cdef remove_from_mapping(self, int index1, int index2):
         """
-        Remove as valid a mapping of vertex `vertex1` from the first graph to
-        vertex `vertex2` from the second graph, and update the terminals
+        Remove as valid a mapping of vertex `index1` from the first graph to
+        vertex `index2` from the second graph, and update the terminals
         status accordingly.        
         """
-        cdef Vertex v, v2
+        cdef int k, depth
+        cdef int *start
+        cdef int *adjacency
+        cdef int *term
 
-        # Unmap the vertices from one another
-        vertex1.mapping = None
-        vertex2.mapping = None
+        depth = self.depth
 
-        # Restore these vertices to the set of terminals
-        for v in vertex1.edges:
-            if v.mapping is not None:
-                vertex1.terminal = True
-                break
-            else:
-                vertex1.terminal = False
-        for v in vertex2.edges:
-            if v.mapping is not None:
-                vertex2.terminal = True
-                break
-            else:
-                vertex2.terminal = False
-
-        # Recompute the terminal status of any neighboring atoms
-        for v in vertex1.edges:
-            if v.mapping is not None: continue
-            for v2 in v.edges:
-                if v2.mapping is not None:
-                    v.terminal = True
-                    break
-            else:
-                v.terminal = False
-        for v in vertex2.edges:
-            if v.mapping is not None: continue
-            for v2 in v.edges:
-                if v2.mapping is not None:
-                    v.terminal = True
-                    break
-            else:
-                v.terminal = False
+        # Unmap the vertices from one another
+        self.core1.data.as_ints[index1] = -1
+        self.core2.data.as_ints[index2] = -1
+
+        # Remove the vertices that were added to the terminals by this pair
+        term = self.term1.data.as_ints
+        start = self.start1.data.as_ints
+        adjacency = self.adjacency1.data.as_ints
+        if term[index1] == depth:
+            term[index1] = 0
+        for k in range(start[index1], start[index1 + 1]):
+            if term[adjacency[k]] == depth:
+                term[adjacency[k]] = 0
+        term = self.term2.data.as_ints
+        start = self.start2.data.as_ints
+        adjacency = self.adjacency2.data.as_ints
+        if term[index2] == depth:
+            term[index2] = 0
+        for k in range(start[index2], start[index2 + 1]):
+            if term[adjacency[k]] == depth:
+                term[adjacency[k]] = 0
+
+        self.depth -= 1
@@ -34,6 +34,7 @@ from multiprocessing import Pool
 import rmgpy.qm.gaussian
 import rmgpy.qm.mopac
 from rmgpy.data.thermo import ThermoLibrary
+from rmgpy.rmg.wire import decode_molecule, encode_molecule
 
 
 class QMSettings(object):
@@ -253,8 +254,10 @@ class QMCalculator(object):
                     _write_qm_files_star(qm_arg)
             elif procnum > 1:
                 logging.info('Writing QM files with {0} processes.'.format(procnum))
-                p = Pool(processes=procnum)
-                p.map(_write_qm_files_star, qm_arg_list)
+                # The calculator is sent once per worker and the molecules in
+                # the compact format of rmgpy.rmg.wire
+                p = Pool(processes=procnum, initializer=_init_qm_worker, initargs=(self,))
+                p.map(_write_qm_files_encoded, [encode_molecule(mol) for mol in mol_list])
                 p.close()
                 p.join()
 
@@ -271,6 +274,23 @@ def _write_qm_files(quantum_mechanics, mol):
     quantum_mechanics.get_thermo_data(mol)
 
 
+_qm_worker = None
+
+
+def _init_qm_worker(quantum_mechanics):
+    """
+    Pool initializer for QM workers, the calculator is only transferred once
+    per worker rather than once per molecule
+    """
+    global _qm_worker
+    _qm_worker = quantum_mechanics
+
+
+def _write_qm_files_encoded(data):
+    """Wrapper to decode a molecule encoded by :func:`encode_molecule` for use with map"""
+    return _write_qm_files(_qm_worker, decode_molecule(data))
+
+
 def save(rmg):
     # Save the QM thermo to a library if QM was turned on
     if rmg.quantum_mechanics:
@@ -1336,9 +1336,9 @@ def pressure_dependence(
 
 
 def options(name='Seed', generateSeedEachIteration=True, saveSeedToDatabase=False, units='si', saveRestartPeriod=None,
-            generateOutputHTML=False, generatePlots=False, saveSimulationProfiles=False, verboseComments=False,
-            saveEdgeSpecies=False, keepIrreversible=False, trimolecularProductReversible=True, wallTime='00:00:00:00',
-            saveSeedModulus=-1):
+            generateOutputHTML=False, outputImageFormat='png', generatePlots=False, saveSimulationProfiles=False,
+            verboseComments=False, saveEdgeSpecies=False, keepIrreversible=False, trimolecularProductReversible=True,
+            wallTime='00:00:00:00', saveSeedModulus=-1, thermoCache=None, thermoCacheReadOnly=False):
     if saveRestartPeriod:
         logging.warning("`saveRestartPeriod` flag was set in the input file, but this feature has been removed. Please "
                         "remove this line from the input file. This will throw an error after RMG-Py 3.1. For "
@@ -1352,6 +1352,9 @@ def options(name='Seed', generateSeedEachIteration=True, saveSeedToDatabase=Fals
     if generateOutputHTML:
         logging.warning('Generate Output HTML option was turned on. Note that this will slow down model generation.')
     rmg.generate_output_html = generateOutputHTML
+    if outputImageFormat not in ('png', 'svg'):
+        raise InputError("outputImageFormat should be either 'png' or 'svg', not {0!r}".format(outputImageFormat))
+    rmg.output_image_format = outputImageFormat
     rmg.generate_plots = generatePlots
     rmg.save_simulation_profiles = saveSimulationProfiles
     rmg.verbose_comments = verboseComments
@@ -1363,6 +1366,8 @@ def options(name='Seed', generateSeedEachIteration=True, saveSeedToDatabase=Fals
     rmg.trimolecular_product_reversible = trimolecularProductReversible
     rmg.walltime = wallTime
     rmg.save_seed_modulus = saveSeedModulus
+    rmg.thermo_cache_path = os.path.abspath(os.path.expandvars(thermoCache)) if thermoCache else None
+    rmg.thermo_cache_read_only = thermoCacheReadOnly
 
 
 def generated_species_constraints(**kwargs):
@@ -1800,6 +1805,8 @@ def save_input_file(path, rmg):
     f.write('options(\n')
     f.write('    units = "{0}",\n'.format(rmg.units))
     f.write('    generateOutputHTML = {0},\n'.format(rmg.generate_output_html))
+    if rmg.output_image_format != 'png':
+        f.write('    outputImageFormat = {0!r},\n'.format(rmg.output_image_format))
     f.write('    generatePlots = {0},\n'.format(rmg.generate_plots))
     f.write('    saveSimulationProfiles = {0},\n'.format(rmg.save_simulation_profiles))
     f.write('    saveEdgeSpecies = {0},\n'.format(rmg.save_edge_species))
@@ -1807,6 +1814,9 @@ def save_input_file(path, rmg):
     f.write('    trimolecularProductReversible = {0},\n'.format(rmg.trimolecular_product_reversible))
     f.write('    verboseComments = {0},\n'.format(rmg.verbose_comments))
     f.write('    wallTime = {0},\n'.format(rmg.walltime))
+    if rmg.thermo_cache_path:
+        f.write('    thermoCache = {0!r},\n'.format(rmg.thermo_cache_path))
+        f.write('    thermoCacheReadOnly = {0},\n'.format(rmg.thermo_cache_read_only))
     f.write(')\n\n')
 
     f.close()
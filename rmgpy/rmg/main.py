@@ -67,6 +67,7 @@ from rmgpy.data.vaporLiquidMassTransfer import vapor_liquid_mass_transfer
 from rmgpy.kinetics import ThirdBody
 from rmgpy.kinetics import Troe
 from rmgpy.molecule import Molecule
+from rmgpy.molecule.cache import identifier_cache, resonance_cache, symmetry_number_cache
 from rmgpy.qm.main import QMDatabaseWriter
 from rmgpy.reaction import Reaction
 from rmgpy.rmg.listener import SimulationProfileWriter, SimulationProfilePlotter
@@ -76,6 +77,7 @@ from rmgpy.rmg.settings import ModelSettings
 from rmgpy.solver.base import TerminationTime, TerminationConversion
 from rmgpy.solver.simple import SimpleReactor
 from rmgpy.stats import ExecutionStatsWriter
+from rmgpy.thermo.cache import thermo_cache
 from rmgpy.thermo.thermoengine import submit
 from rmgpy.tools.plot import plot_sensitivity
 from rmgpy.tools.uncertainty import Uncertainty, process_local_results
@@ -138,6 +140,7 @@ class RMG(util.Subject):
     `verbosity`                                                The level of logging verbosity for console output
     `units`                                                    The unit system to use to save output files (currently must be 'si')
     `generate_output_html`                                     ``True`` to draw pictures of the species and reactions, saving a visualized model in an output HTML file.  ``False`` otherwise
+    `output_image_format`                                      The format of the species pictures in the output HTML file, ``'png'`` or ``'svg'``
     `generate_plots`                                           ``True`` to generate plots of the job execution statistics after each iteration, ``False`` otherwise
     `verbose_comments`                                         ``True`` to keep the verbose comments for database estimates, ``False`` otherwise
     `save_edge_species`                                        ``True`` to save chemkin and HTML files of the edge species, ``False`` otherwise
@@ -216,6 +219,7 @@ class RMG(util.Subject):
         self.verbosity = logging.INFO
         self.units = "si"
         self.generate_output_html = None
+        self.output_image_format = 'png'
         self.generate_plots = None
         self.save_simulation_profiles = None
         self.verbose_comments = None
@@ -229,6 +233,8 @@ class RMG(util.Subject):
         self.species_constraints = {}
         self.walltime = "00:00:00:00"
         self.save_seed_modulus = -1
+        self.thermo_cache_path = None
+        self.thermo_cache_read_only = False
         self.max_iterations = None
         self.initialization_time = 0
         self.kinetics_datastore = None
@@ -459,6 +465,7 @@ class RMG(util.Subject):
                 )
             logging.info("Adding {0} to the forbidden structures database...".format(label))
             self.database.forbidden_structures.entries[label] = forbidden_structure_entry
+            self.database.forbidden_structures.reset_index()
 
         if self.kinetics_estimator == "rate rules":
             if "!training" not in self.kinetics_depositories:
@@ -549,6 +556,10 @@ class RMG(util.Subject):
         # Load databases
         self.load_database()
 
+        if self.thermo_cache_path:
+            thermo_cache.connect(self.thermo_cache_path, self.thermo_cache_read_only)
+            logging.info("Using thermo cache {0}".format(self.thermo_cache_path))
+
         for spec in self.initial_species:
             self.reaction_model.add_species_to_edge(spec)
 
@@ -726,7 +737,7 @@ class RMG(util.Subject):
         self.attach(RMSWriter(self.output_directory))
 
         if self.generate_output_html:
-            self.attach(OutputHTMLWriter(self.output_directory))
+            self.attach(OutputHTMLWriter(self.output_directory, self.output_image_format))
 
         if self.quantum_mechanics:
             self.attach(QMDatabaseWriter())
@@ -2050,6 +2061,12 @@ class RMG(util.Subject):
             logging.info(textwrap.fill(quote, subsequent_indent=" "))
             logging.info("             ---Quote-generating neural network, {}".format(datetime.datetime.now().strftime("%B %Y")))
 
+        resonance_cache.log_statistics()
+        symmetry_number_cache.log_statistics()
+        identifier_cache.log_statistics()
+        if thermo_cache.enabled:
+            thermo_cache.log_statistics()
+
         # Log end timestamp
         logging.info("")
         logging.info("RMG execution terminated at " + time.asctime())
@@ -41,11 +41,13 @@ import numpy as np
 import rmgpy.data.rmg
 from rmgpy import settings
 from rmgpy.constraints import fails_species_constraints, pass_cutting_threshold
+from rmgpy.data.kinetics.common import get_reactant_key
 from rmgpy.data.kinetics.depository import DepositoryReaction
 from rmgpy.data.kinetics.family import KineticsFamily, TemplateReaction
 from rmgpy.data.kinetics.library import KineticsLibrary, LibraryReaction
 from rmgpy.data.vaporLiquidMassTransfer import vapor_liquid_mass_transfer
 from rmgpy.molecule.group import Group
+from rmgpy.molecule.query import MoleculeCollection, MoleculeQuery
 from rmgpy.data.rmg import get_db
 from rmgpy.display import display
 from rmgpy.exceptions import ForbiddenStructureException
@@ -101,15 +103,14 @@ class ReactionModel:
         # Determine which species in other are already in self
         common_species = {}
         unique_species = []
+        collection = MoleculeCollection.from_species(final_model.species)
         for spec in other.species:
-            for spec0 in final_model.species:
-                if spec.is_isomorphic(spec0):
-                    common_species[spec] = spec0
-                    if spec0.label not in ["Ar", "N2", "Ne", "He"]:
-                        if not spec0.thermo.is_identical_to(spec.thermo):
-                            print("Species {0} thermo from model 1 did not match that of model 2.".format(spec.label))
-
-                    break
+            for spec0 in MoleculeQuery(spec.molecule).find_in(collection, first=True):
+                common_species[spec] = spec0
+                if spec0.label not in ["Ar", "N2", "Ne", "He"]:
+                    if not spec0.thermo.is_identical_to(spec.thermo):
+                        print("Species {0} thermo from model 1 did not match that of model 2.".format(spec.label))
+                break
             else:
                 unique_species.append(spec)
 
@@ -719,15 +720,10 @@ class CoreEdgeReactionModel:
         new_core_reactions = self.core.reactions[num_old_core_reactions:]
         new_edge_reactions = self.edge.reactions[num_old_edge_reactions:]
         checked_reactions = self.core.reactions[:num_old_core_reactions] + self.edge.reactions[:num_old_edge_reactions]
-        from rmgpy.chemkin import mark_duplicate_reaction
-
-        for rxn in new_core_reactions:
-            mark_duplicate_reaction(rxn, checked_reactions)
-            checked_reactions.append(rxn)
         if self.save_edge_species:
-            for rxn in new_edge_reactions:
-                mark_duplicate_reaction(rxn, checked_reactions)
-                checked_reactions.append(rxn)
+            mark_new_duplicate_reactions(new_core_reactions + new_edge_reactions, checked_reactions)
+        else:
+            mark_new_duplicate_reactions(new_core_reactions, checked_reactions)
         self.log_enlarge_summary(
             new_core_species=self.core.species[num_old_core_species:],
             new_core_reactions=self.core.reactions[num_old_core_reactions:],
@@ -1820,13 +1816,9 @@ class CoreEdgeReactionModel:
                 self.add_reaction_to_edge(rxn)
 
         if self.save_edge_species:
-            from rmgpy.chemkin import mark_duplicate_reaction
-
             new_edge_reactions = self.edge.reactions[num_old_edge_reactions:]
             checked_reactions = self.core.reactions + self.edge.reactions[:num_old_edge_reactions]
-            for rxn in new_edge_reactions:
-                mark_duplicate_reaction(rxn, checked_reactions)
-                checked_reactions.append(rxn)
+            mark_new_duplicate_reactions(new_edge_reactions, checked_reactions)
 
         self.log_enlarge_summary(
             new_core_species=[],
@@ -2022,11 +2014,18 @@ class CoreEdgeReactionModel:
         Call this if you've done something that may have introduced undetected duplicate reactions,
         like add a reaction library or seed mechanism.
         Anything added via the :meth:`expand` method should already be detected.
+
+        Each reaction is only compared to the following reactions with the
+        same :func:`get_reactant_key` on either side, in the same order as
+        :func:`rmgpy.chemkin.mark_duplicate_reactions` compares them.
         """
-        from rmgpy.chemkin import mark_duplicate_reactions
+        from rmgpy.chemkin import mark_duplicate_reaction
 
         rxn_list = self.core.reactions + self.output_reaction_list
-        mark_duplicate_reactions(rxn_list)
+        index = index_reactions_by_reactants(rxn_list)
+        for position, rxn in enumerate(rxn_list):
+            mark_duplicate_reaction(rxn, [rxn0 for position0, rxn0 in get_duplicate_candidates(index, rxn)
+                                          if position0 > position])
 
     def register_reaction(self, rxn):
         """
@@ -2192,6 +2191,52 @@ def get_family_library_object(label):
     )
 
 
+def index_reactions_by_reactants(reactions):
+    """
+    Return a dictionary mapping the :func:`get_reactant_key` of the reactants
+    of each of the `reactions` to the list of (position, reaction) pairs with
+    those reactants, so that the candidate Chemkin duplicates of a reaction
+    can be found without comparing it to every other reaction.
+    """
+    index = {}
+    for position, rxn in enumerate(reactions):
+        index.setdefault(get_reactant_key(rxn.reactants), []).append((position, rxn))
+    return index
+
+
+def get_duplicate_candidates(index, rxn):
+    """
+    Return the (position, reaction) pairs of `index` from
+    :func:`index_reactions_by_reactants` whose reactants have the same
+    :func:`get_reactant_key` as the reactants or the products of `rxn`,
+    ordered by their position.
+    """
+    keys = {get_reactant_key(rxn.reactants), get_reactant_key(rxn.products)}
+    candidates = []
+    for key in keys:
+        candidates.extend(index.get(key, []))
+    candidates.sort(key=lambda candidate: candidate[0])
+    return candidates
+
+
+def mark_new_duplicate_reactions(new_reactions, checked_reactions):
+    """
+    Mark the Chemkin duplicates of each of the `new_reactions` among the
+    `checked_reactions` and the preceding new reactions, as calling
+    :func:`rmgpy.chemkin.mark_duplicate_reaction` for each new reaction in
+    turn does, but only compare the reactions found by
+    :func:`get_duplicate_candidates`.
+    """
+    from rmgpy.chemkin import mark_duplicate_reaction
+
+    index = index_reactions_by_reactants(checked_reactions)
+    position = len(checked_reactions)
+    for rxn in new_reactions:
+        mark_duplicate_reaction(rxn, [rxn0 for position0, rxn0 in get_duplicate_candidates(index, rxn)])
+        index.setdefault(get_reactant_key(rxn.reactants), []).append((position, rxn))
+        position += 1
+
+
 def get_key(spc):
     """
     Returns a string of the species that can serve as a key in a dictionary.
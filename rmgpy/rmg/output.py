@@ -32,10 +32,12 @@ This module contains functionality for saving the output of RMG jobs to output
 files.
 """
 
+import hashlib
 import logging
 import os.path
 import re
 import textwrap
+from concurrent.futures import ProcessPoolExecutor
 
 from rmgpy.chemkin import get_species_identifier
 from rmgpy.exceptions import OutputError
@@ -44,20 +46,89 @@ from rmgpy.util import make_output_subdirectory
 
 ################################################################################
 
-def save_output_html(path, reaction_model, part_core_edge='core'):
+def get_species_image_name(spec, file_format='png'):
+    """
+    Return the file name of the drawing of species `spec`. The name is derived
+    from the structure of its first molecule rather than from its label, so
+    that renamed species and species shared between models reuse the same
+    drawing.
+    """
+    molecule = spec.molecule[0]
+    try:
+        identifier = molecule.to_smiles()
+    except Exception:
+        # The SMILES string only helps to separate molecules with equal canonical hashes
+        identifier = molecule.to_adjacency_list()
+    key = '{0} {1:d} {2}'.format(identifier, molecule.multiplicity, molecule.get_canonical_hash())
+    return '{0}.{1}'.format(hashlib.sha1(key.encode()).hexdigest()[:20], file_format)
+
+
+def _draw_molecule(molecule, file_format, path):
+    """
+    Draw `molecule` to the file `path`. This function is run in the worker
+    processes of :func:`draw_species_images`.
+    """
+    from rmgpy.molecule.draw import MoleculeDrawer
+    MoleculeDrawer().draw(molecule, file_format, path)
+
+
+def draw_species_images(species_list, directory, file_format='png', processes=None):
+    """
+    Draw the first molecule of each species in `species_list` to the folder
+    `directory`, and return the file names of the drawings keyed by the id
+    of each species. Drawings that already exist are reused, and the missing
+    ones are drawn in a pool of `processes` worker processes, which defaults
+    to the number of processes RMG is allowed to use. The `file_format` can be
+    ``'png'`` or ``'svg'``; SVG drawings skip rasterization and are rendered
+    by the browser.
+    """
+    image_names = {}
+    missing = {}
+    for spec in species_list:
+        if id(spec) in image_names:
+            continue
+        try:
+            name = get_species_image_name(spec, file_format)
+        except IndexError:
+            message = ('{0} species could not be drawn because it did not contain a molecular structure. '
+                       'Please recheck your files.'.format(get_species_identifier(spec)))
+            logging.error(message)
+            raise OutputError(message)
+        image_names[id(spec)] = name
+        path = os.path.join(directory, name)
+        if path not in missing and not os.path.exists(path):
+            missing[path] = spec.molecule[0]
+
+    if processes is None:
+        from rmgpy.rmg.main import determine_procnum_from_ram
+        processes = determine_procnum_from_ram()
+    # Starting the pool is only worthwhile for more than a few drawings
+    if processes > 1 and len(missing) > 2 * processes:
+        with ProcessPoolExecutor(processes) as executor:
+            futures = [executor.submit(_draw_molecule, molecule, file_format, path)
+                       for path, molecule in missing.items()]
+            for future in futures:
+                future.result()
+    else:
+        for path, molecule in missing.items():
+            _draw_molecule(molecule, file_format, path)
+
+    return image_names
+
+
+def save_output_html(path, reaction_model, part_core_edge='core', image_format='png'):
     """
     Save the current set of  species and reactions of `reactionModel` to
     an HTML file `path` on disk. As part of this process, drawings of all 
     species are created in the species folder (if they don't already exist)
-    using the :mod:`rmgpy.molecule.draw` module. The :mod:`jinja`
+    using the :mod:`rmgpy.molecule.draw` module, in the `image_format`
+    ``'png'`` or ``'svg'``. The :mod:`jinja`
     package is used to generate the HTML; if this package is not found, no
     HTML will be generated (but the program will carry on).
     """
 
     from rmgpy.rmg.model import PDepReaction
 
-    from rmgpy.molecule.draw import MoleculeDrawer
-
     try:
         import jinja2
     except ImportError:
@@ -88,17 +159,11 @@ def save_output_html(path, reaction_model, part_core_edge='core'):
         if match:
             spec.index = int(match.group(0)[1:-1])
             spec.label = spec.label[0:match.start()]
-        # Draw molecules if necessary
-        fstr = os.path.join(dirname, 'species', '{0}.png'.format(spec))
-        if not os.path.exists(fstr):
-            try:
-                MoleculeDrawer().draw(spec.molecule[0], 'png', fstr)
-            except IndexError:
-                logging.error("{0} species could not be drawn because it did not contain a molecular structure. "
-                              "Please recheck your files.".format(get_species_identifier(spec)))
-                raise
         # spec.thermo.comment=
         # Text wrap the thermo comments
+
+    # Draw molecules if necessary
+    image_names = draw_species_images(species, os.path.join(dirname, 'species'), image_format)
     # We want to keep species sorted in the original order in which they were added to the RMG core.
     # Rather than ordered by index
     #    species.sort(key=lambda x: x.index)
@@ -133,8 +198,13 @@ def save_output_html(path, reaction_model, part_core_edge='core'):
         """Replace unsafe CSS class name characters with an underscore."""
         return to_remove_from_css_names.sub('_', input)
 
+    def image(spec):
+        """Return the file name of the drawing of a species."""
+        return image_names.get(id(spec)) or get_species_image_name(spec, image_format)
+
     environment = jinja2.Environment()
     environment.filters['csssafe'] = csssafe
+    environment.filters['image'] = image
 
     # Make HTML file
     template = environment.from_string(
@@ -428,7 +498,7 @@ $(document).ready(function() {
 
  </td>
     
-    <td class="structure" valign="top"><a href={{ spec.molecule[0].get_url() }}><img src="species/{{ spec|replace('#','%23') }}.png" alt="{{ get_species_identifier(spec) }}" title="{{ get_species_identifier(spec) }}"></a></td>
+    <td class="structure" valign="top"><a href={{ spec.molecule[0].get_url() }}><img loading="lazy" src="species/{{ spec|image }}" alt="{{ get_species_identifier(spec) }}" title="{{ get_species_identifier(spec) }}"></a></td>
     <td class="label" valign="top">{{ get_species_identifier(spec) }}</td>
     <td class="SMILES" valign="top">{{ spec.molecule[0].to_smiles() }}</td>
     
@@ -477,9 +547,9 @@ $(document).ready(function() {
 <tbody class="reaction">
 <tr class="{{ rxn.get_source()|csssafe }} rxnStart">
     <td class="index"><a href="{{ rxn.get_url() }}" title="Search on RMG website" class="searchlink">{{ rxn.index }}.</a></td>
-    <td class="reactants">{% for reactant in rxn.reactants %}<a href="{{ reactant.molecule[0].get_url() }}"><img src="species/{{ reactant|replace('#','%23') }}.png" alt="{{ get_species_identifier(reactant) }}" title="{{ get_species_identifier(reactant) }}, MW = {{ "%.2f g/mol"|format(reactant.molecule[0].get_molecular_weight() * 1000) }}" {% if reactant.contains_surface_site() %}class="surface_species" {% endif %}></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
+    <td class="reactants">{% for reactant in rxn.reactants %}<a href="{{ reactant.molecule[0].get_url() }}"><img loading="lazy" src="species/{{ reactant|image }}" alt="{{ get_species_identifier(reactant) }}" title="{{ get_species_identifier(reactant) }}, MW = {{ "%.2f g/mol"|format(reactant.molecule[0].get_molecular_weight() * 1000) }}" {% if reactant.contains_surface_site() %}class="surface_species" {% endif %}></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
     <td class="reactionArrow">{% if rxn.reversible %}&hArr;{% else %}&rarr;{% endif %}</td>
-    <td class="products">{% for product in rxn.products %}<a href="{{ product.molecule[0].get_url() }}"><img src="species/{{ product|replace('#','%23') }}.png" alt="{{ get_species_identifier(product) }}" title="{{ get_species_identifier(product) }}, MW = {{ "%.2f g/mol"|format(product.molecule[0].get_molecular_weight() * 1000) }}" {% if product.contains_surface_site() %}class="surface_species" {% endif %}></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
+    <td class="products">{% for product in rxn.products %}<a href="{{ product.molecule[0].get_url() }}"><img loading="lazy" src="species/{{ product|image }}" alt="{{ get_species_identifier(product) }}" title="{{ get_species_identifier(product) }}, MW = {{ "%.2f g/mol"|format(product.molecule[0].get_molecular_weight() * 1000) }}" {% if product.contains_surface_site() %}class="surface_species" {% endif %}></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
     <td class="family">{{ rxn.get_source() }}</td>
 </tr>
 <tr class="kinetics {{ rxn.get_source()|csssafe }} hide_kinetics">
@@ -515,15 +585,15 @@ $(document).ready(function() {
 
 
 def save_diff_html(path, common_species_list, species_list1, species_list2, common_reactions, unique_reactions1,
-                   unique_reactions2):
+                   unique_reactions2, image_format='png'):
     """
     This function outputs the species and reactions on an HTML page
-    for the comparison of two RMG models.
+    for the comparison of two RMG models. The species are drawn in the
+    `image_format` ``'png'`` or ``'svg'``.
     """
     from rmgpy.rmg.model import PDepReaction
     from rmgpy.kinetics import MultiArrhenius, MultiPDepArrhenius
 
-    from rmgpy.molecule.draw import MoleculeDrawer
     try:
         import jinja2
     except ImportError:
@@ -560,51 +630,11 @@ def save_diff_html(path, common_species_list, species_list1, species_list2, comm
             spec2.index = int(match2.group(0)[1:-1])
             spec2.label = spec2.label[0:match2.start()]
 
-            # Draw molecules if necessary
-        fstr = os.path.join(dirname, 'species1', '{0}.png'.format(spec1))
-        if not os.path.exists(fstr):
-            try:
-                MoleculeDrawer().draw(spec1.molecule[0], 'png', fstr)
-            except IndexError:
-                raise OutputError('{0} species could not be drawn because it did not contain a molecular structure. '
-                                  'Please recheck your files.'.format(get_species_identifier(spec1)))
-
-        fstr = os.path.join(dirname, 'species2', '{0}.png'.format(spec2))
-        if not os.path.exists(fstr):
-            try:
-                MoleculeDrawer().draw(spec2.molecule[0], 'png', fstr)
-            except IndexError:
-                raise OutputError(
-                    '{0} species could not be drawn because it did not contain a molecular structure. Please recheck '
-                    'your files.'.format(get_species_identifier(spec2)))
-
-    for spec in species_list1:
-        match = re_index.search(spec.label)
-        if match:
-            spec.index = int(match.group(0)[1:-1])
-            spec.label = spec.label[0:match.start()]
-        # Draw molecules if necessary
-        fstr = os.path.join(dirname, 'species1', '{0}.png'.format(spec))
-        if not os.path.exists(fstr):
-            try:
-                MoleculeDrawer().draw(spec.molecule[0], 'png', fstr)
-            except IndexError:
-                raise OutputError('{0} species could not be drawn because it did not contain a molecular structure. '
-                                  'Please recheck your files.'.format(get_species_identifier(spec)))
-
-    for spec in species_list2:
+    for spec in species_list1 + species_list2:
         match = re_index.search(spec.label)
         if match:
             spec.index = int(match.group(0)[1:-1])
             spec.label = spec.label[0:match.start()]
-        # Draw molecules if necessary
-        fstr = os.path.join(dirname, 'species2', '{0}.png'.format(spec))
-        if not os.path.exists(fstr):
-            try:
-                MoleculeDrawer().draw(spec.molecule[0], 'png', fstr)
-            except IndexError:
-                raise OutputError('{0} species could not be drawn because it did not contain a molecular structure. '
-                                  'Please recheck your files.'.format(get_species_identifier(spec)))
 
     # Add pictures for species that may not have different thermo but are in reactions with different kinetics
     all_rxns = [rxnTuple[0] for rxnTuple in common_reactions] + unique_reactions1 + unique_reactions2
@@ -621,14 +651,12 @@ def save_diff_html(path, common_species_list, species_list1, species_list2, comm
         if match:
             spec.index = int(match.group(0)[1:-1])
             spec.label = spec.label[0:match.start()]
-        # Draw molecules if necessary
-        fstr = os.path.join(dirname, 'species2', '{0}.png'.format(spec))
-        if not os.path.exists(fstr):
-            try:
-                MoleculeDrawer().draw(spec.molecule[0], 'png', fstr)
-            except IndexError:
-                raise OutputError('{0} species could not be drawn because it did not contain a molecular structure. '
-                                  'Please recheck your files.'.format(get_species_identifier(spec)))
+
+    # Draw molecules if necessary
+    image_names = draw_species_images([spec1 for spec1, spec2 in common_species_list] + species_list1,
+                                      os.path.join(dirname, 'species1'), image_format)
+    image_names.update(draw_species_images([spec2 for spec1, spec2 in common_species_list] + species_list2
+                                           + list(all_species), os.path.join(dirname, 'species2'), image_format))
 
     family_count1 = {}
     family_count2 = {}
@@ -678,8 +706,13 @@ def save_diff_html(path, common_species_list, species_list1, species_list2, comm
         """Replace unsafe CSS class name characters with an underscore."""
         return to_remove_from_css_names.sub('_', input)
 
+    def image(spec):
+        """Return the file name of the drawing of a species."""
+        return image_names.get(id(spec)) or get_species_image_name(spec, image_format)
+
     environment = jinja2.Environment()
     environment.filters['csssafe'] = csssafe
+    environment.filters['image'] = image
 
     # Make HTML file
     template = environment.from_string(
@@ -880,7 +913,7 @@ $(document).ready(function() {
                 <tr><th>Structure</th><th>SMILES</th><th>MW (g/mol)</th></tr>
                 <tr>
                     <td>{{ spec1.molecule[0].to_smiles() }}</td>
-                    <td class="structure" align="center"><a href="{{spec1.molecule[0].get_url()}}"><img src="species1/{{ spec1|replace('#','%23') }}.png"></a></td>
+                    <td class="structure" align="center"><a href="{{spec1.molecule[0].get_url()}}"><img loading="lazy" src="species1/{{ spec1|image }}"></a></td>
                     <td>{{ "%.2f"|format(spec1.molecule[0].get_molecular_weight() * 1000) }}</td>
                 </tr>
             </table>
@@ -992,7 +1025,7 @@ $(document).ready(function() {
     <tr class="species">
         <td class="index">
         {{ spec.index }}.</td>
-        <td class="structure"><a href="{{ spec.molecule[0].get_url() }}"><img src="species1/{{ spec|replace('#','%23') }}.png" alt="{{ get_species_identifier(spec) }}" title="{{ get_species_identifier(spec) }}"></a></td>
+        <td class="structure"><a href="{{ spec.molecule[0].get_url() }}"><img loading="lazy" src="species1/{{ spec|image }}" alt="{{ get_species_identifier(spec) }}" title="{{ get_species_identifier(spec) }}"></a></td>
         <td class="label">{{ get_species_identifier(spec) }}</td>
         <td>{{spec.molecule[0].to_smiles()}}</td>
         <td>{{ "%.2f"|format(spec.molecule[0].get_molecular_weight() * 1000) }}</td>
@@ -1041,7 +1074,7 @@ $(document).ready(function() {
     <tr class="species">
         <td class="index">
         {{ spec.index }}.</td>
-        <td class="structure"><a href="{{ spec.molecule[0].get_url() }}"><img src="species2/{{ spec|replace('#','%23') }}.png" alt="{{ get_species_identifier(spec) }}" title="{{ get_species_identifier(spec) }}"></a></td>
+        <td class="structure"><a href="{{ spec.molecule[0].get_url() }}"><img loading="lazy" src="species2/{{ spec|image }}" alt="{{ get_species_identifier(spec) }}" title="{{ get_species_identifier(spec) }}"></a></td>
         <td class="label">{{ get_species_identifier(spec) }}</td>
         <td>{{spec.molecule[0].to_smiles()}}</td>
         <td>{{ "%.2f"|format(spec.molecule[0].get_molecular_weight() * 1000) }}</td>
@@ -1138,9 +1171,9 @@ $(document).ready(function() {
 <td width=100% colspan="4">
 <table align="center">
 <tr>
-    <td class="reactants" align="right">{% for reactant in rxn1.reactants %}<a href="{{reactant.molecule[0].get_url() }}"><img src="species1/{{ reactant|replace('#','%23') }}.png" alt="{{ reactant }}" title="{{ reactant }}, MW = {{ "%.2f"|format(reactant.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
+    <td class="reactants" align="right">{% for reactant in rxn1.reactants %}<a href="{{reactant.molecule[0].get_url() }}"><img loading="lazy" src="species1/{{ reactant|image }}" alt="{{ reactant }}" title="{{ reactant }}, MW = {{ "%.2f"|format(reactant.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
     <td class="reactionArrow" align="center">{% if rxn1.reversible %}&hArr;{% else %}&rarr;{% endif %}</td>
-    <td class="products" align="left">{% for product in rxn1.products %}<a href="{{product.molecule[0].get_url()}}"><img src="species1/{{ product|replace('#','%23') }}.png" alt="{{ product }}" title="{{ product }}, MW = {{ "%.2f"|format(product.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
+    <td class="products" align="left">{% for product in rxn1.products %}<a href="{{product.molecule[0].get_url()}}"><img loading="lazy" src="species1/{{ product|image }}" alt="{{ product }}" title="{{ product }}, MW = {{ "%.2f"|format(product.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
 </tr>
 </table>
 </td>
@@ -1238,9 +1271,9 @@ $(document).ready(function() {
     {% for rxn in unique_reactions1 %}
     <tr class="reaction {{ rxn.get_source()|csssafe }}">
         <td class="index"><a href="{{ rxn.get_url() }}" title="Search on RMG website" class="searchlink">{{ rxn.index }}.</a></td>
-        <td class="reactants">{% for reactant in rxn.reactants %}<a href="{{ reactant.molecule[0].get_url() }}"><img src="species1/{{ reactant|replace('#','%23') }}.png" alt="{{ reactant }}" title="{{ reactant }}, MW = {{ "%.2f"|format(reactant.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
+        <td class="reactants">{% for reactant in rxn.reactants %}<a href="{{ reactant.molecule[0].get_url() }}"><img loading="lazy" src="species1/{{ reactant|image }}" alt="{{ reactant }}" title="{{ reactant }}, MW = {{ "%.2f"|format(reactant.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
         <td class="reactionArrow">{% if rxn.reversible %}&hArr;{% else %}&rarr;{% endif %}</td>
-        <td class="products">{% for product in rxn.products %}<a href="{{ product.molecule[0].get_url() }}"><img src="species1/{{ product|replace('#','%23') }}.png" alt="{{ product }}" title="{{ product }}, MW = {{ "%.2f"|format(product.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
+        <td class="products">{% for product in rxn.products %}<a href="{{ product.molecule[0].get_url() }}"><img loading="lazy" src="species1/{{ product|image }}" alt="{{ product }}" title="{{ product }}, MW = {{ "%.2f"|format(product.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
         <td class="family">{{ rxn.get_source() }}</td>
     </tr>
     <tr class="kinetics {{ rxn.get_source()|csssafe }}">
@@ -1272,9 +1305,9 @@ $(document).ready(function() {
     {% for rxn in unique_reactions2 %}
     <tr class="reaction {{ rxn.get_source()|csssafe }}">
         <td class="index"><a href="{{ rxn.get_url() }}" title="Search on RMG website" class="searchlink">{{ rxn.index }}.</a></td>
-        <td class="reactants">{% for reactant in rxn.reactants %}<a href="{{ reactant.molecule[0].get_url() }}"><img src="species2/{{ reactant|replace('#','%23') }}.png" alt="{{ reactant }}" title="{{ reactant }}, MW = {{ "%.2f"|format(reactant.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
+        <td class="reactants">{% for reactant in rxn.reactants %}<a href="{{ reactant.molecule[0].get_url() }}"><img loading="lazy" src="species2/{{ reactant|image }}" alt="{{ reactant }}" title="{{ reactant }}, MW = {{ "%.2f"|format(reactant.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
         <td class="reactionArrow">{% if rxn.reversible %}&hArr;{% else %}&rarr;{% endif %}</td>
-        <td class="products">{% for product in rxn.products %}<a href="{{ product.molecule[0].get_url() }}"><img src="species2/{{ product|replace('#','%23') }}.png" alt="{{ product }}" title="{{ product }}, MW = {{ "%.2f"|format(product.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
+        <td class="products">{% for product in rxn.products %}<a href="{{ product.molecule[0].get_url() }}"><img loading="lazy" src="species2/{{ product|image }}" alt="{{ product }}" title="{{ product }}, MW = {{ "%.2f"|format(product.molecule[0].get_molecular_weight() * 1000) }}"></a>{% if not loop.last %} + {% endif %}{% endfor %}</td>
         <td class="family">{{ rxn.get_source() }}</td>
     </tr>
     <tr class="kinetics {{ rxn.get_source()|csssafe }}">
@@ -1317,16 +1350,18 @@ $(document).ready(function() {
     f.close()
 
 
-def save_output(rmg):
+def save_output(rmg, image_format='png'):
     """
-    Save the current reaction model to a pretty HTML file.
+    Save the current reaction model to a pretty HTML file, with drawings of
+    the species in the `image_format` ``'png'`` or ``'svg'``.
     """
     logging.info('Saving current model core to HTML file...')
-    save_output_html(os.path.join(rmg.output_directory, 'output.html'), rmg.reaction_model, 'core')
+    save_output_html(os.path.join(rmg.output_directory, 'output.html'), rmg.reaction_model, 'core', image_format)
 
     if rmg.save_edge_species:
         logging.info('Saving current model edge to HTML file...')
-        save_output_html(os.path.join(rmg.output_directory, 'output_edge.html'), rmg.reaction_model, 'edge')
+        save_output_html(os.path.join(rmg.output_directory, 'output_edge.html'), rmg.reaction_model, 'edge',
+                         image_format)
 
 
 class OutputHTMLWriter(object):
@@ -1344,6 +1379,9 @@ class OutputHTMLWriter(object):
     Whenever the subject calls the .notify() method, the
     .update() method of the listener will be called.
 
+    The species are drawn in the `image_format` ``'png'`` or ``'svg'``;
+    SVG drawings are cheaper to make since they are rendered by the browser.
+
     To stop listening to the subject, the class can be detached
     from its subject:
 
@@ -1351,9 +1389,10 @@ class OutputHTMLWriter(object):
 
     """
 
-    def __init__(self, output_directory=''):
+    def __init__(self, output_directory='', image_format='png'):
         super(OutputHTMLWriter, self).__init__()
         make_output_subdirectory(output_directory, 'species')
+        self.image_format = image_format
 
     def update(self, rmg):
-        save_output(rmg)
+        save_output(rmg, self.image_format)
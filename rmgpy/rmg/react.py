@@ -34,6 +34,7 @@ import logging
 from multiprocessing import Pool
 
 from rmgpy.data.rmg import get_db
+from rmgpy.rmg.wire import decode_reactions, decode_species_list, encode_reactions, encode_species_list
 
 
 ################################################################################
@@ -66,8 +67,23 @@ def react(spc_fam_tuples, procnum=1):
         reactions = list(map(_react_species_star, spc_fam_tuples))
     else:
         logging.info('For reaction generation {0} processes are used.'.format(procnum))
-        p = Pool(processes=procnum)
-        reactions = p.map(_react_species_star, spc_fam_tuples)
+        # Send each species to the workers once, in the compact format of
+        # rmgpy.rmg.wire, and refer to the species by index in the tasks.
+        # The reactions are sent back in the same format.
+        species_list = []
+        species_index = {}
+        tasks = []
+        for spc_fam_tuple in spc_fam_tuples:
+            indices = []
+            for spc in spc_fam_tuple[0]:
+                if id(spc) not in species_index:
+                    species_index[id(spc)] = len(species_list)
+                    species_list.append(spc)
+                indices.append(species_index[id(spc)])
+            tasks.append((tuple(indices),) + tuple(spc_fam_tuple[1:]))
+        p = Pool(processes=procnum, initializer=_init_react_worker,
+                 initargs=(encode_species_list(species_list, properties=False),))
+        reactions = [decode_reactions(data) for data in p.map(_react_species_indices, tasks)]
         p.close()
         p.join()
 
@@ -79,6 +95,27 @@ def _react_species_star(args):
     return react_species(*args)
 
 
+_worker_species = None
+
+
+def _init_react_worker(data):
+    """
+    Pool initializer for reaction generation workers, the species are only
+    transferred and decoded once per worker rather than once per task
+    """
+    global _worker_species
+    _worker_species = decode_species_list(data)
+
+
+def _react_species_indices(args):
+    """
+    Generates the reactions of the species with the given indices in the
+    species list of the worker and returns them encoded for transfer
+    """
+    species_tuple = tuple([_worker_species[i] for i in args[0]])
+    return encode_reactions(react_species(species_tuple, *args[1:]))
+
+
 def react_species(species_tuple, only_families=None):
     """
     Given a tuple of Species objects, generates all possible reactions
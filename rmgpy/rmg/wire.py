@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains a compact format for sending molecules, species and
+reactions between processes. Pickling a :class:`Species` pickles one object
+per atom and bond, which makes the data sent to and from the workers of a
+process pool several times larger than the structures it describes. Here a
+molecule is written as an array of atom records and an array of bond records,
+the other resonance structures of a species are written as the atoms and bonds
+that differ from the first one, and the reactions of a batch refer to their
+species by position in a table of the distinct species records of the batch.
+
+The encoded data is a :mod:`marshal` string, so it must be decoded by the same
+version of Python that encoded it, as is the case for the processes of a
+:class:`multiprocessing.Pool`. Fragments, whose cutting labels cannot be
+written as atom records, are written as adjacency lists. Other objects that
+cannot be written in this format, such as reactions that were not made by a
+reaction family, are pickled instead.
+"""
+
+import marshal
+import pickle
+
+import numpy as np
+
+from rmgpy.data.kinetics.family import TemplateReaction
+from rmgpy.molecule.atomtype import ATOMTYPES
+from rmgpy.molecule.element import get_element
+from rmgpy.molecule.fragment import Fragment
+from rmgpy.molecule.molecule import Atom, Bond, Molecule
+from rmgpy.species import Species
+
+# The fields of the record of an atom and of a bond
+ATOM_DTYPE = np.dtype([('number', 'u1'), ('isotope', '<i2'), ('charge', 'i1'), ('radicals', 'i1'),
+                       ('lone_pairs', 'i1'), ('atomtype', '<i2'), ('sorting_label', '<i2')])
+BOND_DTYPE = np.dtype([('atom1', '<u2'), ('atom2', '<u2'), ('order', '<f8')])
+
+# The fields of the record of an atom or a bond that differs between resonance structures
+ATOM_CHANGE_DTYPE = np.dtype([('index', '<u2'), ('charge', 'i1'), ('radicals', 'i1'), ('lone_pairs', 'i1'),
+                              ('atomtype', '<i2'), ('sorting_label', '<i2')])
+BOND_CHANGE_DTYPE = np.dtype([('position', '<u2'), ('order', '<f8')])
+
+# The tags of the records
+_MOLECULE = 0
+_RESONANCE = 1
+_SPECIES = 2
+_REACTION = 3
+_PICKLE = 4
+_FRAGMENT = 5
+
+# The atom types in the order of their indices
+_ATOMTYPE_LIST = list(ATOMTYPES.values())
+
+_elements = {}
+
+
+def _get_element(number, isotope):
+    """
+    Return the :class:`Element` with the given atomic `number` and `isotope`.
+    """
+    try:
+        return _elements[number, isotope]
+    except KeyError:
+        element = _elements[number, isotope] = get_element(number, isotope)
+        return element
+
+
+def _dumps(obj):
+    """
+    Return `obj` pickled, or ``None`` if `obj` is empty.
+    """
+    return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL) if obj else None
+
+
+def _loads(data):
+    """
+    Return the object pickled in `data` by :func:`_dumps`.
+    """
+    return pickle.loads(data) if data is not None else None
+
+
+################################################################################
+
+
+def _get_molecule_arrays(molecule):
+    """
+    Return the atom and bond records of `molecule`, or ``None`` if it is not
+    made of :class:`Atom` and :class:`Bond` objects. Bonds are ordered by the
+    indices of their atoms.
+    """
+    if type(molecule) is not Molecule:
+        return None
+    atoms = molecule.atoms
+    index = {}
+    atom_records = []
+    for i, atom in enumerate(atoms):
+        if type(atom) is not Atom:
+            return None
+        index[id(atom)] = i
+        atomtype = atom.atomtype
+        if atomtype is None:
+            atomtype_index = -1
+        elif atomtype.index >= 0:
+            atomtype_index = atomtype.index
+        else:
+            atomtype_index = ATOMTYPES[atomtype.label].index
+        atom_records.append((atom.element.number, atom.element.isotope, atom.charge, atom.radical_electrons,
+                             atom.lone_pairs, atomtype_index, atom.sorting_label))
+    bond_records = []
+    for i, atom in enumerate(atoms):
+        for neighbor, bond in atom.edges.items():
+            j = index[id(neighbor)]
+            if j > i:
+                bond_records.append((i, j, bond.order))
+    bond_records.sort()
+    return np.array(atom_records, ATOM_DTYPE), np.array(bond_records, BOND_DTYPE)
+
+
+def _get_molecule_attributes(molecule):
+    """
+    Return a tuple of the attributes of `molecule` that are not stored in its
+    atom and bond records.
+    """
+    annotations = tuple([(i, atom.label, atom.site, atom.morphology) for i, atom in enumerate(molecule.atoms)
+                         if atom.label or atom.site or atom.morphology])
+    atoms = molecule.atoms
+    connectivity = bool(atoms) and atoms[0].connectivity1 >= 0
+    return (molecule.multiplicity, molecule.symmetry_number, molecule.reactive, molecule.metal, molecule.facet,
+            annotations, _dumps(molecule.props), connectivity)
+
+
+def _get_resonance_changes(atoms, bonds, atoms0, bonds0):
+    """
+    Return the records of the atoms and bonds in `atoms` and `bonds` that
+    differ from those in `atoms0` and `bonds0`, or ``None`` if the two
+    structures do not have the same atoms and bonded pairs of atoms.
+    """
+    if (len(atoms) != len(atoms0) or len(bonds) != len(bonds0)
+            or np.any(atoms['number'] != atoms0['number']) or np.any(atoms['isotope'] != atoms0['isotope'])
+            or np.any(bonds['atom1'] != bonds0['atom1']) or np.any(bonds['atom2'] != bonds0['atom2'])):
+        return None
+    changed = np.nonzero((atoms['charge'] != atoms0['charge']) | (atoms['radicals'] != atoms0['radicals'])
+                         | (atoms['lone_pairs'] != atoms0['lone_pairs']) | (atoms['atomtype'] != atoms0['atomtype'])
+                         | (atoms['sorting_label'] != atoms0['sorting_label']))[0]
+    atom_changes = np.empty(len(changed), ATOM_CHANGE_DTYPE)
+    atom_changes['index'] = changed
+    for field in ('charge', 'radicals', 'lone_pairs', 'atomtype', 'sorting_label'):
+        atom_changes[field] = atoms[field][changed]
+    changed = np.nonzero(bonds['order'] != bonds0['order'])[0]
+    bond_changes = np.empty(len(changed), BOND_CHANGE_DTYPE)
+    bond_changes['position'] = changed
+    bond_changes['order'] = bonds['order'][changed]
+    return atom_changes, bond_changes
+
+
+def _build_molecule(atoms, bonds, attributes):
+    """
+    Return a new :class:`Molecule` made from the atom and bond records `atoms`
+    and `bonds` and the `attributes` from :func:`_get_molecule_attributes`.
+    """
+    multiplicity, symmetry_number, reactive, metal, facet, annotations, props, connectivity = attributes
+    atom_list = []
+    for number, isotope, charge, radicals, lone_pairs, atomtype, sorting_label in atoms.tolist():
+        atom = Atom(_get_element(number, isotope), radicals, charge, '', lone_pairs)
+        if atomtype >= 0:
+            atom.atomtype = _ATOMTYPE_LIST[atomtype]
+        atom.sorting_label = sorting_label
+        atom_list.append(atom)
+    for i, label, site, morphology in annotations:
+        atom = atom_list[i]
+        atom.label = label
+        atom.site = site
+        atom.morphology = morphology
+    for i, j, order in bonds.tolist():
+        atom1 = atom_list[i]
+        atom2 = atom_list[j]
+        bond = Bond(atom1, atom2, order)
+        atom1.edges[atom2] = bond
+        atom2.edges[atom1] = bond
+    molecule = Molecule(atoms=atom_list, symmetry=symmetry_number, multiplicity=multiplicity, reactive=reactive,
+                        props=_loads(props), metal=metal, facet=facet)
+    if connectivity:
+        molecule.update_connectivity_values()
+    return molecule
+
+
+def _encode_fragment_record(fragment):
+    """
+    Return the record of `fragment`, which is stored as an adjacency list
+    together with the sorting labels of its atoms and its attributes.
+    """
+    return ((_FRAGMENT, fragment.to_adjacency_list(), tuple([atom.sorting_label for atom in fragment.atoms]),
+             fragment.label) + _get_molecule_attributes(fragment))
+
+
+def _build_fragment(record):
+    """
+    Return a new :class:`Fragment` made from a record from
+    :func:`_encode_fragment_record`.
+    """
+    _, adjlist, sorting_labels, label = record[:4]
+    multiplicity, symmetry_number, reactive, metal, facet, annotations, props, connectivity = record[4:]
+    fragment = Fragment(label=label).from_adjacency_list(adjlist, raise_atomtype_exception=False,
+                                                         raise_charge_exception=False)
+    for atom, sorting_label in zip(fragment.atoms, sorting_labels):
+        atom.sorting_label = sorting_label
+    for i, atom_label, site, morphology in annotations:
+        atom = fragment.atoms[i]
+        atom.label = atom_label
+        atom.site = site
+        atom.morphology = morphology
+    fragment.multiplicity = multiplicity
+    fragment.symmetry_number = symmetry_number
+    fragment.reactive = reactive
+    fragment.metal = metal
+    fragment.facet = facet
+    fragment.props = _loads(props) or {}
+    if connectivity:
+        fragment.update_connectivity_values()
+    return fragment
+
+
+def _encode_molecule_record(molecule):
+    """
+    Return the record of `molecule` used by :func:`encode_molecule`.
+    """
+    if type(molecule) is Fragment:
+        return _encode_fragment_record(molecule)
+    arrays = _get_molecule_arrays(molecule)
+    if arrays is None:
+        return _PICKLE, pickle.dumps(molecule, pickle.HIGHEST_PROTOCOL)
+    atoms, bonds = arrays
+    return (_MOLECULE, atoms.tobytes(), bonds.tobytes()) + _get_molecule_attributes(molecule)
+
+
+def _decode_molecule_record(record):
+    """
+    Return a new molecule made from a record from :func:`_encode_molecule_record`.
+    """
+    if record[0] == _PICKLE:
+        return pickle.loads(record[1])
+    elif record[0] == _FRAGMENT:
+        return _build_fragment(record)
+    return _build_molecule(np.frombuffer(record[1], ATOM_DTYPE), np.frombuffer(record[2], BOND_DTYPE), record[3:])
+
+
+def encode_molecule(molecule):
+    """
+    Return `molecule` encoded as a byte string.
+    """
+    return marshal.dumps(_encode_molecule_record(molecule))
+
+
+def decode_molecule(data):
+    """
+    Return a new molecule made from the byte string `data` returned by
+    :func:`encode_molecule`.
+    """
+    return _decode_molecule_record(marshal.loads(data))
+
+
+################################################################################
+
+
+def _encode_species_record(species, properties=True):
+    """
+    Return the record of `species`. The first molecule of the species is
+    stored in full and the others as the atoms and bonds that differ from it.
+    If `properties` is ``False``, the thermo, statmech, transport and energy
+    transfer data of the species are not stored.
+    """
+    if type(species) is not Species:
+        return _PICKLE, pickle.dumps(species, pickle.HIGHEST_PROTOCOL)
+    molecules = []
+    atoms0 = bonds0 = None
+    for molecule in species.molecule:
+        if type(molecule) is Fragment:
+            molecules.append(_encode_fragment_record(molecule))
+            continue
+        arrays = _get_molecule_arrays(molecule)
+        if arrays is None:
+            return _PICKLE, pickle.dumps(species, pickle.HIGHEST_PROTOCOL)
+        atoms, bonds = arrays
+        attributes = _get_molecule_attributes(molecule)
+        changes = _get_resonance_changes(atoms, bonds, atoms0, bonds0) if atoms0 is not None else None
+        if changes is None:
+            molecules.append((_MOLECULE, atoms.tobytes(), bonds.tobytes()) + attributes)
+            if atoms0 is None:
+                atoms0, bonds0 = atoms, bonds
+        else:
+            molecules.append((_RESONANCE, changes[0].tobytes(), changes[1].tobytes()) + attributes)
+    data = None
+    if properties:
+        data = (species.thermo, species.conformer, species.transport_data, species.molecular_weight,
+                species.energy_transfer_model)
+        data = _dumps(data) if any([value is not None for value in data]) else None
+    return _SPECIES, species.index, species.label, species.reactive, tuple(molecules), _dumps(species.props), data
+
+
+def _decode_species_record(record):
+    """
+    Return a new species made from a record from :func:`_encode_species_record`.
+    """
+    if record[0] == _PICKLE:
+        return pickle.loads(record[1])
+    _, index, label, reactive, molecule_records, props, data = record
+    molecules = []
+    atoms0 = bonds0 = None
+    for molecule_record in molecule_records:
+        if molecule_record[0] == _FRAGMENT:
+            molecules.append(_build_fragment(molecule_record))
+            continue
+        elif molecule_record[0] == _MOLECULE:
+            atoms = np.frombuffer(molecule_record[1], ATOM_DTYPE)
+            bonds = np.frombuffer(molecule_record[2], BOND_DTYPE)
+            if atoms0 is None:
+                atoms0, bonds0 = atoms, bonds
+        else:
+            atoms = atoms0.copy()
+            bonds = bonds0.copy()
+            atom_changes = np.frombuffer(molecule_record[1], ATOM_CHANGE_DTYPE)
+            for field in ('charge', 'radicals', 'lone_pairs', 'atomtype', 'sorting_label'):
+                atoms[field][atom_changes['index']] = atom_changes[field]
+            bond_changes = np.frombuffer(molecule_record[2], BOND_CHANGE_DTYPE)
+            bonds['order'][bond_changes['position']] = bond_changes['order']
+        molecules.append(_build_molecule(atoms, bonds, molecule_record[3:]))
+    species = Species(index=index, label=label, molecule=molecules, reactive=reactive, props=_loads(props))
+    if data is not None:
+        (species.thermo, species.conformer, species.transport_data, species.molecular_weight,
+         species.energy_transfer_model) = pickle.loads(data)
+    return species
+
+
+class _Encoder(object):
+    """
+    Collects the distinct species records of a batch. Each species object is
+    given a position in the species table, and species with identical records
+    share the record.
+    """
+
+    def __init__(self, properties=True):
+        self.properties = properties
+        self.records = []
+        self.record_index = {}
+        self.table = []
+        self.table_index = {}
+
+    def species(self, species):
+        """
+        Return the position of `species` in the species table.
+        """
+        try:
+            return self.table_index[id(species)]
+        except KeyError:
+            pass
+        record = _encode_species_record(species, self.properties)
+        try:
+            index = self.record_index[record]
+        except KeyError:
+            index = self.record_index[record] = len(self.records)
+            self.records.append(record)
+        position = self.table_index[id(species)] = len(self.table)
+        self.table.append(index)
+        return position
+
+    def reaction(self, reaction):
+        """
+        Return the record of `reaction`. Reactions that were not made by a
+        reaction family, or whose reactants, products or pairs are not species,
+        are pickled.
+        """
+        if (type(reaction) is not TemplateReaction
+                or not all([isinstance(spc, Species) for spc in reaction.reactants + reaction.products])
+                or (reaction.pairs and not all([isinstance(spc, Species) for pair in reaction.pairs for spc in pair]))
+                or (reaction.specific_collider is not None and not isinstance(reaction.specific_collider, Species))):
+            return _PICKLE, pickle.dumps(reaction, pickle.HIGHEST_PROTOCOL)
+        return (_REACTION,
+                reaction.index,
+                tuple([self.species(spc) for spc in reaction.reactants]),
+                tuple([self.species(spc) for spc in reaction.products]),
+                self.species(reaction.specific_collider) if reaction.specific_collider is not None else None,
+                _dumps(reaction.kinetics),
+                reaction.reversible,
+                _dumps(reaction.transition_state),
+                reaction.duplicate,
+                reaction.degeneracy,
+                tuple([tuple([self.species(spc) for spc in pair]) for pair in reaction.pairs])
+                if reaction.pairs is not None else None,
+                reaction.family,
+                list(reaction.template) if reaction.template is not None else None,
+                reaction.estimator,
+                self.reaction(reaction.reverse) if reaction.reverse is not None else None,
+                reaction.is_forward)
+
+    def dumps(self, items):
+        """
+        Return the byte string holding the species table and `items`.
+        """
+        return marshal.dumps((tuple(self.records), tuple(self.table), items))
+
+
+class _Decoder(object):
+    """
+    Makes the species and reactions of a batch encoded by :class:`_Encoder`.
+    Each position of the species table is made into one species object.
+    """
+
+    def __init__(self, data):
+        self.records, self.table, self.items = marshal.loads(data)
+        self.species_list = [None] * len(self.table)
+
+    def species(self, position):
+        """
+        Return the species at `position` in the species table.
+        """
+        species = self.species_list[position]
+        if species is None:
+            species = self.species_list[position] = _decode_species_record(self.records[self.table[position]])
+        return species
+
+    def reaction(self, record):
+        """
+        Return a new reaction made from a record from :meth:`_Encoder.reaction`.
+        """
+        if record[0] == _PICKLE:
+            return pickle.loads(record[1])
+        (_, index, reactants, products, specific_collider, kinetics, reversible, transition_state, duplicate,
+         degeneracy, pairs, family, template, estimator, reverse, is_forward) = record
+        return TemplateReaction(
+            index=index,
+            reactants=[self.species(position) for position in reactants],
+            products=[self.species(position) for position in products],
+            specific_collider=self.species(specific_collider) if specific_collider is not None else None,
+            kinetics=_loads(kinetics),
+            reversible=reversible,
+            transition_state=_loads(transition_state),
+            duplicate=duplicate,
+            degeneracy=degeneracy,
+            pairs=[[self.species(position) for position in pair] for pair in pairs] if pairs is not None else None,
+            family=family,
+            template=template,
+            estimator=estimator,
+            reverse=self.reaction(reverse) if reverse is not None else None,
+            is_forward=is_forward,
+        )
+
+
+def encode_species_list(species_list, properties=True):
+    """
+    Return the species in `species_list` encoded as a byte string. If
+    `properties` is ``False``, only the structures, labels, indices and
+    properties dictionaries of the species are stored, which is all that is
+    needed to generate their reactions.
+    """
+    encoder = _Encoder(properties)
+    return encoder.dumps(tuple([encoder.species(species) for species in species_list]))
+
+
+def decode_species_list(data):
+    """
+    Return a list of new species made from the byte string `data` returned by
+    :func:`encode_species_list`.
+    """
+    decoder = _Decoder(data)
+    return [decoder.species(position) for position in decoder.items]
+
+
+def encode_reactions(reactions):
+    """
+    Return the reactions in `reactions` encoded as a byte string. Species that
+    appear in more than one reaction are stored once.
+    """
+    encoder = _Encoder()
+    return encoder.dumps(tuple([encoder.reaction(reaction) for reaction in reactions]))
+
+
+def decode_reactions(data):
+    """
+    Return a list of new reactions made from the byte string `data` returned by
+    :func:`encode_reactions`. A species object that was shared between
+    reactions is also shared between the new reactions.
+    """
+    decoder = _Decoder(data)
+    return [decoder.reaction(record) for record in decoder.items]
@@ -312,6 +312,17 @@ class Species(object):
                 elif not strict:
                     return False
         elif isinstance(other, Species):
+            if strict and self.molecule and other.molecule:
+                # No pair of molecules can be isomorphic unless they share a canonical hash
+                hashes = set([molecule.get_canonical_hash() for molecule in self.molecule])
+                if not any([molecule.get_canonical_hash() in hashes for molecule in other.molecule]):
+                    # The cached hashes are out of date if atoms or bonds were modified in place,
+                    # so recompute them before rejecting, as Molecule.is_isomorphic does
+                    for molecule in self.molecule + other.molecule:
+                        molecule.reset_canonical_hash()
+                    hashes = set([molecule.get_canonical_hash() for molecule in self.molecule])
+                    if not any([molecule.get_canonical_hash() in hashes for molecule in other.molecule]):
+                        return False
             for molecule1 in self.molecule:
                 for molecule2 in other.molecule:
                     if molecule1.is_isomorphic(molecule2, generate_initial_map=generate_initial_map,
@@ -351,11 +362,11 @@ class Species(object):
         one Species in species list.
         """
         for species in species_list:
-            if isinstance(species, Species):
-                return self.is_isomorphic(species)
-            else:
+            if not isinstance(species, Species):
                 raise TypeError('Unexpected value "{0!r}" for species_list parameter;'
                                 ' should be a List of Species objects.'.format(species))
+            if self.is_isomorphic(species):
+                return True
         return False
 
     def from_adjacency_list(self, adjlist, raise_atomtype_exception=True, raise_charge_exception=True):
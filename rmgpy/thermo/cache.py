@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+"""
+This module contains the :class:`ThermoCache`, which stores the final thermo
+generated for species by :func:`rmgpy.thermo.thermoengine.generate_thermo_data`
+in an SQLite database, so that later jobs can reuse it instead of estimating
+the thermo of the same species again.
+"""
+
+import atexit
+import hashlib
+import logging
+import os
+import pathlib
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import rmgpy
+from rmgpy.molecule.query import get_molecule_key
+from rmgpy.statmech import Conformer
+
+
+class ThermoCache(object):
+    """
+    A thread-safe cache of the final thermo, including its comment and the
+    ground-state energy E0, generated for species, shared through an SQLite
+    database. Entries are keyed by :func:`~rmgpy.molecule.query.get_molecule_key`
+    of the structure the thermo was generated for (the first resonance
+    structure of the species at that point) and by a fingerprint of everything
+    else that determines the thermo: the loaded thermo libraries and groups,
+    the binding energies, the ML and QM settings, the solvent, the thermo
+    class and the RMG version. Structures whose keys collide are told apart by
+    an isomorphism check.
+
+    The cache is disabled until it is connected to a database. A database
+    opened with `read_only` set is only used for lookups, so a cache filled by
+    one job can be shared by many concurrent jobs. The attributes are:
+
+    =================== =============== ========================================
+    Attribute           Type            Description
+    =================== =============== ========================================
+    `max_size`          ``int``         The maximum number of structures kept in memory
+    `path`              ``str``         The SQLite database the thermo is shared through, if any
+    `read_only`         ``bool``        ``True`` if new thermo is not written to the database
+    `hits`              ``int``         The number of requests answered from the cache
+    `misses`            ``int``         The number of requests which required generating the thermo
+    `evictions`         ``int``         The number of entries removed from memory to respect `max_size`
+    =================== =============== ========================================
+    """
+
+    # The number of database writes made before they are committed
+    commit_interval = 20
+
+    def __init__(self, path=None, read_only=False, max_size=10000):
+        self.max_size = max_size
+        self.path = None
+        self.read_only = read_only
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._connection = None
+        self._pid = None
+        self._pending = 0
+        self._database_fingerprint = None
+        self._close_registered = False
+        if path is not None:
+            self.connect(path, read_only)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return '<ThermoCache with {0:d} structures: {1:d} hits, {2:d} misses>'.format(
+            len(self.entries), self.hits, self.misses)
+
+    @property
+    def enabled(self):
+        """``True`` if the cache is connected to a database."""
+        return self.path is not None
+
+    @property
+    def hit_rate(self):
+        """The fraction of requests answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_statistics(self):
+        """
+        Return a dictionary with the number of structures in memory, hits,
+        misses and evictions and the hit rate.
+        """
+        return {'size': len(self.entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hit_rate}
+
+    def log_statistics(self, level=logging.INFO):
+        """
+        Log the cache statistics at the given `level`.
+        """
+        logging.log(level, 'Thermo cache: {0:d} structures, {1:d} hits, {2:d} misses '
+                           '({3:.1%} hit rate)'.format(len(self.entries), self.hits, self.misses, self.hit_rate))
+
+    def clear(self):
+        """
+        Remove all entries stored in memory and reset the statistics. The
+        database, if any, is not modified.
+        """
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self._database_fingerprint = None
+
+    def connect(self, path, read_only=False):
+        """
+        Share thermo through the SQLite database at `path`, which is created
+        if needed unless `read_only` is set.
+        """
+        with self._lock:
+            self.close()
+            self._connection = self._open(path, read_only)
+            self._pid = os.getpid()
+            self.path = path
+            self.read_only = read_only
+            # Close whichever database is connected at exit
+            if not self._close_registered:
+                atexit.register(self.close)
+                self._close_registered = True
+
+    def commit(self):
+        """
+        Commit any thermo not yet written to the database.
+        """
+        with self._lock:
+            if self._connection is not None and self._pending and self._pid == os.getpid():
+                self._connection.commit()
+                self._pending = 0
+
+    def close(self):
+        """
+        Commit pending thermo and close the database, if any.
+        """
+        with self._lock:
+            if self._connection is not None:
+                if self._pid == os.getpid():
+                    self.commit()
+                    self._connection.close()
+                self._connection = None
+                self._pending = 0
+                self.path = None
+
+    def get_fingerprint(self, thermo_database, thermo_class, solvent_name=''):
+        """
+        Return the fingerprint of the settings which determine the thermo
+        generated with `thermo_database` as `thermo_class` objects in the
+        solvent `solvent_name`. The part describing the libraries and groups
+        of the database is only recomputed if their number of entries has
+        changed.
+        """
+        import rmgpy.rmg.main
+        from rmgpy.rmg.input import get_input
+
+        state = (tuple(thermo_database.library_order),
+                 tuple(len(library.entries) for library in thermo_database.libraries.values()),
+                 tuple(len(groups.entries) for groups in thermo_database.groups.values()))
+        with self._lock:
+            if (self._database_fingerprint is None or self._database_fingerprint[0] is not thermo_database
+                    or self._database_fingerprint[1] != state):
+                self._database_fingerprint = (thermo_database, state, get_database_fingerprint(thermo_database))
+            database_fingerprint = self._database_fingerprint[2]
+
+        try:
+            ml_estimator, ml_settings = get_input('ml_estimator')
+        except Exception:
+            ml_estimator, ml_settings = None, None
+        try:
+            quantum_mechanics = get_input('quantum_mechanics')
+        except Exception:
+            quantum_mechanics = None
+
+        digest = hashlib.sha1()
+        _update_digest(digest, database_fingerprint, rmgpy.__version__, thermo_class.__name__, solvent_name,
+                       rmgpy.rmg.main.solvent, sorted(getattr(thermo_database, 'binding_energies', {}).items()))
+        if ml_estimator is not None:
+            _update_digest(digest, type(ml_estimator).__name__, sorted((ml_settings or {}).items()))
+            for path in [ml_estimator.hf298_path, ml_estimator.s298_cp_path]:
+                _update_digest(digest, path, _get_files_fingerprint(path))
+        if quantum_mechanics is not None:
+            settings = quantum_mechanics.settings
+            _update_digest(digest, settings.software, settings.method, settings.onlyCyclics,
+                           settings.maxRadicalNumber)
+        return digest.hexdigest()
+
+    def get_thermo_data(self, species, fingerprint):
+        """
+        Return a copy of the thermo stored for `species` under `fingerprint`,
+        or ``None`` if there is none. The ground-state energy of the species
+        conformer is set, and the resonance structure the thermo was generated
+        for is moved to the start of ``species.molecule``, as when the thermo
+        is generated.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            for molecule in species.molecule:
+                data = self._find(molecule, fingerprint)
+                if data is not None:
+                    self.hits += 1
+                    break
+            else:
+                self.misses += 1
+                return None
+
+        thermo, E0 = pickle.loads(data)
+        species.molecule.remove(molecule)
+        species.molecule.insert(0, molecule)
+        if species.conformer is None:
+            species.conformer = Conformer()
+        species.conformer.E0 = E0
+        return thermo
+
+    def put_thermo_data(self, species, fingerprint, thermo):
+        """
+        Store the `thermo` generated for `species` under `fingerprint`,
+        together with the ground-state energy of the species conformer.
+        """
+        if not self.enabled or thermo is None:
+            return
+        template = species.molecule[0].copy(deep=True)
+        E0 = species.conformer.E0 if species.conformer is not None else None
+        data = pickle.dumps((thermo, E0), protocol=pickle.HIGHEST_PROTOCOL)
+        key = (repr(get_molecule_key(template)), fingerprint)
+        with self._lock:
+            self.entries.setdefault(key, []).append((template, data))
+            self.entries.move_to_end(key)
+            self._evict()
+            if not self.read_only:
+                self._write('INSERT OR REPLACE INTO thermo VALUES (?, ?, ?, ?)',
+                            (key[0], fingerprint, template.to_adjacency_list(), sqlite3.Binary(data)))
+
+    def _find(self, molecule, fingerprint):
+        """
+        Return the stored data of the structure isomorphic to `molecule`
+        under `fingerprint`, or ``None`` if there is none.
+        """
+        key = (repr(get_molecule_key(molecule)), fingerprint)
+        entries = self.entries.get(key)
+        if entries is None:
+            entries = self._load(key)
+        if entries is not None:
+            for template, data in entries:
+                if template.is_isomorphic(molecule, save_order=True):
+                    self.entries.move_to_end(key)
+                    return data
+        return None
+
+    @staticmethod
+    def _open(path, read_only):
+        """
+        Return a connection to the SQLite database at `path`.
+        """
+        if read_only:
+            # Build the URI from the path so that characters such as ? and # in it are escaped
+            uri = pathlib.Path(path).resolve().as_uri() + '?mode=ro'
+            return sqlite3.connect(uri, uri=True, timeout=30, check_same_thread=False)
+        connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        # Let concurrent jobs read the database while it is being written
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS thermo (molecule_key TEXT, fingerprint TEXT, adjlist TEXT, '
+                           'data BLOB, PRIMARY KEY (molecule_key, fingerprint, adjlist))')
+        connection.commit()
+        return connection
+
+    def _get_connection(self):
+        """
+        Return the database connection of this process, opening a new one in
+        processes forked after the cache was connected.
+        """
+        if self._pid != os.getpid():
+            self._connection = self._open(self.path, self.read_only)
+            self._pid = os.getpid()
+            self._pending = 0
+        return self._connection
+
+    def _evict(self):
+        """
+        Remove the least recently used entries beyond `max_size`.
+        """
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def _write(self, statement, parameters):
+        """
+        Execute the database `statement`, committing every `commit_interval`
+        writes. Errors, e.g. from a locked database, are logged and ignored.
+        """
+        try:
+            self._get_connection().execute(statement, parameters)
+            self._pending += 1
+            if self._pending >= self.commit_interval:
+                self.commit()
+        except sqlite3.Error as e:
+            logging.warning('Unable to write to thermo cache database {0}: {1}'.format(self.path, e))
+
+    def _load(self, key):
+        """
+        Return the entries stored in the database under `key`, adding them
+        to the in-memory cache, or ``None`` if there are none.
+        """
+        try:
+            rows = self._get_connection().execute('SELECT adjlist, data FROM thermo WHERE molecule_key=? '
+                                                  'AND fingerprint=?', key).fetchall()
+        except sqlite3.Error as e:
+            logging.warning('Unable to read from thermo cache database {0}: {1}'.format(self.path, e))
+            return None
+        entries = []
+        for adjlist, data in rows:
+            template = _read_adjacency_list(adjlist)
+            if template is not None:
+                entries.append((template, bytes(data)))
+        if not entries:
+            return None
+        self.entries[key] = entries
+        self._evict()
+        return entries
+
+
+def get_database_fingerprint(thermo_database):
+    """
+    Return a fingerprint of the entries of the libraries, in the order in
+    which they are searched, and of the group additivity databases of
+    `thermo_database`.
+    """
+    digest = hashlib.sha1()
+    for label in thermo_database.library_order:
+        library = thermo_database.libraries[label]
+        _update_digest(digest, label, library.solvent)
+        for entry in library.entries.values():
+            _update_digest(digest, entry.label, _get_item_string(entry.item), repr(entry.data),
+                           entry.metal, entry.facet, entry.site)
+    for label in sorted(thermo_database.groups):
+        groups = thermo_database.groups[label]
+        _update_digest(digest, label)
+        for entry in groups.entries.values():
+            _update_digest(digest, entry.label, entry.parent.label if entry.parent is not None else None,
+                           _get_item_string(entry.item), repr(entry.data))
+    return digest.hexdigest()
+
+
+def _update_digest(digest, *items):
+    """
+    Add the representations of `items` to `digest`.
+    """
+    for item in items:
+        digest.update(repr(item).encode())
+        digest.update(b'\0')
+
+
+def _get_item_string(item):
+    """
+    Return a string describing the structure of a database entry `item`.
+    """
+    try:
+        return item.to_adjacency_list()
+    except AttributeError:
+        return str(item)
+
+
+def _get_files_fingerprint(path):
+    """
+    Return the names, sizes and modification times of the files in the
+    directory or file at `path`, or ``None`` if it does not exist.
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    if os.path.isfile(path):
+        return os.path.getsize(path), os.path.getmtime(path)
+    files = []
+    for directory, _, file_names in sorted(os.walk(path)):
+        for file_name in sorted(file_names):
+            file_path = os.path.join(directory, file_name)
+            files.append((os.path.relpath(file_path, path), os.path.getsize(file_path), os.path.getmtime(file_path)))
+    return files
+
+
+def _read_adjacency_list(adjlist):
+    """
+    Return the molecule described by `adjlist`, or ``None`` if it cannot be
+    read.
+    """
+    from rmgpy.molecule.molecule import Molecule
+    try:
+        return Molecule().from_adjacency_list(adjlist, raise_atomtype_exception=False,
+                                              raise_charge_exception=False, check_consistency=False)
+    except Exception as e:
+        logging.debug('Unable to read cached structure {0}: {1}'.format(adjlist, e))
+        return None
+
+
+# The cache used by rmgpy.thermo.thermoengine.generate_thermo_data
+thermo_cache = ThermoCache()
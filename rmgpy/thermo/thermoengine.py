@@ -36,6 +36,7 @@ import rmgpy.constants as constants
 from rmgpy.data.rmg import get_db
 from rmgpy.statmech import Conformer
 from rmgpy.thermo import Wilhoit, NASA, ThermoData
+from rmgpy.thermo.cache import thermo_cache
 from rmgpy.molecule import Molecule
 from rmgpy.molecule.fragment import Fragment
 
@@ -113,6 +114,9 @@ def generate_thermo_data(spc, thermo_class=NASA, solvent_name=''):
     
     It then calls :meth:`process_thermo_data`, to convert (via Wilhoit) to NASA
     and set the E0.
+
+    If the thermo cache is connected to a database, the thermo is looked up
+    there first, and stored there once it has been generated.
     
     Result stored in `spc.thermo` and returned.
     """
@@ -124,8 +128,57 @@ def generate_thermo_data(spc, thermo_class=NASA, solvent_name=''):
         logging.debug('Could not obtain the thermo database. Not generating thermo...')
         return None
 
+    fingerprint = None
+    if thermo_cache.enabled:
+        fingerprint = thermo_cache.get_fingerprint(thermodb, thermo_class, solvent_name)
+        thermo = thermo_cache.get_thermo_data(spc, fingerprint)
+        if thermo is not None:
+            return thermo
+
     thermo0 = thermodb.get_thermo_data(spc)
 
+    return _finish_thermo_data(spc, thermo0, thermodb, _get_thermo_central_database(), thermo_class, solvent_name,
+                               fingerprint)
+
+
+def generate_thermo_data_batch(species_list, thermo_class=NASA, solvent_name=''):
+    """
+    Generates thermo data for each species in `species_list` as
+    :func:`generate_thermo_data` does, but the species which are neither in
+    the thermo cache nor in the libraries are estimated together by
+    :meth:`ThermoDatabase.get_thermo_data_batch`.
+
+    Returns the list of thermo, in the order of `species_list`.
+    """
+
+    try:
+        thermodb = get_db('thermo')
+        if not thermodb: raise Exception
+    except Exception:
+        logging.debug('Could not obtain the thermo database. Not generating thermo...')
+        return [None] * len(species_list)
+
+    thermo_list = [None] * len(species_list)
+    fingerprint = None
+    if thermo_cache.enabled:
+        fingerprint = thermo_cache.get_fingerprint(thermodb, thermo_class, solvent_name)
+        for i, spc in enumerate(species_list):
+            thermo_list[i] = thermo_cache.get_thermo_data(spc, fingerprint)
+
+    indices = [i for i, thermo in enumerate(thermo_list) if thermo is None]
+    thermo0_list = thermodb.get_thermo_data_batch([species_list[i] for i in indices])
+
+    thermo_central_database = _get_thermo_central_database()
+    for i, thermo0 in zip(indices, thermo0_list):
+        thermo_list[i] = _finish_thermo_data(species_list[i], thermo0, thermodb, thermo_central_database, thermo_class,
+                                             solvent_name, fingerprint)
+    return thermo_list
+
+
+def _get_thermo_central_database():
+    """
+    Return the thermo central database given in the input file, or ``None``.
+    """
     # 1. maybe only submit cyclic core
     # 2. to help radical prediction, HBI should also
     #    look up centrailThermoDB for its saturated version
@@ -137,12 +190,23 @@ def generate_thermo_data(spc, thermo_class=NASA, solvent_name=''):
     except Exception:
         logging.debug('thermoCentralDatabase could not be found.')
         thermo_central_database = None
+    return thermo_central_database
+
 
+def _finish_thermo_data(spc, thermo0, thermodb, thermo_central_database, thermo_class, solvent_name, fingerprint):
+    """
+    Register `spc` in the thermo central database if required, process the
+    database thermo `thermo0` with :func:`process_thermo_data` and store the
+    result in the thermo cache if `fingerprint` is given.
+    """
     if thermo_central_database and thermo_central_database.client \
             and thermo_central_database.satisfy_registration_requirements(spc, thermo0, thermodb):
         thermo_central_database.register_in_central_thermo_db(spc)
 
-    return process_thermo_data(spc, thermo0, thermo_class, solvent_name)
+    thermo = process_thermo_data(spc, thermo0, thermo_class, solvent_name)
+    if fingerprint is not None:
+        thermo_cache.put_thermo_data(spc, fingerprint, thermo)
+    return thermo
 
 
 def evaluator(spc, solvent_name=''):
@@ -158,17 +222,25 @@ def evaluator(spc, solvent_name=''):
     """
     logging.debug("Evaluating spc %s ", spc)
 
+    thermo = generate_thermo_data(_prepare_species(spc), solvent_name=solvent_name)
+
+    return thermo
+
+
+def _prepare_species(spc):
+    """
+    Generate the resonance structures of `spc` and return it, or those of
+    its representative species if `spc` is a species for a fragment.
+    """
     if not isinstance(spc.molecule[0], Fragment):
         spc.generate_resonance_structures()
-        thermo = generate_thermo_data(spc, solvent_name=solvent_name)
+        return spc
     else:
         # assume it's a species for Fragment
         spc.molecule[0].assign_representative_species()
         spc_repr = spc.molecule[0].species_repr
         spc_repr.generate_resonance_structures()
-        thermo = generate_thermo_data(spc_repr, solvent_name=solvent_name)
-
-    return thermo
+        return spc_repr
 
 
 def submit(spc, solvent_name=''):
@@ -182,3 +254,17 @@ def submit(spc, solvent_name=''):
 
     """
     spc.thermo = evaluator(spc, solvent_name=solvent_name)
+
+
+def submit_batch(species_list, solvent_name=''):
+    """
+    Calculates the thermo of all Species objects in `species_list` together,
+    see :func:`generate_thermo_data_batch`, and stores it in their thermo
+    attributes.
+    """
+    logging.debug("Evaluating %d species", len(species_list))
+
+    thermo_list = generate_thermo_data_batch([_prepare_species(spc) for spc in species_list],
+                                             solvent_name=solvent_name)
+    for spc, thermo in zip(species_list, thermo_list):
+        spc.thermo = thermo
@@ -63,6 +63,7 @@ from rmgpy.chemkin import load_chemkin_file
 from rmgpy.rmg.model import ReactionModel
 from rmgpy.rmg.output import save_diff_html
 from rmgpy.kinetics.surface import StickingCoefficient, StickingCoefficientBEP
+from rmgpy.molecule.query import MoleculeCollection, MoleculeQuery
 
 
 ################################################################################
@@ -147,11 +148,14 @@ def compare_model_species(model1, model2):
     unique_species1 = model1.species[:]
     unique_species2 = []
 
+    collection = MoleculeCollection.from_species(model1.species)
+    matched = set()
     for spec2 in model2.species:
-        for spec1 in unique_species1[:]:  # make a copy so you don't remove from the list you are iterating over
-            if spec1.is_isomorphic(spec2):
+        for spec1 in MoleculeQuery(spec2.molecule).find_in(collection):
+            if id(spec1) not in matched:
                 common_species.append([spec1, spec2])
                 unique_species1.remove(spec1)
+                matched.add(id(spec1))
                 break
         else:
             unique_species2.append(spec2)
@@ -41,6 +41,7 @@ import numpy as np
 import pydot
 
 from rmgpy.kinetics.diffusionLimited import diffusion_limiter
+from rmgpy.rmg.output import get_species_image_name
 from rmgpy.rmg.settings import SimulatorSettings
 from rmgpy.solver.base import TerminationTime, TerminationConversion
 from rmgpy.solver.liquid import LiquidReactor
@@ -202,15 +203,19 @@ def generate_flux_diagram(reaction_model, times, concentrations, reaction_rates,
         node.set_penwidth(max_node_pen_width)
         graph.add_node(node)
         # Try to use an image instead of the label
-        species_index = str(species) + '.png'
         image_path = ''
         if not species_directory or not os.path.exists(species_directory):
             continue
-        for root, dirs, files in os.walk(species_directory):
-            for f in files:
-                if f.endswith(species_index):
-                    image_path = os.path.join(root, f)
-                    break
+        if species.molecule:
+            image_path = os.path.join(species_directory, get_species_image_name(species))
+        if not os.path.exists(image_path):
+            # Fall back to images named after the species label
+            species_index = str(species) + '.png'
+            for root, dirs, files in os.walk(species_directory):
+                for f in files:
+                    if f.endswith(species_index):
+                        image_path = os.path.join(root, f)
+                        break
         if os.path.exists(image_path):
             node.set_image(image_path)
             node.set_label(" ")
@@ -361,6 +361,7 @@ def remove_isotope(labeled_obj, inplace=False):
                     if atom.element.isotope != -1:
                         modified_atoms.append((atom, atom.element))
                         atom.element = get_element(atom.element.symbol)
+                mol.reset_canonical_hash()
             return modified_atoms
         else:
             stripped = labeled_obj.copy(deep=True)
@@ -411,6 +412,7 @@ def remove_isotope(labeled_obj, inplace=False):
                 if atom.element.isotope != -1:
                     modified_atoms.append((atom, atom.element))
                     atom.element = get_element(atom.element.symbol)
+            labeled_obj.reset_canonical_hash()
             return modified_atoms
         else:
             stripped = labeled_obj.copy(deep=True)
@@ -469,6 +471,22 @@ def redo_isotope(atom_list):
         atom.element = element
 
 
+def reset_canonical_hashes(labeled_obj):
+    """
+    Clear the cached canonical hashes of the molecules of a Species or
+    Reaction object, or of a Molecule, after the elements of their atoms
+    have been changed in place by :func:`redo_isotope`.
+    """
+    if isinstance(labeled_obj, Reaction):
+        for spc in labeled_obj.reactants + labeled_obj.products:
+            reset_canonical_hashes(spc)
+    elif isinstance(labeled_obj, Species):
+        for mol in labeled_obj.molecule:
+            mol.reset_canonical_hash()
+    elif isinstance(labeled_obj, Molecule):
+        labeled_obj.reset_canonical_hash()
+
+
 def compare_isotopomers(obj1, obj2, either_direction=True):
     """
     This method takes two species or reaction objects and returns true if
@@ -498,6 +516,8 @@ def compare_isotopomers(obj1, obj2, either_direction=True):
     else:
         raise TypeError('Only Reaction and Speicies Objects are supported in compareIsotopomers')
     redo_isotope(atomlist)
+    reset_canonical_hashes(obj1)
+    reset_canonical_hashes(obj2)
     return comparison_bool
 
 
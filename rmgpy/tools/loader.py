@@ -36,6 +36,7 @@ import os.path
 import warnings
 
 from rmgpy.chemkin import load_chemkin_file
+from rmgpy.rmg.output import draw_species_images
 from rmgpy.solver.base import TerminationConversion
 from rmgpy.solver.liquid import LiquidReactor
 from rmgpy.solver.mbSampled import MBSampledReactor
@@ -161,9 +162,6 @@ def load_rmg_py_job(input_file, chemkin_file=None, species_dict=None, generate_i
             os.mkdir(species_path)
         except OSError:
             pass
-        for species in species_list:
-            path = os.path.join(species_path, '{0!s}.png'.format(species))
-            if not os.path.exists(path):
-                species.molecule[0].draw(str(path))
+        draw_species_images(species_list, species_path)
 
     return rmg
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+
+"""
+This script benchmarks atom type perception on its main workloads: typing
+every atom of a set of molecules, loading a species dictionary (which parses
+and types every species) and generating reactions from kinetics families
+(which types the atoms of every product). Each benchmark is run with a cold
+and a warm atom type lookup table.
+
+To compare two implementations, run the script with the same arguments on
+both versions of the code, e.g. ::
+
+    python benchmarkAtomTypes.py --dictionary species_dictionary.txt
+"""
+
+import argparse
+import itertools
+import os.path
+import time
+
+import rmgpy.molecule.atomtype as atomtype
+from rmgpy import settings
+from rmgpy.chemkin import load_species_dictionary
+from rmgpy.data.kinetics.database import KineticsDatabase
+from rmgpy.molecule.atomtype import get_atomtype
+from rmgpy.molecule.molecule import Molecule
+
+SMILES = [
+    'C', 'CC', 'CCC', 'CC(C)C', 'CCCCCCCC', 'C=C', 'C=CC=C', 'C#C', 'C=CC#C', '[CH3]', 'C[CH2]', 'C=C[CH2]',
+    'C1CCCCC1', 'c1ccccc1', 'Cc1ccccc1', 'c1ccc2ccccc2c1', 'C1=CC2C=CC1C2', 'O', 'CO', 'CCO', 'C=O', 'CC=O',
+    'CC(=O)O', 'COC', 'OO', '[OH]', 'CO[O]', 'CC(C)(C)OO', 'O=C=O', 'N', 'CN', 'C#N', 'CC(=O)N', 'S', 'CS',
+    'CSSC', 'CC(C)C(=O)OCC=C', 'OCC(O)CO', 'C1CC2CCC1C2', 'CC1=CC(=O)C=CC1=O',
+]
+
+
+################################################################################
+
+
+def parse_command_line_arguments():
+    """
+    Parse the command-line arguments being passed to the script.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', type=str, default=settings['database.directory'],
+                        help='Location of the RMG database')
+    parser.add_argument('--families', type=str, nargs='+', default=['H_Abstraction', 'R_Addition_MultipleBond',
+                                                                    'R_Recombination', 'Disproportionation'],
+                        help='Kinetics families used to generate reactions, or none to skip reaction generation')
+    parser.add_argument('--dictionary', type=str, default=None,
+                        help='Species dictionary to load instead of the adjacency lists of the built-in molecules')
+    parser.add_argument('--smiles', type=str, default=None,
+                        help='File with one SMILES string per line to use instead of the built-in molecules')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times each benchmark is run')
+    return parser.parse_args()
+
+
+def run_benchmark(label, function, calls, repeat):
+    """
+    Time a run of `function`, which makes `calls` calls, with an empty atom
+    type lookup table and then the best of `repeat` runs with the table
+    filled, and print both times.
+    """
+    atomtype._atomtype_table.clear()
+    t0 = time.perf_counter()
+    function()
+    cold = time.perf_counter() - t0
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - t0)
+    warm = min(times)
+    print('{0:<32} {1:>9d} calls {2:>10.3f} s cold {3:>10.3f} s warm {4:>10.2f} us/call'.format(
+        label, calls, cold, warm, 1e6 * warm / max(calls, 1)))
+
+
+def main():
+    args = parse_command_line_arguments()
+
+    if args.smiles:
+        with open(args.smiles) as f:
+            smiles = [line.strip() for line in f if line.strip()]
+    else:
+        smiles = SMILES
+    molecules = [Molecule(smiles=s) for s in smiles]
+    n_atoms = sum([len(molecule.atoms) for molecule in molecules])
+    print('Benchmarking {0:d} molecules with {1:d} atoms in total'.format(len(molecules), n_atoms))
+
+    def perceive():
+        for molecule in molecules:
+            for atom in molecule.atoms:
+                get_atomtype(atom, atom.edges)
+
+    def update():
+        for molecule in molecules:
+            molecule.update_atomtypes()
+
+    run_benchmark('get_atomtype', perceive, n_atoms, args.repeat)
+    run_benchmark('Molecule.update_atomtypes', update, len(molecules), args.repeat)
+
+    if args.dictionary:
+        with open(args.dictionary) as f:
+            n_species = len([block for block in f.read().split('\n\n') if block.strip()])
+
+        def load():
+            load_species_dictionary(args.dictionary, generate_resonance_structures=False)
+
+        run_benchmark('load_species_dictionary', load, n_species, args.repeat)
+    else:
+        adjlists = [molecule.to_adjacency_list() for molecule in molecules]
+
+        def load():
+            for adjlist in adjlists:
+                Molecule().from_adjacency_list(adjlist)
+
+        run_benchmark('Molecule.from_adjacency_list', load, len(adjlists), args.repeat)
+
+    if args.families:
+        database = KineticsDatabase()
+        database.load_families(os.path.join(args.database, 'kinetics', 'families'), families=args.families)
+        reactants = [[molecule] for molecule in molecules]
+        reactants.extend([list(pair) for pair in itertools.combinations(molecules, 2)])
+
+        def generate():
+            for molecule_list in reactants:
+                database.generate_reactions_from_families(molecule_list, resonance=False)
+
+        run_benchmark('generate_reactions_from_families', generate, len(reactants), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
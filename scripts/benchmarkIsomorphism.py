@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+
+"""
+This script benchmarks the graph isomorphism functions on the workload of the
+kinetics families: every molecule in a set is matched against every group in
+the trees of the selected families by subgraph isomorphism, both for the first
+match and for all matches, and the resonance structures of every molecule are
+compared to each other by full isomorphism.
+
+To compare two implementations, run the script with the same arguments on
+both versions of the code, e.g. ::
+
+    python benchmarkIsomorphism.py --families H_Abstraction R_Addition_MultipleBond
+"""
+
+import argparse
+import os.path
+import time
+
+from rmgpy import settings
+from rmgpy.data.base import LogicNode
+from rmgpy.data.kinetics.database import KineticsDatabase
+from rmgpy.molecule.molecule import Molecule
+
+SMILES = [
+    'C', 'CC', 'CCC', 'CC(C)C', 'CCCCCCCC', 'C=C', 'C=CC=C', 'C#C', 'C=CC#C', '[CH3]', 'C[CH2]', 'C=C[CH2]',
+    'C1CCCCC1', 'c1ccccc1', 'Cc1ccccc1', 'c1ccc2ccccc2c1', 'C1=CC2C=CC1C2', 'O', 'CO', 'CCO', 'C=O', 'CC=O',
+    'CC(=O)O', 'COC', 'OO', '[OH]', 'CO[O]', 'CC(C)(C)OO', 'O=C=O', 'N', 'CN', 'C#N', 'CC(=O)N', 'S', 'CS',
+    'CSSC', 'CC(C)C(=O)OCC=C', 'OCC(O)CO', 'C1CC2CCC1C2', 'CC1=CC(=O)C=CC1=O',
+]
+
+
+################################################################################
+
+
+def parse_command_line_arguments():
+    """
+    Parse the command-line arguments being passed to the script.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', type=str, default=settings['database.directory'],
+                        help='Location of the RMG database')
+    parser.add_argument('--families', type=str, nargs='+', default=['H_Abstraction', 'R_Addition_MultipleBond',
+                                                                    'R_Recombination', 'Disproportionation'],
+                        help='Kinetics families whose groups are used as templates')
+    parser.add_argument('--smiles', type=str, default=None,
+                        help='File with one SMILES string per line to use instead of the built-in molecules')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times each benchmark is run')
+    return parser.parse_args()
+
+
+def get_groups(families):
+    """
+    Return the groups of all nodes in the trees of the given families.
+    """
+    groups = []
+    for family in families.values():
+        for entry in family.groups.entries.values():
+            if not isinstance(entry.item, LogicNode):
+                groups.append(entry.item)
+    return groups
+
+
+def run_benchmark(label, function, calls, repeat):
+    """
+    Time `repeat` runs of `function`, which makes `calls` isomorphism calls
+    and returns the number of successful ones, and print the best time.
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        count = function()
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    print('{0:<32} {1:>9d} calls {2:>9d} matches {3:>10.3f} s {4:>10.2f} us/call'.format(
+        label, calls, count, best, 1e6 * best / max(calls, 1)))
+
+
+def main():
+    args = parse_command_line_arguments()
+
+    if args.smiles:
+        with open(args.smiles) as f:
+            smiles = [line.strip() for line in f if line.strip()]
+    else:
+        smiles = SMILES
+    molecules = [Molecule(smiles=s) for s in smiles]
+    resonance = [molecule.generate_resonance_structures(keep_isomorphic=True) for molecule in molecules]
+
+    database = KineticsDatabase()
+    database.load_families(os.path.join(args.database, 'kinetics', 'families'), families=args.families)
+    groups = get_groups(database.families)
+    print('Benchmarking {0:d} molecules against {1:d} groups from {2}'.format(
+        len(molecules), len(groups), ', '.join(sorted(database.families))))
+
+    def subgraph_first():
+        return sum([molecule.is_subgraph_isomorphic(group) for molecule in molecules for group in groups])
+
+    def subgraph_all():
+        return sum([len(molecule.find_subgraph_isomorphisms(group)) for molecule in molecules for group in groups])
+
+    def full():
+        return sum([molecule1.is_isomorphic(molecule2) for structures in resonance
+                    for molecule1 in structures for molecule2 in structures])
+
+    def full_all():
+        return sum([len(molecule1.find_isomorphism(molecule2)) for structures in resonance
+                    for molecule1 in structures for molecule2 in structures])
+
+    n_subgraph = len(molecules) * len(groups)
+    n_full = sum([len(structures) ** 2 for structures in resonance])
+    run_benchmark('is_subgraph_isomorphic', subgraph_first, n_subgraph, args.repeat)
+    run_benchmark('find_subgraph_isomorphisms', subgraph_all, n_subgraph, args.repeat)
+    run_benchmark('is_isomorphic', full, n_full, args.repeat)
+    run_benchmark('find_isomorphism', full_all, n_full, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
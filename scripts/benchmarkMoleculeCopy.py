@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This script benchmarks the time and memory needed to make deep copies of
+:class:`Molecule` objects.
+
+To compare two implementations, run the script with the same arguments on
+both versions of the code, e.g. ::
+
+    python benchmarkMoleculeCopy.py --copies 1000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from rmgpy.molecule.molecule import Molecule
+
+SMILES = [
+    'C', 'CC', 'CCC', 'CC(C)C', 'CCCCCCCC', 'C=C', 'C=CC=C', 'C#C', 'C=CC#C', '[CH3]', 'C[CH2]', 'C=C[CH2]',
+    'C1CCCCC1', 'c1ccccc1', 'Cc1ccccc1', 'c1ccc2ccccc2c1', 'C1=CC2C=CC1C2', 'O', 'CO', 'CCO', 'C=O', 'CC=O',
+    'CC(=O)O', 'COC', 'OO', '[OH]', 'CO[O]', 'CC(C)(C)OO', 'O=C=O', 'N', 'CN', 'C#N', 'CC(=O)N', 'S', 'CS',
+    'CSSC', 'CC(C)C(=O)OCC=C', 'OCC(O)CO', 'C1CC2CCC1C2', 'CC1=CC(=O)C=CC1=O', 'CCCCCCCCCCCCCCCC',
+]
+
+
+################################################################################
+
+
+def parse_command_line_arguments():
+    """
+    Parse the command-line arguments being passed to the script.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--smiles', type=str, default=None,
+                        help='File with one SMILES string per line to use instead of the built-in molecules')
+    parser.add_argument('--copies', type=int, default=100, help='Number of copies made of each molecule')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times each benchmark is run')
+    return parser.parse_args()
+
+
+def run_benchmark(label, function, calls, repeat):
+    """
+    Time `repeat` runs of `function`, which makes `calls` calls, and print
+    the best time.
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - t0)
+    best = min(times)
+    print('{0:<32} {1:>9d} calls {2:>10.3f} s {3:>10.2f} us/call'.format(label, calls, best, 1e6 * best / calls))
+
+
+def measure_memory(label, function):
+    """
+    Print the memory allocated by the objects returned by `function`.
+    """
+    tracemalloc.start()
+    result = function()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('{0:<32} {1:>9d} objects {2:>10.2f} MB {3:>10.0f} bytes/object'.format(
+        label, len(result), size / 2 ** 20, size / len(result)))
+    return result
+
+
+def main():
+    args = parse_command_line_arguments()
+
+    if args.smiles:
+        with open(args.smiles) as f:
+            smiles = [line.strip() for line in f if line.strip()]
+    else:
+        smiles = SMILES
+    molecules = [Molecule(smiles=s) for s in smiles]
+    n_calls = len(molecules) * args.copies
+    print('Benchmarking {0:d} molecules with {1:d} atoms in total, copied {2:d} times'.format(
+        len(molecules), sum([len(molecule.atoms) for molecule in molecules]), args.copies))
+
+    def copy():
+        return [molecule.copy(deep=True) for molecule in molecules for _ in range(args.copies)]
+
+    def copy_and_map():
+        return [molecule.copy_and_map() for molecule in molecules for _ in range(args.copies)]
+
+    run_benchmark('Molecule.copy(deep=True)', copy, n_calls, args.repeat)
+    run_benchmark('Molecule.copy_and_map', copy_and_map, n_calls, args.repeat)
+
+    measure_memory('Molecule', copy)
+
+
+if __name__ == '__main__':
+    main()
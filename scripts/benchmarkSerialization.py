@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+"""
+This script benchmarks the transfer of species and reactions between the
+processes of reaction generation. It generates the reactions of every species
+and pair of species from a set of molecules, then compares pickling with the
+compact format of :mod:`rmgpy.rmg.wire` on the number of bytes sent to the
+workers (the reacting species) and back (the generated reactions), and on
+the time spent encoding and decoding them.
+
+Run it with the default molecules, or with a file of SMILES strings, e.g. ::
+
+    python benchmarkSerialization.py --smiles species.txt
+"""
+
+import argparse
+import itertools
+import os.path
+import pickle
+import time
+
+from rmgpy import settings
+from rmgpy.data.kinetics.database import KineticsDatabase
+from rmgpy.rmg.wire import decode_reactions, decode_species_list, encode_reactions, encode_species_list
+from rmgpy.species import Species
+
+SMILES = [
+    'C', 'CC', 'CCC', 'CC(C)C', 'CCCCCC', 'C=C', 'C=CC=C', 'C#C', '[CH3]', 'C[CH2]', 'C=C[CH2]', 'C1CCCCC1',
+    'c1ccccc1', 'Cc1ccccc1', 'O', 'CO', 'CCO', 'C=O', 'CC=O', '[OH]', 'CO[O]', '[H]', 'OO', 'C[O]',
+]
+
+
+################################################################################
+
+
+def parse_command_line_arguments():
+    """
+    Parse the command-line arguments being passed to the script.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', type=str, default=settings['database.directory'],
+                        help='Location of the RMG database')
+    parser.add_argument('--families', type=str, nargs='+', default=['H_Abstraction', 'R_Addition_MultipleBond',
+                                                                    'R_Recombination', 'Disproportionation'],
+                        help='Kinetics families used to generate reactions')
+    parser.add_argument('--smiles', type=str, default=None,
+                        help='File with one SMILES string per line to use instead of the built-in molecules')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times each benchmark is run')
+    return parser.parse_args()
+
+
+def run_benchmark(label, items, dumps, loads, repeat):
+    """
+    Encode each of `items` with `dumps` and decode it with `loads`, and print
+    the total number of bytes and the best of `repeat` times for each step.
+    """
+    dump_times = []
+    load_times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        data = [dumps(item) for item in items]
+        dump_times.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        for d in data:
+            loads(d)
+        load_times.append(time.perf_counter() - t0)
+    n_bytes = sum([len(d) for d in data])
+    print('{0:<28} {1:>12d} bytes {2:>10.3f} s encode {3:>10.3f} s decode'.format(
+        label, n_bytes, min(dump_times), min(load_times)))
+    return n_bytes
+
+
+def main():
+    args = parse_command_line_arguments()
+
+    if args.smiles:
+        with open(args.smiles) as f:
+            smiles = [line.strip() for line in f if line.strip()]
+    else:
+        smiles = SMILES
+    species_list = [Species(smiles=s) for s in smiles]
+    for species in species_list:
+        species.generate_resonance_structures()
+
+    database = KineticsDatabase()
+    database.load_families(os.path.join(args.database, 'kinetics', 'families'), families=args.families)
+    species_tuples = [(species,) for species in species_list]
+    species_tuples.extend(itertools.combinations_with_replacement(species_list, 2))
+    t0 = time.perf_counter()
+    reaction_lists = [database.generate_reactions_from_families(list(species_tuple))
+                      for species_tuple in species_tuples]
+    print('Generated {0:d} reactions from {1:d} species tuples in {2:.3f} s'.format(
+        sum([len(reactions) for reactions in reaction_lists]), len(species_tuples), time.perf_counter() - t0))
+
+    def pickle_dumps(obj):
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+    def encode_structures(species):
+        return encode_species_list(species, properties=False)
+
+    print('Species sent to the workers:')
+    pickled = run_benchmark('pickle, per task', species_tuples, pickle_dumps, pickle.loads, args.repeat)
+    encoded = run_benchmark('wire, once per worker', [species_list], encode_structures, decode_species_list,
+                            args.repeat)
+    print('{0:<28} {1:>12.1f}x fewer bytes'.format('', pickled / max(encoded, 1)))
+
+    print('Reactions sent back:')
+    pickled = run_benchmark('pickle', reaction_lists, pickle_dumps, pickle.loads, args.repeat)
+    encoded = run_benchmark('wire', reaction_lists, encode_reactions, decode_reactions, args.repeat)
+    print('{0:<28} {1:>12.1f}x fewer bytes'.format('', pickled / max(encoded, 1)))
+
+
+if __name__ == '__main__':
+    main()
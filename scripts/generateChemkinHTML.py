@@ -37,7 +37,9 @@ command-line, e.g.
     $ python generateChemkinHTML.py /path/to/chem.inp /path/to/species_dictionary.txt [/path/to/output/directory/]
 
 The resulting HTML file and species image folder are placed in the execution
-directory, unless an output directory is specified.
+directory, unless an output directory is specified. Missing species images are
+drawn in parallel; pass ``--svg`` to draw them as SVG files, which are rendered
+by the browser and are quicker to make than PNG files.
 """
 
 import argparse
@@ -50,7 +52,7 @@ from rmgpy.rmg.output import save_output_html
 
 ################################################################################
 
-def main(chemkin, dictionary, output, foreign):
+def main(chemkin, dictionary, output, foreign, image_format='png'):
     model = CoreEdgeReactionModel()
     model.core.species, model.core.reactions = load_chemkin_file(chemkin, dictionary, read_comments=not foreign,
                                                                  check_duplicates=foreign)
@@ -58,7 +60,7 @@ def main(chemkin, dictionary, output, foreign):
     species_path = os.path.join(output, 'species')
     if not os.path.isdir(species_path):
         os.makedirs(species_path)
-    save_output_html(output_path, model)
+    save_output_html(output_path, model, image_format=image_format)
 
 
 if __name__ == '__main__':
@@ -71,6 +73,7 @@ if __name__ == '__main__':
     parser.add_argument('output', metavar='OUTPUT', type=str, nargs='?', default=None,
                         help='output directory, defaults to current directory')
     parser.add_argument('-f', '--foreign', action='store_true', help='not an RMG generated Chemkin file')
+    parser.add_argument('--svg', action='store_true', help='draw the species as SVG instead of PNG images')
 
     args = parser.parse_args()
 
@@ -79,4 +82,4 @@ if __name__ == '__main__':
     output = os.path.abspath(args.output) if args.output is not None else os.getcwd()
     foreign = args.foreign
 
-    main(chemkin, dictionary, output, foreign)
+    main(chemkin, dictionary, output, foreign, 'svg' if args.svg else 'png')
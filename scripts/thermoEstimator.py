@@ -42,14 +42,16 @@ from rmgpy.data.rmg import RMGDatabase
 from rmgpy.data.thermo import ThermoLibrary
 from rmgpy.rmg.main import RMG
 from rmgpy.rmg.model import Species
-from rmgpy.thermo.thermoengine import submit
+from rmgpy.thermo.cache import thermo_cache
+from rmgpy.thermo.thermoengine import submit_batch
 
 
 ################################################################################
 
-def run_thermo_estimator(input_file, library_flag):
+def run_thermo_estimator(input_file, library_flag, cache_path=None, cache_read_only=False):
     """
     Estimate thermo for a list of species using RMG and the settings chosen inside a thermo input file.
+    If `cache_path` is given, thermo is reused from and stored in the thermo cache database at that path.
     """
 
     rmg = RMG()
@@ -66,8 +68,14 @@ def run_thermo_estimator(input_file, library_flag):
         Species.solvent_data = rmg.database.solvation.get_solvent_data(rmg.solvent)
         Species.solvent_name = rmg.solvent
 
-    for species in rmg.initial_species:
-        submit(species)
+    if cache_path:
+        thermo_cache.connect(cache_path, cache_read_only)
+
+    submit_batch(rmg.initial_species)
+
+    if cache_path:
+        thermo_cache.log_statistics()
+        thermo_cache.close()
 
     if library_flag:
         library = ThermoLibrary(name='Thermo Estimation Library')
@@ -95,9 +103,14 @@ if __name__ == '__main__':
     parser.add_argument('input', metavar='INPUT', type=str, nargs=1,
                         help='Thermo input file')
     parser.add_argument('-l', '--library', action='store_true', help='generate RMG thermo library')
+    parser.add_argument('-c', '--cache', metavar='FILE', type=str,
+                        help='SQLite database to reuse estimated thermo from and store it in')
+    parser.add_argument('--cache-read-only', action='store_true', help='do not store new thermo in the cache')
 
     args = parser.parse_args()
 
     input_file = os.path.abspath(args.input[0])
 
-    run_thermo_estimator(input_file, args.library)
+    cache_path = os.path.abspath(args.cache) if args.cache else None
+
+    run_thermo_estimator(input_file, args.library, cache_path, args.cache_read_only)
@@ -30,6 +30,7 @@
 
 from rmgpy.data.base import Entry, Database, ForbiddenStructures
 from rmgpy.molecule import Group, Molecule
+from rmgpy.molecule.query import MoleculeQuery
 
 import pytest
 
@@ -118,6 +119,49 @@ class TestBaseDatabase:
         assert self.database.match_node_to_node(entry1, entry1)
         assert not self.database.match_node_to_node(entry1, entry2)
 
+    def test_descend_compiled_tree(self):
+        """
+        Test that descending a compiled tree tests simple extensions directly
+        and gives the same nodes as matching every child.
+        """
+        def make_entry(label, adjlist, parent=None):
+            entry = Entry(label=label, item=Group().from_adjacency_list(adjlist), parent=parent)
+            self.database.entries[label] = entry
+            if parent is not None:
+                parent.children.append(entry)
+            return entry
+
+        root = make_entry("Root", "1 * C u0 {2,S}\n2 R u0 {1,S}")
+        carbon = make_entry("C-C", "1 * C u0 {2,S}\n2 C u0 {1,S}", root)
+        oxygen = make_entry("C-O", "1 * C u0 {2,S}\n2 O u0 {1,S}", root)
+        methyl = make_entry("C-CH3", "1 * C u0 {2,S}\n2 C u0 {1,S} {3,S} {4,S} {5,S}\n3 H u0 {2,S}\n"
+                                     "4 H u0 {2,S}\n5 H u0 {2,S}", carbon)
+        self.database.top = [root]
+        self.database.compile_tree()
+
+        decision_node = self.database.get_decision_node(root)
+        assert [test[1] is not None for test in decision_node.tests] == [True, True]
+        assert [test[1] is not None for test in self.database.get_decision_node(carbon).tests] == [False]
+
+        ethane = Molecule().from_smiles("CC")
+        methanol = Molecule().from_smiles("CO")
+        propane = Molecule().from_smiles("CCC")
+        for molecule, expected in [(ethane, methyl), (methanol, oxygen), (propane, carbon)]:
+            # Label the carbon atom with the most hydrogen atoms
+            carbons = [atom for atom in molecule.atoms if atom.is_carbon()]
+            max(carbons, key=lambda atom: sum(1 for a in atom.edges if a.is_hydrogen())).label = "*"
+            atoms = molecule.get_all_labeled_atoms()
+            assert self.database.descend_tree(molecule, atoms) is expected
+            for node in [root, carbon]:
+                assert self.database.match_children_to_structure(node, molecule, atoms) == [
+                    child for child in node.children if self.database.match_node_to_structure(child, molecule, atoms)
+                ]
+
+        # Modifying the tree invalidates the compiled node
+        root.children.remove(oxygen)
+        assert not decision_node.is_valid()
+        assert len(self.database.get_decision_node(root).tests) == 1
+
 
 class TestForbiddenStructures:
     def setup_class(self):
@@ -222,3 +266,70 @@ multiplicity 3
 
         assert self.database.is_molecule_forbidden(molecule1)
         assert self.database.is_molecule_forbidden(molecule2)
+
+    def test_forbidden_index(self):
+        """Test that the forbidden structure index screens molecules and follows changes to the entries."""
+        database = ForbiddenStructures()
+        database.load_entry(
+            label="carbene",
+            group="""
+1 C u2 p0 {2,D}
+2 C u0 {1,D}
+""",
+        )
+        database.load_entry(
+            label="oxygen",
+            molecule="""
+multiplicity 3
+1 O u1 p2 c0 {2,S}
+2 O u1 p2 c0 {1,S}
+""",
+        )
+
+        index = database.get_index()
+        assert len(index.groups) == 1
+        assert len(index.molecules) == 1
+        assert MoleculeQuery(Molecule().from_smiles("[O][O]")).find_in(index.molecules) == [database.entries["oxygen"]]
+        assert database.get_index() is index
+
+        # water is screened out of the group without an isomorphism check, ethane has to be checked
+        entry, labels, element_count, atomtypes = index.groups[0]
+        water = Molecule().from_smiles("O")
+        assert not index.is_fingerprint_match(index.get_molecule_fingerprint(water), element_count, atomtypes)
+        assert not database.is_molecule_forbidden(water)
+        ethane = Molecule().from_smiles("CC")
+        assert index.is_fingerprint_match(index.get_molecule_fingerprint(ethane), element_count, atomtypes)
+        assert not database.is_molecule_forbidden(ethane)
+        assert database.is_molecule_forbidden(Molecule().from_smiles("[O][O]"))
+
+        database.load_entry(
+            label="oxygen",
+            molecule="""
+1 C u4 p0 c0
+""",
+        )
+        assert database.get_index() is not index
+        assert not database.is_molecule_forbidden(Molecule().from_smiles("[O][O]"))
+        assert database.is_molecule_forbidden(Molecule().from_adjacency_list("1 C u4 p0 c0"))
+
+        # entries changed directly are only indexed after resetting the index
+        index = database.get_index()
+        del database.entries["oxygen"]
+        assert database.get_index() is index
+        database.reset_index()
+        assert database.get_index() is not index
+        assert not database.is_molecule_forbidden(Molecule().from_adjacency_list("1 C u4 p0 c0"))
+
+    def test_unsupported_forbidden_entry(self):
+        """Test that an unsupported entry is reported even if a supported entry matches first."""
+        database = ForbiddenStructures()
+        database.load_entry(
+            label="carbene",
+            group="""
+1 C u2 p0 {2,D}
+2 C u0 {1,D}
+""",
+        )
+        database.load_entry(label="logic", group="OR{carbene}")
+        with pytest.raises(NotImplementedError):
+            database.is_molecule_forbidden(Molecule().from_smiles("[C]=C"))
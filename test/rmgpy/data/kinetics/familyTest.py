@@ -876,6 +876,75 @@ class TestTreeGeneration:
         self.family.regularize(thermo_database=self.thermoDatabase, rxns=self.treerxns)
         self.family.check_tree()
 
+    def test_g_tree_checkpoint(self, tmp_path):
+        """
+        test that a checkpointed tree is restored and that tree generation resumes from and removes the checkpoint
+        """
+        self.family.clean_tree()
+        self.family.generate_tree(thermo_database=self.thermoDatabase, rxns=self.treerxns, nprocs=1)
+        labels = {label: (entry.parent.label if entry.parent else None) for label, entry in self.family.groups.entries.items()}
+
+        path = str(tmp_path / "tree.pkl")
+        self.family.save_tree_checkpoint(path)
+        self.family.clean_tree()
+        assert self.family.load_tree_checkpoint(path) == 0
+        restored = {label: (entry.parent.label if entry.parent else None) for label, entry in self.family.groups.entries.items()}
+        assert restored == labels
+
+        self.family.generate_tree(thermo_database=self.thermoDatabase, rxns=self.treerxns, nprocs=1, checkpoint_path=path)
+        assert not os.path.exists(path)
+        assert set(self.family.groups.entries.keys()) == set(labels.keys())
+        self.family.check_tree()
+
+    def test_h_parallel_generate_tree(self):
+        """
+        test that subtrees built on worker processes give the same tree as a serial build
+        """
+        self.family.clean_tree()
+        self.family.generate_tree(thermo_database=self.thermoDatabase, rxns=self.treerxns, nprocs=1)
+        labels = set(self.family.groups.entries.keys())
+
+        self.family.clean_tree()
+        self.family.generate_tree(thermo_database=self.thermoDatabase, rxns=self.treerxns, nprocs=2,
+                                  min_splitable_entry_num=0, min_rxns_to_spawn=1)
+        assert set(self.family.groups.entries.keys()) == labels
+        self.family.check_tree()
+
+    def test_i_parallel_cross_validate(self):
+        """
+        test that cross validation folds evaluated on worker processes match the serial evaluation
+        """
+        self.family.clean_tree()
+        self.family.generate_tree(thermo_database=self.thermoDatabase, rxns=self.treerxns, nprocs=1)
+        template_rxn_map = self.family.get_reaction_matches(thermo_database=self.thermoDatabase, remove_degeneracy=True,
+                                                            get_reverse=True, fix_labels=True)
+        self.family.make_bm_rules_from_template_rxn_map(template_rxn_map)
+
+        errors, uncertainties = self.family.cross_validate(folds=2, template_rxn_map=template_rxn_map, nprocs=1)
+        par_errors, par_uncertainties = self.family.cross_validate(folds=2, template_rxn_map=template_rxn_map, nprocs=2)
+
+        assert len(errors) == len(template_rxn_map["Root"])
+        assert set(par_errors.keys()) == set(errors.keys())
+        assert set(par_uncertainties.keys()) == set(uncertainties.keys())
+        for rxn, err in errors.items():
+            assert par_errors[rxn] == pytest.approx(err)
+
+    def test_j_parallel_tree_no_duplicate_children(self):
+        """
+        test that nodes grafted from worker processes are not extended or dispatched again
+        """
+        self.family.clean_tree()
+        self.family.generate_tree(thermo_database=self.thermoDatabase, rxns=self.treerxns, nprocs=3,
+                                  min_splitable_entry_num=0, min_rxns_to_spawn=1)
+        self.family.check_tree()
+        for entry in self.family.groups.entries.values():
+            children = entry.children
+            assert len(set(child.label for child in children)) == len(children)
+            for i, child in enumerate(children):
+                for other in children[i + 1:]:
+                    assert not child.item.is_identical(other.item), "duplicate children {0} and {1} of {2}".format(
+                        child.label, other.label, entry.label)
+
 
 class TestGenerateReactions:
     @classmethod
@@ -34,6 +34,7 @@ import shutil
 
 import rmgpy
 from rmgpy import settings
+from rmgpy.data.kinetics.common import get_reactant_key
 from rmgpy.data.kinetics.database import KineticsDatabase
 from rmgpy.data.kinetics.family import TemplateReaction
 from rmgpy.data.kinetics.library import LibraryReaction
@@ -155,3 +156,24 @@ class TestLibrary:
                         assert round(abs(rxn.network_kinetics.n.value_si - 0), 7) == 0
                         # 2. Check that the pre-exponential factor equals to 6e+8 m^3/(mol*s)
                         assert round(abs(int(rxn.network_kinetics.A.value_si) - 6e8), 7) == 0
+
+    def test_reaction_index(self):
+        """
+        test that library lookups through the reaction index find the same entries as a full scan
+        """
+        library = self.libraries["GRI-Mech3.0"]
+        index = library.get_reaction_index()
+        assert library.get_reaction_index() is index
+
+        for entry in list(library.entries.values())[:20]:
+            reactants = entry.item.reactants[:]
+            assert entry in index[get_reactant_key(reactants)]
+            assert entry in index[get_reactant_key(entry.item.products)]
+
+            expected = [e for e in library.entries.values() if e.item.matches_species(reactants)]
+            found = self.database.generate_reactions_from_library(library, reactants)
+            assert [rxn.entry for rxn in found] == expected
+
+        library.reset_reaction_index()
+        assert library.get_reaction_index() is not index
+        assert library.get_reaction_index() == index
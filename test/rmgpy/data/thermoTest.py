@@ -55,6 +55,7 @@ from rmgpy.data.thermo import (
 from rmgpy.exceptions import DatabaseError
 from rmgpy.ml.estimator import MLEstimator, ADMONITION
 from rmgpy.molecule.molecule import Molecule
+from rmgpy.molecule.query import MoleculeQuery
 from rmgpy.quantity import Quantity
 from rmgpy.species import Species
 import pytest
@@ -602,6 +603,43 @@ multiplicity 2
         assert arom.is_isomorphic(spec.molecule[0])  # The aromatic structure should now be the first one
         assert "library" in thermo.comment, "Thermo not found from library, test purpose not fulfilled."
 
+    def test_library_lookup_by_key(self):
+        """Test that library and depository entries are found through the canonical key index"""
+        for library in self.database.libraries.values():
+            for entry in list(library.entries.values())[:5]:
+                if entry.data is None or entry.item.contains_surface_site():
+                    continue
+                spec = Species(molecule=[entry.item.copy(deep=True)])
+                query = MoleculeQuery(spec.molecule)
+                match = self.database.get_thermo_data_from_library(spec, library, query)
+                thermo_data, matched_library, matched_entry = match
+                assert matched_library is library
+                assert matched_entry is entry
+                assert thermo_data.label == entry.label
+
+        entry = list(self.database.depository["stable"].entries.values())[0]
+        spec = Species(molecule=[entry.item.copy(deep=True)])
+        assert entry in [match[2] for match in self.database.get_thermo_data_from_depository(spec)]
+
+        assert self.database.get_thermo_data_from_library(Species(smiles="OOOOOOOOC#N"), library) is None
+
+    def test_library_molecule_collection_reset(self):
+        """Test that the molecule collections of libraries and depositories are rebuilt after a reset"""
+        library = self.database.libraries["primaryThermoLibrary"]
+        collection = library.get_molecule_collection()
+        assert library.get_molecule_collection() is collection
+        assert len(collection) == len(library.entries)
+
+        library.reset_molecule_collection()
+        assert library.get_molecule_collection() is not collection
+        assert len(library.get_molecule_collection()) == len(collection)
+
+        depository = self.database.depository["stable"]
+        collection = depository.get_molecule_collection()
+        assert depository.get_molecule_collection() is collection
+        depository.reset_molecule_collection()
+        assert depository.get_molecule_collection() is not collection
+
     @pytest.mark.skip(reason=ADMONITION)
     def test_species_thermo_generation_ml(self):
         """Test thermo generation for species objects based on ML estimation."""
@@ -820,6 +858,40 @@ multiplicity 2
         thermo_gav = self.database.get_thermo_data_from_groups(spc)
         assert "missing(N5tc-C2tcS2s)" in thermo_gav.comment
 
+    def test_get_thermo_data_batch(self):
+        """
+        Test that `get_thermo_data_batch` takes library thermo from the libraries and corrects
+        the group additivity estimates for symmetry
+        """
+        thermo_list = self.database.get_thermo_data_batch([Species(molecule=[Molecule().from_smiles("C")])])
+        assert len(thermo_list) == 1
+        assert "Thermo library" in thermo_list[0].comment
+
+        species_list = [Species(molecule=[Molecule().from_smiles(smiles)]) for smiles in ["C[CH]C=CC", "CCCCO"]]
+        thermo_list = self.databaseWithoutLibraries.get_thermo_data_batch(species_list)
+        assert len(thermo_list) == 2
+        for spc, thermo_batch in zip(species_list, thermo_list):
+            thermo = self.databaseWithoutLibraries.estimate_thermo_via_group_additivity(spc.molecule[0].copy(deep=True))
+            symmetry_contribution_to_entropy = -constants.R * math.log(spc.get_symmetry_number())
+            assert thermo_batch.comment.startswith("Thermo group additivity estimation")
+            assert round(abs(thermo_batch.get_enthalpy(298.0) - thermo.get_enthalpy(298.0)), 6) == 0
+            assert round(abs(thermo_batch.get_entropy(298.0) - (thermo.get_entropy(298.0) + symmetry_contribution_to_entropy)), 6) == 0
+
+        # The saturated forms of radicals are estimated in the batch, which matches the estimate via HBI
+        radical = Molecule().from_smiles("C[CH]C=CC")
+        molecule = radical.copy(deep=True)
+        molecule.sort_atoms()
+        thermo = self.databaseWithoutLibraries.estimate_radical_thermo_via_hbi(
+            molecule, self.databaseWithoutLibraries.compute_group_additivity_thermo)
+        thermo_batch = self.databaseWithoutLibraries.estimate_thermo_via_group_additivity_batch(
+            [radical, Molecule().from_smiles("CCCCO")])[0]
+        assert round(abs(thermo_batch.get_enthalpy(298.0) - thermo.get_enthalpy(298.0)), 6) == 0
+        assert round(abs(thermo_batch.get_entropy(298.0) - thermo.get_entropy(298.0)), 6) == 0
+        assert round(abs(thermo_batch.get_heat_capacity(1000.0) - thermo.get_heat_capacity(1000.0)), 6) == 0
+
+        assert self.database.get_thermo_data_batch([]) == []
+        assert self.database.compute_group_additivity_thermo_batch([]) == []
+
     def test_adsorbate_thermo_generation_gav(self):
         """Test thermo generation for adsorbate from Group Additivity value.
 
@@ -1505,6 +1577,38 @@ class TestThermoAccuracy:
                     round(abs(Cp - thermo_data.get_heat_capacity(T) / 4.184), 1) == 0
                 ), "Cp{3} error for {0}. Expected {1} but calculated {2}.".format(smiles, Cp, thermo_data.get_heat_capacity(T) / 4.184, T)
 
+    def test_thermo_generation_batch(self):
+        """
+        Test that estimating the thermo of all test cases together gives the expected group additivity values.
+        """
+        species_list = []
+        for test_case in self.testCases:
+            species = Species().from_smiles(test_case[0])
+            species.generate_resonance_structures()
+            species_list.append(species)
+        species_thermo_list = self.database.get_thermo_data_from_groups_batch(species_list)
+        molecule_thermo_list = self.database.estimate_thermo_via_group_additivity_batch(
+            [Molecule().from_smiles(test_case[0]) for test_case in self.testCases])
+
+        for test_case, species, species_thermo, molecule_thermo in zip(self.testCases, species_list,
+                                                                       species_thermo_list, molecule_thermo_list):
+            smiles, symm, H298, S298 = test_case[:4]
+            cp_list = test_case[4:]
+            if len(species.molecule) > 1:
+                # the expected values may come from the library thermo of another resonance isomer
+                continue
+            for thermo_data in [species_thermo, molecule_thermo]:
+                assert round(abs(H298 - thermo_data.get_enthalpy(298) / 4184), 1) == 0, "H298 error for {0}. Expected {1}, but calculated {2}.".format(
+                    smiles, H298, thermo_data.get_enthalpy(298) / 4184
+                )
+                assert round(abs(S298 - thermo_data.get_entropy(298) / 4.184), 1) == 0, "S298 error for {0}. Expected {1}, but calculated {2}.".format(
+                    smiles, S298, thermo_data.get_entropy(298) / 4.184
+                )
+                for T, Cp in zip(self.Tlist, cp_list):
+                    assert (
+                        round(abs(Cp - thermo_data.get_heat_capacity(T) / 4.184), 1) == 0
+                    ), "Cp{3} error for {0}. Expected {1} but calculated {2}.".format(smiles, Cp, thermo_data.get_heat_capacity(T) / 4.184, T)
+
     def test_symmetry_number_generation(self):
         """
         Test we generate symmetry numbers correctly.
@@ -30,7 +30,7 @@
 import logging
 
 
-from rmgpy.molecule.adjlist import InvalidAdjacencyListError
+from rmgpy.molecule.adjlist import InvalidAdjacencyListError, _read_atom_lines, _read_molecule_atom_lines
 from rmgpy.molecule.group import Group
 from rmgpy.molecule.molecule import Molecule
 import pytest
@@ -685,6 +685,43 @@ class TestMoleculeAdjLists:
         assert "H" in adjlist
         assert "{1,0.5}" in adjlist
 
+    def test_read_molecule_atom_lines(self):
+        """
+        Test that the fast path parser gives the same atoms as the general parser.
+        """
+        adjlist = """
+1 *1 C u1 p0 c0 i13 {2,S} {3,S} {4,S}
+2    H u0 p0 c0 {1,S}
+3    H u0 p0 c0 {1,S}
+4 *2 N u0 p0 c+1 {6,D} {1,S} {5,S}
+5    O u0 p3 c-1 {4,S}
+6    O u0 p2 c0 {4,D}
+"""
+        lines = adjlist.strip().splitlines()
+        atoms1 = _read_molecule_atom_lines(lines)
+        atoms2 = _read_atom_lines(lines, adjlist, False)[0]
+        assert len(atoms1) == len(atoms2) == 6
+        for atom1, atom2 in zip(atoms1, atoms2):
+            assert atom1.equivalent(atom2)
+            assert atom1.label == atom2.label
+            assert atom1.element is atom2.element
+            assert [atoms1.index(atom) for atom in atom1.edges] == [atoms2.index(atom) for atom in atom2.edges]
+            assert [bond.order for bond in atom1.edges.values()] == [bond.order for bond in atom2.edges.values()]
+        assert atoms1[0].element.isotope == 13
+
+    def test_read_molecule_atom_lines_fallback(self):
+        """
+        Test that adjacency lists not in the standard form are left to the general parser.
+        """
+        for adjlist in ["1 O u0 p2 c0 {2,S},{3,S}\n2 H u0 p0 c0 {1,S}\n3 H u0 p0 c0 {1,S}",
+                        "2 H u0 p0 c0 {1,S}\n1 H u0 p0 c0 {2,S}",
+                        "1 H u0 p0 c0 {2,S}\n2 H u0 p0 c0",
+                        "1 X u0 p0 c0 s\"ontop\" {2,S}\n2 H u0 p0 c0 {1,S}",
+                        "1 H u0 p0 c0 {2,0.5}\n2 H u0 p0 c0 {1,0.5}"]:
+            assert _read_molecule_atom_lines(adjlist.splitlines()) is None
+        molecule = Molecule().from_adjacency_list("2 H u0 p0 c0 {1,S}\n1 H u0 p0 c0 {2,S}")
+        assert molecule.is_isomorphic(Molecule(smiles='[H][H]'))
+
     @pytest.mark.skip(reason="WIP")
     def test_from_adjacency_list_for_non_integer_bonds(self):
         """
@@ -35,7 +35,7 @@ This module contains unit tests of the rmgpy.molecule.atomtype module.
 import logging
 import rmgpy.molecule
 from rmgpy.molecule import Molecule
-from rmgpy.molecule.atomtype import get_atomtype
+from rmgpy.molecule.atomtype import get_atomtype, get_features, get_feature_key
 
 import pytest
 
@@ -1003,3 +1003,27 @@ class TestGetAtomType:
         assert self.atom_type(self.mol77, 1) == "H"
         assert self.atom_type(self.mol77, 3) == "Xv"
         assert self.atom_type(self.mol78, 0) == "Xv"
+
+    def test_get_feature_key(self):
+        """
+        Test that get_feature_key() gives distinct keys for distinct features.
+        """
+        keys = {}
+        for mol in [self.mol1, self.mol2, self.mol76, self.mol77]:
+            for atom in mol.atoms:
+                features = get_features(atom, atom.edges)
+                key = get_feature_key(features)
+                assert key >= 0
+                assert keys.setdefault(key, features) == features
+        assert get_feature_key([16, 0, 0, 0, 0, 0, 0, 0, 0, 0]) == -1
+        assert get_feature_key([0, 0, 0, 0, 0, 0, 0, 0, -100, 0]) >= 0
+
+    def test_repeated_perception(self):
+        """
+        Test that get_atomtype() gives the same types when they are looked up again.
+        """
+        first = [self.atom_type(self.mol1, i) for i in range(len(self.mol1.atoms))]
+        second = [self.atom_type(self.mol1, i) for i in range(len(self.mol1.atoms))]
+        assert first == second
+        assert first[0] == "Cs"
+        assert first[5] == "Cd"
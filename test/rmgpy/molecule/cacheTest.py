@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import os
+from unittest.mock import patch
+
+from rmgpy.molecule import Molecule
+from rmgpy.molecule.cache import IdentifierCache, ResonanceCache
+from rmgpy.molecule.resonance import _generate_resonance_structure_list
+
+
+class TestResonanceCache:
+    """
+    Contains unit tests of the ResonanceCache class.
+    """
+
+    def generate(self, cache, mol):
+        mol.update()
+        return cache.generate(mol, _generate_resonance_structure_list)
+
+    def test_hit(self):
+        """Test that a cached result is returned for an isomorphic molecule."""
+        cache = ResonanceCache()
+        mol_list = self.generate(cache, Molecule().from_smiles("C=CC=C[CH2]"))
+        assert len(mol_list) == 2
+        assert cache.misses == 1 and cache.hits == 0
+
+        mol = Molecule().from_smiles("[CH2]C=CC=C")
+        cached_list = self.generate(cache, mol)
+        assert cache.misses == 1 and cache.hits == 1
+        assert cached_list[0] is mol
+        assert len(cached_list) == 2
+        assert cached_list[1].is_isomorphic(mol_list[1])
+        assert cached_list[1] is not mol_list[1]
+        for atom in cached_list[1].atoms:
+            assert '_resonance_cache_index' not in atom.props
+        assert cache.get_statistics()['hit_rate'] == 0.5
+
+    def test_hit_input_state(self):
+        """Test that a cache hit leaves the input molecule as generating the structures does."""
+        cache = ResonanceCache()
+        self.generate(cache, Molecule().from_smiles("C=CC=C[CH2]"))
+
+        mol = Molecule().from_smiles("[CH2]C=CC=C")
+        mol.update()
+        order = mol.atoms[:]
+        uncached = mol.copy(deep=True)
+        self.generate(ResonanceCache(), uncached)
+        self.generate(cache, mol)
+        assert cache.hits == 1
+        assert mol.atoms == order
+        assert mol.reactive == uncached.reactive
+        assert mol.to_adjacency_list() == uncached.to_adjacency_list()
+        for atom in mol.atoms:
+            assert '_resonance_cache_index' not in atom.props
+
+    def test_labels(self):
+        """Test that the atom labels of the new input molecule are transferred to the cached structures."""
+        cache = ResonanceCache()
+        self.generate(cache, Molecule().from_smiles("C=CC=C[CH2]"))
+
+        mol = Molecule().from_adjacency_list("""
+multiplicity 2
+1  *1 C u1 p0 c0 {2,S} {6,S} {7,S}
+2  *2 C u0 p0 c0 {1,S} {3,D} {8,S}
+3  *3 C u0 p0 c0 {2,D} {4,S} {9,S}
+4     C u0 p0 c0 {3,S} {5,D} {10,S}
+5     C u0 p0 c0 {4,D} {11,S} {12,S}
+6     H u0 p0 c0 {1,S}
+7     H u0 p0 c0 {1,S}
+8     H u0 p0 c0 {2,S}
+9     H u0 p0 c0 {3,S}
+10    H u0 p0 c0 {4,S}
+11    H u0 p0 c0 {5,S}
+12    H u0 p0 c0 {5,S}
+""")
+        mol_list = self.generate(cache, mol)
+        assert cache.hits == 1
+        structure = mol_list[1]
+        assert structure.get_labeled_atoms('*1')[0].radical_electrons == 0
+        assert structure.get_labeled_atoms('*3')[0].radical_electrons == 1
+        assert structure.get_bond(structure.get_labeled_atoms('*1')[0],
+                                  structure.get_labeled_atoms('*2')[0]).is_double()
+
+    def test_max_size(self):
+        """Test that the least recently used structures are evicted."""
+        cache = ResonanceCache(max_size=1)
+        self.generate(cache, Molecule().from_smiles("C=C[CH2]"))
+        self.generate(cache, Molecule().from_smiles("C=CC=C[CH2]"))
+        assert len(cache) == 1
+        assert cache.evictions == 1
+        self.generate(cache, Molecule().from_smiles("C=C[CH2]"))
+        assert cache.hits == 0
+
+    def test_save_and_load(self, tmp_path):
+        """Test that the cache can be saved to and loaded from a file."""
+        path = os.path.join(str(tmp_path), 'resonance.pkl')
+        cache = ResonanceCache(path=path)
+        self.generate(cache, Molecule().from_smiles("C=CC=C[CH2]"))
+        cache.save()
+
+        cache = ResonanceCache(path=path)
+        assert len(cache) == 1
+        mol_list = self.generate(cache, Molecule().from_smiles("[CH2]C=CC=C"))
+        assert cache.hits == 1
+        assert len(mol_list) == 2
+
+
+class TestIdentifierCache:
+    """
+    Contains unit tests of the IdentifierCache class.
+    """
+
+    def test_identifier(self):
+        """Test that identifiers are returned for isomorphic molecules only."""
+        cache = IdentifierCache()
+        cache.put_identifier(Molecule().from_smiles("CCO"), 'smi', 'rdkit', 'CCO')
+        assert cache.get_identifier(Molecule().from_smiles("OCC"), 'smi', 'rdkit') == 'CCO'
+        assert cache.get_identifier(Molecule().from_smiles("OCC"), 'inchi', 'rdkit') is None
+        assert cache.get_identifier(Molecule().from_smiles("COC"), 'smi', 'rdkit') is None
+        assert cache.hits == 1 and cache.misses == 2
+
+    def test_structure(self):
+        """Test that copies of the stored structures are returned."""
+        cache = IdentifierCache()
+        mol = Molecule().from_smiles("[CH2]C=C")
+        cache.put_structure('[CH2]C=C', 'smi', 'rdkit', True, mol)
+        structure = cache.get_structure('[CH2]C=C', 'smi', 'rdkit', True)
+        assert structure.is_isomorphic(mol)
+        assert structure.multiplicity == 2
+        assert structure.atoms[0] is not mol.atoms[0]
+        assert cache.get_structure('[CH2]C=C', 'smi', 'rdkit', False) is None
+
+    def test_max_size(self):
+        """Test that the least recently used translations are evicted."""
+        cache = IdentifierCache(max_size=1)
+        cache.put_identifier(Molecule().from_smiles("CCO"), 'smi', 'rdkit', 'CCO')
+        cache.put_identifier(Molecule().from_smiles("COC"), 'smi', 'rdkit', 'COC')
+        assert cache.evictions == 1
+        assert cache.get_identifier(Molecule().from_smiles("CCO"), 'smi', 'rdkit') is None
+
+    def test_database(self, tmp_path):
+        """Test that translations are shared through the database."""
+        path = os.path.join(str(tmp_path), 'identifiers.db')
+        cache = IdentifierCache(path=path)
+        cache.put_identifier(Molecule().from_smiles("CCO"), 'smi', 'rdkit', 'CCO')
+        cache.put_structure('C=C[CH2]', 'smi', 'rdkit', True, Molecule().from_smiles("C=C[CH2]"))
+        cache.close()
+
+        cache = IdentifierCache(path=path, read_only=True)
+        assert cache.get_identifier(Molecule().from_smiles("OCC"), 'smi', 'rdkit') == 'CCO'
+        structure = cache.get_structure('C=C[CH2]', 'smi', 'rdkit', True)
+        assert structure.is_isomorphic(Molecule().from_smiles("[CH2]C=C"))
+        assert cache.hits == 2
+        cache.put_identifier(Molecule().from_smiles("COC"), 'smi', 'rdkit', 'COC')
+        cache.close()
+
+        cache = IdentifierCache(path=path)
+        assert cache.get_identifier(Molecule().from_smiles("COC"), 'smi', 'rdkit') is None
+        cache.close()
+
+    def test_read_only_path_with_uri_characters(self, tmp_path):
+        """Test that a database whose path contains URI delimiters can be opened read-only."""
+        path = os.path.join(str(tmp_path), 'identifiers #1?.db')
+        cache = IdentifierCache(path=path)
+        cache.put_identifier(Molecule().from_smiles("CCO"), 'smi', 'rdkit', 'CCO')
+        cache.close()
+
+        cache = IdentifierCache(path=path, read_only=True)
+        assert cache.get_identifier(Molecule().from_smiles("OCC"), 'smi', 'rdkit') == 'CCO'
+        cache.close()
+
+    def test_translator(self):
+        """Test that the translator reuses cached translations."""
+        from rmgpy.molecule.cache import identifier_cache
+        identifier_cache.clear()
+        mol = Molecule().from_smiles("CC(C)O", backend='rdkit')
+        Molecule().from_smiles("CC(C)O", backend='rdkit')
+        assert identifier_cache.hits == 1
+        assert mol.to_inchi() == Molecule().from_smiles("OC(C)C").to_inchi()
+        assert identifier_cache.hits == 2
+
+    def test_aug_inchi_repeated(self):
+        """Test that repeated augmented InChI lookups return the same string and keep the atom order."""
+        from rmgpy.molecule.cache import identifier_cache
+        identifier_cache.clear()
+        singlet = Molecule().from_adjacency_list("""
+1 C u0 p1 c0 {2,S} {3,S}
+2 H u0 p0 c0 {1,S}
+3 H u0 p0 c0 {1,S}
+""")
+        triplet = Molecule().from_adjacency_list("""
+multiplicity 3
+1 C u2 p0 c0 {2,S} {3,S}
+2 H u0 p0 c0 {1,S}
+3 H u0 p0 c0 {1,S}
+""")
+        order = singlet.atoms[:]
+        aug_inchi = singlet.to_augmented_inchi()
+        for _ in range(2):
+            assert singlet.to_augmented_inchi() == aug_inchi
+            assert singlet.atoms == order
+        assert identifier_cache.hits == 2
+        assert triplet.to_augmented_inchi() != aug_inchi
+        assert triplet.to_augmented_inchi() == triplet.copy(deep=True).to_augmented_inchi()
+
+    def test_labelled_smiles(self):
+        """Test that SMILES of molecules with labelled atoms are not served from the cache."""
+        from rmgpy.molecule.cache import identifier_cache
+        from rmgpy.molecule.fragment import Fragment
+        identifier_cache.clear()
+        smiles_r = Fragment().from_smiles_like_string("CCR").to_smiles()
+        smiles_l = Fragment().from_smiles_like_string("CCL").to_smiles()
+        assert smiles_r != smiles_l
+        assert Fragment().from_smiles_like_string("CCR").to_smiles() == smiles_r
+
+    @patch("rmgpy.molecule.cache.atexit")
+    def test_database_close_registered_once(self, mock_atexit, tmp_path):
+        """Test that reconnecting to a database registers the exit handler only once."""
+        cache = IdentifierCache()
+        cache.connect(os.path.join(str(tmp_path), 'identifiers1.db'))
+        cache.connect(os.path.join(str(tmp_path), 'identifiers2.db'))
+        mock_atexit.register.assert_called_once_with(cache.close)
+        cache.close()
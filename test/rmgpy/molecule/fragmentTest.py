@@ -642,6 +642,44 @@ class TestFragment:
         assert len(frags) == 2
         assert expected_element == total_element
 
+    def test_sliceitup_arom_fragments(self):
+        # cut an alkylbenzene at the fourth aliphatic carbon
+        fragment = rmgpy.molecule.fragment.Fragment().from_smiles_like_string("c1ccccc1CCCCCCCCC")
+        frags = rmgpy.molecule.fragment.Fragment().sliceitup_arom(fragment)
+
+        assert len(frags) == 2
+        expected = [
+            [rmgpy.molecule.fragment.Fragment().from_smiles_like_string(smiles) for smiles in pair]
+            for pair in (("c1ccccc1CCCCR", "LCCCCC"), ("c1ccccc1CCCCL", "RCCCCC"))
+        ]
+        assert any(
+            all(frag.is_isomorphic(expected_frag) for frag, expected_frag in zip(frags, pair))
+            for pair in expected
+        )
+
+    def test_sliceitup_arom_branched(self):
+        # cut both branches at the benzylic carbon into three fragments
+        fragment = rmgpy.molecule.fragment.Fragment().from_smiles_like_string("c1ccccc1C(CCCCCCCC)CCCCCCCC")
+        frags = rmgpy.molecule.fragment.Fragment().sliceitup_arom(fragment)
+
+        assert len(frags) == 3
+        expected = [
+            rmgpy.molecule.fragment.Fragment().from_smiles_like_string(smiles)
+            for smiles in ("c1ccccc1C(CCCR)CCCR", "LCCCCC", "LCCCCC")
+        ]
+        for frag in frags:
+            assert any(frag.is_isomorphic(expected_frag) for expected_frag in expected)
+        assert sum(1 for frag in frags if frag.is_isomorphic(expected[1])) == 2
+
+    def test_sliceitup_arom_aromatic_terminal(self):
+        # the terminal aliphatic carbon of a pattern does not match an aromatic carbon,
+        # so 1,5-diphenylpentane is not cut
+        fragment = rmgpy.molecule.fragment.Fragment().from_smiles_like_string("c1ccccc1CCCCCc1ccccc1")
+        frags = rmgpy.molecule.fragment.Fragment().sliceitup_arom(fragment)
+
+        assert len(frags) == 1
+        assert fragment.is_isomorphic(frags[0])
+
     def test_sliceitup_arom2(self):
         # do not cut when input is aliphatic species
 
@@ -694,6 +732,25 @@ class TestFragment:
 
         assert len(new_frags) == 2
 
+    def test_cut_molecule3(self):
+        # test cutting into three fragments and reusing the cached cut
+        fragment = rmgpy.molecule.fragment.Fragment().from_smiles_like_string("c1ccccc1C(CCCCCCCC)CCCCCCCC")
+        new_frags = fragment.cut_molecule(cut_through=False)
+
+        assert len(new_frags) == 3
+        labels = sorted(
+            sorted(atom.symbol for atom in frag.atoms if isinstance(atom, rmgpy.molecule.fragment.CuttingLabel))
+            for frag in new_frags
+        )
+        assert labels == [["L"], ["L"], ["R", "R"]]
+        assert sum(frag.get_num_atoms("C") for frag in new_frags) == 23
+
+        cached_frags = fragment.cut_molecule(cut_through=False)
+        assert len(cached_frags) == 3
+        for frag, cached_frag in zip(new_frags, cached_frags):
+            assert frag is not cached_frag
+            assert frag.is_isomorphic(cached_frag)
+
     def test_calculate_symmetry_number1(self):
         #  for fragment with 1 CuttingLabel
         fragment = rmgpy.molecule.fragment.Fragment().from_smiles_like_string("CCR")
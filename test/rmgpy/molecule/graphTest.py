@@ -487,6 +487,32 @@ class TestGraph:
         assert graph2.is_subgraph_isomorphic(graph1)
         assert len(graph1.find_subgraph_isomorphisms(graph2)) > 0
 
+    def test_canonical_hash(self):
+        """
+        Check that the canonical hash does not depend on the vertex order and
+        is reset when the graph is modified.
+        """
+        vertices = [Vertex() for _ in range(6)]
+        graph = Graph()
+        for vertex in reversed(vertices):
+            graph.add_vertex(vertex)
+        for i in range(5):
+            graph.add_edge(Edge(vertices[i], vertices[i + 1]))
+        assert graph.get_canonical_hash() == self.graph.get_canonical_hash()
+        assert graph.get_canonical_hash(strict=False) == self.graph.get_canonical_hash(strict=False)
+
+        # A star with the same number of vertices and edges is not isomorphic to the chain
+        star = Graph([Vertex() for _ in range(6)])
+        for vertex in star.vertices[1:]:
+            star.add_edge(Edge(star.vertices[0], vertex))
+        assert star.get_canonical_hash() != self.graph.get_canonical_hash()
+
+        hash0 = graph.get_canonical_hash()
+        graph.remove_edge(graph.get_edge(vertices[2], vertices[3]))
+        assert graph.get_canonical_hash() != hash0
+        graph.add_edge(Edge(vertices[2], vertices[3]))
+        assert graph.get_canonical_hash() == hash0
+
     def test_subgraph_isomorphism(self):
         """
         Check the subgraph isomorphism functions.
@@ -713,6 +739,53 @@ class TestGraph:
         size_list = sorted([len(cycle) for cycle in cycle_list])
         assert size_list == [4, 4, 4, 4, 4]
 
+    def test_ring_perception_cache(self):
+        """
+        Test that ring perception results are cached and reset when the graph
+        is modified.
+        """
+        edge = Edge(self.graph.vertices[0], self.graph.vertices[3])
+        self.graph.add_edge(edge)
+        sssr = self.graph.get_smallest_set_of_smallest_rings()
+        assert len(sssr) == 1
+
+        # Modifying the returned list does not modify the cached result
+        sssr[0].pop()
+        sssr.append([])
+        cycle_list = self.graph.get_smallest_set_of_smallest_rings()
+        assert len(cycle_list) == 1
+        assert len(cycle_list[0]) == 4
+        assert self.graph.get_monocycles() == cycle_list
+        assert self.graph.get_all_cycles_of_size(4) != []
+
+        self.graph.remove_edge(edge)
+        assert self.graph.get_smallest_set_of_smallest_rings() == []
+        assert self.graph.get_relevant_cycles() == []
+        assert self.graph.get_monocycles() == []
+        assert self.graph.get_all_cycles_of_size(4) == []
+
+    def test_ring_perception_cache_with_save_order(self):
+        """
+        Test that an isomorphism check which saves and restores the vertex order
+        does not clear the cached rings if the order is unchanged.
+        """
+        edge = Edge(self.graph.vertices[0], self.graph.vertices[3])
+        self.graph.add_edge(edge)
+        self.graph.sort_vertices()
+        order = self.graph.vertices[:]
+        monocycles = self.graph.get_monocycles()
+        assert len(monocycles) == 1
+
+        other = self.graph.copy(deep=True)
+        assert self.graph.is_isomorphic(other, save_order=True)
+        assert self.graph.vertices == order
+
+        # Remove the edge without resetting the cache, so that the cached rings
+        # are only returned if they survived the isomorphism check
+        del edge.vertex1.edges[edge.vertex2]
+        del edge.vertex2.edges[edge.vertex1]
+        assert self.graph.get_monocycles() == monocycles
+
     def test_cycle_list_order_sssr(self):
         """
         Test that get_smallest_set_of_smallest_rings return vertices in the proper order.
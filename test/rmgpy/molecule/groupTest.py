@@ -406,6 +406,40 @@ class TestGroupAtom:
                     assert not atom1.is_specific_case_of(atom2gen), "{0!s} is a specific case of {1!s}".format(atom1, atom2gen)
                     assert not atom1gen.is_specific_case_of(atom2), "{0!s} is a specific case of {1!s}".format(atom1gen, atom2)
 
+    def test_get_match_masks(self):
+        """
+        Test that the GroupAtom.get_match_masks() method agrees with Atom.is_specific_case_of().
+        """
+        molecule = Molecule().from_smiles("[CH2]C(=O)[O-]")
+        groups = [
+            GroupAtom(atomtype=[ATOMTYPES["R"]]),
+            GroupAtom(atomtype=[ATOMTYPES["R!H"]], radical_electrons=[1]),
+            GroupAtom(atomtype=[ATOMTYPES["Cs"], ATOMTYPES["CO"]], radical_electrons=[0]),
+            GroupAtom(atomtype=[ATOMTYPES["O"]], charge=[-1], lone_pairs=[3]),
+            GroupAtom(atomtype=[ATOMTYPES["O2d"]], lone_pairs=[1, 2]),
+            GroupAtom(atomtype=[]),
+        ]
+        for group in groups:
+            masks = group.get_match_masks()
+            for atom in molecule.atoms:
+                bits = atom.get_match_bits()
+                match = all(bit & mask for bit, mask in zip(bits, masks))
+                assert match == atom.is_specific_case_of(group), "{0!r} and {1!r}".format(atom, group)
+
+        # Every atom type has its own bit, including those beyond the width of a C int
+        assert len(set(atomtype.match_bit for atomtype in ATOMTYPES.values())) == len(ATOMTYPES)
+        group = Group().from_adjacency_list(
+            """
+1 [Cs,CO] u0 {2,S}
+2 [Cs,CO] u0 {1,S}
+"""
+        )
+        assert not molecule.is_subgraph_isomorphic(group)
+
+        # Constraints that are not encoded leave the matching to is_specific_case_of
+        assert GroupAtom(atomtype=[ATOMTYPES["X"]], site=["ontop"]).get_match_masks() is None
+        assert GroupAtom(atomtype=[ATOMTYPES["C"]], props={"inRing": True}).get_match_masks() is None
+
     def test_copy(self):
         """
         Test the GroupAtom.copy() method.
@@ -694,6 +728,19 @@ class TestGroupBond:
                 else:
                     assert not bond1.is_specific_case_of(bond2)
 
+    def test_get_match_masks(self):
+        """
+        Test that the GroupBond.get_match_masks() method agrees with Bond.is_specific_case_of().
+        """
+        molecule = Molecule().from_smiles("C=CC#C")
+        for order in self.orderList:
+            group = GroupBond(None, None, order=order)
+            mask = group.get_match_masks()
+            assert mask != 0
+            for bond in molecule.get_all_edges():
+                assert bool(bond.get_match_bits() & mask) == bond.is_specific_case_of(group)
+        assert GroupBond(None, None, order=[0.7]).get_match_masks() == 0
+
     def test_copy(self):
         """
         Test the GroupBond.copy() method.
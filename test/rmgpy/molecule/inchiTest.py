@@ -41,13 +41,14 @@ from rmgpy.molecule.inchi import (
     U_LAYER_PREFIX,
 )
 from rmgpy.molecule.inchi import (
+    _find_lowest_u_layer,
     _has_unexpected_lone_pairs,
     _parse_e_layer,
     _parse_h_layer,
     _parse_n_layer,
     _reset_lone_pairs,
 )
-from rmgpy.molecule.molecule import Atom, Molecule
+from rmgpy.molecule.molecule import Atom, Bond, Molecule
 import pytest
 
 
@@ -241,6 +242,50 @@ class CreateULayerTest:
         assert u_layers[0] == u_layers[1]
 
 
+class FindLowestULayerTest:
+    def make_ring(self, size, u_layer):
+        """
+        Return a ring of carbon atoms with unpaired electrons on the atoms
+        with the 1-based indices in `u_layer`.
+        """
+        atoms = [Atom(element="C", radical_electrons=u_layer.count(i + 1)) for i in range(size)]
+        mol = Molecule(atoms=atoms)
+        for i in range(size):
+            mol.add_bond(Bond(atoms[i], atoms[(i + 1) % size], order=1))
+        return mol
+
+    def test_equivalent_ring_atoms(self):
+        """
+        Test that the radical positions of a ring polyradical are moved to the
+        lowest equivalent positions with the same spacing.
+        """
+        u_layer = [2, 5, 8, 11, 14, 17, 20, 23]
+        mol = self.make_ring(24, u_layer)
+        result = _find_lowest_u_layer(mol, u_layer, [list(range(1, 25))])
+        assert result == [1, 4, 7, 10, 13, 16, 19, 22]
+
+    def test_single_electrons(self):
+        """
+        Test that unpaired electrons that are each alone in their set of
+        equivalent atoms are moved together.
+        """
+        u_layer = [5, 9, 11, 15, 18, 20, 22, 24]
+        mol = self.make_ring(24, u_layer)
+        equivalent_atoms = [[k, k + 8, k + 16] for k in range(1, 9)]
+        result = _find_lowest_u_layer(mol, u_layer, equivalent_atoms)
+        assert result == [1, 3, 5, 7, 10, 14, 16, 20]
+
+    def test_atom_with_two_electrons(self):
+        """
+        Test that the u-layer is unchanged if an equivalent atom bears more
+        than one unpaired electron.
+        """
+        u_layer = [4, 4, 8]
+        mol = self.make_ring(8, u_layer)
+        result = _find_lowest_u_layer(mol, u_layer, [[2, 3, 4, 7], [6, 8]])
+        assert result == [4, 4, 8]
+
+
 class ExpectedLonePairsTest:
     def test_singlet_carbon(self):
         mol = Molecule(atoms=[Atom(element="C", lone_pairs=1)])
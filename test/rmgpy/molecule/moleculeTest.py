@@ -32,6 +32,7 @@ from rmgpy.exceptions import InchiException
 from rmgpy.molecule.element import get_element, element_list
 from rmgpy.molecule.group import Group, ActionError
 from rmgpy.molecule.molecule import Atom, Bond, Molecule
+from rmgpy.molecule.query import get_molecule_key
 import pytest
 
 
@@ -1156,6 +1157,56 @@ class TestMolecule:
         new_molecule = Molecule().from_adjacency_list(adjlist_1)
         assert self.molecule[0].is_isomorphic(new_molecule)
 
+    def test_canonical_hash(self):
+        """
+        Check that the strict canonical hash distinguishes resonance structures
+        while the non-strict hash does not, and that it is reset by update().
+        """
+        molecule1 = Molecule().from_smiles("C=CC=C[CH]C")
+        molecule2 = Molecule().from_smiles("C[CH]C=CC=C")
+        assert molecule1.get_canonical_hash() == molecule2.get_canonical_hash()
+
+        resonance = Molecule().from_smiles("[CH2]C=CC=CC")
+        assert molecule1.get_canonical_hash() != resonance.get_canonical_hash()
+        assert molecule1.get_canonical_hash(strict=False) == resonance.get_canonical_hash(strict=False)
+        assert not molecule1.is_isomorphic(resonance)
+        assert molecule1.is_isomorphic(resonance, strict=False)
+
+        ethane = Molecule().from_smiles("CC")
+        hash0 = ethane.get_canonical_hash()
+        hydrogen = [atom for atom in ethane.atoms if atom.is_hydrogen()][0]
+        carbon = list(hydrogen.edges.keys())[0]
+        ethane.remove_atom(hydrogen)
+        carbon.increment_radical()
+        ethane.update()
+        assert ethane.get_canonical_hash() != hash0
+        assert ethane.is_isomorphic(Molecule().from_smiles("[CH2]C"))
+
+        # Updating the atom types after modifying bonds in place clears the cached hash
+        kekule = Molecule().from_smiles("C1=CC=CC=C1")
+        aromatic = [mol for mol in kekule.generate_resonance_structures() if mol.is_aromatic()][0]
+        hash0 = kekule.get_canonical_hash()
+        for bond in kekule.get_all_edges():
+            if bond.atom1.is_carbon() and bond.atom2.is_carbon():
+                bond.set_order_str('B')
+        kekule.update_atomtypes()
+        assert kekule.get_canonical_hash() != hash0
+        assert kekule.is_isomorphic(aromatic)
+        assert kekule.find_isomorphism(aromatic)
+        assert get_molecule_key(kekule) == get_molecule_key(aromatic)
+
+        # Editing an atom in place leaves the cached hash stale, which must not
+        # make isomorphic molecules compare as different
+        labeled = Molecule().from_smiles("CC")
+        unlabeled = Molecule().from_smiles("CC")
+        [atom for atom in labeled.atoms if atom.is_carbon()][0].element = get_element("C", 13)
+        assert not labeled.is_isomorphic(unlabeled)
+        for atom in labeled.atoms:
+            if atom.element.isotope != -1:
+                atom.element = get_element(atom.element.symbol)
+        assert labeled.is_isomorphic(unlabeled)
+        assert labeled.find_isomorphism(unlabeled)
+
     def test_isomorphism(self):
         """
         Check the graph isomorphism functions.
@@ -2110,6 +2161,22 @@ multiplicity 2
             lp += atom.lone_pairs
         assert lp == 1
 
+    def test_update_atomtypes_of_atoms(self):
+        """
+        Test that only the given atoms are re-typed by update_atomtypes().
+        """
+        mol = Molecule().from_smiles("C=CC")
+        atom1, atom2 = mol.atoms[0], mol.atoms[1]
+        bond = mol.get_bond(atom1, atom2)
+        bond.decrement_order()
+        atom1.increment_radical()
+        atom2.increment_radical()
+        mol.update_atomtypes(atoms=[atom1])
+        assert atom1.atomtype.label == "Cs"
+        assert atom2.atomtype.label == "Cd"
+        mol.update_atomtypes()
+        assert atom2.atomtype.label == "Cs"
+
     def test_large_mol_update(self):
         adjlist = """
 1  C u0 p0 c0 {7,S} {33,S} {34,S} {35,S}
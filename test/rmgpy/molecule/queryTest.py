@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+
+import pytest
+
+from rmgpy.molecule import Molecule
+from rmgpy.molecule.query import MoleculeCollection, MoleculeQuery, get_molecule_key
+from rmgpy.species import Species
+
+
+class TestMoleculeQuery:
+    """
+    Contains unit tests of the MoleculeQuery and MoleculeCollection classes.
+    """
+
+    def setup_class(self):
+        self.species = [Species().from_smiles(smiles) for smiles in ["C", "CC", "C=C[CH2]", "CCO", "OCC"]]
+        for species in self.species:
+            species.generate_resonance_structures()
+        self.collection = MoleculeCollection.from_species(self.species)
+
+    def test_collection(self):
+        """Test that every molecule of every species is indexed by its key."""
+        assert len(self.collection) == sum([len(species.molecule) for species in self.species])
+        for species in self.species:
+            for molecule in species.molecule:
+                assert (molecule, species) in [
+                    (target, item) for position, target, item in self.collection.get_candidates(get_molecule_key(molecule))
+                ]
+
+    def test_find_in(self):
+        """Test that the isomorphic items are found in the order of the collection."""
+        allyl = Molecule().from_smiles("[CH2]C=C")
+        assert MoleculeQuery(allyl).find_in(self.collection) == [self.species[2]]
+        # Ethanol was added twice, but each item is only returned once
+        ethanol = Species().from_smiles("CCO")
+        assert MoleculeQuery(ethanol.molecule).find_in(self.collection) == [self.species[3], self.species[4]]
+        assert MoleculeQuery(ethanol.molecule).find_in(self.collection, first=True) == [self.species[3]]
+        assert MoleculeQuery(ethanol.molecule).is_in(self.collection)
+        assert not MoleculeQuery(Molecule().from_smiles("CCC")).is_in(self.collection)
+
+    def test_find_matches(self):
+        """Test that the matching query molecule is returned with each item."""
+        resonance = Molecule().from_smiles("C=C[CH2]").generate_resonance_structures()
+        query = MoleculeQuery(resonance)
+        matches = query.find_matches(self.collection)
+        assert len(matches) == 1
+        assert matches[0][0] is self.species[2]
+        assert matches[0][1] is resonance[0]
+
+    def test_strict(self):
+        """Test that the strictness of the query and the collection must agree."""
+        with pytest.raises(ValueError):
+            MoleculeQuery(Molecule().from_smiles("C")).find_in(MoleculeCollection(strict=False))
+        collection = MoleculeCollection(strict=False)
+        collection.add(Molecule().from_smiles("[CH2]C=C"))
+        assert MoleculeQuery(Molecule().from_smiles("C=C[CH2]"), strict=False).is_in(collection)
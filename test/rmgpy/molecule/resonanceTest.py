@@ -28,9 +28,12 @@
 ###############################################################################
 
 
+from rmgpy.molecule.filtration import filter_structures
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.molecule.resonance import (
+    _clar_enumeration,
     _clar_optimization,
+    _enumerate_clar_solutions,
     _clar_transformation,
     generate_clar_structures,
     generate_kekule_structure,
@@ -76,6 +79,16 @@ class ResonanceTest:
         mol_list = generate_resonance_structures(Molecule(smiles="C=C[CH][O]"))
         assert len(mol_list) == 3
 
+    def test_filter_while_generating(self):
+        """Test that discarding structures during generation gives the same structures as filtering afterwards"""
+        for smiles in ["[NH]N=S=O", "CS(=O)SC", "[N-]=[N+]=N", "[O]N=O", "N#[N+]SS[O-]", "OS(=O)(=O)O"]:
+            filtered = generate_resonance_structures(Molecule(smiles=smiles))
+            unfiltered = generate_resonance_structures(Molecule(smiles=smiles), filter_structures=False)
+            expected = filter_structures(unfiltered)
+            assert len(filtered) == len(expected)
+            for mol in expected:
+                assert any(mol.is_isomorphic(other) for other in filtered)
+
     def ch2no(self):
         """Test combined resonance transitions of allyl-shift and lonePair-radical"""
         mol_list = generate_resonance_structures(Molecule(smiles="[CH2]N=O"))
@@ -1402,6 +1415,37 @@ class ClarTest:
             # Check that we only assign 1 aromatic sextet
             assert sum(y) == 1
 
+    def test_clar_enumeration(self):
+        """Test that the Clar enumeration finds the same sextets as the optimization"""
+        for smiles in [
+            "C1=CC=C2C=CC=CC2=C1",  # naphthalene
+            "C1=CC=C2C(C=CC3=CC=CC=C32)=C1",  # phenanthrene
+            "C1=CC2=CC=CC3CC=CC(=C1)C=32",  # phenalene
+            "C1=CC2=CC=C3C=CC4=C5C6=C(C2=C35)C1=CC=C6C=C4",  # corannulene
+            "C1=CC=C2C=C3C=CC=CC3=CC2=C1",  # anthracene
+            "C=C1C=CC=CC1=C",  # exocyclic double bonds
+        ]:
+            mol = Molecule(smiles=smiles)
+            mol.assign_atom_ids()
+            expected = sorted([solution[0:len(asssr)] for molecule, asssr, bonds, solution in _clar_optimization(mol)])
+            output = _clar_enumeration(mol)
+            assert sorted([solution[0:len(asssr)] for molecule, asssr, bonds, solution in output]) == expected
+            assert len(set([id(molecule) for molecule, asssr, bonds, solution in output])) == len(output)
+            for molecule, asssr, bonds, solution in output:
+                assert all([bond in molecule.get_all_edges() for bond in bonds])
+
+    def test_enumerate_clar_solutions(self):
+        """Test the Clar enumeration on the ring system of naphthalene, with atoms 4 and 5 shared"""
+        rings = [(0, 1, 2, 3, 4, 5), (4, 5, 6, 7, 8, 9)]
+        bonds = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (0, 5), (4, 9), (5, 6), (6, 7), (7, 8), (8, 9)]
+        exo = [None] * len(bonds)
+        solutions = _enumerate_clar_solutions(10, rings, bonds, exo)
+        assert sorted([solution[0:2] for solution in solutions]) == [[0, 1], [1, 0]]
+        for solution in solutions:
+            assert sum(solution[2:]) == 2
+        # The search gives up if it takes too many steps
+        assert _enumerate_clar_solutions(10, rings, bonds, exo, max_steps=1) is None
+
     def test_phenanthrene(self):
         """Test that we generate 1 Clar structure for phenanthrene."""
         mol = Molecule().from_smiles("C1=CC=C2C(C=CC3=CC=CC=C32)=C1")
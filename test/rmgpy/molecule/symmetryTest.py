@@ -28,6 +28,7 @@
 ###############################################################################
 
 
+from rmgpy.molecule.cache import SymmetryNumberCache
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.molecule.resonance import generate_optimal_aromatic_resonance_structures
 from rmgpy.molecule.symmetry import (
@@ -35,6 +36,8 @@ from rmgpy.molecule.symmetry import (
     calculate_axis_symmetry_number,
     calculate_bond_symmetry_number,
     calculate_cyclic_symmetry_number,
+    calculate_symmetry_number,
+    _get_cyclic_bonds,
     _indistinguishable,
 )
 from rmgpy.species import Species
@@ -712,6 +715,28 @@ multiplicity 3
         """
         assert Species().from_smiles("CC1CC(C)C1").get_symmetry_number() == 36
 
+    def test_get_cyclic_bonds(self):
+        """
+        Test that the bonds in cycles are found, and not the bonds to substituents
+        """
+        mol = Molecule().from_smiles("CC1CC1C2CCC2")
+        cyclic_bonds = _get_cyclic_bonds(mol)
+        for bond in mol.get_all_edges():
+            assert (id(bond) in cyclic_bonds) == mol.is_bond_in_cycle(bond)
+        assert len(cyclic_bonds) == 7
+
+    def test_symmetry_number_cache(self):
+        """
+        Test that symmetry numbers are reused for isomorphic molecules
+        """
+        cache = SymmetryNumberCache()
+        assert cache.get_symmetry_number(Molecule().from_smiles("CC(C)C"), calculate_symmetry_number) == 81
+        assert cache.get_symmetry_number(Molecule().from_smiles("C(C)(C)C"), calculate_symmetry_number) == 81
+        assert cache.get_symmetry_number(Molecule().from_smiles("CC"), calculate_symmetry_number) == 18
+        assert cache.hits == 1
+        assert cache.misses == 2
+        assert cache.get_statistics()['calculation_time'] >= 0.0
+
     def test_indistinguishable(self):
         """
         Test that the _indistinguishable function works properly
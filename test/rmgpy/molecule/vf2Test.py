@@ -31,6 +31,7 @@
 from numpy import testing
 
 from rmgpy.molecule.graph import get_vertex_connectivity_value
+from rmgpy.molecule.group import Group
 from rmgpy.molecule.molecule import Molecule
 from rmgpy.molecule.vf2 import VF2
 
@@ -88,3 +89,52 @@ class TestVF2:
         for atom in self.mol.atoms:
             assert atom.mapping is None
             assert not atom.terminal
+
+    def test_save_order_repeated(self):
+        """Test that the vertex order is restored when the same graphs are compared more than once."""
+        mol = Molecule().from_smiles("C=CC(=O)O")
+        mol2 = Molecule().from_smiles("OC(=O)C=C")
+        order = mol.atoms[:]
+        order2 = mol2.atoms[:]
+        for _ in range(3):
+            assert self.vf2.is_isomorphic(mol, mol2, None, save_order=True)
+            assert mol.atoms == order
+            assert mol2.atoms == order2
+
+        # A graph with a different number of vertices is not reordered either
+        methane = Molecule().from_smiles("C")
+        order3 = methane.atoms[:]
+        assert not self.vf2.is_isomorphic(mol, methane, None, save_order=True)
+        assert methane.atoms == order3
+
+    def test_find_all_mappings(self):
+        """Test that all isomorphisms and subgraph isomorphisms are found."""
+        # The Kekule structure only has the 6 automorphisms which preserve the alternating bond orders
+        benzene = Molecule().from_smiles("c1ccccc1")
+        benzene2 = benzene.copy(deep=True)
+        assert len(self.vf2.find_isomorphism(benzene, benzene2, None)) == 6
+
+        aromatic = [mol for mol in benzene.generate_resonance_structures() if mol.is_aromatic()][0]
+        aromatic2 = aromatic.copy(deep=True)
+        assert len(self.vf2.find_isomorphism(aromatic, aromatic2, None)) == 12
+
+        propane = Molecule().from_smiles("CCC")
+        group = Group().from_adjacency_list(
+            """
+1 C u0 {2,S}
+2 C u0 {1,S}
+"""
+        )
+        mappings = self.vf2.find_subgraph_isomorphisms(propane, group, None)
+        assert len(mappings) == 4
+        for mapping in mappings:
+            for atom, group_atom in mapping.items():
+                assert atom.is_carbon()
+                assert group_atom in group.atoms
+
+        # An initial mapping restricts the search to mappings that contain it
+        center = [atom for atom in propane.atoms if atom.is_carbon() and len(atom.edges) == 4
+                  and sum([1 for a in atom.edges if a.is_carbon()]) == 2][0]
+        mappings = self.vf2.find_subgraph_isomorphisms(propane, group, {center: group.atoms[0]})
+        assert len(mappings) == 2
+        assert all([mapping[center] is group.atoms[0] for mapping in mappings])
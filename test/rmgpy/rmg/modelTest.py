@@ -39,9 +39,11 @@ from rmgpy.data.base import ForbiddenStructures
 from rmgpy.data.kinetics.family import TemplateReaction
 from rmgpy.data.rmg import RMGDatabase
 from rmgpy.data.thermo import NASA, NASAPolynomial
+from rmgpy.kinetics import Arrhenius
 from rmgpy.molecule import Molecule
 from rmgpy.rmg.main import RMG
-from rmgpy.rmg.model import CoreEdgeReactionModel
+from rmgpy.reaction import Reaction
+from rmgpy.rmg.model import CoreEdgeReactionModel, mark_new_duplicate_reactions
 from rmgpy.rmg.react import react
 from rmgpy.species import Species
 
@@ -822,6 +824,30 @@ class TestCoreEdgeReactionModel:
         assert found, "check_for_existing_reaction failed to identify existing reaction in the reverse direction"
         assert rxn == rxn_f
 
+    def test_mark_new_duplicate_reactions(self):
+        """
+        Test that mark_new_duplicate_reactions marks new reactions which duplicate
+        a checked reaction or a preceding new reaction in either direction
+        """
+        s1 = Species().from_smiles("[H]")
+        s2 = Species().from_smiles("CC")
+        s3 = Species().from_smiles("[H][H]")
+        s4 = Species().from_smiles("C[CH2]")
+        s5 = Species().from_smiles("C")
+
+        def make_reaction(reactants, products):
+            return Reaction(reactants=reactants, products=products, reversible=True,
+                            kinetics=Arrhenius(A=(1e13, "cm^3/(mol*s)"), n=0, Ea=(0, "kJ/mol"), T0=(1, "K")))
+
+        checked = [make_reaction([s1, s2], [s3, s4]), make_reaction([s2], [s5, s5])]
+        new = [make_reaction([s3, s4], [s1, s2]), make_reaction([s5, s5], [s1, s2]),
+               make_reaction([s5, s5], [s1, s2])]
+        mark_new_duplicate_reactions(new, checked)
+
+        assert checked[0].duplicate and new[0].duplicate
+        assert not checked[1].duplicate
+        assert new[1].duplicate and new[2].duplicate
+
     @classmethod
     def teardown_class(cls):
         """
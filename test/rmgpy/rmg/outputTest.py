@@ -32,7 +32,8 @@ import shutil
 
 
 from rmgpy.rmg.model import CoreEdgeReactionModel, ReactionModel
-from rmgpy.rmg.output import save_output_html
+from rmgpy.rmg.output import draw_species_images, get_species_image_name, save_output_html
+from rmgpy.species import Species
 from rmgpy.chemkin import load_chemkin_file
 
 
@@ -60,3 +61,31 @@ class TestOutput:
         assert os.path.isfile(out)
         os.remove(out)
         shutil.rmtree(os.path.join(folder, "species"))
+
+    def test_get_species_image_name(self):
+        """
+        Test that species images are named by structure rather than by label.
+        """
+        ethane = Species(label="ethane").from_smiles("CC")
+        renamed = Species(label="C2H6(1)").from_smiles("CC")
+        ethyl = Species(label="ethyl").from_smiles("C[CH2]")
+        assert get_species_image_name(ethane) == get_species_image_name(renamed)
+        assert get_species_image_name(ethane) != get_species_image_name(ethyl)
+        assert get_species_image_name(ethane).endswith(".png")
+        assert get_species_image_name(ethane, "svg").endswith(".svg")
+
+    def test_draw_species_images(self, tmp_path):
+        """
+        Test that existing species images are reused instead of being drawn again.
+        """
+        species = [Species(label=smiles).from_smiles(smiles) for smiles in ["CC", "C[CH2]", "C=C", "CC"]]
+        for spec in species:
+            (tmp_path / get_species_image_name(spec)).write_text("placeholder")
+
+        image_names = draw_species_images(species, str(tmp_path), processes=1)
+
+        assert len(image_names) == 4
+        assert image_names[id(species[0])] == image_names[id(species[3])]
+        assert len(list(tmp_path.iterdir())) == 3
+        for name in image_names.values():
+            assert (tmp_path / name).read_text() == "placeholder"
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This module contains unit tests of the rmgpy.rmg.wire module.
+"""
+
+import pickle
+
+from rmgpy.data.kinetics.family import TemplateReaction
+from rmgpy.molecule.fragment import Fragment
+from rmgpy.molecule.molecule import Molecule
+from rmgpy.rmg.wire import (
+    decode_molecule,
+    decode_reactions,
+    decode_species_list,
+    encode_molecule,
+    encode_reactions,
+    encode_species_list,
+)
+from rmgpy.species import Species
+from rmgpy.thermo import ThermoData
+
+
+class TestWire:
+    """
+    Contains unit tests of the compact transfer format.
+    """
+
+    def test_molecule(self):
+        """
+        Test that a molecule is recovered with its atom types, labels and attributes
+        """
+        molecule = Molecule().from_adjacency_list("""
+multiplicity 2
+1 *1 C u1 p0 c0 {2,S} {3,S} {4,S}
+2    C u0 p0 c0 {1,S} {5,D} {6,S}
+3    H u0 p0 c0 {1,S}
+4    H u0 p0 c0 {1,S}
+5    O u0 p2 c0 {2,D}
+6    H u0 p0 c0 {2,S}
+""")
+        data = encode_molecule(molecule)
+        new = decode_molecule(data)
+        assert new.is_isomorphic(molecule)
+        assert new.multiplicity == 2
+        assert [atom.label for atom in new.atoms] == [atom.label for atom in molecule.atoms]
+        assert [atom.atomtype for atom in new.atoms] == [atom.atomtype for atom in molecule.atoms]
+        assert [atom.lone_pairs for atom in new.atoms] == [atom.lone_pairs for atom in molecule.atoms]
+        assert new.get_bond(new.atoms[1], new.atoms[4]).is_double()
+        assert len(data) < len(pickle.dumps(molecule, pickle.HIGHEST_PROTOCOL))
+
+    def test_bond_orders(self):
+        """
+        Test that bond orders are recovered exactly
+        """
+        molecule = Molecule().from_smiles("CO")
+        bond = molecule.get_bond(molecule.atoms[0], molecule.atoms[1])
+        bond.order = 0.1
+        new = decode_molecule(encode_molecule(molecule))
+        assert new.get_bond(new.atoms[0], new.atoms[1]).order == 0.1
+
+    def test_fragment(self):
+        """
+        Test that fragments are recovered with their cutting labels, alone and in species
+        """
+        fragment = Fragment().from_smiles_like_string("CCR")
+        fragment.label = "frag"
+        new = decode_molecule(encode_molecule(fragment))
+        assert isinstance(new, Fragment)
+        assert new.label == "frag"
+        assert new.is_isomorphic(fragment)
+        assert [atom.symbol for atom in new.atoms] == [atom.symbol for atom in fragment.atoms]
+
+        species = Species(label="frag", molecule=[Fragment().from_smiles_like_string("CCL")])
+        new = decode_species_list(encode_species_list([species]))[0]
+        assert new.label == "frag"
+        assert isinstance(new.molecule[0], Fragment)
+        assert new.molecule[0].is_isomorphic(species.molecule[0])
+
+    def test_species_list(self):
+        """
+        Test that species are recovered with all their resonance structures
+        """
+        species_list = [Species(label="allyl", smiles="[CH2]C=C"), Species(smiles="c1ccccc1"), Species(smiles="CC")]
+        for species in species_list:
+            species.generate_resonance_structures()
+        species_list[2].thermo = ThermoData(Tdata=([300, 400, 500, 600, 800, 1000, 1500], "K"),
+                                            Cpdata=([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0], "cal/(mol*K)"),
+                                            H298=(-20.0, "kcal/mol"), S298=(50.0, "cal/(mol*K)"))
+        data = encode_species_list(species_list)
+        new_list = decode_species_list(data)
+        assert len(new_list) == 3
+        assert new_list[0].label == "allyl"
+        for species, new in zip(species_list, new_list):
+            assert len(new.molecule) == len(species.molecule)
+            for molecule, new_molecule in zip(species.molecule, new.molecule):
+                assert new_molecule.is_isomorphic(molecule)
+        assert new_list[2].thermo.H298.value_si == species_list[2].thermo.H298.value_si
+        assert len(data) < len(pickle.dumps(species_list, pickle.HIGHEST_PROTOCOL))
+
+        new_list = decode_species_list(encode_species_list(species_list, properties=False))
+        assert new_list[2].thermo is None
+        assert new_list[2].molecule[0].is_isomorphic(species_list[2].molecule[0])
+
+    def test_reactions(self):
+        """
+        Test that reactions are recovered with their species shared as in the originals
+        """
+        ch3 = Species(smiles="[CH3]")
+        ch4 = Species(smiles="C")
+        oh = Species(smiles="[OH]")
+        h2o = Species(smiles="O")
+        reverse = TemplateReaction(reactants=[ch3, h2o], products=[ch4, oh], family="H_Abstraction",
+                                   template=["O_pri_rad", "Cs_H"], degeneracy=2, is_forward=False)
+        reaction = TemplateReaction(reactants=[ch4, oh], products=[ch3, h2o], family="H_Abstraction",
+                                    template=["C_methane", "O_pri_rad"], degeneracy=4, pairs=[[ch4, ch3], [oh, h2o]],
+                                    reverse=reverse, is_forward=True)
+        other = TemplateReaction(reactants=[ch3, ch3], products=[Species(smiles="CC")], family="R_Recombination",
+                                 template=["Y_rad", "Y_rad"], degeneracy=0.5, is_forward=True)
+
+        new_reaction, new_other = decode_reactions(encode_reactions([reaction, other]))
+        assert isinstance(new_reaction, TemplateReaction)
+        assert new_reaction.is_isomorphic(reaction)
+        assert new_reaction.family == "H_Abstraction"
+        assert new_reaction.template == ["C_methane", "O_pri_rad"]
+        assert new_reaction.degeneracy == 4
+        assert new_reaction.is_forward
+        assert new_reaction.pairs[0][0] is new_reaction.reactants[0]
+        assert new_reaction.pairs[1][1] is new_reaction.products[1]
+        assert new_reaction.reverse.is_isomorphic(reverse)
+        assert new_reaction.reverse.reactants[0] is new_reaction.products[0]
+        assert not new_reaction.reverse.is_forward
+        assert new_other.reactants[0] is new_other.reactants[1]
+        assert new_other.reactants[0] is new_reaction.products[0]
+        assert new_other.degeneracy == 0.5
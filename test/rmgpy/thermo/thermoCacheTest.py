@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+###############################################################################
+#                                                                             #
+# RMG - Reaction Mechanism Generator                                          #
+#                                                                             #
+# Copyright (c) 2002-2023 Prof. William H. Green (whgreen@mit.edu),           #
+# Prof. Richard H. West (r.west@neu.edu) and the RMG Team (rmg_dev@mit.edu)   #
+#                                                                             #
+# Permission is hereby granted, free of charge, to any person obtaining a     #
+# copy of this software and associated documentation files (the 'Software'),  #
+# to deal in the Software without restriction, including without limitation   #
+# the rights to use, copy, modify, merge, publish, distribute, sublicense,    #
+# and/or sell copies of the Software, and to permit persons to whom the       #
+# Software is furnished to do so, subject to the following conditions:        #
+#                                                                             #
+# The above copyright notice and this permission notice shall be included in  #
+# all copies or substantial portions of the Software.                         #
+#                                                                             #
+# THE SOFTWARE IS PROVIDED 'AS IS', WITHOUT WARRANTY OF ANY KIND, EXPRESS OR  #
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,    #
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE #
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER      #
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING     #
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER         #
+# DEALINGS IN THE SOFTWARE.                                                   #
+#                                                                             #
+###############################################################################
+
+"""
+This script contains unit tests of the :mod:`rmgpy.thermo.cache` module.
+"""
+
+import os
+
+from rmgpy.data.thermo import ThermoDatabase, ThermoLibrary
+from rmgpy.species import Species
+from rmgpy.statmech import Conformer
+from rmgpy.thermo import NASA, NASAPolynomial, ThermoData
+from rmgpy.thermo.cache import ThermoCache
+
+
+class TestThermoCache:
+    """
+    Contains unit tests of the ThermoCache class.
+    """
+
+    def setup_method(self):
+        self.thermo = NASA(
+            polynomials=[
+                NASAPolynomial(coeffs=[3.61263, -0.00100893, 2.49898e-06, -1.43376e-09, 2.58636e-13, -1051.1, 2.6527],
+                               Tmin=(200, 'K'), Tmax=(1000, 'K')),
+                NASAPolynomial(coeffs=[2.97591, 0.0016414, -7.19719e-07, 1.25377e-10, -7.91522e-15, -1025.84, 5.53757],
+                               Tmin=(1000, 'K'), Tmax=(6000, 'K')),
+            ],
+            Tmin=(200, 'K'), Tmax=(6000, 'K'), comment='Thermo group additivity estimation: group(Cs-CsHHH)',
+        )
+
+    def test_disabled(self):
+        """Test that the cache does nothing until it is connected to a database."""
+        cache = ThermoCache()
+        spc = Species(smiles="CC")
+        cache.put_thermo_data(spc, 'fingerprint', self.thermo)
+        assert not cache.enabled
+        assert len(cache) == 0
+        assert cache.get_thermo_data(spc, 'fingerprint') is None
+
+    def test_database(self, tmp_path):
+        """Test that thermo, its comment and E0 are shared through the database."""
+        path = os.path.join(str(tmp_path), 'thermo.db')
+        cache = ThermoCache(path=path)
+        spc = Species(smiles="[CH2]C=C")
+        spc.generate_resonance_structures()
+        spc.conformer = None
+        spc.thermo = self.thermo
+        assert cache.get_thermo_data(spc, 'fingerprint') is None
+        spc.conformer = Conformer(E0=(150.0, 'kJ/mol'))
+        cache.put_thermo_data(spc, 'fingerprint', self.thermo)
+        cache.close()
+
+        cache = ThermoCache(path=path, read_only=True)
+        new = Species(smiles="C=C[CH2]")
+        new.generate_resonance_structures()
+        new.molecule.reverse()
+        thermo = cache.get_thermo_data(new, 'fingerprint')
+        assert thermo is not self.thermo
+        assert thermo.comment == self.thermo.comment
+        assert thermo.get_enthalpy(500) == self.thermo.get_enthalpy(500)
+        assert new.conformer.E0.value_si == 150000.0
+        assert new.molecule[0].is_isomorphic(spc.molecule[0])
+        assert cache.get_thermo_data(new, 'other fingerprint') is None
+        assert cache.get_thermo_data(Species(smiles="CCC"), 'fingerprint') is None
+        assert cache.hits == 1 and cache.misses == 2
+        cache.put_thermo_data(Species(smiles="CCC"), 'fingerprint', self.thermo)
+        cache.close()
+
+        cache = ThermoCache(path=path)
+        assert cache.get_thermo_data(Species(smiles="CCC"), 'fingerprint') is None
+        cache.close()
+
+    def test_read_only_path_with_uri_characters(self, tmp_path):
+        """Test that a database whose path contains URI delimiters can be opened read-only."""
+        path = os.path.join(str(tmp_path), 'thermo #1?.db')
+        cache = ThermoCache(path=path)
+        cache.put_thermo_data(Species(smiles="CC"), 'fingerprint', self.thermo)
+        cache.close()
+
+        cache = ThermoCache(path=path, read_only=True)
+        thermo = cache.get_thermo_data(Species(smiles="CC"), 'fingerprint')
+        assert thermo.get_enthalpy(500) == self.thermo.get_enthalpy(500)
+        cache.close()
+
+    def test_fingerprint(self):
+        """Test that the fingerprint changes with the libraries and the thermo class."""
+        cache = ThermoCache()
+        database = ThermoDatabase()
+        fingerprint = cache.get_fingerprint(database, NASA)
+        assert cache.get_fingerprint(database, NASA) == fingerprint
+        assert cache.get_fingerprint(database, ThermoData) != fingerprint
+
+        library = ThermoLibrary(label='test')
+        library.load_entry(index=1, label='H2', molecule="1 H u0 p0 c0 {2,S}\n2 H u0 p0 c0 {1,S}", thermo=self.thermo)
+        database.libraries['test'] = library
+        database.library_order.append('test')
+        assert cache.get_fingerprint(database, NASA) != fingerprint
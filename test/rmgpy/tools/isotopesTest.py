@@ -282,6 +282,32 @@ class IsotopesTest:
 
         assert eth.is_isomorphic(stripped)
 
+    def test_inplace_remove_isotope_resets_canonical_hash(self):
+        """
+        Test that removing and restoring isotopes in place keeps the isomorphism
+        checks consistent with the current elements of the atoms.
+        """
+        eth = Species().from_smiles("CC")
+        ethi = Species().from_adjacency_list(
+            """
+1 C u0 p0 c0 {2,S} {3,S} {4,S} {5,S}
+2 C u0 p0 c0 i13 {1,S} {6,S} {7,S} {8,S}
+3 H u0 p0 c0 {1,S}
+4 H u0 p0 c0 {1,S}
+5 H u0 p0 c0 {1,S}
+6 H u0 p0 c0 {2,S}
+7 H u0 p0 c0 {2,S}
+8 H u0 p0 c0 {2,S}
+"""
+        )
+        assert not eth.is_isomorphic(ethi)
+
+        atom_list = remove_isotope(ethi, inplace=True)
+        assert eth.is_isomorphic(ethi)
+
+        redo_isotope(atom_list)
+        assert not eth.is_isomorphic(ethi)
+
     def test_inplace_remove_isotope_for_reactions(self):
         """
         Test that removeIsotope and redoIsotope works with reactions